@@ -21,16 +21,22 @@ from utils.file_handler import save_uploaded_file, validate_xml_file, cleanup_te
 from utils.pipeline import (
     get_available_scripts,
     get_script_description,
-    run_pipeline
+    run_pipeline_job
 )
+from utils.job_queue import CANCELLED_MESSAGE, STATUS_CANCELLED, get_job_queue
 from utils.validation import (
-    validate_xml_syntax,
-    validate_xml_syntax_with_script,
-    validate_text_content,
     format_validation_report
 )
 from utils.label_analyzer import analyze_xml_labels
 from components.xml_preview import preview_xml_file
+from components.step_timing import render_step_timing
+from components.job_status import (
+    is_job_active,
+    job_progress,
+    load_job_result,
+    restore_job_id,
+    set_job_id
+)
 
 # ページ設定
 st.set_page_config(
@@ -54,6 +60,10 @@ if 'selected_scripts' not in st.session_state:
 if 'show_output_preview' not in st.session_state:
     st.session_state.show_output_preview = False
 
+# 変換ジョブのID（ページを再読み込みした場合はURLのクエリパラメータから復元）
+JOB_QUERY_PARAM = "job"
+restore_job_id('job_id', JOB_QUERY_PARAM, 'uploaded_file_path', 'uploaded_file_name')
+
 def main():
     """メイン関数"""
     st.title("📄 XML変換パイプライン処理システム")
@@ -82,7 +92,7 @@ def main():
         else:
             # デフォルトで推奨順序のスクリプトを選択
             if not st.session_state.selected_scripts:
-                st.session_state.selected_scripts = available_scripts[:15]  # 推奨順序の15個
+                st.session_state.selected_scripts = list(available_scripts)  # 登録済みの全ステップ（推奨順序）
             
             selected_scripts = st.multiselect(
                 "実行するスクリプトを選択",
@@ -229,6 +239,11 @@ def main():
         else:
             st.warning("⚠️ サイドバーで変換スクリプトを選択してください。")
         
+        # ジョブの状態（待機中・実行中は処理開始ボタンを無効にする）
+        job_id = st.session_state.job_id
+        job_status = get_job_queue().get_status(job_id) if job_id else None
+        st.session_state.processing = is_job_active(job_status)
+        
         # 処理開始ボタン
         col1, col2 = st.columns([1, 4])
         
@@ -243,20 +258,14 @@ def main():
                 )
             )
         
-        # 処理実行
+        # 処理の登録（変換はバックグラウンドのジョブとして実行し、このページは進捗を定期的に確認する）
         if process_button:
             if st.session_state.uploaded_file_path is None:
                 st.error("❌ XMLファイルをアップロードしてください。")
             elif not st.session_state.selected_scripts:
                 st.error("❌ 変換スクリプトを選択してください。")
             else:
-                st.session_state.processing = True
-                st.session_state.processing_result = None
-                
-                # 出力ファイルのパスを決定
                 input_path = st.session_state.uploaded_file_path
-                output_dir = project_root / "output"
-                output_dir.mkdir(exist_ok=True)
                 
                 # アップロード時のファイル名を使用して出力ファイル名を決定
                 uploaded_file_name = st.session_state.uploaded_file_name or input_path.name
@@ -265,102 +274,57 @@ def main():
                     output_filename = uploaded_file_name[:-4] + '_final.xml'
                 else:
                     output_filename = uploaded_file_name + '_final.xml'
-                output_path = output_dir / output_filename
                 
-                # 中間ファイル保存ディレクトリ
-                # アップロード時のファイル名（拡張子なし）を使用
-                uploaded_file_name = st.session_state.uploaded_file_name or input_path.name
-                intermediate_stem = Path(uploaded_file_name).stem
-                intermediate_dir = output_dir / "intermediate_files" / intermediate_stem
-                intermediate_dir.mkdir(parents=True, exist_ok=True)
-                
-                # 進捗バーとステータス表示
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                def progress_callback(current_step, total_steps, script_name):
-                    """進捗コールバック関数"""
-                    progress = current_step / total_steps
-                    progress_bar.progress(progress)
-                    status_text.info(f"処理中 ({current_step}/{total_steps}): {script_name}")
+                # 出力ファイル・中間ファイルはジョブのディレクトリ（output/jobs/<ジョブID>/）に保存
+                job_id = get_job_queue().submit(
+                    "convert",
+                    run_pipeline_job,
+                    input_path,
+                    label=uploaded_file_name,
+                    scripts=list(st.session_state.selected_scripts),
+                    script_dir=script_dir,
+                    output_filename=output_filename,
+                    timeout=300
+                )
+                set_job_id('job_id', JOB_QUERY_PARAM, job_id)
+                st.session_state.processing_result = None
+                st.rerun()
+        
+        # ジョブの状態
+        if job_id and job_status is None:
+            # ジョブのディレクトリが削除された場合
+            set_job_id('job_id', JOB_QUERY_PARAM, None)
+        elif st.session_state.processing:
+            job_progress(job_id, key="convert_job")
+        elif job_id:
+            if st.session_state.processing_result is None:
+                st.session_state.processing_result = load_job_result(job_id, job_status)
+            result = st.session_state.processing_result
+            if result.get("success"):
+                st.progress(1.0)
+                st.success("✅ パイプライン処理が完了しました！")
                 
-                # パイプライン実行
-                with st.spinner("パイプライン処理を実行中..."):
-                    success, error_msg, execution_log = run_pipeline(
-                        input_path=input_path,
-                        output_path=output_path,
-                        scripts=st.session_state.selected_scripts,
-                        script_dir=script_dir,
-                        intermediate_dir=intermediate_dir,
-                        timeout=300,
-                        progress_callback=progress_callback
+                # ステップごとの処理時間
+                with st.expander("⏱ ステップごとの処理時間", expanded=False):
+                    render_step_timing(
+                        result.get("execution_log") or {},
+                        Path(st.session_state.uploaded_file_name or "output").stem,
+                        key="convert_timing"
                     )
+            elif job_status["status"] == STATUS_CANCELLED:
+                st.warning(f"⏹ {result.get('error') or CANCELLED_MESSAGE}")
+            else:
+                st.error(f"❌ エラーが発生しました: {result.get('error')}")
                 
-                st.session_state.processing = False
-                
-                if success:
-                    progress_bar.progress(1.0)
-                    status_text.success("✅ パイプライン処理が完了しました！")
-                    
-                    # 検証を自動実行
-                    validation_results = {}
-                    
-                    # 構文検証を自動実行
-                    if output_path.exists():
-                        with st.spinner("構文検証を実行中..."):
-                            script_dir = project_root / "scripts"
-                            validation_script = script_dir / "validate_xml.py"
-                            syntax_valid, syntax_error, syntax_output = validate_xml_syntax_with_script(
-                                output_path,
-                                validation_script if validation_script.exists() else None
-                            )
-                            validation_results['syntax'] = {
-                                'is_valid': syntax_valid,
-                                'error': syntax_error,
-                                'output': syntax_output
-                            }
-                    
-                    # テキスト内容検証を自動実行
-                    original_file = st.session_state.uploaded_file_path
-                    if original_file and original_file.exists() and output_path.exists():
-                        with st.spinner("テキスト内容検証を実行中..."):
-                            script_dir = project_root / "scripts"
-                            comparison_script = script_dir / "compare_xml_text_content.py"
-                            content_valid, content_error, content_output, report_data = validate_text_content(
-                                original_file,
-                                output_path,
-                                comparison_script if comparison_script.exists() else None
-                            )
-                            validation_results['content'] = {
-                                'is_valid': content_valid,
-                                'error': content_error,
-                                'output': content_output,
-                                'report_data': report_data
-                            }
-                    
-                    st.session_state.processing_result = {
-                        "success": True,
-                        "output_path": output_path,
-                        "execution_log": execution_log,
-                        "intermediate_dir": intermediate_dir,
-                        "validation_results": validation_results
-                    }
-                else:
-                    status_text.error(f"❌ エラーが発生しました: {error_msg}")
-                    st.session_state.processing_result = {
-                        "success": False,
-                        "error": error_msg,
-                        "execution_log": execution_log
-                    }
-                    
-                    # エラー詳細の表示
-                    if execution_log and execution_log.get("steps"):
-                        with st.expander("エラー詳細", expanded=True):
-                            for step_info in execution_log["steps"]:
-                                if not step_info.get("success", False):
-                                    st.error(f"ステップ {step_info['step']}: {step_info['script']}")
-                                    if step_info.get("error"):
-                                        st.code(step_info["error"], language=None)
+                # エラー詳細の表示
+                execution_log = result.get("execution_log")
+                if execution_log and execution_log.get("steps"):
+                    with st.expander("エラー詳細", expanded=True):
+                        for step_info in execution_log["steps"]:
+                            if not step_info.get("success", False):
+                                st.error(f"ステップ {step_info['step']}: {step_info['script']}")
+                                if step_info.get("error"):
+                                    st.code(step_info["error"], language=None)
         
         st.markdown("---")
         
@@ -525,7 +489,8 @@ def main():
         
         3. **パイプライン処理の実行**
            - 「処理開始」ボタンをクリック
-           - 処理中は進捗バーで進捗を確認できます
+           - 処理はサーバー上のバックグラウンドで実行され、進捗バーで進捗を確認できます
+           - 処理中は「キャンセル」ボタンで中止できます。ページを再読み込みしても、同じURLで結果を確認できます
         
         4. **結果のダウンロード**
            - 処理が完了すると、ダウンロードボタンが表示されます
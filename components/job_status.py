@@ -0,0 +1,106 @@
+"""
+バックグラウンドジョブの状態表示コンポーネント
+
+変換ページ・逆変換ページで共通の、ジョブIDの保持（セッション状態とURLのクエリパラメータ）と
+進捗表示・キャンセルボタンを提供します。ジョブの実行と状態の保存は utils/job_queue.py が行います。
+"""
+import streamlit as st
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.job_queue import (
+    FINISHED_STATUSES,
+    STATUS_LABELS,
+    STATUS_QUEUED,
+    get_job_queue
+)
+
+# 進捗の確認間隔（秒）
+JOB_POLL_INTERVAL = 1.0
+
+
+def restore_job_id(state_key: str, query_param: str, input_path_key: str, input_name_key: str) -> Optional[str]:
+    """
+    セッション状態のジョブIDを取得（新しいセッションではURLのクエリパラメータから復元）
+
+    ページを再読み込みするとセッション状態は失われるため、ジョブIDはクエリパラメータにも保持する。
+    復元したジョブの入力ファイル（ジョブのディレクトリのコピー）をアップロード済みのファイルとして設定する。
+
+    Args:
+        state_key: ジョブIDを保持するセッション状態のキー
+        query_param: ジョブIDを保持するクエリパラメータ名
+        input_path_key: アップロード済みファイルのパスを保持するセッション状態のキー
+        input_name_key: アップロード済みファイル名を保持するセッション状態のキー
+
+    Returns:
+        ジョブID（ない場合はNone）
+    """
+    if state_key not in st.session_state:
+        job_id = st.query_params.get(query_param)
+        status = get_job_queue().get_status(job_id) if job_id else None
+        st.session_state[state_key] = job_id if status else None
+        if status and st.session_state.get(input_path_key) is None:
+            st.session_state[input_path_key] = Path(status["input_path"])
+            st.session_state[input_name_key] = status["label"]
+    return st.session_state[state_key]
+
+
+def set_job_id(state_key: str, query_param: str, job_id: Optional[str]) -> None:
+    """ジョブIDをセッション状態とクエリパラメータに保存（Noneの場合は削除）"""
+    st.session_state[state_key] = job_id
+    if job_id:
+        st.query_params[query_param] = job_id
+    elif query_param in st.query_params:
+        del st.query_params[query_param]
+
+
+def is_job_active(status: Optional[Dict]) -> bool:
+    """ジョブが待機中・実行中か"""
+    return status is not None and status["status"] not in FINISHED_STATUSES
+
+
+def load_job_result(job_id: str, status: Dict) -> Dict:
+    """
+    完了したジョブの結果を画面表示用の形式で取得（出力ファイル・中間ファイルのパスを Path に戻す）
+
+    Returns:
+        {"success", "error", "execution_log", ...}
+    """
+    result = get_job_queue().get_result(job_id) or {"success": False, "execution_log": {}}
+    for key in ("output_path", "intermediate_dir"):
+        if result.get(key):
+            result[key] = Path(result[key])
+    if not result.get("success"):
+        result["error"] = status.get("error") or result.get("error")
+    return result
+
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def job_progress(job_id: str, key: str) -> None:
+    """
+    実行中のジョブの進捗とキャンセルボタンを表示（この部分だけを一定間隔で再実行する）
+
+    ジョブが完了したらページ全体を再実行し、結果を表示させる。
+
+    Args:
+        job_id: ジョブID
+        key: ウィジェットのキーの接頭辞
+    """
+    queue = get_job_queue()
+    status = queue.get_status(job_id)
+    if not is_job_active(status):
+        st.rerun()
+
+    total_steps = status["total_steps"] or 1
+    st.progress(min(status["current_step"] / total_steps, 1.0))
+    if status["status"] == STATUS_QUEUED:
+        st.info(f"⏳ {STATUS_LABELS[STATUS_QUEUED]}: 他の変換の完了を待っています（ジョブID: {job_id}）")
+    else:
+        st.info(f"処理中 ({status['current_step']}/{status['total_steps']}): {status['step_name'] or '準備中'}"
+                f"（ジョブID: {job_id}）")
+
+    if status["cancel_requested"]:
+        st.caption("キャンセルを要求しました。実行中の処理を終了しています...")
+    elif st.button("⏹ キャンセル", key=f"{key}_cancel"):
+        queue.cancel(job_id)
+    st.caption("💡 処理はサーバー上で実行されます。ページを再読み込みしても、このURLから結果を確認できます。")
@@ -0,0 +1,67 @@
+"""
+ステップごとの処理時間の表示コンポーネント
+
+実行ログ（execution_log）の各ステップの計測結果（"profile"）を表で表示し、
+実行ログ（JSON）とChromeのトレース形式のファイルをダウンロードできるようにします。
+計測結果の形式と表の作成は scripts/step_profiler.py を使用します。
+"""
+import json
+import sys
+import streamlit as st
+from pathlib import Path
+from typing import Dict
+
+# scripts/ の計測モジュールを使用（scripts/utils と名前が衝突しないよう、パスの末尾に追加）
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.append(str(SCRIPTS_DIR))
+
+import step_profiler
+
+
+def render_step_timing(execution_log: Dict, file_stem: str, key: str) -> None:
+    """
+    ステップごとの処理時間の表とダウンロードボタンを表示
+
+    Args:
+        execution_log: run_pipeline / run_reverse_pipeline の実行ログ
+        file_stem: ダウンロードするファイル名の接頭辞
+        key: ウィジェットのキーの接頭辞
+    """
+    rows = step_profiler.build_table_rows(execution_log)
+    if not rows:
+        st.info("計測結果がありません。")
+        return
+
+    profile = execution_log.get("profile") or {}
+    if profile.get("wall_time") is not None:
+        summary = f"**合計処理時間**: {profile['wall_time']:.2f} 秒"
+        if profile.get("peak_rss_kb") is not None:
+            summary += f"　**最大メモリ使用量**: {profile['peak_rss_kb'] / 1024:.1f} MB"
+        st.markdown(summary)
+
+    # 値のない列（個別に実行したスクリプトのみの場合の内訳等）は表示しない
+    columns = [column for column in rows[0] if any(row[column] not in (None, "") for row in rows)]
+    st.dataframe([{column: row[column] for column in columns} for row in rows],
+                 use_container_width=True, hide_index=True)
+    st.caption("変換・整形・書き出しはパイプラインエンジンで実行したステップの内訳です。"
+               "一括変換したステップ（Item〜Subitem10）は先頭の行にまとめて表示します。")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="📥 実行ログ（JSON）",
+            data=json.dumps(execution_log, ensure_ascii=False, indent=2, default=str),
+            file_name=f"{file_stem}_execution_log.json",
+            mime="application/json",
+            key=f"{key}_log_json"
+        )
+    with col2:
+        st.download_button(
+            label="📥 トレース（Chrome形式）",
+            data=json.dumps(step_profiler.build_chrome_trace(execution_log), ensure_ascii=False),
+            file_name=f"{file_stem}_trace.json",
+            mime="application/json",
+            key=f"{key}_trace",
+            help="chrome://tracing または https://ui.perfetto.dev で開くと、ステップと処理段階を時系列で表示します"
+        )
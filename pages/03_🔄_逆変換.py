@@ -19,15 +19,19 @@ from utils.file_handler import save_uploaded_file, validate_xml_file, cleanup_te
 from utils.reverse_pipeline import (
     REVERSE_SCRIPT_ORDER,
     get_reverse_script_description,
-    run_reverse_pipeline
-)
-from utils.validation import (
-    validate_xml_syntax,
-    validate_xml_syntax_with_script,
-    validate_text_content,
-    format_validation_report
+    run_reverse_pipeline_job
 )
+from utils.job_queue import CANCELLED_MESSAGE, STATUS_CANCELLED, get_job_queue
+from utils.validation import format_validation_report
 from components.xml_preview import preview_xml_file
+from components.step_timing import render_step_timing
+from components.job_status import (
+    is_job_active,
+    job_progress,
+    load_job_result,
+    restore_job_id,
+    set_job_id
+)
 
 st.set_page_config(
     page_title="逆変換 - XML変換パイプライン",
@@ -60,6 +64,10 @@ if 'reverse_include_remarks' not in st.session_state:
 if 'reverse_include_newprovision' not in st.session_state:
     st.session_state.reverse_include_newprovision = True
 
+# 逆変換ジョブのID（ページを再読み込みした場合はURLのクエリパラメータから復元）
+REVERSE_JOB_QUERY_PARAM = "reverse_job"
+restore_job_id('reverse_job_id', REVERSE_JOB_QUERY_PARAM, 'reverse_uploaded_file_path', 'reverse_uploaded_file_name')
+
 def main():
     """メイン関数"""
     st.title("🔄 逆変換処理")
@@ -206,6 +214,11 @@ def main():
             )
             st.session_state.reverse_include_newprovision = include_newprovision
         
+        # ジョブの状態（待機中・実行中は逆変換開始ボタンを無効にする）
+        job_id = st.session_state.reverse_job_id
+        job_status = get_job_queue().get_status(job_id) if job_id else None
+        st.session_state.reverse_processing = is_job_active(job_status)
+        
         # 処理開始ボタン
         col1, col2 = st.columns([1, 4])
         
@@ -219,18 +232,12 @@ def main():
                 )
             )
         
-        # 処理実行
+        # 処理の登録（逆変換はバックグラウンドのジョブとして実行し、このページは進捗を定期的に確認する）
         if process_button:
             if st.session_state.reverse_uploaded_file_path is None:
                 st.error("❌ XMLファイルをアップロードしてください。")
             else:
-                st.session_state.reverse_processing = True
-                st.session_state.reverse_processing_result = None
-                
-                # 出力ファイルのパスを決定
                 input_path = st.session_state.reverse_uploaded_file_path
-                output_dir = project_root / "output"
-                output_dir.mkdir(exist_ok=True)
                 
                 # アップロード時のファイル名を使用して出力ファイル名を決定
                 uploaded_file_name = st.session_state.reverse_uploaded_file_name or input_path.name
@@ -239,100 +246,38 @@ def main():
                     output_filename = uploaded_file_name[:-4] + '_reverse.xml'
                 else:
                     output_filename = uploaded_file_name + '_reverse.xml'
-                output_path = output_dir / output_filename
-                
-                # 中間ファイル保存ディレクトリ
-                uploaded_file_name = st.session_state.reverse_uploaded_file_name or input_path.name
-                intermediate_stem = Path(uploaded_file_name).stem
-                intermediate_dir = output_dir / "reverse_intermediate_files" / intermediate_stem
-                intermediate_dir.mkdir(parents=True, exist_ok=True)
-                
-                # 進捗バーとステータス表示
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                def progress_callback(current_step, total_steps, script_name):
-                    """進捗コールバック関数"""
-                    progress = current_step / total_steps
-                    progress_bar.progress(progress)
-                    status_text.info(f"処理中 ({current_step}/{total_steps}): {script_name}")
                 
                 # 逆変換スクリプトディレクトリ
                 reverse_script_dir = project_root / "reverse_app"
                 
-                # パイプライン実行
-                with st.spinner("逆変換パイプライン処理を実行中..."):
-                    success, error_msg, execution_log = run_reverse_pipeline(
-                        input_path=input_path,
-                        output_path=output_path,
-                        script_dir=reverse_script_dir,
-                        intermediate_dir=intermediate_dir,
-                        timeout=300,
-                        progress_callback=progress_callback,
-                        include_paragraph=st.session_state.reverse_include_paragraph,
-                        include_class=st.session_state.reverse_include_class,
-                        include_appdxtable=st.session_state.reverse_include_appdxtable,
-                        include_tablecolumn=st.session_state.reverse_include_tablecolumn,
-                        include_remarks=st.session_state.reverse_include_remarks,
-                        include_newprovision=st.session_state.reverse_include_newprovision
-                    )
-                
-                st.session_state.reverse_processing = False
-                
-                if success:
-                    progress_bar.progress(1.0)
-                    status_text.success("✅ 逆変換処理が完了しました！")
-                    
-                    # 検証を自動実行
-                    validation_results = {}
-                    
-                    # 構文検証を自動実行
-                    if output_path.exists():
-                        with st.spinner("構文検証を実行中..."):
-                            script_dir = project_root / "scripts"
-                            validation_script = script_dir / "validate_xml.py"
-                            syntax_valid, syntax_error, syntax_output = validate_xml_syntax_with_script(
-                                output_path,
-                                validation_script if validation_script.exists() else None
-                            )
-                            validation_results['syntax'] = {
-                                'is_valid': syntax_valid,
-                                'error': syntax_error,
-                                'output': syntax_output
-                            }
-                    
-                    # テキスト内容検証を自動実行
-                    original_file = st.session_state.reverse_uploaded_file_path
-                    if original_file and original_file.exists() and output_path.exists():
-                        with st.spinner("テキスト内容検証を実行中..."):
-                            script_dir = project_root / "scripts"
-                            comparison_script = script_dir / "compare_xml_text_content.py"
-                            content_valid, content_error, content_output, report_data = validate_text_content(
-                                original_file,
-                                output_path,
-                                comparison_script if comparison_script.exists() else None
-                            )
-                            validation_results['content'] = {
-                                'is_valid': content_valid,
-                                'error': content_error,
-                                'output': content_output,
-                                'report_data': report_data
-                            }
-                    
-                    st.session_state.reverse_processing_result = {
-                        "success": True,
-                        "output_path": output_path,
-                        "execution_log": execution_log,
-                        "intermediate_dir": intermediate_dir,
-                        "validation_results": validation_results
-                    }
-                else:
-                    status_text.error(f"❌ エラーが発生しました: {error_msg}")
-                    st.session_state.reverse_processing_result = {
-                        "success": False,
-                        "error": error_msg,
-                        "execution_log": execution_log
-                    }
+                # 出力ファイル・中間ファイルはジョブのディレクトリ（output/jobs/<ジョブID>/）に保存
+                job_id = get_job_queue().submit(
+                    "reverse",
+                    run_reverse_pipeline_job,
+                    input_path,
+                    label=uploaded_file_name,
+                    script_dir=reverse_script_dir,
+                    output_filename=output_filename,
+                    timeout=300,
+                    include_paragraph=st.session_state.reverse_include_paragraph,
+                    include_class=st.session_state.reverse_include_class,
+                    include_appdxtable=st.session_state.reverse_include_appdxtable,
+                    include_tablecolumn=st.session_state.reverse_include_tablecolumn,
+                    include_remarks=st.session_state.reverse_include_remarks,
+                    include_newprovision=st.session_state.reverse_include_newprovision
+                )
+                set_job_id('reverse_job_id', REVERSE_JOB_QUERY_PARAM, job_id)
+                st.session_state.reverse_processing_result = None
+                st.rerun()
+        
+        # ジョブの状態
+        if job_id and job_status is None:
+            # ジョブのディレクトリが削除された場合
+            set_job_id('reverse_job_id', REVERSE_JOB_QUERY_PARAM, None)
+        elif st.session_state.reverse_processing:
+            job_progress(job_id, key="reverse_job")
+        elif job_id and st.session_state.reverse_processing_result is None:
+            st.session_state.reverse_processing_result = load_job_result(job_id, job_status)
         
         # 処理結果の表示
         if st.session_state.reverse_processing_result is not None:
@@ -372,6 +317,8 @@ def main():
                 # 実行ログの表示
                 execution_log = result.get("execution_log", {})
                 if execution_log:
+                    with st.expander("⏱ ステップごとの処理時間", expanded=False):
+                        render_step_timing(execution_log, output_path.stem, key="reverse_timing")
                     with st.expander("📋 実行ログ", expanded=False):
                         st.json(execution_log)
                 
@@ -403,6 +350,20 @@ def main():
                             if content_result.get('report_data'):
                                 report = format_validation_report(content_result['report_data'])
                                 st.text(report)
+
+                    # テキスト順序検証結果
+                    if 'order' in validation_results:
+                        order_result = validation_results['order']
+                        if order_result['is_order_preserved']:
+                            st.success("✅ テキスト順序検証: 正常")
+                        else:
+                            st.warning("⚠️ テキスト順序検証: 順序の変更あり")
+                            if order_result.get('error'):
+                                st.error(order_result['error'])
+                            if order_result.get('report'):
+                                st.text(order_result['report'])
+            elif job_status and job_status["status"] == STATUS_CANCELLED:
+                st.warning(f"⏹ {result.get('error') or CANCELLED_MESSAGE}")
             else:
                 st.error("❌ 逆変換処理に失敗しました")
                 if "error" in result:
@@ -413,10 +374,6 @@ def main():
                 if execution_log:
                     with st.expander("📋 実行ログ", expanded=True):
                         st.json(execution_log)
-        
-        # 処理中の表示
-        if st.session_state.reverse_processing:
-            st.info("⏳ 逆変換処理を実行中です。しばらくお待ちください...")
 
 
 if __name__ == "__main__":
@@ -17,19 +17,20 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from reverse_xml_converter import ReverseConversionConfig, main_with_config
 
 
+# Item逆変換の設定
+CONFIG = ReverseConversionConfig(
+    parent_tag='Paragraph',
+    child_tag='Item',
+    title_tag='ItemTitle',
+    sentence_tag='ItemSentence',
+    script_name='reverse_convert_item'
+)
+
+
 def main():
     """メイン関数"""
-    # Item逆変換の設定
-    config = ReverseConversionConfig(
-        parent_tag='Paragraph',
-        child_tag='Item',
-        title_tag='ItemTitle',
-        sentence_tag='ItemSentence',
-        script_name='reverse_convert_item'
-    )
-
     return main_with_config(
-        config,
+        CONFIG,
         description='Item要素をList要素に逆変換するスクリプト',
         default_output_suffix='_reverse_item.xml'
     )
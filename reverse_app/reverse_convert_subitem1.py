@@ -17,19 +17,20 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from reverse_xml_converter import ReverseConversionConfig, main_with_config
 
 
+# Subitem1逆変換の設定
+CONFIG = ReverseConversionConfig(
+    parent_tag='Item',
+    child_tag='Subitem1',
+    title_tag='Subitem1Title',
+    sentence_tag='Subitem1Sentence',
+    script_name='reverse_convert_subitem1'
+)
+
+
 def main():
     """メイン関数"""
-    # Subitem1逆変換の設定
-    config = ReverseConversionConfig(
-        parent_tag='Item',
-        child_tag='Subitem1',
-        title_tag='Subitem1Title',
-        sentence_tag='Subitem1Sentence',
-        script_name='reverse_convert_subitem1'
-    )
-
     return main_with_config(
-        config,
+        CONFIG,
         description='Subitem1要素をList要素に逆変換するスクリプト',
         default_output_suffix='_reverse_subitem1.xml'
     )
@@ -17,19 +17,20 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from reverse_xml_converter import ReverseConversionConfig, main_with_config
 
 
+# Subitem10逆変換の設定
+CONFIG = ReverseConversionConfig(
+    parent_tag='Subitem9',
+    child_tag='Subitem10',
+    title_tag='Subitem10Title',
+    sentence_tag='Subitem10Sentence',
+    script_name='reverse_convert_subitem10'
+)
+
+
 def main():
     """メイン関数"""
-    # Subitem10逆変換の設定
-    config = ReverseConversionConfig(
-        parent_tag='Subitem9',
-        child_tag='Subitem10',
-        title_tag='Subitem10Title',
-        sentence_tag='Subitem10Sentence',
-        script_name='reverse_convert_subitem10'
-    )
-
     return main_with_config(
-        config,
+        CONFIG,
         description='Subitem10要素をList要素に逆変換するスクリプト',
         default_output_suffix='_reverse_subitem10.xml'
     )
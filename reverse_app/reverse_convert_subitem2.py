@@ -17,19 +17,20 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from reverse_xml_converter import ReverseConversionConfig, main_with_config
 
 
+# Subitem2逆変換の設定
+CONFIG = ReverseConversionConfig(
+    parent_tag='Subitem1',
+    child_tag='Subitem2',
+    title_tag='Subitem2Title',
+    sentence_tag='Subitem2Sentence',
+    script_name='reverse_convert_subitem2'
+)
+
+
 def main():
     """メイン関数"""
-    # Subitem2逆変換の設定
-    config = ReverseConversionConfig(
-        parent_tag='Subitem1',
-        child_tag='Subitem2',
-        title_tag='Subitem2Title',
-        sentence_tag='Subitem2Sentence',
-        script_name='reverse_convert_subitem2'
-    )
-
     return main_with_config(
-        config,
+        CONFIG,
         description='Subitem2要素をList要素に逆変換するスクリプト',
         default_output_suffix='_reverse_subitem2.xml'
     )
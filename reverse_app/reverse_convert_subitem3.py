@@ -17,19 +17,20 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from reverse_xml_converter import ReverseConversionConfig, main_with_config
 
 
+# Subitem3逆変換の設定
+CONFIG = ReverseConversionConfig(
+    parent_tag='Subitem2',
+    child_tag='Subitem3',
+    title_tag='Subitem3Title',
+    sentence_tag='Subitem3Sentence',
+    script_name='reverse_convert_subitem3'
+)
+
+
 def main():
     """メイン関数"""
-    # Subitem3逆変換の設定
-    config = ReverseConversionConfig(
-        parent_tag='Subitem2',
-        child_tag='Subitem3',
-        title_tag='Subitem3Title',
-        sentence_tag='Subitem3Sentence',
-        script_name='reverse_convert_subitem3'
-    )
-
     return main_with_config(
-        config,
+        CONFIG,
         description='Subitem3要素をList要素に逆変換するスクリプト',
         default_output_suffix='_reverse_subitem3.xml'
     )
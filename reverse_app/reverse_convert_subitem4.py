@@ -17,19 +17,20 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from reverse_xml_converter import ReverseConversionConfig, main_with_config
 
 
+# Subitem4逆変換の設定
+CONFIG = ReverseConversionConfig(
+    parent_tag='Subitem3',
+    child_tag='Subitem4',
+    title_tag='Subitem4Title',
+    sentence_tag='Subitem4Sentence',
+    script_name='reverse_convert_subitem4'
+)
+
+
 def main():
     """メイン関数"""
-    # Subitem4逆変換の設定
-    config = ReverseConversionConfig(
-        parent_tag='Subitem3',
-        child_tag='Subitem4',
-        title_tag='Subitem4Title',
-        sentence_tag='Subitem4Sentence',
-        script_name='reverse_convert_subitem4'
-    )
-
     return main_with_config(
-        config,
+        CONFIG,
         description='Subitem4要素をList要素に逆変換するスクリプト',
         default_output_suffix='_reverse_subitem4.xml'
     )
@@ -17,19 +17,20 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from reverse_xml_converter import ReverseConversionConfig, main_with_config
 
 
+# Subitem5逆変換の設定
+CONFIG = ReverseConversionConfig(
+    parent_tag='Subitem4',
+    child_tag='Subitem5',
+    title_tag='Subitem5Title',
+    sentence_tag='Subitem5Sentence',
+    script_name='reverse_convert_subitem5'
+)
+
+
 def main():
     """メイン関数"""
-    # Subitem5逆変換の設定
-    config = ReverseConversionConfig(
-        parent_tag='Subitem4',
-        child_tag='Subitem5',
-        title_tag='Subitem5Title',
-        sentence_tag='Subitem5Sentence',
-        script_name='reverse_convert_subitem5'
-    )
-
     return main_with_config(
-        config,
+        CONFIG,
         description='Subitem5要素をList要素に逆変換するスクリプト',
         default_output_suffix='_reverse_subitem5.xml'
     )
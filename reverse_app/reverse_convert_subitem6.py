@@ -17,19 +17,20 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from reverse_xml_converter import ReverseConversionConfig, main_with_config
 
 
+# Subitem6逆変換の設定
+CONFIG = ReverseConversionConfig(
+    parent_tag='Subitem5',
+    child_tag='Subitem6',
+    title_tag='Subitem6Title',
+    sentence_tag='Subitem6Sentence',
+    script_name='reverse_convert_subitem6'
+)
+
+
 def main():
     """メイン関数"""
-    # Subitem6逆変換の設定
-    config = ReverseConversionConfig(
-        parent_tag='Subitem5',
-        child_tag='Subitem6',
-        title_tag='Subitem6Title',
-        sentence_tag='Subitem6Sentence',
-        script_name='reverse_convert_subitem6'
-    )
-
     return main_with_config(
-        config,
+        CONFIG,
         description='Subitem6要素をList要素に逆変換するスクリプト',
         default_output_suffix='_reverse_subitem6.xml'
     )
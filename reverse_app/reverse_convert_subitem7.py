@@ -17,19 +17,20 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from reverse_xml_converter import ReverseConversionConfig, main_with_config
 
 
+# Subitem7逆変換の設定
+CONFIG = ReverseConversionConfig(
+    parent_tag='Subitem6',
+    child_tag='Subitem7',
+    title_tag='Subitem7Title',
+    sentence_tag='Subitem7Sentence',
+    script_name='reverse_convert_subitem7'
+)
+
+
 def main():
     """メイン関数"""
-    # Subitem7逆変換の設定
-    config = ReverseConversionConfig(
-        parent_tag='Subitem6',
-        child_tag='Subitem7',
-        title_tag='Subitem7Title',
-        sentence_tag='Subitem7Sentence',
-        script_name='reverse_convert_subitem7'
-    )
-
     return main_with_config(
-        config,
+        CONFIG,
         description='Subitem7要素をList要素に逆変換するスクリプト',
         default_output_suffix='_reverse_subitem7.xml'
     )
@@ -17,19 +17,20 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from reverse_xml_converter import ReverseConversionConfig, main_with_config
 
 
+# Subitem8逆変換の設定
+CONFIG = ReverseConversionConfig(
+    parent_tag='Subitem7',
+    child_tag='Subitem8',
+    title_tag='Subitem8Title',
+    sentence_tag='Subitem8Sentence',
+    script_name='reverse_convert_subitem8'
+)
+
+
 def main():
     """メイン関数"""
-    # Subitem8逆変換の設定
-    config = ReverseConversionConfig(
-        parent_tag='Subitem7',
-        child_tag='Subitem8',
-        title_tag='Subitem8Title',
-        sentence_tag='Subitem8Sentence',
-        script_name='reverse_convert_subitem8'
-    )
-
     return main_with_config(
-        config,
+        CONFIG,
         description='Subitem8要素をList要素に逆変換するスクリプト',
         default_output_suffix='_reverse_subitem8.xml'
     )
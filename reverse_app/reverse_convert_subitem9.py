@@ -17,19 +17,20 @@ sys.path.insert(0, str(Path(__file__).resolve().parent))
 from reverse_xml_converter import ReverseConversionConfig, main_with_config
 
 
+# Subitem9逆変換の設定
+CONFIG = ReverseConversionConfig(
+    parent_tag='Subitem8',
+    child_tag='Subitem9',
+    title_tag='Subitem9Title',
+    sentence_tag='Subitem9Sentence',
+    script_name='reverse_convert_subitem9'
+)
+
+
 def main():
     """メイン関数"""
-    # Subitem9逆変換の設定
-    config = ReverseConversionConfig(
-        parent_tag='Subitem8',
-        child_tag='Subitem9',
-        title_tag='Subitem9Title',
-        sentence_tag='Subitem9Sentence',
-        script_name='reverse_convert_subitem9'
-    )
-
     return main_with_config(
-        config,
+        CONFIG,
         description='Subitem9要素をList要素に逆変換するスクリプト',
         default_output_suffix='_reverse_subitem9.xml'
     )
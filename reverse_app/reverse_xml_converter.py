@@ -14,7 +14,12 @@ import re
 from pathlib import Path
 from lxml import etree
 from typing import Optional, Tuple, Dict, List as ListType
-from copy import deepcopy
+from copy import copy
+
+# 共通ユーティリティ（scripts/utils）をインポートパスに追加
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+from utils.xml_utils import write_xml, transfer_element, transfer_children
 
 
 class ReverseConversionConfig:
@@ -34,17 +39,9 @@ class ReverseConversionConfig:
         self.allowed_parent_tags = allowed_parent_tags  # Noneの場合はすべての要素を対象
 
 
-def format_xml_lxml(tree, output_path):
-    """lxmlのElementTreeをインデント整形して保存"""
-    clean_root = etree.fromstring(etree.tostring(tree.getroot()))
-    etree.indent(clean_root, space="  ", level=0)
-    new_tree = etree.ElementTree(clean_root)
-    new_tree.write(
-        output_path,
-        encoding='utf-8',
-        xml_declaration=True,
-        pretty_print=False
-    )
+def format_xml_lxml(tree, output_path, formatted=True):
+    """lxmlのElementTreeをインデント整形して保存（formatted=Falseの場合は整形せずに保存）"""
+    write_xml(tree, output_path, indent_str="  ", formatted=formatted)
 
 
 def get_element_title_text(element, config: ReverseConversionConfig) -> str:
@@ -93,8 +90,12 @@ def has_title(element, config: ReverseConversionConfig) -> bool:
     return bool(title_text.strip())
 
 
-def create_list_element_with_columns(title_text: str, sentence_text: str, sentence_elem: Optional[etree.Element] = None) -> etree.Element:
-    """2カラムのList要素を作成"""
+def create_list_element_with_columns(title_text: str, sentence_text: str, sentence_elem: Optional[etree.Element] = None,
+                                     move: bool = False) -> etree.Element:
+    """
+    2カラムのList要素を作成
+    move=Trueの場合は元の要素をコピーせずに移動する（元の要素は破棄される前提）
+    """
     list_elem = etree.Element('List')
     list_sentence = etree.SubElement(list_elem, 'ListSentence')
 
@@ -110,8 +111,7 @@ def create_list_element_with_columns(title_text: str, sentence_text: str, senten
     # Sentence要素全体をコピー（Ruby要素などの子要素構造を保持）
     if sentence_elem is not None:
         sentence2.text = sentence_elem.text
-        for child in sentence_elem:
-            sentence2.append(deepcopy(child))
+        transfer_children(sentence_elem, sentence2, move)
         # 属性をコピー
         for attr_name, attr_value in sentence_elem.attrib.items():
             if attr_name != 'Num':  # Num属性は既に設定済みなのでスキップ
@@ -122,8 +122,12 @@ def create_list_element_with_columns(title_text: str, sentence_text: str, senten
     return list_elem
 
 
-def create_list_element_with_columns_and_multiple_sentences(title_text: str, sentence_elements: ListType[etree.Element]) -> etree.Element:
-    """タイトルと複数のSentence要素を持つ2カラムのList要素を作成"""
+def create_list_element_with_columns_and_multiple_sentences(title_text: str, sentence_elements: ListType[etree.Element],
+                                                            move: bool = False) -> etree.Element:
+    """
+    タイトルと複数のSentence要素を持つ2カラムのList要素を作成
+    move=Trueの場合は元の要素をコピーせずに移動する（元の要素は破棄される前提）
+    """
     list_elem = etree.Element('List')
     list_sentence = etree.SubElement(list_elem, 'ListSentence')
 
@@ -140,8 +144,7 @@ def create_list_element_with_columns_and_multiple_sentences(title_text: str, sen
         # Sentence要素全体をコピー（Ruby要素などの子要素構造を保持）
         if sentence_elem is not None:
             sentence.text = sentence_elem.text
-            for child in sentence_elem:
-                sentence.append(deepcopy(child))
+            transfer_children(sentence_elem, sentence, move)
             # 元の属性を先にコピー（順序を保持）
             for attr_name, attr_value in sentence_elem.attrib.items():
                 sentence.set(attr_name, attr_value)
@@ -153,8 +156,12 @@ def create_list_element_with_columns_and_multiple_sentences(title_text: str, sen
     return list_elem
 
 
-def create_list_element_with_title_and_multiple_columns(title_text: str, columns: ListType[etree.Element]) -> etree.Element:
-    """タイトルと複数のColumn要素を持つList要素を作成"""
+def create_list_element_with_title_and_multiple_columns(title_text: str, columns: ListType[etree.Element],
+                                                        move: bool = False) -> etree.Element:
+    """
+    タイトルと複数のColumn要素を持つList要素を作成
+    move=Trueの場合は元の要素をコピーせずに移動する（元の要素は破棄される前提）
+    """
     list_elem = etree.Element('List')
     list_sentence = etree.SubElement(list_elem, 'ListSentence')
 
@@ -165,29 +172,36 @@ def create_list_element_with_title_and_multiple_columns(title_text: str, columns
 
     # Column 2以降: 元のColumn要素をコピー
     for idx, column in enumerate(columns, start=2):
-        new_column = deepcopy(column)
+        new_column = transfer_element(column, move)
         new_column.set('Num', str(idx))
         list_sentence.append(new_column)
 
     return list_elem
 
 
-def create_list_element_with_multiple_columns(columns: ListType[etree.Element]) -> etree.Element:
-    """複数のColumn要素を持つList要素を作成（タイトルなし）"""
+def create_list_element_with_multiple_columns(columns: ListType[etree.Element], move: bool = False) -> etree.Element:
+    """
+    複数のColumn要素を持つList要素を作成（タイトルなし）
+    move=Trueの場合は元の要素をコピーせずに移動する（元の要素は破棄される前提）
+    """
     list_elem = etree.Element('List')
     list_sentence = etree.SubElement(list_elem, 'ListSentence')
 
     # すべてのColumn要素をコピー
     for idx, column in enumerate(columns, start=1):
-        new_column = deepcopy(column)
+        new_column = transfer_element(column, move)
         new_column.set('Num', str(idx))
         list_sentence.append(new_column)
 
     return list_elem
 
 
-def create_list_element_no_columns(sentence_text: str, sentence_elem: Optional[etree.Element] = None) -> etree.Element:
-    """ColumnなしのList要素を作成"""
+def create_list_element_no_columns(sentence_text: str, sentence_elem: Optional[etree.Element] = None,
+                                   move: bool = False) -> etree.Element:
+    """
+    ColumnなしのList要素を作成
+    move=Trueの場合は元の要素をコピーせずに移動する（元の要素は破棄される前提）
+    """
     list_elem = etree.Element('List')
     list_sentence = etree.SubElement(list_elem, 'ListSentence')
     sentence = etree.SubElement(list_sentence, 'Sentence', Num='1')
@@ -195,8 +209,7 @@ def create_list_element_no_columns(sentence_text: str, sentence_elem: Optional[e
     # Sentence要素全体をコピー（Ruby要素などの子要素構造を保持）
     if sentence_elem is not None:
         sentence.text = sentence_elem.text
-        for child in sentence_elem:
-            sentence.append(deepcopy(child))
+        transfer_children(sentence_elem, sentence, move)
         # 属性をコピー
         for attr_name, attr_value in sentence_elem.attrib.items():
             if attr_name != 'Num':  # Num属性は既に設定済みなのでスキップ
@@ -207,8 +220,12 @@ def create_list_element_no_columns(sentence_text: str, sentence_elem: Optional[e
     return list_elem
 
 
-def create_list_element_with_column_and_multiple_sentences(sentence_elements: ListType[etree.Element]) -> etree.Element:
-    """タイトルなしで、1つのColumn内に複数のSentence要素を持つList要素を作成"""
+def create_list_element_with_column_and_multiple_sentences(sentence_elements: ListType[etree.Element],
+                                                           move: bool = False) -> etree.Element:
+    """
+    タイトルなしで、1つのColumn内に複数のSentence要素を持つList要素を作成
+    move=Trueの場合は元の要素をコピーせずに移動する（元の要素は破棄される前提）
+    """
     list_elem = etree.Element('List')
     list_sentence = etree.SubElement(list_elem, 'ListSentence')
     
@@ -220,8 +237,7 @@ def create_list_element_with_column_and_multiple_sentences(sentence_elements: Li
         # Sentence要素全体をコピー（Ruby要素などの子要素構造を保持）
         if sentence_elem is not None:
             sentence.text = sentence_elem.text
-            for child in sentence_elem:
-                sentence.append(deepcopy(child))
+            transfer_children(sentence_elem, sentence, move)
             # 元の属性を先にコピー（順序を保持）
             for attr_name, attr_value in sentence_elem.attrib.items():
                 sentence.set(attr_name, attr_value)
@@ -237,6 +253,9 @@ def convert_child_to_list(child_elem, config: ReverseConversionConfig, stats) ->
     """
     子要素をList要素に変換
     返り値: (変換されたList要素のリスト, 子要素内の子要素（孫要素）のリスト)、または([], [])（変換不要の場合）
+
+    変換した子要素は破棄されるため、Sentence・Column・孫要素はコピーせずに移動する
+    （深い階層でも各要素は1回移動するだけで、階層ごとにサブツリー全体をコピーしない）。
     """
     if child_elem.tag != config.child_tag:
         return [], []
@@ -254,7 +273,7 @@ def convert_child_to_list(child_elem, config: ReverseConversionConfig, stats) ->
     for grandchild in list(child_elem):
         # TitleとSentence以外の要素（既に変換されたList要素やその他の要素）を保持
         if grandchild.tag != config.title_tag and grandchild.tag != config.sentence_tag:
-            child_children.append(deepcopy(grandchild))
+            child_children.append(grandchild)
 
     list_elements = []
 
@@ -262,12 +281,12 @@ def convert_child_to_list(child_elem, config: ReverseConversionConfig, stats) ->
     if len(columns) > 0:
         if title_text:
             # ケース3: タイトルがあり、複数のColumn要素がある場合
-            list_elem = create_list_element_with_title_and_multiple_columns(title_text, columns)
+            list_elem = create_list_element_with_title_and_multiple_columns(title_text, columns, move=True)
             list_elements.append(list_elem)
             stats['CONVERTED_WITH_TITLE'] += 1
         else:
             # ケース4: タイトルが空で、複数のColumn要素がある場合
-            list_elem = create_list_element_with_multiple_columns(columns)
+            list_elem = create_list_element_with_multiple_columns(columns, move=True)
             list_elements.append(list_elem)
             stats['CONVERTED_NO_TITLE'] += 1
     else:
@@ -276,25 +295,25 @@ def convert_child_to_list(child_elem, config: ReverseConversionConfig, stats) ->
             if title_text:
                 # ケース5: タイトルがあり、複数のSentence要素がある場合
                 # すべてのSentence要素を1つのColumn内に配置
-                list_elem = create_list_element_with_columns_and_multiple_sentences(title_text, sentence_elements)
+                list_elem = create_list_element_with_columns_and_multiple_sentences(title_text, sentence_elements, move=True)
                 list_elements.append(list_elem)
                 stats['CONVERTED_WITH_TITLE'] += 1
             else:
                 # ケース6: タイトルが空で、複数のSentence要素がある場合
                 # 1つのList要素のColumn内に複数のSentence要素を配置
-                list_elem = create_list_element_with_column_and_multiple_sentences(sentence_elements)
+                list_elem = create_list_element_with_column_and_multiple_sentences(sentence_elements, move=True)
                 list_elements.append(list_elem)
                 stats['CONVERTED_NO_TITLE'] += 1
         else:
             # 通常のケース: Column要素がなく、Sentence要素が1つのみの場合
             if title_text:
                 # ケース1: タイトルがある場合（2カラムList）
-                list_elem = create_list_element_with_columns(title_text, sentence_text, sentence_elem)
+                list_elem = create_list_element_with_columns(title_text, sentence_text, sentence_elem, move=True)
                 list_elements.append(list_elem)
                 stats['CONVERTED_WITH_TITLE'] += 1
             else:
                 # ケース2: タイトルがない場合（ColumnなしList）
-                list_elem = create_list_element_no_columns(sentence_text, sentence_elem)
+                list_elem = create_list_element_no_columns(sentence_text, sentence_elem, move=True)
                 list_elements.append(list_elem)
                 stats['CONVERTED_NO_TITLE'] += 1
 
@@ -351,42 +370,14 @@ def process_parent_element(parent_elem, config: ReverseConversionConfig, stats)
     return made_changes
 
 
-def process_xml_file(input_path: Path, output_path: Path, config: ReverseConversionConfig) -> int:
-    """XMLファイルを処理"""
-    print("=" * 80)
-    print(f"【{config.parent_tag} → List 逆変換】")
-    print("=" * 80)
-    print(f"入力ファイル: {input_path}")
-
-    try:
-        tree = etree.parse(str(input_path))
-    except Exception as e:
-        print(f"エラー: XMLファイルの読み込みに失敗しました: {e}", file=sys.stderr)
-        return 1
-
-    stats = {
-        'CONVERTED_WITH_TITLE': 0,
-        'CONVERTED_NO_TITLE': 0
-    }
-
-    root = tree.getroot()
-
-    # 処理対象の親要素を取得
+def get_parent_elements(root, config: ReverseConversionConfig) -> ListType[etree.Element]:
+    """処理対象の親要素を文書順に取得"""
     if config.child_tag == 'Item':
         if config.allowed_parent_tags is None or len(config.allowed_parent_tags) == 0:
             # すべての要素を対象にする場合
             # Item要素を子要素として持つすべての要素を処理対象にする
             # Paragraph, AppdxTable, Class, TableColumn, Remarks, その他の要素に対応
             parent_elements = root.xpath(f'.//*[{config.child_tag}]')
-            # 重複を除去（子要素が親要素としても含まれる可能性があるため）
-            seen = set()
-            unique_parents = []
-            for elem in parent_elements:
-                elem_id = id(elem)
-                if elem_id not in seen:
-                    seen.add(elem_id)
-                    unique_parents.append(elem)
-            parent_elements = unique_parents
         else:
             # 指定された親要素タグのみを対象にする場合
             parent_elements = []
@@ -394,31 +385,66 @@ def process_xml_file(input_path: Path, output_path: Path, config: ReverseConvers
                 # 各タグでItem要素を直接の子要素として持つ要素を取得
                 elements = root.xpath(f'.//{tag}[Item]')
                 parent_elements.extend(elements)
-            # 重複を除去
-            seen = set()
-            unique_parents = []
-            for elem in parent_elements:
-                elem_id = id(elem)
-                if elem_id not in seen:
-                    seen.add(elem_id)
-                    unique_parents.append(elem)
-            parent_elements = unique_parents
+        # 重複を除去（子要素が親要素としても含まれる可能性があるため）
+        seen = set()
+        unique_parents = []
+        for elem in parent_elements:
+            elem_id = id(elem)
+            if elem_id not in seen:
+                seen.add(elem_id)
+                unique_parents.append(elem)
+        return unique_parents
     elif config.parent_tag == 'Paragraph':
         # ドキュメント内の全Paragraph要素を処理
-        parent_elements = root.xpath('.//Paragraph')
+        return root.xpath('.//Paragraph')
     else:
         # 指定された親要素内の子要素を処理
-        parent_elements = root.xpath(f'.//{config.parent_tag}')
+        return root.xpath(f'.//{config.parent_tag}')
+
 
-    total_changes = 0
-    for parent_elem in parent_elements:
+def convert_tree(tree, config: ReverseConversionConfig) -> Dict[str, int]:
+    """
+    パース済みのツリーに対して逆変換を行う（ツリーはその場で更新される）
+
+    Args:
+        tree: lxmlのElementTree
+        config: 逆変換設定
+
+    Returns:
+        変換統計（CONVERTED_WITH_TITLE, CONVERTED_NO_TITLE, CHANGED_PARENTS）
+    """
+    stats = {
+        'CONVERTED_WITH_TITLE': 0,
+        'CONVERTED_NO_TITLE': 0,
+        'CHANGED_PARENTS': 0
+    }
+
+    for parent_elem in get_parent_elements(tree.getroot(), config):
         if process_parent_element(parent_elem, config, stats):
-            total_changes += 1
+            stats['CHANGED_PARENTS'] += 1
+
+    return stats
+
+
+def process_xml_file(input_path: Path, output_path: Path, config: ReverseConversionConfig) -> int:
+    """XMLファイルを処理"""
+    print("=" * 80)
+    print(f"【{config.parent_tag} → List 逆変換】")
+    print("=" * 80)
+    print(f"入力ファイル: {input_path}")
+
+    try:
+        tree = etree.parse(str(input_path))
+    except Exception as e:
+        print(f"エラー: XMLファイルの読み込みに失敗しました: {e}", file=sys.stderr)
+        return 1
+
+    stats = convert_tree(tree, config)
 
     print("\n変換統計:")
     print(f" - タイトルあり → 2カラムList: {stats['CONVERTED_WITH_TITLE']}箇所")
     print(f" - タイトルなし → ColumnなしList: {stats['CONVERTED_NO_TITLE']}箇所")
-    print(f" - 変更された親要素数: {total_changes}箇所")
+    print(f" - 変更された親要素数: {stats['CHANGED_PARENTS']}箇所")
 
     format_xml_lxml(tree, str(output_path))
 
@@ -476,8 +502,9 @@ def main_with_config(config: ReverseConversionConfig, description: str, default_
 
     output_path = Path(args.output_file) if args.output_file else input_path.parent / f"{input_path.stem}{default_output_suffix}"
 
-    # コマンドライン引数からallowed_parent_tagsを設定（Item要素の場合のみ）
+    # コマンドライン引数からallowed_parent_tagsを設定（Item要素の場合のみ、スクリプトのCONFIGは変更しない）
     if config.child_tag == 'Item':
+        config = copy(config)
         allowed_tags = []
         if not getattr(args, 'no_include_paragraph', False):
             allowed_tags.append('Paragraph')
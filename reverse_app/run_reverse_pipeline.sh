@@ -25,20 +25,15 @@ set -e
 # スクリプトディレクトリを取得
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" >/dev/null 2>&1 && pwd)"
 
-# 逆変換スクリプトのリスト（実行順序が重要: 内側から外側へ）
-REVERSE_CONVERTERS=(
-  "reverse_convert_subitem10.py"
-  "reverse_convert_subitem9.py"
-  "reverse_convert_subitem8.py"
-  "reverse_convert_subitem7.py"
-  "reverse_convert_subitem6.py"
-  "reverse_convert_subitem5.py"
-  "reverse_convert_subitem4.py"
-  "reverse_convert_subitem3.py"
-  "reverse_convert_subitem2.py"
-  "reverse_convert_subitem1.py"
-  "reverse_convert_item.py"
-)
+# 逆変換スクリプトのリスト（内側から外側へ。実行順序は scripts/step_registry.py の依存関係から決まる）
+REVERSE_CONVERTERS=()
+while IFS= read -r converter; do
+  REVERSE_CONVERTERS+=("$converter")
+done < <(python3 "$SCRIPT_DIR/../scripts/step_registry.py" --direction reverse)
+if [ ${#REVERSE_CONVERTERS[@]} -eq 0 ]; then
+  echo "エラー: 逆変換スクリプトの一覧を取得できませんでした: $SCRIPT_DIR/../scripts/step_registry.py" >&2
+  exit 1
+fi
 
 # 色付き出力用（オプション）
 RED='\033[0;31m'
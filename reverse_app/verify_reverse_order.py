@@ -8,18 +8,77 @@
 変わっていないことを検証します。
 
 使用方法:
-    python3 verify_reverse_order.py <元のXMLファイル> <逆変換後のXMLファイル> [--report <レポートファイル>]
+    python3 verify_reverse_order.py <元のXMLファイル> <逆変換後のXMLファイル> [--report <レポートファイル>] [--max-mismatches <件数>]
 
 例:
     python3 verify_reverse_order.py input.xml output.xml
     python3 verify_reverse_order.py input.xml output.xml --report order_report.txt
+    python3 verify_reverse_order.py input.xml output.xml --max-mismatches 5
+
+2つのファイルは iterparse で同時に読み進めて比較するため、文書全体のツリーを保持しない。
+逆変換パイプライン（utils/reverse_pipeline.run_reverse_pipeline の verify_order）からも
+最終ステップの直後に実行される。
 """
 
 import sys
 import argparse
 from pathlib import Path
 from lxml import etree
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+# 件数の上限を指定しない場合にレポートに表示する不一致の件数
+DEFAULT_DISPLAY_MISMATCHES = 10
+
+
+def iter_texts_in_order(source: Union[str, Path]) -> Iterator[Tuple[str, str]]:
+    """
+    XMLファイルを iterparse で1回走査し、すべてのテキストノードを順番に返すジェネレータ
+    
+    要素のテキストはその要素のタグ、要素の後のテキスト（tail）は親要素のタグとともに返す
+    （extract_texts_in_order と同じ順序・同じ組）。走査済みの要素は解放するため、
+    文書全体のツリーやテキストのリストを保持せず、入れ子の深さにも制限がない。
+    
+    Args:
+        source: XMLファイルのパス
+        
+    Yields:
+        (テキスト, 要素タグ)
+    """
+    # テキスト（tail）がまだ確定していない要素: (要素, tailかどうか, 返すタグ)
+    # 次のイベントの時点で、その直前までのテキストはパース済みになる
+    pending = None
+    for event, element in etree.iterparse(str(source), events=('start', 'end', 'comment', 'pi')):
+        if pending is not None:
+            pending_element, is_tail, tag = pending
+            text = pending_element.tail if is_tail else pending_element.text
+            if text:
+                text = text.strip()
+                if text:
+                    yield text, tag
+            if is_tail:
+                # tailまで読んだ要素（とそれより前の兄弟要素）を解放
+                pending_element.clear()
+                parent = pending_element.getparent()
+                while pending_element.getprevious() is not None:
+                    del parent[0]
+            pending = None
+        
+        if event == 'start':
+            pending = (element, False, element.tag)
+            continue
+        
+        parent = element.getparent()
+        if parent is None:
+            # ルート要素の終了、またはルート要素の外のコメント・処理命令
+            continue
+
+        if event != 'end' and element.text:
+            # コメント・処理命令の内容
+            text = element.text.strip()
+            if text:
+                yield text, str(element.tag)
+        pending = (element, True, parent.tag)
 
 
 def extract_texts_in_order(tree: etree._ElementTree) -> List[Tuple[str, str]]:
@@ -34,90 +93,180 @@ def extract_texts_in_order(tree: etree._ElementTree) -> List[Tuple[str, str]]:
     """
     texts = []
     
-    def traverse(element):
-        """要素を順番に走査してテキストを抽出"""
+    # 再帰せずにスタックで走査（要素を積んだ後、その要素の後のテキストを返す位置に tail を積む）
+    stack = [(tree.getroot(), None)]
+    while stack:
+        element, tail_tag = stack.pop()
+        if tail_tag is not None:
+            # 子要素の後のテキスト（tail）
+            tail_text = element.tail.strip() if element.tail else ''
+            if tail_text:
+                texts.append((tail_text, tail_tag))
+            continue
+        
         # 要素の直接のテキスト
         if element.text:
             text = element.text.strip()
             if text:
                 texts.append((text, element.tag))
         
-        # 子要素を順番に処理
-        for child in element:
-            traverse(child)
-            
-            # 子要素の後のテキスト（tail）
-            if child.tail:
-                tail_text = child.tail.strip()
-                if tail_text:
-                    texts.append((tail_text, element.tag))
+        # 子要素を順番に処理（後に処理するものから積む）
+        for child in reversed(element):
+            stack.append((child, element.tag))
+            stack.append((child, None))
     
-    traverse(tree.getroot())
     return texts
 
 
-def compare_text_order(
-    original_texts: List[Tuple[str, str]],
-    converted_texts: List[Tuple[str, str]]
-) -> Tuple[bool, List[str]]:
+def compare_text_streams(
+    original_texts: Iterable[Tuple[str, str]],
+    converted_texts: Iterable[Tuple[str, str]],
+    max_mismatches: Optional[int] = None
+) -> Dict:
     """
-    2つのテキストリストの順序を比較します。
+    2つのテキスト列を先頭から同時に読み進めて順序を比較します。
     
     Args:
-        original_texts: 元のXMLファイルのテキストリスト
-        converted_texts: 逆変換後のXMLファイルのテキストリスト
+        original_texts: 元のXMLファイルのテキスト列（リストまたはジェネレータ）
+        converted_texts: 逆変換後のXMLファイルのテキスト列（リストまたはジェネレータ）
+        max_mismatches: この件数の不一致を検出した時点で比較を打ち切る（None: 最後まで比較）
         
     Returns:
-        (順序が一致しているか, 差異のレポート)
+        {"is_order_preserved", "original_count", "converted_count", "compared_count",
+         "mismatch_count", "mismatches", "stopped_early"}
+        mismatches には最初の不一致（max_mismatches 件、指定がない場合は DEFAULT_DISPLAY_MISMATCHES 件まで）の
+        位置とテキストを記録する。打ち切った場合、テキスト数は打ち切った位置までの数になる。
     """
-    report = []
-    is_order_preserved = True
+    keep_count = max_mismatches if max_mismatches is not None else DEFAULT_DISPLAY_MISMATCHES
+    original_iter = iter(original_texts)
+    converted_iter = iter(converted_texts)
+    mismatches = []
+    mismatch_count = 0
+    position = 0
+    stopped_early = False
     
-    # テキストの数が異なる場合
-    if len(original_texts) != len(converted_texts):
-        report.append(f"⚠️  テキストの数が異なります:")
-        report.append(f"   元のファイル: {len(original_texts)}個")
-        report.append(f"   逆変換後: {len(converted_texts)}個")
-        is_order_preserved = False
+    while True:
+        original = next(original_iter, None)
+        converted = next(converted_iter, None)
+        if original is None or converted is None:
+            break
+        position += 1
+        
+        if original[0] != converted[0]:
+            mismatch_count += 1
+            if len(mismatches) < keep_count:
+                mismatches.append({
+                    'index': position,
+                    'original': original,
+                    'converted': converted
+                })
+            if max_mismatches is not None and mismatch_count >= max_mismatches:
+                stopped_early = True
+                break
     
-    # 順序の比較
-    mismatches = []
-    min_len = min(len(original_texts), len(converted_texts))
+    original_count = converted_count = position
+    if not stopped_early:
+        # 一方が先に終わった場合は、残りのテキストを数える
+        original_count += (original is not None) + sum(1 for _ in original_iter)
+        converted_count += (converted is not None) + sum(1 for _ in converted_iter)
+    
+    return {
+        'is_order_preserved': mismatch_count == 0 and original_count == converted_count,
+        'original_count': original_count,
+        'converted_count': converted_count,
+        'compared_count': position,
+        'mismatch_count': mismatch_count,
+        'mismatches': mismatches,
+        'stopped_early': stopped_early
+    }
+
+
+def verify_order_files(
+    original_path: Union[str, Path],
+    converted_path: Union[str, Path],
+    max_mismatches: Optional[int] = None
+) -> Dict:
+    """
+    2つのXMLファイルを iterparse で同時に走査し、テキストの順序を比較します。
+    
+    Args:
+        original_path: 元のXMLファイル（逆変換前）
+        converted_path: 逆変換後のXMLファイル
+        max_mismatches: この件数の不一致を検出した時点で比較を打ち切る（None: 最後まで比較）
+        
+    Returns:
+        compare_text_streams の結果
+        
+    Raises:
+        etree.XMLSyntaxError: XMLファイルのパースに失敗した場合
+    """
+    return compare_text_streams(
+        iter_texts_in_order(original_path),
+        iter_texts_in_order(converted_path),
+        max_mismatches
+    )
+
+
+def format_order_details(result: Dict) -> List[str]:
+    """
+    compare_text_streams の結果から差異のレポートを作成します。
     
-    for i in range(min_len):
-        orig_text, orig_tag = original_texts[i]
-        conv_text, conv_tag = converted_texts[i]
+    Args:
+        result: compare_text_streams の結果
         
-        if orig_text != conv_text:
-            mismatches.append({
-                'index': i + 1,
-                'original': (orig_text, orig_tag),
-                'converted': (conv_text, conv_tag)
-            })
-            is_order_preserved = False
+    Returns:
+        差異のレポート
+    """
+    report = []
+    
+    if result['stopped_early']:
+        report.append(f"⚠️  不一致が {result['mismatch_count']} 件に達したため、"
+                      f"位置 {result['compared_count']} で比較を打ち切りました")
+    elif result['original_count'] != result['converted_count']:
+        # テキストの数が異なる場合
+        report.append(f"⚠️  テキストの数が異なります:")
+        report.append(f"   元のファイル: {result['original_count']}個")
+        report.append(f"   逆変換後: {result['converted_count']}個")
     
+    mismatches = result['mismatches']
     if mismatches:
-        report.append(f"\n❌ 順序の不一致が {len(mismatches)} 箇所で検出されました:")
+        report.append(f"\n❌ 順序の不一致が {result['mismatch_count']} 箇所で検出されました:")
         report.append("-" * 80)
         
-        # 最初の10件を表示
-        display_count = min(10, len(mismatches))
-        for i, mismatch in enumerate(mismatches[:display_count]):
+        for mismatch in mismatches:
             orig_text, orig_tag = mismatch['original']
             conv_text, conv_tag = mismatch['converted']
             report.append(f"\n位置 {mismatch['index']}:")
             report.append(f"  元のファイル: [{orig_tag}] {orig_text[:50]}{'...' if len(orig_text) > 50 else ''}")
             report.append(f"  逆変換後:     [{conv_tag}] {conv_text[:50]}{'...' if len(conv_text) > 50 else ''}")
         
-        if len(mismatches) > display_count:
-            report.append(f"\n... 他 {len(mismatches) - display_count} 件の不一致があります")
+        if result['mismatch_count'] > len(mismatches):
+            report.append(f"\n... 他 {result['mismatch_count'] - len(mismatches)} 件の不一致があります")
     
-    return is_order_preserved, report
+    return report
 
 
-def generate_summary_report(
+def compare_text_order(
     original_texts: List[Tuple[str, str]],
-    converted_texts: List[Tuple[str, str]],
+    converted_texts: List[Tuple[str, str]]
+) -> Tuple[bool, List[str]]:
+    """
+    2つのテキストリストの順序を比較します。
+    
+    Args:
+        original_texts: 元のXMLファイルのテキストリスト
+        converted_texts: 逆変換後のXMLファイルのテキストリスト
+        
+    Returns:
+        (順序が一致しているか, 差異のレポート)
+    """
+    result = compare_text_streams(original_texts, converted_texts)
+    return result['is_order_preserved'], format_order_details(result)
+
+
+def format_summary_report(
+    original_count: int,
+    converted_count: int,
     is_order_preserved: bool,
     details: List[str]
 ) -> str:
@@ -125,8 +274,8 @@ def generate_summary_report(
     検証レポートを生成します。
     
     Args:
-        original_texts: 元のXMLファイルのテキストリスト
-        converted_texts: 逆変換後のXMLファイルのテキストリスト
+        original_count: 元のXMLファイルのテキスト数
+        converted_count: 逆変換後のXMLファイルのテキスト数
         is_order_preserved: 順序が保持されているか
         details: 詳細な差異情報
         
@@ -142,8 +291,8 @@ def generate_summary_report(
     # 統計情報
     report.append("統計情報:")
     report.append("-" * 80)
-    report.append(f"元のファイルのテキスト数: {len(original_texts)}")
-    report.append(f"逆変換後のテキスト数: {len(converted_texts)}")
+    report.append(f"元のファイルのテキスト数: {original_count}")
+    report.append(f"逆変換後のテキスト数: {converted_count}")
     report.append("")
     
     # 結果サマリー
@@ -167,6 +316,45 @@ def generate_summary_report(
     return "\n".join(report)
 
 
+def format_verification_report(result: Dict) -> str:
+    """
+    compare_text_streams / verify_order_files の結果から検証レポートを生成します。
+    
+    Args:
+        result: compare_text_streams の結果
+        
+    Returns:
+        レポート文字列
+    """
+    return format_summary_report(
+        result['original_count'],
+        result['converted_count'],
+        result['is_order_preserved'],
+        format_order_details(result)
+    )
+
+
+def generate_summary_report(
+    original_texts: List[Tuple[str, str]],
+    converted_texts: List[Tuple[str, str]],
+    is_order_preserved: bool,
+    details: List[str]
+) -> str:
+    """
+    検証レポートを生成します。
+    
+    Args:
+        original_texts: 元のXMLファイルのテキストリスト
+        converted_texts: 逆変換後のXMLファイルのテキストリスト
+        is_order_preserved: 順序が保持されているか
+        details: 詳細な差異情報
+        
+    Returns:
+        レポート文字列
+    """
+    return format_summary_report(len(original_texts), len(converted_texts), is_order_preserved, details)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="逆変換前後のXMLファイルの順序を検証します",
@@ -175,6 +363,7 @@ def main():
 例:
   python3 verify_reverse_order.py input.xml output.xml
   python3 verify_reverse_order.py input.xml output.xml --report order_report.txt
+  python3 verify_reverse_order.py input.xml output.xml --max-mismatches 5
         """
     )
     parser.add_argument(
@@ -190,6 +379,12 @@ def main():
         help='レポートを保存するファイルパス（デフォルト: reverse_order_report.txt）',
         default='reverse_order_report.txt'
     )
+    parser.add_argument(
+        '--max-mismatches',
+        type=int,
+        default=None,
+        help='この件数の不一致を検出した時点で比較を打ち切る（デフォルト: 最後まで比較）'
+    )
     
     args = parser.parse_args()
     
@@ -214,31 +409,20 @@ def main():
     print("-" * 80)
     
     try:
-        # XMLファイルのパース
-        print("XMLファイルを読み込み中...")
-        original_tree = etree.parse(str(original_path))
-        converted_tree = etree.parse(str(converted_path))
-        
-        # テキストの抽出
-        print("テキストを抽出中...")
-        original_texts = extract_texts_in_order(original_tree)
-        converted_texts = extract_texts_in_order(converted_tree)
+        # 2つのファイルを同時に読み進めて順序を比較（ツリー全体は読み込まない）
+        print("テキストの順序を比較中...")
+        result = verify_order_files(original_path, converted_path, args.max_mismatches)
+        is_order_preserved = result['is_order_preserved']
         
-        print(f"元のファイルから {len(original_texts)} 個のテキストを抽出")
-        print(f"逆変換後から {len(converted_texts)} 個のテキストを抽出")
+        if result['stopped_early']:
+            print(f"不一致が {result['mismatch_count']} 件に達したため、位置 {result['compared_count']} で比較を打ち切りました")
+        else:
+            print(f"元のファイルから {result['original_count']} 個のテキストを抽出")
+            print(f"逆変換後から {result['converted_count']} 個のテキストを抽出")
         print("-" * 80)
         
-        # 順序の比較
-        print("順序を比較中...")
-        is_order_preserved, details = compare_text_order(original_texts, converted_texts)
-        
         # レポートの生成
-        report = generate_summary_report(
-            original_texts,
-            converted_texts,
-            is_order_preserved,
-            details
-        )
+        report = format_verification_report(result)
         
         # レポートの表示と保存
         print("\n" + report)
@@ -2,79 +2,64 @@
 # -*- coding: utf-8 -*-
 """
 List要素のColumnの1番目の値を分析し、ラベルの種類として新規作成が必要かどうかを判定するスクリプト
+
+値は utils/column_value_scanner.py でストリーミングに抽出して値ごとに集計し、
+ラベル判定は異なる値ごとに1回だけ行う。
 """
 
 import sys
 import json
 from pathlib import Path
-from lxml import etree
 from collections import defaultdict
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # scripts/utils/をインポートパスに追加
 script_dir = Path(__file__).resolve().parent
 sys.path.insert(0, str(script_dir))
 
 from utils.label_utils import LabelConfig
+from utils.column_value_scanner import MODE_NUM1_COLUMNS, ColumnValueSummary, scan_list_column1_values
 
 
-def extract_column1_values(xml_path: str) -> List[Tuple[str, int]]:
+def extract_column1_values(xml_path: str) -> ColumnValueSummary:
     """
-    XMLファイルからList要素のColumnの1番目の値を抽出
+    XMLファイルからList要素のColumnの1番目の値を抽出（ストリーミング）
     
     Returns:
-        List[Tuple[str, int]]: (Column1の値, 行番号)のリスト
+        ColumnValueSummary: 値ごとの出現回数と行番号の集計
     """
-    tree = etree.parse(xml_path)
-    root = tree.getroot()
-    
-    results = []
-    
-    # すべてのList要素を検索
-    for list_elem in root.iter('List'):
-        columns = list_elem.findall('.//Column[@Num="1"]')
-        
-        for col in columns:
-            # Column内のSentence要素からテキストを取得
-            sentence = col.find('.//Sentence')
-            if sentence is not None:
-                # すべてのテキストを結合
-                text = "".join(sentence.itertext()).strip()
-                if text:
-                    # 行番号を取得
-                    line_no = sentence.sourceline if hasattr(sentence, 'sourceline') else None
-                    results.append((text, line_no))
-    
-    return results
+    return scan_list_column1_values(xml_path, MODE_NUM1_COLUMNS)
 
 
-def analyze_labels(column1_values: List[Tuple[str, int]], label_config: LabelConfig) -> Dict:
+def analyze_labels(column1_values: ColumnValueSummary, label_config: LabelConfig) -> Dict:
     """
-    Column1の値をラベルパターンと照合して分析
+    Column1の値をラベルパターンと照合して分析（異なる値ごとに1回だけ判定）
     
     Returns:
-        Dict: 分析結果
+        Dict: 分析結果（unmatched_values は値ごと・最初に出現した順）
     """
     # ラベルIDごとの出現回数
     label_counts: Dict[str, int] = defaultdict(int)
     
     # マッチしない値のリスト
-    unmatched_values: List[Tuple[str, int]] = []
+    unmatched_values: List[Tuple[str, Optional[int]]] = []
     
     # 各値に対してラベルIDを判定
-    for value, line_no in column1_values:
-        label_id = label_config.detect_label_id(value)
+    label_ids = column1_values.classify(label_config.detect_label_id)
+    for value in column1_values.values.values():
+        label_id = label_ids[value.text]
         
         if label_id:
-            label_counts[label_id] += 1
+            label_counts[label_id] += value.count
         else:
-            unmatched_values.append((value, line_no))
+            unmatched_values.extend((value.text, line_no) for line_no in value.line_numbers)
     
+    total_count = column1_values.total_count
     return {
         'label_counts': dict(label_counts),
         'unmatched_values': unmatched_values,
-        'total_count': len(column1_values),
-        'matched_count': len(column1_values) - len(unmatched_values),
+        'total_count': total_count,
+        'matched_count': total_count - len(unmatched_values),
         'unmatched_count': len(unmatched_values)
     }
 
@@ -202,7 +187,7 @@ def main():
     # XMLファイルからColumn1の値を抽出
     print(f"XMLファイルを読み込み中: {args.xml_file}")
     column1_values = extract_column1_values(args.xml_file)
-    print(f"Column1の値が{len(column1_values)}個見つかりました。\n")
+    print(f"Column1の値が{column1_values.total_count}個見つかりました（{len(column1_values.values)}種類）。\n")
     
     # ラベル分析
     analysis_result = analyze_labels(column1_values, label_config)
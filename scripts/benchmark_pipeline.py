@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+変換パイプラインのベンチマーク
+
+generate_benchmark_xml.py で生成した文書（または指定したXMLファイル）を pipeline_engine.run_steps で
+順変換し、その出力を逆変換して、ステップごとの実時間を計測する（--repeat 回の最小値）。
+結果はコミットID・実行環境・文書の設定とともに結果ファイル（JSON Lines）に1行ずつ追記し、
+同じ文書・同じ実行環境の前回の結果と比較して、遅くなったステップを表示する。
+
+順変換はStreamlitアプリと同じく中間ファイルを書き出して各ステップを個別に計測する
+（--fused を指定すると中間ファイルを書き出さず、Item〜Subitem10を一括変換した場合を計測する）。
+
+使用方法:
+    python3 scripts/benchmark_pipeline.py                         # medium のプリセットを計測して記録
+    python3 scripts/benchmark_pipeline.py --size large --repeat 3
+    python3 scripts/benchmark_pipeline.py --articles 20 --depth 6 --no-column-ratio 0.3
+    python3 scripts/benchmark_pipeline.py --input sample/a.xml    # 既存のXMLファイルを計測
+    python3 scripts/benchmark_pipeline.py --no-record --fail-on-regression
+"""
+
+import os
+import sys
+import json
+import socket
+import hashlib
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from lxml import etree
+
+# scripts/をインポートパスに追加
+script_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(script_dir))
+
+import step_registry
+from pipeline_engine import build_intermediate_paths, run_steps
+from generate_benchmark_xml import DEFAULT_SIZE, add_spec_arguments, spec_from_args, write_document
+from step_profiler import pad_text
+
+# 結果ファイルのデフォルトのパス
+DEFAULT_RESULTS_FILE = script_dir.parent / "output" / "benchmarks" / "benchmark_results.jsonl"
+
+# 前回より遅くなったと判定する割合（%）と、判定の対象にする最小の時間（秒、短いステップの揺らぎを除く）
+DEFAULT_REGRESSION_THRESHOLD = 10.0
+MIN_COMPARED_SECONDS = 0.005
+
+# 計測する変換の方向
+DIRECTIONS = [step_registry.DIRECTION_FORWARD, step_registry.DIRECTION_REVERSE]
+
+
+def git_revision() -> Dict:
+    """コミットIDと未コミットの変更の有無（gitがない場合はNone）"""
+    def git(*args):
+        result = subprocess.run(['git', *args], cwd=str(script_dir), capture_output=True, text=True)
+        return result.stdout.strip() if result.returncode == 0 else None
+    try:
+        commit = git('rev-parse', '--short', 'HEAD')
+        status = git('status', '--porcelain', '--untracked-files=no')
+    except OSError:
+        commit, status = None, None
+    return {'commit': commit, 'dirty': bool(status) if status is not None else None}
+
+
+def host_info() -> Dict:
+    """実行環境（前回の結果との比較は同じホスト名の結果に限る）"""
+    return {
+        'hostname': socket.gethostname(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'lxml': '.'.join(str(v) for v in etree.LXML_VERSION),
+    }
+
+
+def run_direction(direction: str, input_path: Path, work_dir: Path, write_intermediate: bool) -> Dict:
+    """
+    1方向の変換を1回実行して計測
+
+    Returns:
+        {"wall_time", "peak_rss_kb", "output_path", "steps": {スクリプト名: 実時間（秒）}}
+
+    Raises:
+        RuntimeError: 変換に失敗した場合
+    """
+    script_names = step_registry.get_step_order(direction)
+    output_path = work_dir / f"{direction}.xml"
+    intermediate_paths = (build_intermediate_paths(input_path, work_dir / f"{direction}_steps", script_names)
+                          if write_intermediate else None)
+    success, error_msg, execution_log = run_steps(
+        input_path, output_path, script_names,
+        intermediate_paths=intermediate_paths,
+        capture_output=True,
+        profile=True
+    )
+    if not success:
+        raise RuntimeError(f"{direction} の変換に失敗しました: {error_msg}")
+
+    steps = {}
+    for step_info in execution_log["steps"]:
+        profile = step_info.get("profile")
+        if profile:
+            steps[step_info["script"]] = profile["wall_time"]
+    profile = execution_log["profile"]
+    return {
+        'wall_time': profile['wall_time'],
+        'peak_rss_kb': profile.get('peak_rss_kb'),
+        'output_path': output_path,
+        'steps': steps,
+    }
+
+
+def benchmark_document(input_path: Path, repeat: int, fused: bool) -> Dict:
+    """
+    文書を順変換・逆変換して計測（各値は repeat 回の最小値）
+
+    Returns:
+        {方向: {"wall_time", "peak_rss_kb", "steps"}}
+    """
+    results: Dict[str, Dict] = {}
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            work_dir = Path(temp_dir)
+            current_input = input_path
+            for direction in DIRECTIONS:
+                write_intermediate = direction != step_registry.DIRECTION_FORWARD or not fused
+                run = run_direction(direction, current_input, work_dir, write_intermediate)
+                current_input = run.pop('output_path')
+                best = results.get(direction)
+                if best is None:
+                    results[direction] = run
+                    continue
+                best['wall_time'] = min(best['wall_time'], run['wall_time'])
+                if run['peak_rss_kb'] is not None:
+                    best['peak_rss_kb'] = max(best['peak_rss_kb'] or 0, run['peak_rss_kb'])
+                for script, seconds in run['steps'].items():
+                    best['steps'][script] = min(best['steps'].get(script, seconds), seconds)
+    return results
+
+
+def document_key(record: Dict) -> str:
+    """前回の結果と比較する文書の識別子"""
+    return json.dumps(record['document'], sort_keys=True, ensure_ascii=False) + f"|fused={record['fused']}"
+
+
+def load_previous_record(results_file: Path, record: Dict) -> Optional[Dict]:
+    """同じ文書・同じホストの直近の結果（結果ファイルがない場合等はNone）"""
+    if not results_file.exists():
+        return None
+    key = document_key(record)
+    previous = None
+    with open(results_file, encoding='utf-8') as f:
+        for line in f:
+            try:
+                candidate = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if (candidate.get('host', {}).get('hostname') == record['host']['hostname']
+                    and document_key(candidate) == key):
+                previous = candidate
+    return previous
+
+
+def append_record(results_file: Path, record: Dict) -> None:
+    """結果ファイルに1行追記"""
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(results_file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def find_regressions(record: Dict, previous: Optional[Dict], threshold: float) -> List[str]:
+    """前回より threshold % 以上遅くなったステップ（"方向/スクリプト名"、合計は "方向/合計"）"""
+    if previous is None:
+        return []
+    regressions = []
+    for direction in DIRECTIONS:
+        current = record['results'].get(direction, {})
+        before = previous['results'].get(direction, {})
+        pairs = [('合計', current.get('wall_time'), before.get('wall_time'))]
+        pairs += [(script, seconds, before.get('steps', {}).get(script))
+                  for script, seconds in current.get('steps', {}).items()]
+        for name, seconds, previous_seconds in pairs:
+            if (seconds is not None and previous_seconds and previous_seconds >= MIN_COMPARED_SECONDS
+                    and (seconds - previous_seconds) / previous_seconds * 100 >= threshold):
+                regressions.append(f"{direction}/{name}")
+    return regressions
+
+
+def format_report(record: Dict, previous: Optional[Dict], regressions: List[str]) -> str:
+    """計測結果（前回の結果がある場合は差分）を表に整形"""
+    lines = []
+    if previous is not None:
+        lines.append(f"前回: {previous['timestamp']}（コミット {previous['git'].get('commit')}）")
+    for direction in DIRECTIONS:
+        current = record['results'][direction]
+        before = (previous or {}).get('results', {}).get(direction, {})
+        lines.append("")
+        lines.append(f"[{direction}]")
+        lines.append("  ".join([pad_text("スクリプト", 40)] +
+                               [pad_text(header, 10, align_right=True) for header in ("今回(ms)", "前回(ms)", "差(%)")]))
+        rows = list(current['steps'].items()) + [('合計', current['wall_time'])]
+        for name, seconds in rows:
+            previous_seconds = before.get('wall_time') if name == '合計' else before.get('steps', {}).get(name)
+            previous_ms = f"{previous_seconds * 1000:.1f}" if previous_seconds is not None else "-"
+            change = (f"{(seconds - previous_seconds) / previous_seconds * 100:+.1f}"
+                      if previous_seconds else "-")
+            mark = "  ⚠️" if f"{direction}/{name}" in regressions else ""
+            lines.append(f"{pad_text(name, 40)}  {seconds * 1000:>10.1f}  {previous_ms:>10}  {change:>10}{mark}")
+        if current.get('peak_rss_kb') is not None:
+            lines.append(f"最大RSS: {current['peak_rss_kb'] / 1024:.1f} MB")
+    return "\n".join(lines)
+
+
+def file_sha256(path: Path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(
+        description='変換パイプライン（順変換・逆変換）のステップごとの処理時間を計測し、前回の結果と比較します'
+    )
+    parser.add_argument('--input', default=None,
+                        help='計測するXMLファイル（省略時は generate_benchmark_xml.py で文書を生成）')
+    add_spec_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=1, help='計測の繰り返し回数（最小値を採用、デフォルト: 1）')
+    parser.add_argument('--fused', action='store_true',
+                        help='順変換で中間ファイルを書き出さず、Item〜Subitem10を一括変換した場合を計測する')
+    parser.add_argument('--results-file', default=str(DEFAULT_RESULTS_FILE),
+                        help=f'結果ファイル（JSON Lines、デフォルト: {DEFAULT_RESULTS_FILE}）')
+    parser.add_argument('--no-record', action='store_true', help='結果ファイルに追記しない（前回との比較のみ）')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help=f'前回より遅くなったと判定する割合（%%、デフォルト: {DEFAULT_REGRESSION_THRESHOLD}）')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='前回より遅くなったステップがある場合に終了コード1を返す')
+    parser.add_argument('--keep-input', default=None, help='生成した文書を保存するパス')
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error("--repeat は1以上を指定してください")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.input:
+            input_path = Path(args.input)
+            if not input_path.exists():
+                print(f"エラー: 入力ファイルが見つかりません: {input_path}", file=sys.stderr)
+                return 1
+            document = {'input': str(input_path), 'sha256': file_sha256(input_path)}
+        else:
+            input_path = Path(args.keep_input) if args.keep_input else Path(temp_dir) / "benchmark.xml"
+            try:
+                spec = spec_from_args(args)
+                write_document(spec, input_path)
+            except ValueError as e:
+                print(f"エラー: {e}", file=sys.stderr)
+                return 1
+            document = {'size': args.size or DEFAULT_SIZE, **spec.to_dict()}
+
+        root = etree.parse(str(input_path)).getroot()
+        element_count = sum(1 for _ in root.iter('*'))
+        file_bytes = input_path.stat().st_size
+        print(f"入力: {args.input or '生成した文書'}（要素数: {element_count} / {file_bytes / 1024:.1f} KB）")
+
+        try:
+            results = benchmark_document(input_path, args.repeat, args.fused)
+        except RuntimeError as e:
+            print(f"エラー: {e}", file=sys.stderr)
+            return 1
+
+    record = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git': git_revision(),
+        'host': host_info(),
+        'document': document,
+        'elements': element_count,
+        'bytes': file_bytes,
+        'fused': args.fused,
+        'repeat': args.repeat,
+        'results': results,
+    }
+    results_file = Path(args.results_file)
+    previous = load_previous_record(results_file, record)
+    regressions = find_regressions(record, previous, args.threshold)
+    print(format_report(record, previous, regressions))
+
+    if not args.no_record:
+        append_record(results_file, record)
+        print(f"\n結果を記録しました: {results_file}")
+    if regressions:
+        print(f"\n⚠️ 前回より {args.threshold}% 以上遅くなりました: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+save_xml_with_indent のインデント整形ベンチマーク
+
+utils.xml_utils.indent_xml（etree.indent によるC実装）と、従来の純Pythonの再帰実装について、
+save_xml_with_indent の出力がバイト単位で一致することを確認し、処理時間を比較する。
+
+使用方法:
+    python3 scripts/benchmark_xml_indent.py              # sample/ 配下のXMLを対象
+    python3 scripts/benchmark_xml_indent.py a.xml dir/  # ファイル・フォルダを指定
+    python3 scripts/benchmark_xml_indent.py --repeat 10
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from lxml import etree
+
+# scripts/をインポートパスに追加
+script_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(script_dir))
+
+from utils.xml_utils import indent_xml, save_xml_with_indent
+
+DEFAULT_SAMPLE_DIR = script_dir.parent / "sample"
+
+
+def indent_xml_recursive(elem, level=0, indent_str="  "):
+    """従来の純Pythonによる再帰的なインデント整形（比較用の基準実装）"""
+    current_indent = "\n" + (indent_str * level)
+
+    if len(elem):
+        if not elem.text or not elem.text.strip():
+            elem.text = current_indent + indent_str
+
+        for i, child in enumerate(elem):
+            indent_xml_recursive(child, level + 1, indent_str)
+
+            if i < len(elem) - 1:
+                if not child.tail or not child.tail.strip():
+                    child.tail = current_indent + indent_str
+            else:
+                if not child.tail or not child.tail.strip():
+                    child.tail = current_indent
+
+        if not elem.tail or not elem.tail.strip():
+            elem.tail = current_indent
+    else:
+        if level > 0 and (not elem.tail or not elem.tail.strip()):
+            elem.tail = current_indent
+
+
+def save_xml_recursive(tree, output_path, indent_str="  "):
+    """従来の save_xml_with_indent と同じ処理（基準実装で整形して保存）"""
+    indent_xml_recursive(tree.getroot(), indent_str=indent_str)
+    tree.write(str(output_path), encoding='utf-8', xml_declaration=True, pretty_print=True)
+
+
+def collect_xml_files(paths):
+    """引数のファイル・フォルダからXMLファイルを収集"""
+    xml_files = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            xml_files.extend(sorted(path.rglob('*.xml')))
+        elif path.is_file():
+            xml_files.append(path)
+    return xml_files
+
+
+def time_indent(xml_file, indent_func, repeat):
+    """インデント整形のみの処理時間（最小値、秒）を計測"""
+    best = None
+    for _ in range(repeat):
+        tree = etree.parse(str(xml_file))
+        start = time.perf_counter()
+        indent_func(tree.getroot())
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark_file(xml_file, repeat, work_dir):
+    """
+    1ファイルについて出力の一致確認と処理時間の計測を行う
+
+    Returns:
+        dict: file, elements, identical, python_sec, native_sec
+    """
+    expected_path = work_dir / "recursive.xml"
+    actual_path = work_dir / "native.xml"
+    save_xml_recursive(etree.parse(str(xml_file)), expected_path)
+    save_xml_with_indent(etree.parse(str(xml_file)), actual_path)
+
+    return {
+        'file': str(xml_file),
+        'elements': sum(1 for _ in etree.parse(str(xml_file)).getroot().iter()),
+        'identical': expected_path.read_bytes() == actual_path.read_bytes(),
+        'python_sec': time_indent(xml_file, indent_xml_recursive, repeat),
+        'native_sec': time_indent(xml_file, indent_xml, repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='save_xml_with_indent のインデント整形について、出力の一致と処理時間を比較します'
+    )
+    parser.add_argument('paths', nargs='*', default=[str(DEFAULT_SAMPLE_DIR)],
+                        help=f'対象のXMLファイルまたはフォルダ（デフォルト: {DEFAULT_SAMPLE_DIR}）')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='計測の繰り返し回数（最小値を採用、デフォルト: 5）')
+    args = parser.parse_args()
+
+    xml_files = collect_xml_files(args.paths)
+    if not xml_files:
+        print("エラー: XMLファイルが見つかりません")
+        return 1
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for xml_file in xml_files:
+            try:
+                results.append(benchmark_file(xml_file, args.repeat, Path(temp_dir)))
+            except etree.XMLSyntaxError as e:
+                print(f"スキップ（パースエラー）: {xml_file}: {e}")
+
+    print(f"{'一致':<4} {'要素数':>8} {'Python(ms)':>11} {'lxml(ms)':>9} {'倍率':>6}  ファイル")
+    for r in results:
+        speedup = r['python_sec'] / r['native_sec'] if r['native_sec'] else float('inf')
+        print(f"{'✅' if r['identical'] else '❌':<4} {r['elements']:>8} "
+              f"{r['python_sec'] * 1000:>11.2f} {r['native_sec'] * 1000:>9.2f} {speedup:>5.1f}x  {r['file']}")
+
+    mismatched = [r for r in results if not r['identical']]
+    total_python = sum(r['python_sec'] for r in results)
+    total_native = sum(r['native_sec'] for r in results)
+    print("=" * 50)
+    print(f"一致: {len(results) - len(mismatched)}/{len(results)} ファイル")
+    if total_native:
+        print(f"合計: Python {total_python * 1000:.2f}ms / lxml {total_native * 1000:.2f}ms "
+              f"({total_python / total_native:.1f}x)")
+
+    return 1 if mismatched else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,17 +4,68 @@ XMLファイル比較スクリプト
 スクリプト実行前後のXMLファイルを比較し、値の改変や順序の変更を検出します。
 """
 
+import io
+import re
 import sys
 import os
 from xml.etree import ElementTree as ET
-from collections import defaultdict
+from collections import Counter, defaultdict
 import difflib
 
+# 構造順序の違いとしてレポートに表示する差分の最大行数
+STRUCTURE_DIFF_MAX_LINES = 20
+
+# unified diff のハンク見出し（@@ -a,b +c,d @@）の開始行番号
+_HUNK_START_PATTERN = re.compile(r'(?<= )([-+])(\d+)')
+
+
+def iter_element_paths(root):
+    """
+    要素を文書順（行きがけ順）に走査し、(タグのパス, 要素) を返すジェネレータ
+
+    再帰せずにスタックで走査するため、深い階層でもパスのリストを作らずに処理できる。
+    """
+    stack = [(root, "")]
+    while stack:
+        element, parent_path = stack.pop()
+        current_path = f"{parent_path}/{element.tag}" if parent_path else element.tag
+        yield current_path, element
+        stack.extend((child, current_path) for child in reversed(list(element)))
+
+
+def unified_diff_trimmed(seq1, seq2, context=3):
+    """
+    2つの列の unified diff の行を返すジェネレータ
+
+    共通の先頭・末尾は線形時間で読み飛ばし、異なる範囲（と前後のcontext行）だけを difflib で比較する。
+    ハンク見出しの行番号は元の列の行番号に補正する。
+    """
+    len1, len2 = len(seq1), len(seq2)
+    limit = min(len1, len2)
+    prefix = 0
+    while prefix < limit and seq1[prefix] == seq2[prefix]:
+        prefix += 1
+    if prefix == len1 == len2:
+        return
+    suffix = 0
+    while suffix < limit - prefix and seq1[len1 - 1 - suffix] == seq2[len2 - 1 - suffix]:
+        suffix += 1
+
+    start = max(0, prefix - context)
+    window1 = seq1[start:min(len1, len1 - suffix + context)]
+    window2 = seq2[start:min(len2, len2 - suffix + context)]
+    for line in difflib.unified_diff(window1, window2, lineterm='', n=context):
+        if start and line.startswith('@@'):
+            line = _HUNK_START_PATTERN.sub(lambda m: f"{m.group(1)}{int(m.group(2)) + start}", line)
+        yield line
+
+
 class XMLComparator:
     def __init__(self, file1, file2):
         self.file1 = file1
         self.file2 = file2
         self.differences = []
+        self.difference_count = 0
         self.element_counts = defaultdict(lambda: {'file1': 0, 'file2': 0})
 
     def parse_xml(self, file_path):
@@ -45,208 +96,211 @@ class XMLComparator:
             return ""
         return text.strip()
 
+    def iter_element_differences(self, elem1, elem2):
+        """要素を文書順に比較し、差異を1件ずつ返すジェネレータ（要素数も集計する）"""
+        stack = [(elem1, elem2, "")]
+        while stack:
+            elem1, elem2, path = stack.pop()
+            current_path = f"{path}/{elem1.tag}" if path else elem1.tag
+
+            # 要素数のカウント
+            self.element_counts[elem1.tag]['file1'] += 1
+            self.element_counts[elem2.tag]['file2'] += 1
+
+            # タグ名の比較
+            if elem1.tag != elem2.tag:
+                yield {
+                    'type': 'tag_mismatch',
+                    'path': current_path,
+                    'file1_tag': elem1.tag,
+                    'file2_tag': elem2.tag
+                }
+
+            # 属性の比較
+            attrs1 = dict(elem1.attrib)
+            attrs2 = dict(elem2.attrib)
+
+            if attrs1 != attrs2:
+                yield {
+                    'type': 'attribute_difference',
+                    'path': current_path,
+                    'file1_attrs': attrs1,
+                    'file2_attrs': attrs2
+                }
+
+            # テキストの比較
+            text1 = self.normalize_text(elem1.text)
+            text2 = self.normalize_text(elem2.text)
+
+            if text1 != text2:
+                yield {
+                    'type': 'text_difference',
+                    'path': current_path,
+                    'file1_text': text1,
+                    'file2_text': text2
+                }
+
+            # 子要素数の比較
+            children1 = list(elem1)
+            children2 = list(elem2)
+
+            if len(children1) != len(children2):
+                yield {
+                    'type': 'children_count_mismatch',
+                    'path': current_path,
+                    'file1_count': len(children1),
+                    'file2_count': len(children2)
+                }
+                continue
+
+            # 子要素の比較（文書順に処理するため逆順に積む）
+            for i in range(len(children1) - 1, -1, -1):
+                stack.append((children1[i], children2[i], f"{current_path}[{i+1}]"))
+
     def compare_elements_recursive(self, elem1, elem2, path=""):
         """要素を再帰的に比較"""
-        current_path = f"{path}/{elem1.tag}" if path else elem1.tag
-
-        # 要素数のカウント
-        self.element_counts[elem1.tag]['file1'] += 1
-        self.element_counts[elem2.tag]['file2'] += 1
-
-        # タグ名の比較
-        if elem1.tag != elem2.tag:
-            self.differences.append({
-                'type': 'tag_mismatch',
-                'path': current_path,
-                'file1_tag': elem1.tag,
-                'file2_tag': elem2.tag
-            })
-
-        # 属性の比較
-        attrs1 = dict(elem1.attrib)
-        attrs2 = dict(elem2.attrib)
-
-        if attrs1 != attrs2:
-            self.differences.append({
-                'type': 'attribute_difference',
-                'path': current_path,
-                'file1_attrs': attrs1,
-                'file2_attrs': attrs2
-            })
-
-        # テキストの比較
-        text1 = self.normalize_text(elem1.text)
-        text2 = self.normalize_text(elem2.text)
-
-        if text1 != text2:
-            self.differences.append({
-                'type': 'text_difference',
-                'path': current_path,
-                'file1_text': text1,
-                'file2_text': text2
-            })
-            print(f"TEXT_DIFFERENCE detected: {current_path}")
-            print(f"  File1: {text1[:50]}{'...' if len(text1) > 50 else ''}")
-            print(f"  File2: {text2[:50]}{'...' if len(text2) > 50 else ''}")
-
-
-        # 子要素数の比較
-        children1 = list(elem1)
-        children2 = list(elem2)
-
-        if len(children1) != len(children2):
-            self.differences.append({
-                'type': 'children_count_mismatch',
-                'path': current_path,
-                'file1_count': len(children1),
-                'file2_count': len(children2)
-            })
-            return
-
-        # 子要素の比較
-        for i, (child1, child2) in enumerate(zip(children1, children2)):
-            child_path = f"{current_path}[{i+1}]"
-            self.compare_elements_recursive(child1, child2, child_path)
+        self.differences.extend(self.iter_element_differences(elem1, elem2))
+
+    def iter_structure_differences(self, root1, root2):
+        """構造（タグのパスの列）の順序を比較し、違いがあれば1件返すジェネレータ"""
+        struct1 = [path for path, _ in iter_element_paths(root1)]
+        struct2 = [path for path, _ in iter_element_paths(root2)]
+
+        # レポートに表示する行数（と続きがあるかどうか）だけ差分を取得
+        diff = []
+        for line in unified_diff_trimmed(struct1, struct2):
+            diff.append(line)
+            if len(diff) > STRUCTURE_DIFF_MAX_LINES:
+                break
+        if diff:
+            yield {
+                'type': 'structure_order_difference',
+                'details': '\n'.join(diff)
+            }
 
     def compare_structure_order(self, root1, root2):
         """構造の順序を比較"""
-        def get_structure_list(element, path=""):
-            structures = []
-            current_path = f"{path}/{element.tag}" if path else element.tag
-            structures.append(current_path)
-
-            for i, child in enumerate(element):
-                structures.extend(get_structure_list(child, current_path))
-            return structures
-
-        struct1 = get_structure_list(root1)
-        struct2 = get_structure_list(root2)
-
-        if struct1 != struct2:
-            # 順序の違いを検出
-            diff = list(difflib.unified_diff(struct1, struct2, lineterm=''))
-            if diff:
-                self.differences.append({
-                    'type': 'structure_order_difference',
-                    'details': '\n'.join(diff)
-                })
+        self.differences.extend(self.iter_structure_differences(root1, root2))
+
+    def iter_text_differences(self, root1, root2):
+        """
+        テキスト内容を比較し、差異を1件ずつ返すジェネレータ
+
+        file2のテキストを (パス, 同じパスでの出現番号) で索引し、file1のテキストは
+        同じパスの同じ出現番号のテキストと比較する。
+        """
+        def iter_texts(root):
+            occurrences = Counter()
+            for path, element in iter_element_paths(root):
+                if element.text and element.text.strip():
+                    yield path, occurrences[path], element.text.strip()
+                    occurrences[path] += 1
+
+        texts2 = {(path, ordinal): text for path, ordinal, text in iter_texts(root2)}
+
+        for path, ordinal, text1 in iter_texts(root1):
+            text2 = texts2.get((path, ordinal))
+            if text2 is not None and text1 != text2:
+                yield {
+                    'type': 'text_content_difference',
+                    'path': path,
+                    'file1_text': text1,
+                    'file2_text': text2
+                }
 
     def compare_text_content(self, root1, root2):
         """テキスト内容の包括的な比較"""
-        def collect_all_text(element, path=""):
-            texts = []
-            current_path = f"{path}/{element.tag}" if path else element.tag
+        return list(self.iter_text_differences(root1, root2))
+
+    def iter_differences(self, root1, root2):
+        """構造順序・要素・テキスト内容の差異を順に返すジェネレータ"""
+        yield from self.iter_structure_differences(root1, root2)
+        yield from self.iter_element_differences(root1, root2)
+        yield from self.iter_text_differences(root1, root2)
+
+    def format_difference(self, number, diff):
+        """差異1件のレポート行を作成"""
+        lines = [f"{number}. {diff['type'].upper()}", f"   パス: {diff.get('path', 'N/A')}"]
+
+        if diff['type'] == 'tag_mismatch':
+            lines.append(f"   ファイル1: {diff['file1_tag']}")
+            lines.append(f"   ファイル2: {diff['file2_tag']}")
+        elif diff['type'] == 'attribute_difference':
+            lines.append(f"   ファイル1属性: {diff['file1_attrs']}")
+            lines.append(f"   ファイル2属性: {diff['file2_attrs']}")
+        elif diff['type'] in ('text_difference', 'text_content_difference'):
+            lines.append(f"   ファイル1テキスト: {diff['file1_text'][:100]}{'...' if len(diff['file1_text']) > 100 else ''}")
+            lines.append(f"   ファイル2テキスト: {diff['file2_text'][:100]}{'...' if len(diff['file2_text']) > 100 else ''}")
+        elif diff['type'] == 'children_count_mismatch':
+            lines.append(f"   ファイル1子要素数: {diff['file1_count']}")
+            lines.append(f"   ファイル2子要素数: {diff['file2_count']}")
+        elif diff['type'] == 'structure_order_difference':
+            details = diff['details'].split('\n')
+            lines.append("   構造順序の違い:")
+            lines.append("   " + "\n   ".join(details[:STRUCTURE_DIFF_MAX_LINES]))  # 最初の20行のみ
+            if len(details) > STRUCTURE_DIFF_MAX_LINES:
+                lines.append("   ... (続き省略)")
+
+        lines.append("")
+        return lines
+
+    def write_report(self, *outputs):
+        """
+        比較を実行し、レポートを1行ずつ書き出す
+
+        差異は見つかった順に書き出し、一覧をメモリに保持しない。差異の件数は最後に書き出す。
+
+        Args:
+            *outputs: 書き出し先（write()を持つオブジェクト。複数指定した場合はすべてに書き出す）
+
+        Returns:
+            検出された差異の件数
+        """
+        def write(line):
+            for output in outputs:
+                output.write(line + "\n")
+
+        write("=" * 80)
+        write("XMLファイル比較レポート")
+        write("=" * 80)
+        write(f"ファイル1: {self.file1}")
+        write(f"ファイル2: {self.file2}")
+        write("")
 
-            # テキストノードの収集
-            if element.text and element.text.strip():
-                texts.append({
-                    'path': current_path,
-                    'text': element.text.strip(),
-                    'tag': element.tag
-                })
-
-            # 子要素の再帰処理
-            for child in element:
-                texts.extend(collect_all_text(child, current_path))
-
-            return texts
-
-        texts1 = collect_all_text(root1)
-        texts2 = collect_all_text(root2)
-
-        # テキスト内容の比較
-        text_diffs = []
-        for text1 in texts1:
-            # 同じパスのテキストを探す
-            matching_text = None
-            for text2 in texts2:
-                if text1['path'] == text2['path']:
-                    matching_text = text2
-                    break
-
-            if matching_text and text1['text'] != matching_text['text']:
-                text_diffs.append({
-                    'type': 'text_content_difference',
-                    'path': text1['path'],
-                    'file1_text': text1['text'],
-                    'file2_text': matching_text['text']
-                })
+        root1 = self.parse_xml(self.file1)
+        root2 = self.parse_xml(self.file2)
 
-        return text_diffs
+        count = 0
+        for count, diff in enumerate(self.iter_differences(root1, root2), 1):
+            for line in self.format_difference(count, diff):
+                write(line)
+        self.difference_count = count
 
-    def generate_report(self):
-        """比較レポートを生成"""
-        report = []
-        report.append("=" * 80)
-        report.append("XMLファイル比較レポート")
-        report.append("=" * 80)
-        report.append(f"ファイル1: {self.file1}")
-        report.append(f"ファイル2: {self.file2}")
-        report.append("")
-
-        # 構造比較の結果
-        root1 = ET.parse(self.file1).getroot()
-        root2 = ET.parse(self.file2).getroot()
-        text_diffs = self.compare_text_content(root1, root2)
-
-        if not self.differences and not text_diffs:
-            report.append("✓ 差異は検出されませんでした。")
-            return "\n".join(report)
-
-        # すべての差異を統合
-        all_diffs = self.differences + text_diffs
-        report.append(f"検出された差異: {len(all_diffs)}件")
-        report.append("")
-
-        for i, diff in enumerate(all_diffs, 1):
-            report.append(f"{i}. {diff['type'].upper()}")
-            report.append(f"   パス: {diff.get('path', 'N/A')}")
-
-            if diff['type'] == 'tag_mismatch':
-                report.append(f"   ファイル1: {diff['file1_tag']}")
-                report.append(f"   ファイル2: {diff['file2_tag']}")
-            elif diff['type'] == 'attribute_difference':
-                report.append(f"   ファイル1属性: {diff['file1_attrs']}")
-                report.append(f"   ファイル2属性: {diff['file2_attrs']}")
-            elif diff['type'] == 'text_difference':
-                report.append(f"   ファイル1テキスト: {diff['file1_text'][:100]}{'...' if len(diff['file1_text']) > 100 else ''}")
-                report.append(f"   ファイル2テキスト: {diff['file2_text'][:100]}{'...' if len(diff['file2_text']) > 100 else ''}")
-            elif diff['type'] == 'children_count_mismatch':
-                report.append(f"   ファイル1子要素数: {diff['file1_count']}")
-                report.append(f"   ファイル2子要素数: {diff['file2_count']}")
-            elif diff['type'] == 'structure_order_difference':
-                report.append("   構造順序の違い:")
-                report.append("   " + "\n   ".join(diff['details'].split('\n')[:20]))  # 最初の20行のみ
-                if len(diff['details'].split('\n')) > 20:
-                    report.append("   ... (続き省略)")
-            elif diff['type'] == 'text_content_difference':
-                report.append(f"   ファイル1テキスト: {diff['file1_text'][:100]}{'...' if len(diff['file1_text']) > 100 else ''}")
-                report.append(f"   ファイル2テキスト: {diff['file2_text'][:100]}{'...' if len(diff['file2_text']) > 100 else ''}")
-
-            report.append("")
+        if count == 0:
+            write("✓ 差異は検出されませんでした。")
+            return count
+
+        write(f"検出された差異: {count}件")
+        write("")
 
         # 要素数のサマリー
-        report.append("要素数サマリー:")
-        report.append("-" * 40)
+        write("要素数サマリー:")
+        write("-" * 40)
         for tag, counts in sorted(self.element_counts.items()):
             if counts['file1'] != counts['file2']:
-                report.append(f"{tag}: ファイル1={counts['file1']}, ファイル2={counts['file2']}")
+                write(f"{tag}: ファイル1={counts['file1']}, ファイル2={counts['file2']}")
+        return count
 
-        return "\n".join(report)
+    def generate_report(self):
+        """比較レポートを生成"""
+        self.element_counts.clear()
+        report = io.StringIO()
+        self.write_report(report)
+        return report.getvalue().rstrip("\n")
 
     def compare(self):
         """比較を実行"""
         print("XMLファイルを比較中...")
-
-        root1 = self.parse_xml(self.file1)
-        root2 = self.parse_xml(self.file2)
-
-        # 構造順序の比較
-        self.compare_structure_order(root1, root2)
-
-        # 詳細比較
-        self.compare_elements_recursive(root1, root2)
-
         return self.generate_report()
 
 def main():
@@ -268,14 +322,12 @@ def main():
         sys.exit(1)
 
     comparator = XMLComparator(file1, file2)
-    report = comparator.compare()
-
-    print(report)
+    print("XMLファイルを比較中...")
 
-    # レポートをファイルに保存
+    # レポートを表示しながらファイルに保存
     report_file = "xml_comparison_report.txt"
     with open(report_file, 'w', encoding='utf-8') as f:
-        f.write(report)
+        comparator.write_report(sys.stdout, f)
 
     print(f"\nレポートを保存しました: {report_file}")
 
@@ -4,13 +4,24 @@
 """
 2つのXMLファイルを比較し、テキスト内容の欠落がないか検証するスクリプト
 表の順序と数も検証します。
+
+各ファイルは iterparse で1回だけ走査し（scan_xml_content）、テキストはダイジェストの
+多重集合として比較します。get_all_texts() / get_table_sequence() はツリーを使う基準実装です。
 """
 
 import sys
+import heapq
+import hashlib
 import argparse
+from collections import Counter
 from lxml import etree
 from pathlib import Path
 
+# 表の内容識別に使用するテキスト数
+TABLE_CONTENT_TEXT_COUNT = 10
+# テキストのダイジェストのバイト数（blake2b）
+TEXT_DIGEST_SIZE = 16
+
 def get_all_texts(tree: etree._ElementTree) -> set:
     """
     XMLツリーからすべてのテキストコンテンツを抽出し、セットとして返す。
@@ -121,6 +132,520 @@ def get_table_sequence(tree: etree._ElementTree) -> list:
             tables.append(table_id)
     return tables
 
+def text_digest(text: str) -> bytes:
+    """テキストのダイジェスト（テキスト多重集合のキー）"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=TEXT_DIGEST_SIZE).digest()
+
+
+def _truncate(text: str, max_length: int) -> str:
+    return text[:max_length] if len(text) > max_length else text
+
+
+def _discard_element(elem) -> None:
+    """iterparseで処理済みの要素と、その前の兄弟要素をツリーから破棄する"""
+    elem.clear()
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
+class _StreamFrame:
+    """ストリーミング走査中の開いている要素の情報（内部用）"""
+
+    __slots__ = ('tag', 'num', 'seq', 'index', 'sentence_number', 'child_count', 'title_tag',
+                 'title_found', 'title_text', 'sentence_id', 'sentence_text', 'last_child_tag',
+                 'last_child_context', 'pending_tables', 'awaiting_next', 'table_texts')
+
+    def __init__(self, tag, num, seq, index, sentence_number=None):
+        self.tag = tag
+        self.num = num
+        self.seq = seq
+        self.index = index
+        # Sentence要素の場合: 出現順の番号
+        self.sentence_number = sentence_number
+        self.child_count = 0
+        # 親要素の情報（ParagraphNum / <tag>Title の最初の子要素）
+        self.title_tag = None
+        if tag == 'Paragraph':
+            self.title_tag = 'ParagraphNum'
+        elif isinstance(tag, str) and (tag.startswith('Subitem') or tag == 'Item'):
+            self.title_tag = f'{tag}Title'
+        self.title_found = False
+        self.title_text = None
+        # 最初のSentence子孫要素（None: 未出現、int: そのSentenceの番号）とそのテキスト
+        self.sentence_id = None
+        self.sentence_text = None
+        # 直前の子要素のタグとコンテキストテキスト
+        self.last_child_tag = None
+        self.last_child_context = ""
+        # 親要素の終了時に識別子を確定する表: [(seq, content_id, index, context_parts)]
+        self.pending_tables = []
+        # 次の兄弟要素のコンテキスト待ちの表のcontext_parts
+        self.awaiting_next = None
+        # TableStructの場合: 文書順で最初のテキスト（(seq, text)の最大ヒープ）
+        self.table_texts = [] if tag == 'TableStruct' else None
+
+    def context_text(self, own_text, max_length):
+        """get_element_context_text() と同じ規則のコンテキストテキスト"""
+        if self.sentence_text:
+            return _truncate(self.sentence_text.strip(), max_length)
+        if own_text:
+            return _truncate(own_text.strip(), max_length)
+        return ""
+
+    def parent_info(self):
+        """get_table_sequence() と同じ規則の親要素情報"""
+        if self.tag == 'Paragraph':
+            if self.title_text:
+                return f"{self.tag}[{self.title_text.strip()}]"
+        elif self.title_tag is not None:
+            if self.title_text:
+                return f"{self.tag}[{self.title_text.strip()[:20]}]"
+            elif self.num:
+                return f"{self.tag}[Num={self.num}]"
+        return self.tag
+
+
+class XMLContentSummary:
+    """
+    XMLファイルのテキスト内容と表の並びの要約
+
+    Attributes:
+        text_counts: テキストのダイジェスト -> 出現回数（空白のみのテキストは除外）
+        tables: 表の識別子のリスト（文書順、get_table_sequence() と同じ形式）
+        source: 要約元（ファイルパスまたはツリー。ダイジェストからテキストを復元する際に使用）
+    """
+
+    def __init__(self, text_counts: Counter, tables: list, source=None):
+        self.text_counts = text_counts
+        self.tables = tables
+        self.source = source
+
+    @property
+    def unique_text_count(self) -> int:
+        return len(self.text_counts)
+
+
+def scan_xml_content(xml_path) -> XMLContentSummary:
+    """
+    XMLファイルを iterparse で1回だけ走査し、テキストの多重集合（ダイジェスト）と表の識別子を求める
+
+    処理済みの要素はその場で破棄するため、ツリー全体をメモリに保持しない。
+    結果は get_all_texts()（の要素の集合）・get_table_sequence() と同じになる。
+
+    Args:
+        xml_path: XMLファイルのパス
+
+    Returns:
+        XMLContentSummary
+    """
+    events = etree.iterparse(str(xml_path), events=('start', 'end', 'comment', 'pi'))
+    summary = _summarize_events(events, discard=True)
+    summary.source = xml_path
+    return summary
+
+
+def summarize_xml_tree(tree) -> XMLContentSummary:
+    """
+    メモリ上のツリーから scan_xml_content() と同じ要約を求める（再パース不要）
+
+    Args:
+        tree: ElementTreeまたはルート要素（変更しない）
+
+    Returns:
+        XMLContentSummary
+    """
+    root = tree.getroot() if isinstance(tree, etree._ElementTree) else tree
+    events = etree.iterwalk(root, events=('start', 'end', 'comment', 'pi'))
+    summary = _summarize_events(events, discard=False)
+    summary.source = root
+    return summary
+
+
+def _summarize_events(events, discard: bool) -> XMLContentSummary:
+    """iterparse / iterwalk のイベント列から要約を求める（内部用）"""
+    text_counts = Counter()
+    tables = []
+    stack = []
+    open_tables = []
+    seq = 0
+    sentence_seq = 0
+
+    def add_text(text, node_seq):
+        if not text:
+            return
+        text = text.strip()
+        if not text:
+            return
+        text_counts[text_digest(text)] += 1
+        for frame in open_tables:
+            heap = frame.table_texts
+            item = (-node_seq, text)
+            if len(heap) < TABLE_CONTENT_TEXT_COUNT:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+    def close_child(parent, child_tag, child_context, child_text):
+        """子要素（コメント等を含む）の終了を親要素に反映"""
+        if parent.awaiting_next is not None:
+            if child_context:
+                parent.awaiting_next.append(f"next:{child_tag}[{child_context}]")
+            parent.awaiting_next = None
+        if parent.title_tag is not None and not parent.title_found and child_tag == parent.title_tag:
+            parent.title_found = True
+            parent.title_text = child_text
+        parent.last_child_tag = child_tag
+        parent.last_child_context = child_context
+
+    for event, elem in events:
+        if event == 'start':
+            seq += 1
+            index = 0
+            if stack:
+                parent = stack[-1]
+                index = parent.child_count
+                parent.child_count += 1
+            sentence_number = None
+            if elem.tag == 'Sentence':
+                sentence_seq += 1
+                sentence_number = sentence_seq
+                for ancestor in reversed(stack):
+                    if ancestor.sentence_id is not None:
+                        break
+                    ancestor.sentence_id = sentence_number
+            frame = _StreamFrame(elem.tag, elem.get('Num'), seq, index, sentence_number)
+            stack.append(frame)
+            if frame.table_texts is not None:
+                open_tables.append(frame)
+            continue
+
+        if event in ('comment', 'pi'):
+            # ルート要素の外側のコメント・処理命令は tree.iter() の対象外
+            if not stack:
+                continue
+            seq += 1
+            parent = stack[-1]
+            index = parent.child_count
+            parent.child_count += 1
+            add_text(elem.text, seq)
+            comment_context = _truncate(elem.text.strip(), 30) if elem.text else ""
+            close_child(parent, elem.tag, comment_context, elem.text)
+            continue
+
+        # event == 'end'
+        frame = stack.pop()
+        own_text = elem.text
+        add_text(own_text, frame.seq)
+        if frame.sentence_number is not None:
+            # 最初のSentence子孫要素が自身である祖先要素にテキストを設定
+            for ancestor in reversed(stack):
+                if ancestor.sentence_id != frame.sentence_number:
+                    break
+                ancestor.sentence_text = own_text
+        context_text = frame.context_text(own_text, 30)
+
+        if frame.table_texts is not None:
+            open_tables.remove(frame)
+            texts = [text for _, text in sorted(frame.table_texts, reverse=True)]
+            content_id = ' | '.join(texts)
+            if stack:
+                parent = stack[-1]
+                context_parts = []
+                if frame.index > 0 and parent.last_child_context:
+                    context_parts.append(f"prev:{parent.last_child_tag}[{parent.last_child_context}]")
+                parent.pending_tables.append((frame.seq, content_id, frame.index, context_parts))
+            else:
+                tables.append((frame.seq, content_id if content_id else "EMPTY_TABLE"))
+
+        if stack:
+            parent = stack[-1]
+            close_child(parent, elem.tag, context_text, own_text)
+            if frame.table_texts is not None:
+                parent.awaiting_next = parent.pending_tables[-1][3]
+
+        # 親要素の情報が揃ったので、この要素の子である表の識別子を確定
+        if frame.pending_tables:
+            parent_info = frame.parent_info()
+            for table_seq, content_id, index, context_parts in frame.pending_tables:
+                context_str = ' | '.join(context_parts)
+                if context_str:
+                    table_id = f"{content_id} | POS:{parent_info}[{index}] | {context_str}"
+                else:
+                    table_id = f"{content_id} | POS:{parent_info}[{index}]"
+                tables.append((table_seq, table_id))
+
+        # 処理済みの要素と前の兄弟要素を破棄
+        if discard:
+            _discard_element(elem)
+    del events
+
+    tables.sort()
+    return XMLContentSummary(text_counts, [table_id for _, table_id in tables])
+
+
+def find_texts_by_digest(source, digests) -> set:
+    """
+    指定したダイジェストに該当するテキストを抽出する（欠落テキストの表示用）
+
+    Args:
+        source: XMLファイルのパス（iterparseで走査）、またはElementTree・ルート要素
+        digests: 対象のダイジェストの集合
+
+    Returns:
+        該当するテキストの集合
+    """
+    found = set()
+    if not digests:
+        return found
+    if isinstance(source, (etree._ElementTree, etree._Element)):
+        for text in get_all_texts(source):
+            if text_digest(text) in digests:
+                found.add(text)
+        return found
+    xml_path = source
+    depth = 0
+    for event, elem in etree.iterparse(str(xml_path), events=('start', 'end', 'comment', 'pi')):
+        if event == 'start':
+            depth += 1
+            continue
+        if event == 'end':
+            depth -= 1
+        elif depth == 0:
+            continue
+        text = elem.text.strip() if elem.text else ""
+        if text and text_digest(text) in digests:
+            found.add(text)
+        if event == 'end':
+            _discard_element(elem)
+    return found
+
+
+class TextContentComparison:
+    """
+    テキスト内容検証の結果
+
+    Attributes:
+        original_summary / final_summary: 各ファイルの XMLContentSummary
+        missing_texts: 元ファイルにあって最終ファイルにないテキスト（ソート済み）
+        extra_texts: 最終ファイルにだけあるテキスト（ソート済み、エラーではない）
+        table_count_error: 表の数が一致しない場合のメッセージ（一致する場合はNone）
+        table_order_errors: 表の内容の順序が一致しない位置 [{'index', 'original', 'final'}]
+        table_position_warnings: 内容は同じで位置情報だけが異なる位置 [{'index', 'original', 'final'}]
+    """
+
+    def __init__(self, original_summary, final_summary, missing_texts, extra_texts,
+                 table_count_error, table_order_errors, table_position_warnings):
+        self.original_summary = original_summary
+        self.final_summary = final_summary
+        self.missing_texts = missing_texts
+        self.extra_texts = extra_texts
+        self.table_count_error = table_count_error
+        self.table_order_errors = table_order_errors
+        self.table_position_warnings = table_position_warnings
+
+    @property
+    def is_valid(self) -> bool:
+        """エラーがないか（位置情報の違いは警告のみなので、エラーとして扱わない）"""
+        return not self.missing_texts and not self.table_count_error and not self.table_order_errors
+
+    def to_dict(self) -> dict:
+        """JSONに変換可能な辞書"""
+        return {
+            'is_valid': self.is_valid,
+            'original_unique_texts': self.original_summary.unique_text_count,
+            'final_unique_texts': self.final_summary.unique_text_count,
+            'original_tables': len(self.original_summary.tables),
+            'final_tables': len(self.final_summary.tables),
+            'missing_texts': list(self.missing_texts),
+            'extra_texts': list(self.extra_texts),
+            'table_count_error': self.table_count_error,
+            'table_order_errors': list(self.table_order_errors),
+            'table_position_warnings': list(self.table_position_warnings),
+        }
+
+    def format_report(self) -> str:
+        """レポートファイル（--report_file）の内容"""
+        lines = []
+        # テキスト内容の検証結果
+        if not self.missing_texts:
+            lines.append("✅ Success: All text content from the original file is present in the final file.\n\n")
+        else:
+            lines.append(f"❌ Error: Found {len(self.missing_texts)} text elements missing from the final file.\n\n")
+            lines.append("Missing text elements:\n")
+            lines.append("-" * 30 + "\n")
+            for i, text in enumerate(self.missing_texts):
+                lines.append(f"{i+1}: {text}\n")
+            lines.append("\n")
+
+        # 表の検証結果
+        lines.append("=" * 80 + "\n")
+        lines.append("Table Validation Results\n")
+        lines.append("=" * 80 + "\n\n")
+
+        if self.table_count_error:
+            lines.append(self.table_count_error + "\n\n")
+
+        if self.table_order_errors:
+            lines.append(f"❌ Error: Found {len(self.table_order_errors)} table(s) with content order mismatch.\n\n")
+            lines.append("Table content order mismatches:\n")
+            lines.append("-" * 30 + "\n")
+            for error in self.table_order_errors:
+                lines.append(f"Position {error['index']}:\n")
+                lines.append(f"  Original: {error['original']}\n")
+                lines.append(f"  Final:    {error['final']}\n\n")
+        elif self.table_position_warnings:
+            lines.append("✅ Table content order is correct.\n\n")
+            lines.append(f"⚠️  Warning: Found {len(self.table_position_warnings)} table(s) with position changes.\n")
+            lines.append("This is normal after conversion (tables may move to different parent elements).\n\n")
+            lines.append("Table position changes:\n")
+            lines.append("-" * 30 + "\n")
+            for warning in self.table_position_warnings[:10]:  # 最初の10個のみ表示
+                lines.append(f"Position {warning['index']}:\n")
+                lines.append(f"  Original: {warning['original']}\n")
+                lines.append(f"  Final:    {warning['final']}\n\n")
+            if len(self.table_position_warnings) > 10:
+                lines.append(f"... and {len(self.table_position_warnings) - 10} more position changes\n\n")
+        elif not self.table_count_error:
+            lines.append("✅ Table order is correct.\n")
+
+        return ''.join(lines)
+
+
+def compare_tables(original_tables: list, final_tables: list):
+    """
+    表の識別子の並びを比較する
+
+    Returns:
+        (table_count_error, table_order_errors, table_position_warnings)
+    """
+    table_order_errors = []
+    table_position_warnings = []
+
+    # 表の数の検証
+    if len(original_tables) != len(final_tables):
+        table_count_error = f"❌ Error: Table count mismatch. Original: {len(original_tables)}, Final: {len(final_tables)}"
+        return table_count_error, table_order_errors, table_position_warnings
+
+    # 表の内容のみで順序を検証（位置情報を除く）
+    original_content = [t.split(' | POS:')[0] for t in original_tables]
+    final_content = [t.split(' | POS:')[0] for t in final_tables]
+
+    # 位置情報を含めた詳細な比較
+    for i in range(len(original_tables)):
+        if original_tables[i] != final_tables[i]:
+            # 内容が同じかどうかを確認
+            if original_content[i] == final_content[i]:
+                # 内容は同じだが位置情報が異なる場合は警告
+                table_position_warnings.append({
+                    'index': i + 1,
+                    'original': original_tables[i][:150],
+                    'final': final_tables[i][:150]
+                })
+            else:
+                # 内容が異なる場合はエラー
+                table_order_errors.append({
+                    'index': i + 1,
+                    'original': original_tables[i][:100],
+                    'final': final_tables[i][:100]
+                })
+
+    return None, table_order_errors, table_position_warnings
+
+
+def summarize_xml(source) -> XMLContentSummary:
+    """ファイルパスはストリーミングで、メモリ上のツリーはそのまま要約する"""
+    if isinstance(source, XMLContentSummary):
+        return source
+    if isinstance(source, (etree._ElementTree, etree._Element)):
+        return summarize_xml_tree(source)
+    return scan_xml_content(source)
+
+
+def compare_text_content(original, final) -> TextContentComparison:
+    """
+    2つのXMLのテキスト内容と表の並びを比較する（プロセス内で使用するAPI）
+
+    Args:
+        original: 元のXML（ファイルパス、ElementTree・ルート要素、または作成済みの XMLContentSummary）
+        final: 変換後のXML（同上）
+
+    Returns:
+        TextContentComparison
+
+    Raises:
+        etree.XMLSyntaxError: ファイルのパースに失敗した場合
+    """
+    original_summary = summarize_xml(original)
+    final_summary = summarize_xml(final)
+
+    # 欠落・追加されたテキストがある場合のみ、該当するテキストを復元
+    missing_digests = original_summary.text_counts.keys() - final_summary.text_counts.keys()
+    extra_digests = final_summary.text_counts.keys() - original_summary.text_counts.keys()
+    missing_texts = sorted(find_texts_by_digest(original_summary.source, missing_digests))
+    extra_texts = sorted(find_texts_by_digest(final_summary.source, extra_digests))
+
+    table_count_error, table_order_errors, table_position_warnings = compare_tables(
+        original_summary.tables, final_summary.tables)
+
+    return TextContentComparison(original_summary, final_summary, missing_texts, extra_texts,
+                                 table_count_error, table_order_errors, table_position_warnings)
+
+
+def print_comparison(result: TextContentComparison) -> None:
+    """検証結果（テキスト数・表の検証結果・テキスト内容の検証結果）を標準出力に表示"""
+    print(f"Found {result.original_summary.unique_text_count} unique text elements in the original file.")
+    print(f"Found {result.final_summary.unique_text_count} unique text elements in the final file.")
+
+    print("-" * 80)
+    print(f"Found {len(result.original_summary.tables)} tables in the original file.")
+    print(f"Found {len(result.final_summary.tables)} tables in the final file.")
+    print_table_results(result)
+    print("-" * 80)
+
+    # テキスト内容の検証結果
+    if not result.missing_texts:
+        print("✅ Success: All text content from the original file is present in the final file.")
+    else:
+        print(f"❌ Error: Found {len(result.missing_texts)} text elements missing from the final file.")
+
+
+def print_table_results(result: TextContentComparison) -> None:
+    """表の検証結果を標準出力に表示"""
+    if result.table_count_error:
+        print(result.table_count_error)
+        return
+
+    table_order_errors = result.table_order_errors
+    table_position_warnings = result.table_position_warnings
+    if table_order_errors:
+        print(f"❌ Error: Found {len(table_order_errors)} table(s) with content order mismatch.")
+        for error in table_order_errors[:5]:  # 最初の5つのエラーのみ表示
+            print(f"  Position {error['index']}:")
+            print(f"    Original: {error['original']}...")
+            print(f"    Final:    {error['final']}...")
+        if len(table_order_errors) > 5:
+            print(f"  ... and {len(table_order_errors) - 5} more content order mismatches")
+    elif table_position_warnings:
+        # 位置情報の違いは警告として表示（内容の順序は一致している）
+        print(f"✅ Table content order is correct.")
+        print(f"⚠️  Warning: Found {len(table_position_warnings)} table(s) with position changes (this is normal after conversion).")
+        if len(table_position_warnings) <= 5:
+            for warning in table_position_warnings:
+                print(f"  Position {warning['index']}:")
+                print(f"    Original: {warning['original']}...")
+                print(f"    Final:    {warning['final']}...")
+        else:
+            for warning in table_position_warnings[:3]:
+                print(f"  Position {warning['index']}:")
+                print(f"    Original: {warning['original']}...")
+                print(f"    Final:    {warning['final']}...")
+            print(f"  ... and {len(table_position_warnings) - 3} more position changes")
+    else:
+        print("✅ Table order is correct.")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Compare two XML files to check for missing text content."
@@ -149,151 +674,24 @@ def main():
     print(f"Final file   : {final_path}")
     print("-" * 80)
 
+    # 両ファイルをストリーミングで1回ずつ走査（ツリー全体は保持しない）
     try:
-        original_tree = etree.parse(str(original_path))
-        final_tree = etree.parse(str(final_path))
+        result = compare_text_content(original_path, final_path)
     except etree.XMLSyntaxError as e:
         print(f"Error parsing XML: {e}")
         sys.exit(1)
 
-    original_texts = get_all_texts(original_tree)
-    final_texts = get_all_texts(final_tree)
-
-    print(f"Found {len(original_texts)} unique text elements in the original file.")
-    print(f"Found {len(final_texts)} unique text elements in the final file.")
-
-    missing_texts = original_texts - final_texts
-
-    # 表の順序と数を検証
-    original_tables = get_table_sequence(original_tree)
-    final_tables = get_table_sequence(final_tree)
-
-    print("-" * 80)
-    print(f"Found {len(original_tables)} tables in the original file.")
-    print(f"Found {len(final_tables)} tables in the final file.")
-
-    table_order_errors = []
-    table_position_warnings = []
-    table_count_error = None
-
-    # 表の数の検証
-    if len(original_tables) != len(final_tables):
-        table_count_error = f"❌ Error: Table count mismatch. Original: {len(original_tables)}, Final: {len(final_tables)}"
-        print(table_count_error)
-    else:
-        # 表の内容のみで順序を検証（位置情報を除く）
-        original_content = [t.split(' | POS:')[0] for t in original_tables]
-        final_content = [t.split(' | POS:')[0] for t in final_tables]
-        
-        # 内容の順序が一致しているか確認
-        content_order_match = original_content == final_content
-        
-        # 位置情報を含めた詳細な比較
-        for i in range(len(original_tables)):
-            if original_tables[i] != final_tables[i]:
-                # 内容が同じかどうかを確認
-                if original_content[i] == final_content[i]:
-                    # 内容は同じだが位置情報が異なる場合は警告
-                    table_position_warnings.append({
-                        'index': i + 1,
-                        'original': original_tables[i][:150],
-                        'final': final_tables[i][:150]
-                    })
-                else:
-                    # 内容が異なる場合はエラー
-                    table_order_errors.append({
-                        'index': i + 1,
-                        'original': original_tables[i][:100],
-                        'final': final_tables[i][:100]
-                    })
-        
-        # 結果の表示
-        if table_order_errors:
-            print(f"❌ Error: Found {len(table_order_errors)} table(s) with content order mismatch.")
-            for error in table_order_errors[:5]:  # 最初の5つのエラーのみ表示
-                print(f"  Position {error['index']}:")
-                print(f"    Original: {error['original']}...")
-                print(f"    Final:    {error['final']}...")
-            if len(table_order_errors) > 5:
-                print(f"  ... and {len(table_order_errors) - 5} more content order mismatches")
-        elif table_position_warnings:
-            # 位置情報の違いは警告として表示（内容の順序は一致している）
-            print(f"✅ Table content order is correct.")
-            print(f"⚠️  Warning: Found {len(table_position_warnings)} table(s) with position changes (this is normal after conversion).")
-            if len(table_position_warnings) <= 5:
-                for warning in table_position_warnings:
-                    print(f"  Position {warning['index']}:")
-                    print(f"    Original: {warning['original']}...")
-                    print(f"    Final:    {warning['final']}...")
-            else:
-                for warning in table_position_warnings[:3]:
-                    print(f"  Position {warning['index']}:")
-                    print(f"    Original: {warning['original']}...")
-                    print(f"    Final:    {warning['final']}...")
-                print(f"  ... and {len(table_position_warnings) - 3} more position changes")
-        else:
-            print("✅ Table order is correct.")
-
-    print("-" * 80)
+    print_comparison(result)
 
     # レポートファイルに書き込み
-    has_errors = False
     with report_path.open('w', encoding='utf-8') as f:
-        # テキスト内容の検証結果
-        if not missing_texts:
-            success_message = "✅ Success: All text content from the original file is present in the final file."
-            print(success_message)
-            f.write(success_message + "\n\n")
-        else:
-            has_errors = True
-            error_message = f"❌ Error: Found {len(missing_texts)} text elements missing from the final file."
-            print(error_message)
-            f.write(error_message + "\n\n")
-            f.write("Missing text elements:\n")
-            f.write("-" * 30 + "\n")
-            for i, text in enumerate(sorted(list(missing_texts))):
-                f.write(f"{i+1}: {text}\n")
-            f.write("\n")
-        
-        # 表の検証結果
-        f.write("=" * 80 + "\n")
-        f.write("Table Validation Results\n")
-        f.write("=" * 80 + "\n\n")
-        
-        if table_count_error:
-            has_errors = True
-            f.write(table_count_error + "\n\n")
-        
-        if table_order_errors:
-            has_errors = True
-            f.write(f"❌ Error: Found {len(table_order_errors)} table(s) with content order mismatch.\n\n")
-            f.write("Table content order mismatches:\n")
-            f.write("-" * 30 + "\n")
-            for error in table_order_errors:
-                f.write(f"Position {error['index']}:\n")
-                f.write(f"  Original: {error['original']}\n")
-                f.write(f"  Final:    {error['final']}\n\n")
-        elif table_position_warnings:
-            f.write("✅ Table content order is correct.\n\n")
-            f.write(f"⚠️  Warning: Found {len(table_position_warnings)} table(s) with position changes.\n")
-            f.write("This is normal after conversion (tables may move to different parent elements).\n\n")
-            f.write("Table position changes:\n")
-            f.write("-" * 30 + "\n")
-            for warning in table_position_warnings[:10]:  # 最初の10個のみ表示
-                f.write(f"Position {warning['index']}:\n")
-                f.write(f"  Original: {warning['original']}\n")
-                f.write(f"  Final:    {warning['final']}\n\n")
-            if len(table_position_warnings) > 10:
-                f.write(f"... and {len(table_position_warnings) - 10} more position changes\n\n")
-        elif not table_count_error:
-            f.write("✅ Table order is correct.\n")
-        
-        print(f"A detailed report has been saved to: {report_path}")
+        f.write(result.format_report())
+    print(f"A detailed report has been saved to: {report_path}")
 
     print("=" * 80)
 
     # エラーがある場合は1を返す（位置情報の違いは警告のみなので、エラーとして扱わない）
-    return 0 if not missing_texts and not table_count_error and not table_order_errors else 1
+    return 0 if result.is_valid else 1
 
 if __name__ == '__main__':
     sys.exit(main())
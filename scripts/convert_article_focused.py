@@ -345,15 +345,16 @@ class ArticleFocusedConverter:
         
         return result
     
-    def process_xml(self, input_path: Path, output_path: Path, renumber: bool = True):
-        """XMLファイルを処理
+    def convert_tree(self, tree: ET.ElementTree, renumber: bool = True) -> ET.ElementTree:
+        """パース済みのツリーを変換（ツリーはその場で更新される）
         
         Args:
-            input_path: 入力XMLファイルのパス
-            output_path: 出力XMLファイルのパス
+            tree: 変換対象のElementTree
             renumber: Num属性を振り直すかどうか（デフォルト: True）
+        
+        Returns:
+            ET.ElementTree: 変換後のツリー
         """
-        tree = ET.parse(str(input_path))
         root = tree.getroot()
 
         # 前処理: Articleの直接子要素としてListがある場合、新しいParagraphでラップする
@@ -443,6 +444,19 @@ class ArticleFocusedConverter:
             for elem_type, count in renumber_stats.items():
                 print(f"  - {elem_type}: {count}個（親要素ごとに1からリセット）")
         
+        return tree
+    
+    def process_xml(self, input_path: Path, output_path: Path, renumber: bool = True):
+        """XMLファイルを処理
+        
+        Args:
+            input_path: 入力XMLファイルのパス
+            output_path: 出力XMLファイルのパス
+            renumber: Num属性を振り直すかどうか（デフォルト: True）
+        """
+        tree = ET.parse(str(input_path))
+        self.convert_tree(tree, renumber=renumber)
+        
         # 結果を保存（インデント整形付き）
         save_xml_with_indent(tree, output_path)
         
@@ -14,6 +14,18 @@ from pathlib import Path
 # 共通モジュールをインポート
 from xml_converter import ConversionConfig, process_xml_file
 
+# Item変換の設定
+CONFIG = ConversionConfig(
+    parent_tag='Paragraph',
+    child_tag='Item',
+    title_tag='ItemTitle',
+    sentence_tag='ItemSentence',
+    column_condition_min=2,  # Itemは col_count == 2
+    supported_types=['labeled', 'subject_name', 'instruction', 'grade'],
+    script_name='convert_item_step0',
+    skip_empty_parent=False  # Item作成では親要素チェックをスキップ（空ParagraphでもItem作成）
+)
+
 
 def main():
     """メイン関数"""
@@ -40,19 +52,7 @@ def main():
 
     output_path = Path(args.output_file) if args.output_file else input_path.parent / f"{input_path.stem}_item_step0.xml"
 
-    # Item変換の設定
-    config = ConversionConfig(
-        parent_tag='Paragraph',
-        child_tag='Item',
-        title_tag='ItemTitle',
-        sentence_tag='ItemSentence',
-        column_condition_min=2,  # Itemは col_count == 2
-        supported_types=['labeled', 'subject_name', 'instruction', 'grade'],
-        script_name='convert_item_step0',
-        skip_empty_parent=False  # Item作成では親要素チェックをスキップ（空ParagraphでもItem作成）
-    )
-
-    return process_xml_file(input_path, output_path, config)
+    return process_xml_file(input_path, output_path, CONFIG)
 
 
 if __name__ == '__main__':
@@ -26,22 +26,13 @@ script_dir = Path(__file__).resolve().parent
 sys.path.insert(0, str(script_dir))
 
 from utils.label_utils import detect_label_id, is_label
+from utils.xml_utils import write_xml
 
-def format_xml_lxml(tree, output_path):
+def format_xml_lxml(tree, output_path, formatted=True):
     """
-    lxmlのElementTreeをインデント整形して保存
+    lxmlのElementTreeをインデント整形して保存（formatted=Falseの場合は整形せずに保存）
     """
-    # 文字列化と再パースで空白ノードを正規化し、indent()で確実に整形する
-    clean_root = etree.fromstring(etree.tostring(tree.getroot()))
-    etree.indent(clean_root, space="  ", level=0)
-    new_tree = etree.ElementTree(clean_root)
-    
-    new_tree.write(
-        output_path,
-        encoding='utf-8',
-        xml_declaration=True,
-        pretty_print=False
-    )
+    write_xml(tree, output_path, indent_str="  ", formatted=formatted)
 
 def get_list_info(list_element):
     """List要素からラベル、内容、Column数を取得する"""
@@ -102,47 +93,17 @@ def renumber_elements(tree):
         for i, item in enumerate(items):
             item.set('Num', str(i + 1))
 
-def main():
-    """メイン関数"""
-    parser = argparse.ArgumentParser(
-        description='Paragraph特化スクリプト - 処理3 (Paragraph分割)',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog='''
-使用例:
-  python3 convert_paragraph_step3.py input.xml
-  python3 convert_paragraph_step3.py input.xml output.xml
-  python3 convert_paragraph_step3.py input.xml --verification
-'''
-    )
-    parser.add_argument('input_file', help='入力XMLファイル（処理2実行済み）')
-    parser.add_argument('output_file', nargs='?', help='出力XMLファイル（デフォルト: <input>_paragraph_step4.xml）')
-    parser.add_argument('--verification', action='store_true', help='変更箇所にコメントを挿入する検証モードを有効にする')
-    
-    args = parser.parse_args()
-    
-    input_path = Path(args.input_file)
-    if not input_path.exists():
-        print(f"エラー: 入力ファイルが見つかりません: {args.input_file}", file=sys.stderr)
-        return 1
-        
-    output_path = Path(args.output_file) if args.output_file else input_path.parent / f"{input_path.stem}_step3.xml"
-
-    print("=" * 80)
-    print("【Paragraph要素特化型変換 - 処理3: Paragraph分割】")
-    print("=" * 80)
-    print(f"入力ファイル: {input_path}")
-
-    script_name = Path(__file__).name
+def split_paragraphs_in_tree(tree, stats, verification=False, script_name=None):
+    """XMLツリー全体のParagraphを分割し、ParagraphとItemのNumを再採番する
 
-    try:
-        tree = etree.parse(str(input_path))
-    except Exception as e:
-        print(f"エラー: XMLファイルの読み込みに失敗しました: {e}", file=sys.stderr)
-        return 1
-
-    stats = {
-        'split_paragraph': 0,
-    }
+    Args:
+        tree: lxmlのElementTree（その場で更新される）
+        stats: 統計情報を格納する辞書（'split_paragraph'キーを加算）
+        verification: 変更箇所にコメントを挿入するかどうか
+        script_name: 検証コメントに記載するスクリプト名
+    """
+    if script_name is None:
+        script_name = Path(__file__).name
 
     root = tree.getroot()
     parents = {c: p for p in root.iter() for c in p}
@@ -155,7 +116,7 @@ def main():
         split_list_elem = find_split_point(paragraph)
         
         if parent is not None and split_list_elem is not None:
-            if args.verification:
+            if verification:
                 before_str = etree.tostring(paragraph, pretty_print=True, encoding='unicode')
                 comment_text = f"\n*** {script_name}: SPLIT Paragraph ***\n{before_str}\n"
                 comment = etree.Comment(comment_text)
@@ -192,6 +153,50 @@ def main():
     
     renumber_elements(tree)
 
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(
+        description='Paragraph特化スクリプト - 処理3 (Paragraph分割)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+使用例:
+  python3 convert_paragraph_step3.py input.xml
+  python3 convert_paragraph_step3.py input.xml output.xml
+  python3 convert_paragraph_step3.py input.xml --verification
+'''
+    )
+    parser.add_argument('input_file', help='入力XMLファイル（処理2実行済み）')
+    parser.add_argument('output_file', nargs='?', help='出力XMLファイル（デフォルト: <input>_paragraph_step4.xml）')
+    parser.add_argument('--verification', action='store_true', help='変更箇所にコメントを挿入する検証モードを有効にする')
+    
+    args = parser.parse_args()
+    
+    input_path = Path(args.input_file)
+    if not input_path.exists():
+        print(f"エラー: 入力ファイルが見つかりません: {args.input_file}", file=sys.stderr)
+        return 1
+        
+    output_path = Path(args.output_file) if args.output_file else input_path.parent / f"{input_path.stem}_step3.xml"
+
+    print("=" * 80)
+    print("【Paragraph要素特化型変換 - 処理3: Paragraph分割】")
+    print("=" * 80)
+    print(f"入力ファイル: {input_path}")
+
+    script_name = Path(__file__).name
+
+    try:
+        tree = etree.parse(str(input_path))
+    except Exception as e:
+        print(f"エラー: XMLファイルの読み込みに失敗しました: {e}", file=sys.stderr)
+        return 1
+
+    stats = {
+        'split_paragraph': 0,
+    }
+
+    split_paragraphs_in_tree(tree, stats, verification=args.verification, script_name=script_name)
+
     print("\n変換統計:")
     print(f"  - Paragraph分割: {stats['split_paragraph']}回")
 
@@ -29,20 +29,13 @@ script_dir = Path(__file__).resolve().parent
 sys.path.insert(0, str(script_dir))
 
 from utils.label_utils import is_label, is_paragraph_label
+from utils.xml_utils import write_xml
 
-def format_xml_lxml(tree, output_path):
+def format_xml_lxml(tree, output_path, formatted=True):
     """
-    lxmlのElementTreeをインデント整形して保存
+    lxmlのElementTreeをインデント整形して保存（formatted=Falseの場合は整形せずに保存）
     """
-    # etree.indent() を使って確実なインデントを行う
-    etree.indent(tree.getroot(), space="  ", level=0)
-    
-    tree.write(
-        output_path,
-        encoding='utf-8',
-        xml_declaration=True,
-        pretty_print=False # indent() を使う場合、pretty_printはFalseにする
-    )
+    write_xml(tree, output_path, indent_str="  ", formatted=formatted)
 
 from utils.label_utils import is_label, is_paragraph_label
 
@@ -14,6 +14,18 @@ from pathlib import Path
 # 共通モジュールをインポート
 from xml_converter import ConversionConfig, process_xml_file
 
+# Subitem1変換の設定
+CONFIG = ConversionConfig(
+    parent_tag='Item',
+    child_tag='Subitem1',
+    title_tag='Subitem1Title',
+    sentence_tag='Subitem1Sentence',
+    column_condition_min=1,  # Subitem1は col_count >= 1
+    supported_types=['labeled', 'subject_name', 'instruction', 'grade_single', 'grade_double'],
+    script_name='convert_subitem1_step0',
+    skip_empty_parent=False  # Subitem1変換では親要素チェックをスキップ（空ItemでもSubitem1作成）
+)
+
 
 def main():
     """メイン関数"""
@@ -40,19 +52,7 @@ def main():
 
     output_path = Path(args.output_file) if args.output_file else input_path.parent / f"{input_path.stem}_subitem1_step0.xml"
 
-    # Subitem1変換の設定
-    config = ConversionConfig(
-        parent_tag='Item',
-        child_tag='Subitem1',
-        title_tag='Subitem1Title',
-        sentence_tag='Subitem1Sentence',
-        column_condition_min=1,  # Subitem1は col_count >= 1
-        supported_types=['labeled', 'subject_name', 'instruction', 'grade_single', 'grade_double'],
-        script_name='convert_subitem1_step0',
-        skip_empty_parent=False  # Subitem1変換では親要素チェックをスキップ（空ItemでもSubitem1作成）
-    )
-
-    return process_xml_file(input_path, output_path, config)
+    return process_xml_file(input_path, output_path, CONFIG)
 
 
 if __name__ == '__main__':
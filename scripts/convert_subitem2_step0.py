@@ -14,6 +14,18 @@ from pathlib import Path
 # 共通モジュールをインポート
 from xml_converter import ConversionConfig, process_xml_file
 
+# Subitem2変換の設定（学年パターンもサポート）
+CONFIG = ConversionConfig(
+    parent_tag='Subitem1',
+    child_tag='Subitem2',
+    title_tag='Subitem2Title',
+    sentence_tag='Subitem2Sentence',
+    column_condition_min=0,  # Subitem2は col_count >= 0
+    supported_types=['labeled', 'subject_name', 'instruction', 'grade_single', 'grade_double'],
+    script_name='convert_subitem2_step0',
+    skip_empty_parent=False  # Subitem2変換では親要素が空でも変換を実行
+)
+
 
 def main():
     """メイン関数"""
@@ -40,19 +52,7 @@ def main():
 
     output_path = Path(args.output_file) if args.output_file else input_path.parent / f"{input_path.stem}_subitem2_step0.xml"
 
-    # Subitem2変換の設定（学年パターンもサポート）
-    config = ConversionConfig(
-        parent_tag='Subitem1',
-        child_tag='Subitem2',
-        title_tag='Subitem2Title',
-        sentence_tag='Subitem2Sentence',
-        column_condition_min=0,  # Subitem2は col_count >= 0
-        supported_types=['labeled', 'subject_name', 'instruction', 'grade_single', 'grade_double'],
-        script_name='convert_subitem2_step0',
-        skip_empty_parent=False  # Subitem2変換では親要素が空でも変換を実行
-    )
-
-    return process_xml_file(input_path, output_path, config)
+    return process_xml_file(input_path, output_path, CONFIG)
 
 
 if __name__ == '__main__':
@@ -14,6 +14,18 @@ from pathlib import Path
 # 共通モジュールをインポート
 from xml_converter import ConversionConfig, process_xml_file
 
+# Subitem3変換の設定（学年パターンもサポート）
+CONFIG = ConversionConfig(
+    parent_tag='Subitem2',
+    child_tag='Subitem3',
+    title_tag='Subitem3Title',
+    sentence_tag='Subitem3Sentence',
+    column_condition_min=2,  # Subitem3は col_count == 2
+    supported_types=['labeled', 'subject_name', 'instruction', 'grade_single', 'grade_double', 'circled_number'],
+    script_name='convert_subitem3_step0',
+    skip_empty_parent=False  # Subitem3変換では親要素が空でも変換を実行
+)
+
 
 def main():
     """メイン関数"""
@@ -40,19 +52,7 @@ def main():
 
     output_path = Path(args.output_file) if args.output_file else input_path.parent / f"{input_path.stem}_subitem3_step0.xml"
 
-    # Subitem3変換の設定（学年パターンもサポート）
-    config = ConversionConfig(
-        parent_tag='Subitem2',
-        child_tag='Subitem3',
-        title_tag='Subitem3Title',
-        sentence_tag='Subitem3Sentence',
-        column_condition_min=2,  # Subitem3は col_count == 2
-        supported_types=['labeled', 'subject_name', 'instruction', 'grade_single', 'grade_double', 'circled_number'],
-        script_name='convert_subitem3_step0',
-        skip_empty_parent=False  # Subitem3変換では親要素が空でも変換を実行
-    )
-
-    return process_xml_file(input_path, output_path, config)
+    return process_xml_file(input_path, output_path, CONFIG)
 
 
 if __name__ == '__main__':
@@ -14,6 +14,18 @@ from pathlib import Path
 # 共通モジュールをインポート
 from xml_converter import ConversionConfig, process_xml_file
 
+# Subitem6変換の設定（学年パターンもサポート）
+CONFIG = ConversionConfig(
+    parent_tag='Subitem5',
+    child_tag='Subitem6',
+    title_tag='Subitem6Title',
+    sentence_tag='Subitem6Sentence',
+    column_condition_min=2,  # Subitem6は col_count == 2
+    supported_types=['labeled', 'subject_name', 'instruction', 'grade_single', 'grade_double'],
+    script_name='convert_subitem6_step0',
+    skip_empty_parent=False  # Subitem6変換では親要素が空でも変換を実行
+)
+
 
 def main():
     """メイン関数"""
@@ -40,19 +52,7 @@ def main():
 
     output_path = Path(args.output_file) if args.output_file else input_path.parent / f"{input_path.stem}_subitem6_step0.xml"
 
-    # Subitem6変換の設定（学年パターンもサポート）
-    config = ConversionConfig(
-        parent_tag='Subitem5',
-        child_tag='Subitem6',
-        title_tag='Subitem6Title',
-        sentence_tag='Subitem6Sentence',
-        column_condition_min=2,  # Subitem6は col_count == 2
-        supported_types=['labeled', 'subject_name', 'instruction', 'grade_single', 'grade_double'],
-        script_name='convert_subitem6_step0',
-        skip_empty_parent=False  # Subitem6変換では親要素が空でも変換を実行
-    )
-
-    return process_xml_file(input_path, output_path, config)
+    return process_xml_file(input_path, output_path, CONFIG)
 
 
 if __name__ == '__main__':
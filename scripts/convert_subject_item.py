@@ -17,18 +17,15 @@ from pathlib import Path
 from lxml import etree
 from copy import deepcopy
 
+# scripts/をインポートパスに追加
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-def format_xml_lxml(tree, output_path):
-    """lxmlのElementTreeをインデント整形して保存"""
-    clean_root = etree.fromstring(etree.tostring(tree.getroot()))
-    etree.indent(clean_root, space="    ", level=0)
-    new_tree = etree.ElementTree(clean_root)
-    new_tree.write(
-        output_path,
-        encoding='utf-8',
-        xml_declaration=True,
-        pretty_print=False
-    )
+from utils.xml_utils import write_xml
+
+
+def format_xml_lxml(tree, output_path, formatted=True):
+    """lxmlのElementTreeをインデント整形して保存（formatted=Falseの場合は整形せずに保存）"""
+    write_xml(tree, output_path, indent_str="    ", formatted=formatted)
 
 
 def is_subject_name_bracket(text: str) -> bool:
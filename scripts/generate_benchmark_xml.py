@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ベンチマーク用の大きな入力XMLの生成
+
+変換前の告示XML（kokuji スキーマ）と同じ形式で、Article の区切り（「第○」）と、
+ラベル付きのList要素を文書順に並べた文書を生成する。ラベルの種類は階層（Item, Subitem1〜Subitem10）ごとに
+label_config.json のラベルIDで指定し、階層が深くなるごとに別の種類のラベルを使うため、
+変換後は指定した深さまで Item/Subitem 要素が入れ子になる。
+
+文書の大きさは次の値で調整する。
+- Article数（--articles）
+- 1つの親要素あたりのList要素の数（--lists）と、そのうち子の階層を持つ要素の数（--branching）
+- 階層の深さ（--depth、1: Item のみ 〜 11: Subitem10 まで）
+- Columnの構成（ColumnなしのList要素・3カラムのList要素の割合）
+
+使用方法:
+    python3 scripts/generate_benchmark_xml.py output.xml                 # medium のプリセット
+    python3 scripts/generate_benchmark_xml.py output.xml --size large
+    python3 scripts/generate_benchmark_xml.py output.xml --articles 100 --lists 5 --depth 11 --seed 1
+    python3 scripts/generate_benchmark_xml.py --list-labels              # 使用できるラベルIDを表示
+"""
+
+import sys
+import random
+import argparse
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+from lxml import etree
+
+# scripts/をインポートパスに追加
+script_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(script_dir))
+
+from utils.label_utils import detect_label_id, load_label_config
+
+
+# ============================================================================
+# ラベルの生成
+# ============================================================================
+
+_KANJI_DIGITS = '〇一二三四五六七八九'
+_KATAKANA = 'アイウエオカキクケコサシスセソタチツテトナニヌネノハヒフヘホマミムメモヤユヨラリルレロワ'
+_FULLWIDTH_DIGITS = str.maketrans('0123456789', '０１２３４５６７８９')
+
+
+def _kanji_number(n: int) -> str:
+    """漢数字（1〜99）"""
+    tens, ones = divmod(n, 10)
+    if not tens:
+        return _KANJI_DIGITS[ones]
+    return (_KANJI_DIGITS[tens] if tens > 1 else '') + '十' + (_KANJI_DIGITS[ones] if ones else '')
+
+
+def _fullwidth_number(n: int) -> str:
+    return str(n).translate(_FULLWIDTH_DIGITS)
+
+
+class LabelFormat:
+    """ラベルIDごとの連番ラベルの書式"""
+
+    def __init__(self, format_func: Callable[[int], str], max_count: int):
+        self.format_func = format_func  # 番号（1始まり）→ ラベル文字列
+        self.max_count = max_count      # 作成できる連番の上限
+
+    def __call__(self, n: int) -> str:
+        return self.format_func(n)
+
+
+# ラベルID（label_config.json）→ 連番の書式
+LABEL_FORMATS: Dict[str, LabelFormat] = {
+    'kanji_number': LabelFormat(_kanji_number, 99),
+    'paren_kanji_number': LabelFormat(lambda n: f'（{_kanji_number(n)}）', 99),
+    'fullwidth_number': LabelFormat(_fullwidth_number, 999),
+    'paren_fullwidth_number': LabelFormat(lambda n: f'（{_fullwidth_number(n)}）', 999),
+    'halfwidth_number': LabelFormat(str, 999),
+    'paren_halfwidth_number': LabelFormat(lambda n: f'({n})', 999),
+    'katakana': LabelFormat(lambda n: _KATAKANA[n - 1], len(_KATAKANA)),
+    'paren_katakana': LabelFormat(lambda n: f'（{_KATAKANA[n - 1]}）', len(_KATAKANA)),
+    'circled_number': LabelFormat(lambda n: chr(0x2460 + n - 1), 20),
+    'fullwidth_lowercase_alphabet': LabelFormat(lambda n: chr(0xFF41 + n - 1), 26),
+    'fullwidth_uppercase_alphabet': LabelFormat(lambda n: chr(0xFF21 + n - 1), 26),
+    'paren_fullwidth_uppercase_alphabet': LabelFormat(lambda n: f'（{chr(0xFF21 + n - 1)}）', 26),
+    'roman_number_uppercase': LabelFormat(lambda n: chr(0x2160 + n - 1), 12),
+    'roman_number_lowercase': LabelFormat(lambda n: chr(0x2170 + n - 1), 12),
+}
+
+# 階層（Item, Subitem1〜Subitem10）ごとのデフォルトのラベルID
+DEFAULT_LEVEL_LABELS = [
+    'kanji_number',                   # Item: 一
+    'paren_kanji_number',             # Subitem1: （一）
+    'katakana',                       # Subitem2: ア
+    'paren_katakana',                 # Subitem3: （ア）
+    'fullwidth_number',               # Subitem4: １
+    'paren_fullwidth_number',         # Subitem5: （１）
+    'circled_number',                 # Subitem6: ①
+    'fullwidth_lowercase_alphabet',   # Subitem7: ａ
+    'roman_number_uppercase',         # Subitem8: Ⅰ
+    'roman_number_lowercase',         # Subitem9: ⅰ
+    'fullwidth_uppercase_alphabet',   # Subitem10: Ａ
+]
+
+# 階層の最大の深さ（Item + Subitem1〜Subitem10）
+MAX_DEPTH = len(DEFAULT_LEVEL_LABELS)
+
+# 文書の大きさのプリセット
+SIZE_PRESETS = {
+    'small': {'articles': 5, 'lists': 4, 'branching': 1, 'depth': 4},
+    'medium': {'articles': 50, 'lists': 6, 'branching': 1, 'depth': 11},
+    'large': {'articles': 100, 'lists': 8, 'branching': 1, 'depth': 11},
+}
+DEFAULT_SIZE = 'medium'
+
+# 本文の文言（List要素ごとに順番に使う）
+_SENTENCE_PHRASES = [
+    '事業者は、必要な措置を講ずるものとする',
+    '前号の規定にかかわらず、別に定める基準によることができる',
+    '当該施設の管理者は、記録を作成し、これを保存しなければならない',
+    '次に掲げる事項について、適切な教育訓練を行うこと',
+]
+
+
+def check_level_labels(level_labels: Sequence[str], max_count: int) -> None:
+    """
+    階層ごとのラベルIDが使用できることを確認
+
+    label_config.json に定義されたラベルIDで、連番の書式があり、
+    作成したラベルが設定のパターンでそのラベルIDと判定されることを確認する。
+
+    Args:
+        level_labels: 階層ごとのラベルID
+        max_count: 1つの親要素あたりの最大の連番
+
+    Raises:
+        ValueError: 使用できないラベルIDがある場合
+    """
+    definitions = load_label_config().get('label_definitions', {})
+    if len(set(level_labels)) != len(level_labels):
+        raise ValueError("階層ごとのラベルIDは重複しないように指定してください")
+    for label_id in level_labels:
+        if label_id not in definitions:
+            raise ValueError(f"label_config.json に定義されていないラベルIDです: {label_id}")
+        label_format = LABEL_FORMATS.get(label_id)
+        if label_format is None:
+            raise ValueError(f"連番の書式がないラベルIDです: {label_id}"
+                             f"（使用できるラベルID: {', '.join(LABEL_FORMATS)}）")
+        if max_count > label_format.max_count:
+            raise ValueError(f"{label_id} で作成できるラベルは {label_format.max_count} 個までです")
+        for n in range(1, max_count + 1):
+            detected = detect_label_id(label_format(n))
+            if detected != label_id:
+                raise ValueError(f"ラベル '{label_format(n)}' が {label_id} ではなく {detected} と判定されます")
+
+
+# ============================================================================
+# 文書の生成
+# ============================================================================
+
+class BenchmarkDocumentSpec:
+    """生成する文書の設定"""
+
+    def __init__(self,
+                 articles: int = 50,                  # Article数
+                 lists: int = 6,                      # 1つの親要素あたりのList要素の数
+                 branching: int = 1,                  # そのうち子の階層を持つ要素の数
+                 depth: int = MAX_DEPTH,              # 階層の深さ（1: Item のみ 〜 11: Subitem10 まで）
+                 no_column_ratio: float = 0.1,        # ColumnなしのList要素（直前の項目の続きの文）の割合
+                 three_column_ratio: float = 0.1,     # 3カラムのList要素の割合
+                 level_labels: Optional[Sequence[str]] = None,  # 階層ごとのラベルID
+                 seed: int = 0):                      # Columnの構成を決める乱数のシード
+        if articles < 1 or lists < 1 or not 0 <= branching <= lists:
+            raise ValueError("articles・lists は1以上、branching は0以上 lists 以下を指定してください")
+        if not 1 <= depth <= MAX_DEPTH:
+            raise ValueError(f"depth は1〜{MAX_DEPTH}を指定してください")
+        if no_column_ratio < 0 or three_column_ratio < 0 or no_column_ratio + three_column_ratio > 1:
+            raise ValueError("Columnの構成の割合は0以上、合計1以下を指定してください")
+        self.articles = articles
+        self.lists = lists
+        self.branching = branching
+        self.depth = depth
+        self.no_column_ratio = no_column_ratio
+        self.three_column_ratio = three_column_ratio
+        self.level_labels = list(level_labels or DEFAULT_LEVEL_LABELS[:depth])
+        if len(self.level_labels) < depth:
+            raise ValueError(f"階層ごとのラベルIDを {depth} 個指定してください")
+        self.level_labels = self.level_labels[:depth]
+        self.seed = seed
+
+    @classmethod
+    def from_preset(cls, size: str, **overrides) -> 'BenchmarkDocumentSpec':
+        """プリセットの設定（overrides の値で上書き、Noneの値は無視）"""
+        params = dict(SIZE_PRESETS[size])
+        params.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(**params)
+
+    def to_dict(self) -> Dict:
+        """実行結果の記録用の辞書"""
+        return {
+            'articles': self.articles,
+            'lists': self.lists,
+            'branching': self.branching,
+            'depth': self.depth,
+            'no_column_ratio': self.no_column_ratio,
+            'three_column_ratio': self.three_column_ratio,
+            'level_labels': self.level_labels,
+            'seed': self.seed,
+        }
+
+    @property
+    def lists_per_article(self) -> int:
+        """1つのArticleあたりのラベル付きList要素の数（ColumnなしのList要素を除く）"""
+        total, nodes = 0, 1
+        for _ in range(self.depth):
+            total += nodes * self.lists
+            nodes *= self.branching
+        return total
+
+
+def _append_list(paragraph, columns: List[str]) -> None:
+    """List要素を追加（columns が1つの場合はColumnなし）"""
+    list_elem = etree.SubElement(paragraph, 'List')
+    list_sentence = etree.SubElement(list_elem, 'ListSentence')
+    if len(columns) == 1:
+        etree.SubElement(list_sentence, 'Sentence', Num='1').text = columns[0]
+        return
+    for num, text in enumerate(columns, 1):
+        column = etree.SubElement(list_sentence, 'Column', Num=str(num))
+        etree.SubElement(column, 'Sentence', Num='1').text = text
+
+
+def generate_document(spec: BenchmarkDocumentSpec) -> etree._ElementTree:
+    """
+    設定に従って変換前の文書を生成
+
+    1つ目のArticleはArticleTitle「第１」のArticle要素とし、2つ目以降は変換前の文書と同じく
+    Paragraph内の「第○」のList要素として配置する（convert_article_focused.py が分割する）。
+
+    Raises:
+        ValueError: 使用できないラベルIDがある場合
+    """
+    check_level_labels(spec.level_labels, spec.lists)
+    rng = random.Random(spec.seed)
+    formats = [LABEL_FORMATS[label_id] for label_id in spec.level_labels]
+
+    law = etree.Element('Law', nsmap={'xsi': 'http://www.w3.org/2001/XMLSchema-instance'})
+    law.set('{http://www.w3.org/2001/XMLSchema-instance}noNamespaceSchemaLocation',
+            '../schema/kokuji20250320_asukoe.xsd')
+    for name, value in (('Era', 'Reiwa'), ('Lang', 'ja'), ('LawType', 'Misc'), ('Num', '1'), ('Year', '7')):
+        law.set(name, value)
+    etree.SubElement(law, 'LawNum').text = '令和七年ベンチマーク告示第一号'
+    law_body = etree.SubElement(law, 'LawBody')
+    etree.SubElement(law_body, 'LawTitle').text = 'ベンチマーク用の告示'
+    main_provision = etree.SubElement(law_body, 'MainProvision')
+    article = etree.SubElement(main_provision, 'Article', Num='1')
+    etree.SubElement(article, 'ArticleTitle').text = '第１'
+    paragraph = etree.SubElement(article, 'Paragraph', Num='1')
+    etree.SubElement(paragraph, 'ParagraphNum')
+    paragraph_sentence = etree.SubElement(paragraph, 'ParagraphSentence')
+    etree.SubElement(paragraph_sentence, 'Sentence', Num='1').text = '次に掲げる基準を定める。'
+
+    counter = 0
+
+    def sentence_text(level: int, n: int) -> str:
+        nonlocal counter
+        counter += 1
+        return f"{_SENTENCE_PHRASES[counter % len(_SENTENCE_PHRASES)]}（{level + 1}階層目の{n}番目）。"
+
+    def append_level(level: int) -> None:
+        for n in range(1, spec.lists + 1):
+            label = formats[level](n)
+            roll = rng.random()
+            if roll < spec.three_column_ratio:
+                _append_list(paragraph, [label, sentence_text(level, n), sentence_text(level, n)])
+            else:
+                _append_list(paragraph, [label, sentence_text(level, n)])
+            if rng.random() < spec.no_column_ratio:
+                _append_list(paragraph, [sentence_text(level, n)])
+            if n <= spec.branching and level + 1 < spec.depth:
+                append_level(level + 1)
+
+    for article_num in range(1, spec.articles + 1):
+        if article_num > 1:
+            _append_list(paragraph, [f'第{_fullwidth_number(article_num)}', f'第{article_num}の基準'])
+        append_level(0)
+
+    return etree.ElementTree(law)
+
+
+def write_document(spec: BenchmarkDocumentSpec, output_path: Path) -> int:
+    """
+    文書を生成して保存
+
+    Returns:
+        要素数
+    """
+    tree = generate_document(spec)
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tree.write(str(output_path), encoding='UTF-8', xml_declaration=True, pretty_print=True)
+    return sum(1 for _ in tree.getroot().iter('*'))
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    """文書の設定のコマンドライン引数を追加（benchmark_pipeline.py と共通）"""
+    parser.add_argument('--size', choices=list(SIZE_PRESETS), default=None,
+                        help=f'文書の大きさのプリセット（デフォルト: {DEFAULT_SIZE}）')
+    parser.add_argument('--articles', type=int, default=None, help='Article数')
+    parser.add_argument('--lists', type=int, default=None, help='1つの親要素あたりのList要素の数')
+    parser.add_argument('--branching', type=int, default=None,
+                        help='1つの親要素あたりの、子の階層を持つList要素の数')
+    parser.add_argument('--depth', type=int, default=None,
+                        help=f'階層の深さ（1: Item のみ 〜 {MAX_DEPTH}: Subitem10 まで）')
+    parser.add_argument('--no-column-ratio', type=float, default=None,
+                        help='ColumnなしのList要素（直前の項目の続きの文）の割合（デフォルト: 0.1）')
+    parser.add_argument('--three-column-ratio', type=float, default=None,
+                        help='3カラムのList要素の割合（デフォルト: 0.1）')
+    parser.add_argument('--labels', default=None,
+                        help='階層ごとのラベルID（label_config.json、カンマ区切り、Itemから順に）')
+    parser.add_argument('--seed', type=int, default=None, help='乱数のシード（デフォルト: 0）')
+
+
+def spec_from_args(args: argparse.Namespace) -> BenchmarkDocumentSpec:
+    """コマンドライン引数から文書の設定を作成"""
+    return BenchmarkDocumentSpec.from_preset(
+        args.size or DEFAULT_SIZE,
+        articles=args.articles,
+        lists=args.lists,
+        branching=args.branching,
+        depth=args.depth,
+        no_column_ratio=args.no_column_ratio,
+        three_column_ratio=args.three_column_ratio,
+        level_labels=args.labels.split(',') if args.labels else None,
+        seed=args.seed,
+    )
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description='ベンチマーク用の大きな入力XMLを生成します')
+    parser.add_argument('output_file', nargs='?', help='出力XMLファイル')
+    parser.add_argument('--list-labels', action='store_true', help='使用できるラベルIDを表示する')
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    if args.list_labels:
+        for label_id, label_format in LABEL_FORMATS.items():
+            print(f"{label_id}\t{label_format(1)} {label_format(2)} {label_format(3)} …（{label_format.max_count}個まで）")
+        return 0
+    if not args.output_file:
+        parser.error("出力XMLファイルを指定してください")
+
+    try:
+        spec = spec_from_args(args)
+        element_count = write_document(spec, Path(args.output_file))
+    except ValueError as e:
+        print(f"エラー: {e}", file=sys.stderr)
+        return 1
+
+    print(f"出力ファイル: {args.output_file}")
+    print(f"Article数: {spec.articles} / 1Articleあたりのラベル付きList要素: {spec.lists_per_article} / "
+          f"階層: {spec.depth} / 要素数: {element_count}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
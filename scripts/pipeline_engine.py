@@ -0,0 +1,947 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+インプロセス・パイプライン実行エンジン
+
+入力XMLを1回だけパースし、同じlxmlツリーを各変換ステップに順番に受け渡す。
+各ステップは「ツリーを受け取り、変換後のツリーを返す」オブジェクトとして実装し、
+スクリプトごとのインタープリタ起動と、中間ファイルの書き出し・再パースを省略する。
+
+ステップ間では、各スクリプトが出力ファイルに書き出して次のスクリプトが再パースした場合と
+同じ状態になるよう、空白ノードだけをその場で正規化する（出力はバイト単位で同一）。
+中間ファイルは出力先が指定された場合のみ、各スクリプトと同じ書式で書き出す。
+ステップ結果キャッシュ（utils/step_cache.py）を指定した場合は、キャッシュ済みの出力を再利用し、
+最初に無効になったステップから変換を再開する。
+
+ステップの一覧・実行順序・処理対象の要素タグは step_registry.py で宣言する（逆変換のステップも実行可能）。
+処理対象の要素が文書にない（逆変換では親要素の直下にない）ステップは、変換処理を省略する。
+要素の有無は1回の走査で作成する索引（TagIndex）で判定し、索引はツリーを変更したステップの後にのみ作り直す。
+省略したステップが直前のステップと同じ書式で書き出す場合は、整形・再シリアライズも行わず直前の出力を使う。
+--profile（run_steps の profile=True）を指定すると、ステップごとの実時間・CPU時間・処理段階の内訳・
+要素数・メモリ使用量を実行ログに記録する（step_profiler.py。--trace でChromeのトレース形式でも保存）。
+ラベル設定（label_config.json）は実行ごとに LabelSettings として渡し、--set（または環境変数
+XML_FORMATTER_CONFIG_OVERRIDES）で設定ファイルを書き換えずに一部を上書きできる。
+
+使用例:
+  python3 pipeline_engine.py input.xml output.xml
+  python3 pipeline_engine.py input.xml output.xml --intermediate-dir ./intermediate_files/input
+  python3 pipeline_engine.py input.xml output.xml --steps convert_item_step0.py convert_subitem1_step0.py
+  python3 pipeline_engine.py input.xml output.xml --cache-dir ~/.cache/xml-formatter/steps
+  python3 pipeline_engine.py input.xml output.xml --direction reverse
+  python3 pipeline_engine.py input.xml output.xml --set conversion_behaviors.no_column_text_split_mode.enabled=false
+  python3 pipeline_engine.py input.xml output.xml --profile --log-json log.json --trace trace.json
+"""
+
+import sys
+import io
+import json
+import shutil
+import argparse
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext, redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from lxml import etree
+
+# scripts/をインポートパスに追加
+script_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(script_dir))
+
+from utils import indent_xml, normalize_empty_text, save_xml_with_indent, write_xml
+from utils.config_registry import get_active_settings, parse_config_overrides, resolve_settings
+from utils.label_utils import LabelSettings, use_label_settings
+from utils.step_cache import (
+    CACHE_DIR_ENV, DEFAULT_MAX_MB, StepCache, chain_key, file_digest, files_digest
+)
+import xml_converter
+import preprocess_non_first_sentence_to_list
+import convert_article_focused
+import convert_paragraph_step3
+import convert_paragraph_step4
+import compare_xml_text_content
+import step_registry
+from step_profiler import StepProfiler, format_table, write_chrome_trace
+
+
+# 出力書式（各スクリプトがファイルに書き出す際の整形方法）
+FORMAT_INDENT_XML = 'indent_xml'      # utils.save_xml_with_indent（indent_xml + pretty_print）
+FORMAT_LXML_INDENT = 'lxml_indent'    # format_xml_lxml（etree.indent）
+
+# 推奨実行順序（step_registry の依存関係から決まる順序）
+DEFAULT_STEP_ORDER = step_registry.get_step_order(step_registry.DIRECTION_FORWARD)
+
+# 進捗出力の接頭辞（--progress 指定時、呼び出し元がこの行を解釈する）
+PROGRESS_PREFIX = "PROGRESS"
+
+
+# ============================================================================
+# ステップ定義
+# ============================================================================
+
+class TagIndex:
+    """
+    文書のプリスキャン結果（要素タグ → 親要素のタグの集合）
+
+    各ステップの処理対象の要素が文書にあるかどうかを、ステップごとにXPathで
+    文書全体を検索せずに判定するための索引。索引対象のタグを指定した1回の走査で作成する。
+    """
+
+    def __init__(self, root: etree._Element, tags):
+        """
+        TagIndexの初期化
+
+        Args:
+            root: ルート要素
+            tags: 索引を作成する要素タグ
+        """
+        self.parent_tags: Dict[str, set] = {}
+        tags = set(tags)
+        if not tags:
+            return
+        for elem in root.iter(*tags):
+            parent = elem.getparent()
+            self.parent_tags.setdefault(elem.tag, set()).add(parent.tag if parent is not None else None)
+
+    def contains(self, tags, parent_tags=()) -> bool:
+        """
+        指定したタグの要素があるかどうか
+
+        Args:
+            tags: 要素タグ（いずれかがあればTrue）
+            parent_tags: 親要素のタグ（指定した場合、いずれかの直下にある要素のみ対象）
+        """
+        for tag in tags:
+            parents = self.parent_tags.get(tag)
+            if parents and (not parent_tags or not parents.isdisjoint(parent_tags)):
+                return True
+        return False
+
+
+class PipelineStep:
+    """パイプラインの1ステップ（lxmlツリーを受け取り、変換後のツリーを返す）"""
+
+    script_name = ''
+    output_format = FORMAT_LXML_INDENT
+    # 処理対象の要素タグと、その親要素のタグ（step_registry の宣言。
+    # 親要素の直下に処理対象の要素がない場合は変換を省略できる）
+    target_tags: Tuple[str, ...] = ()
+    target_parent_tags: Tuple[str, ...] = ()
+
+    @property
+    def script_names(self) -> List[str]:
+        """このステップが実行するスクリプト名のリスト"""
+        return [self.script_name]
+
+    @property
+    def source_files(self) -> List[Path]:
+        """キャッシュキーに含めるソースファイル（ステップのスクリプト）"""
+        return [script_dir / self.script_name]
+
+    @property
+    def cache_params(self) -> str:
+        """キャッシュキーに含めるステップのパラメータ"""
+        return f"{type(self).__name__}:{self.script_name}:{self.output_format}"
+
+    @property
+    def index_tags(self) -> Tuple[str, ...]:
+        """プリスキャン（TagIndex）で索引を作成する要素タグ"""
+        return self.target_tags + self.target_parent_tags
+
+    @property
+    def serialization(self) -> Tuple:
+        """
+        出力の整形・書き出し方法
+
+        この値が同じステップ間では、同じツリーの出力はバイト単位で同一になる
+        （変更のないステップは、直前の出力をそのまま使える）。
+        """
+        return (self.output_format, type(self).write)
+
+    def find_skipped_scripts(self, tag_index: 'TagIndex') -> List[str]:
+        """
+        処理対象の要素が文書にないため、何も変更しないスクリプト名のリストを取得
+
+        Args:
+            tag_index: ステップ実行前の文書のプリスキャン結果
+        """
+        if self.target_tags and not tag_index.contains(self.target_tags, self.target_parent_tags):
+            return [self.script_name]
+        return []
+
+    def convert(self, tree: etree._ElementTree, stats: Dict) -> etree._ElementTree:
+        """
+        ツリーを変換する
+
+        Args:
+            tree: 変換対象のElementTree
+            stats: 統計情報を格納する辞書
+
+        Returns:
+            変換後のElementTree
+        """
+        raise NotImplementedError
+
+    def finalize(self, tree: etree._ElementTree) -> None:
+        """
+        出力ファイルへの書き出し→再パースと同じ状態になるよう、ツリーをその場で正規化する
+
+        Args:
+            tree: 正規化するElementTree
+        """
+        root = tree.getroot()
+        if self.output_format == FORMAT_INDENT_XML:
+            indent_xml(root)
+        else:
+            etree.indent(root, space="  ", level=0)
+        normalize_empty_text(root)
+        # ルート要素のtailは再パースで失われる（indent_xmlは改行を設定する）
+        root.tail = None
+
+    def write(self, tree: etree._ElementTree, output_path: Path) -> None:
+        """
+        スクリプト単体で実行した場合と同じ書式でツリーを書き出す
+
+        finalize() でインデント済みのため、整形せずにそのまま書き出す。
+
+        Args:
+            tree: 書き出すElementTree
+            output_path: 出力ファイルのパス
+        """
+        write_xml(tree, output_path, formatted=False)
+
+
+class PreprocessStep(PipelineStep):
+    """前処理: 2個目以降のSentence要素をList要素に変換"""
+
+    script_name = "preprocess_non_first_sentence_to_list.py"
+    output_format = FORMAT_INDENT_XML
+
+    def convert(self, tree, stats):
+        stats.setdefault('total_sentences', 0)
+        preprocess_non_first_sentence_to_list.split_sentences_in_tree(tree, stats)
+        return tree
+
+    def write(self, tree, output_path):
+        save_xml_with_indent(tree, output_path)
+
+
+class ArticleFocusedStep(PipelineStep):
+    """Article要素の分割と調整"""
+
+    script_name = "convert_article_focused.py"
+    output_format = FORMAT_INDENT_XML
+
+    def convert(self, tree, stats):
+        converter = convert_article_focused.ArticleFocusedConverter()
+        tree = converter.convert_tree(tree, renumber=True)
+        stats.update(converter.stats)
+        return tree
+
+    def write(self, tree, output_path):
+        save_xml_with_indent(tree, output_path)
+
+
+class ParagraphSplitStep(PipelineStep):
+    """Paragraph処理（step3）: Paragraph分割"""
+
+    script_name = "convert_paragraph_step3.py"
+
+    def convert(self, tree, stats):
+        stats.setdefault('split_paragraph', 0)
+        convert_paragraph_step3.split_paragraphs_in_tree(tree, stats)
+        return tree
+
+
+class ParagraphSentenceStep(PipelineStep):
+    """Paragraph処理（step4）: ParagraphNumの次のList要素の変換"""
+
+    script_name = "convert_paragraph_step4.py"
+
+    def convert(self, tree, stats):
+        stats.update(convert_paragraph_step4.convert_list_after_paragraph_num(tree))
+        return tree
+
+
+class ConverterStep(PipelineStep):
+    """xml_converterによるList→Item/Subitem変換（ConversionConfigごとに1ステップ）"""
+
+    def __init__(self, script_name: str, config: xml_converter.ConversionConfig):
+        self.script_name = script_name
+        self.config = config
+
+    @property
+    def source_files(self):
+        return [script_dir / self.script_name, Path(xml_converter.__file__)]
+
+    def convert(self, tree, stats):
+        stats.update(xml_converter.convert_tree(tree, self.config))
+        return tree
+
+
+class ReverseConverterStep(PipelineStep):
+    """reverse_xml_converterによるItem/Subitem→List逆変換（ReverseConversionConfigごとに1ステップ）"""
+
+    def __init__(self, script_name: str, config, module):
+        self.script_name = script_name
+        self.config = config
+        # 逆変換スクリプトのモジュール（reverse_app/ から読み込む）
+        self.module = module
+
+    @property
+    def source_files(self):
+        return [Path(self.module.__file__), Path(sys.modules['reverse_xml_converter'].__file__)]
+
+    def convert(self, tree, stats):
+        stats.update(sys.modules['reverse_xml_converter'].convert_tree(tree, self.config))
+        return tree
+
+
+class FusedConverterStep(PipelineStep):
+    """
+    連続するxml_converterステップ（Item→Subitem10）を1回のツリー走査でまとめて実行するステップ
+
+    中間ファイルを書き出さない場合に使用する。統計情報はスクリプト名ごとに格納する。
+    """
+
+    def __init__(self, steps: List[ConverterStep]):
+        self.steps = steps
+        self.script_name = steps[0].script_name
+        # 変換を省略するスクリプト名（find_skipped_scripts() の結果を実行前に設定する）
+        self.skipped_scripts: List[str] = []
+
+    @property
+    def script_names(self) -> List[str]:
+        return [step.script_name for step in self.steps]
+
+    @property
+    def index_tags(self):
+        return tuple(tag for step in self.steps for tag in step.index_tags)
+
+    def find_skipped_scripts(self, tag_index):
+        """
+        末尾から連続して何も変更しないステップのスクリプト名を取得
+
+        各階層の親要素は、文書に元からあるか、直前の階層の変換で作成される場合にのみ存在する。
+        途中の階層を除くと階層の連鎖が崩れるため、省略するのは末尾の連続する範囲のみ。
+        """
+        active = []
+        for step in self.steps:
+            previous_active = bool(active) and active[-1]
+            active.append(not step.target_tags or previous_active
+                          or not step.find_skipped_scripts(tag_index))
+        while active and not active[-1]:
+            active.pop()
+        return [step.script_name for step in self.steps[len(active):]]
+
+    def convert(self, tree, stats):
+        steps = [step for step in self.steps if step.script_name not in self.skipped_scripts]
+        stats_list = xml_converter.convert_tree_fused(tree, [step.config for step in steps])
+        for step, step_stats in zip(steps, stats_list):
+            stats[step.script_name] = step_stats
+        return tree
+
+
+def fuse_converter_steps(steps: List[PipelineStep]) -> List[PipelineStep]:
+    """連続する2つ以上のConverterStepをFusedConverterStepにまとめる"""
+    fused = []
+    group = []
+    for step in steps + [None]:
+        if isinstance(step, ConverterStep):
+            group.append(step)
+            continue
+        if len(group) >= 2:
+            fused.append(FusedConverterStep(group))
+        else:
+            fused.extend(group)
+        group = []
+        if step is not None:
+            fused.append(step)
+    return fused
+
+
+# CONFIGを使わないステップ（step_registry の engine_step で指定するクラス）
+ENGINE_STEP_CLASSES = {
+    cls.__name__: cls
+    for cls in (PreprocessStep, ArticleFocusedStep, ParagraphSplitStep, ParagraphSentenceStep)
+}
+
+
+def _registered_step_factory(spec: step_registry.StepSpec) -> Callable[..., PipelineStep]:
+    """step_registry の宣言からステップのファクトリを作成"""
+    def factory(settings: Optional[LabelSettings] = None):
+        if spec.engine_step is not None:
+            step = ENGINE_STEP_CLASSES[spec.engine_step]()
+        elif spec.direction == step_registry.DIRECTION_REVERSE:
+            step = ReverseConverterStep(spec.script_name, spec.load_config(), spec.load_module())
+        else:
+            step = ConverterStep(spec.script_name, spec.load_config().with_settings(settings))
+        step.target_tags = spec.target_tags
+        step.target_parent_tags = spec.target_parent_tags
+        return step
+    return factory
+
+
+# スクリプト名 → ステップのファクトリ
+STEP_FACTORIES: Dict[str, Callable[..., PipelineStep]] = {
+    spec.script_name: _registered_step_factory(spec)
+    for direction in (step_registry.DIRECTION_FORWARD, step_registry.DIRECTION_REVERSE)
+    for spec in step_registry.get_step_specs(direction)
+}
+
+
+def is_supported_step(script_name: str) -> bool:
+    """エンジンで実行可能なスクリプトかどうかを判定"""
+    return script_name in STEP_FACTORIES
+
+
+def create_step(script_name: str, settings: Optional[LabelSettings] = None) -> PipelineStep:
+    """
+    スクリプト名からステップを作成
+
+    Args:
+        script_name: スクリプト名
+        settings: xml_converter のステップの ConversionConfig に渡すラベル設定
+                  （Noneの場合は変換時に有効な設定）
+
+    Raises:
+        KeyError: エンジンで実行できないスクリプトの場合
+    """
+    if script_name not in STEP_FACTORIES:
+        raise KeyError(f"エンジンで実行できないスクリプトです: {script_name}")
+    return STEP_FACTORIES[script_name](settings)
+
+
+# ============================================================================
+# 実行
+# ============================================================================
+
+def compute_cache_keys(input_path: Path, steps: List[PipelineStep], settings: LabelSettings) -> List[str]:
+    """
+    各ステップの出力のキャッシュキーを計算（融合前のステップ単位）
+
+    キーは「直前のキー（先頭は入力XMLのハッシュ）・ステップのソース・ラベル設定（上書き適用後）・
+    共通モジュール（utils/ とこのエンジン）・ステップのパラメータ」の連鎖で、
+    あるステップのキーが一致すればそこまでの出力はすべて同一になる。
+
+    Args:
+        input_path: 入力XMLファイルのパス
+        steps: ステップのリスト（実行順）
+        settings: 変換に使うラベル設定
+
+    Returns:
+        ステップごとのキーのリスト
+    """
+    config_digest = settings.digest
+    library_digest = files_digest(list((script_dir / "utils").glob("*.py")) + [Path(__file__)])
+    keys = []
+    key = file_digest(input_path)
+    for step in steps:
+        key = chain_key(key, files_digest(step.source_files), config_digest, library_digest,
+                        step.cache_params)
+        keys.append(key)
+    return keys
+
+
+def _find_restart_index(step_cache: StepCache, cache_keys: List[str], require_prefix: bool) -> int:
+    """
+    キャッシュから再利用できるステップ数（＝最初に実行するステップのインデックス）を取得
+
+    Args:
+        step_cache: ステップ結果キャッシュ
+        cache_keys: 各ステップのキャッシュキー
+        require_prefix: 先頭から連続してキャッシュされている範囲のみ再利用するか
+                        （中間ファイルを書き出す場合、再利用する全ステップの出力が必要）
+    """
+    if require_prefix:
+        restart = 0
+        while restart < len(cache_keys) and step_cache.contains(cache_keys[restart]):
+            restart += 1
+        return restart
+    for idx in range(len(cache_keys), 0, -1):
+        if step_cache.contains(cache_keys[idx - 1]):
+            return idx
+    return 0
+
+
+def run_steps(input_path: Path,
+              output_path: Path,
+              script_names: List[str],
+              intermediate_paths: Optional[List[Path]] = None,
+              progress_callback: Optional[Callable[[int, int, str], None]] = None,
+              capture_output: bool = False,
+              validation_report: Optional[Path] = None,
+              step_cache: Optional[StepCache] = None,
+              skip_absent_tags: bool = True,
+              settings: Optional[LabelSettings] = None,
+              profile: bool = False) -> Tuple[bool, Optional[str], Dict]:
+    """
+    入力XMLを1回だけパースし、各ステップにツリーを受け渡して変換する
+
+    Args:
+        input_path: 入力XMLファイルのパス
+        output_path: 最終出力XMLファイルのパス
+        script_names: 実行するスクリプト名のリスト（実行順）
+        intermediate_paths: 各ステップの中間ファイルのパス（Noneの場合は書き出さない）
+        progress_callback: 進捗コールバック関数（current_step, total_steps, script_name）
+        capture_output: 各ステップの標準出力を取り込んで実行ログに記録するかどうか
+        validation_report: 指定した場合、入力XMLとのテキスト内容検証を行い、レポートを保存する
+                           （最終ツリーは再パースせずメモリ上のものを使用し、最終出力の書き出しと並行して実行。
+                           結果は execution_log["validation"] に記録）
+        step_cache: ステップ結果キャッシュ（指定した場合、キャッシュ済みの出力を再利用し、
+                    最初に無効になったステップから変換を再開する。結果は execution_log["cache"] に記録）
+        skip_absent_tags: 処理対象の要素（step_registry の宣言）が文書にないステップの変換を省略するか
+                          （省略したステップは実行ログで "skipped": True。出力は変換した場合と同一。
+                          直前のステップと同じ書式のステップは整形・書き出しも省略し、"pass_through": True）
+        settings: ラベル設定（Noneの場合は設定ファイルに環境変数 XML_FORMATTER_CONFIG_OVERRIDES の上書きを
+                  適用した設定。実行中の全ステップのラベル判定に使い、設定ファイルは変更しない。
+                  ダイジェストは execution_log["config_digest"] に記録）
+        profile: ステップごとの実時間・CPU時間・処理段階の内訳・要素数・メモリ使用量を計測するか
+                 （各ステップの "profile" と execution_log["profile"] に記録。形式は step_profiler.py を参照）
+
+    Returns:
+        (success: bool, error_message: Optional[str], execution_log: Dict)
+    """
+    total_steps = len(script_names)
+    execution_log = {
+        "total_steps": total_steps,
+        "completed_steps": 0,
+        "failed_step": None,
+        "steps": []
+    }
+
+    if intermediate_paths is not None and len(intermediate_paths) != total_steps:
+        return False, "中間ファイルのパス数がステップ数と一致しません", execution_log
+
+    if settings is None:
+        try:
+            settings = get_active_settings()
+        except (OSError, ValueError) as e:
+            return False, f"ラベル設定の読み込みに失敗しました: {e}", execution_log
+    execution_log["config_digest"] = settings.digest
+
+    try:
+        steps = [create_step(name, settings) for name in script_names]
+    except KeyError as e:
+        return False, str(e.args[0]), execution_log
+
+    profiler = StepProfiler() if profile else None
+    with use_label_settings(settings):
+        result = _run_created_steps(input_path, output_path, steps, intermediate_paths, progress_callback,
+                                    capture_output, validation_report, step_cache, skip_absent_tags,
+                                    settings, execution_log, profiler)
+    if profiler is not None:
+        execution_log["profile"] = profiler.summary()
+    return result
+
+
+def _phase(target, name: str):
+    """計測している場合（target: StepProfiler / StepMeasurement）は処理段階の時間を計測する"""
+    return target.phase(name) if target is not None else nullcontext()
+
+
+def _run_created_steps(input_path: Path, output_path: Path, steps: List[PipelineStep],
+                       intermediate_paths: Optional[List[Path]],
+                       progress_callback: Optional[Callable[[int, int, str], None]],
+                       capture_output: bool, validation_report: Optional[Path],
+                       step_cache: Optional[StepCache], skip_absent_tags: bool,
+                       settings: LabelSettings, execution_log: Dict,
+                       profiler: Optional[StepProfiler] = None) -> Tuple[bool, Optional[str], Dict]:
+    """run_steps の本体（ラベル設定を有効にした範囲内で実行する）"""
+    total_steps = execution_log["total_steps"]
+
+    # キャッシュ済みのステップを特定し、その出力から再開する
+    cache_keys = None
+    restart_idx = 0
+    tree = None
+    # 現在のツリーを直前のステップの書式で書き出したファイル（中間ファイル・キャッシュファイル）
+    current_file = None
+    if step_cache is not None:
+        try:
+            cache_keys = compute_cache_keys(input_path, steps, settings)
+        except OSError as e:
+            return False, f"XMLファイルの読み込みに失敗しました: {e}", execution_log
+        restart_idx = _find_restart_index(step_cache, cache_keys, intermediate_paths is not None)
+        if restart_idx:
+            try:
+                with _phase(profiler, "cache_restore"):
+                    tree, current_file = _restore_cached_steps(
+                        step_cache, cache_keys[:restart_idx], steps[:restart_idx],
+                        intermediate_paths, progress_callback, total_steps, execution_log)
+            except (OSError, etree.XMLSyntaxError):
+                # 他のプロセスによる削除等で読み込めない場合は最初から実行する
+                restart_idx = 0
+                tree = None
+                current_file = None
+                execution_log["steps"] = []
+        execution_log["cache"] = {
+            "reused_steps": restart_idx,
+            "stored_steps": 0,
+            "cache_dir": str(step_cache.cache_dir)
+        }
+    execution_log["completed_steps"] = restart_idx
+    last_step = steps[-1] if steps else None
+    # 現在のツリーの書式（入力XMLは未整形）
+    current_serialization = steps[restart_idx - 1].serialization if restart_idx else None
+    steps = steps[restart_idx:]
+
+    # 中間ファイルを書き出さない場合は、Item→Subitem10の変換を1回の走査でまとめて行う
+    if intermediate_paths is None:
+        steps = fuse_converter_steps(steps)
+
+    if tree is None:
+        try:
+            with _phase(profiler, "parse"):
+                tree = etree.parse(str(input_path))
+        except Exception as e:
+            return False, f"XMLファイルの読み込みに失敗しました: {e}", execution_log
+
+    # 処理対象の要素のプリスキャン（ツリーを変更したステップの後にのみ作り直す）
+    index_tags = {tag for step in steps for tag in step.index_tags} if skip_absent_tags else set()
+    tag_index = None
+
+    step_idx = restart_idx
+    for step in steps:
+        first_idx = step_idx + 1
+        step_idx += len(step.script_names)
+        if progress_callback:
+            progress_callback(first_idx, total_steps, step.script_name)
+
+        step_output = intermediate_paths[step_idx - 1] if intermediate_paths is not None else None
+        step_infos = [{
+            "step": idx,
+            "script": name,
+            "output": None,
+            "success": False,
+            "error": None,
+            "stats": {}
+        } for idx, name in enumerate(step.script_names, first_idx)]
+        step_infos[-1]["output"] = str(step_output) if step_output is not None else None
+        step_stats = step_infos[0]["stats"] if len(step_infos) == 1 else {}
+
+        measurement = profiler.begin_step(tree.getroot()) if profiler is not None else None
+        buffer = io.StringIO()
+        changed = False
+        try:
+            skipped_scripts = []
+            if skip_absent_tags and step.index_tags:
+                if tag_index is None:
+                    with _phase(measurement, "prescan"):
+                        tag_index = TagIndex(tree.getroot(), index_tags)
+                skipped_scripts = step.find_skipped_scripts(tag_index)
+            if isinstance(step, FusedConverterStep):
+                step.skipped_scripts = skipped_scripts
+            # 何も変更せず、直前のステップと同じ書式で書き出すステップは、
+            # 整形・書き出しを省略して直前の出力をそのまま使う
+            pass_through = (len(skipped_scripts) == len(step.script_names)
+                            and step.serialization == current_serialization)
+            if not pass_through:
+                if len(skipped_scripts) < len(step.script_names):
+                    tag_index = None
+                    changed = True
+                    with _phase(measurement, "convert"):
+                        if capture_output:
+                            with redirect_stdout(buffer):
+                                tree = step.convert(tree, step_stats)
+                        else:
+                            tree = step.convert(tree, step_stats)
+                with _phase(measurement, "finalize"):
+                    step.finalize(tree)
+                current_file = None
+            current_serialization = step.serialization
+            if step_output is not None:
+                Path(step_output).parent.mkdir(parents=True, exist_ok=True)
+                with _phase(measurement, "serialize"):
+                    if current_file is not None:
+                        shutil.copyfile(current_file, step_output)
+                    else:
+                        step.write(tree, step_output)
+                current_file = step_output
+        except Exception as e:
+            error_msg = f"実行エラー: {step.script_name} - {e}"
+            step_infos[0]["error"] = error_msg + "\n" + traceback.format_exc()
+            if capture_output:
+                step_infos[0]["stdout"] = buffer.getvalue()
+            if measurement is not None:
+                step_infos[0]["profile"] = measurement.finish(None)
+            execution_log["steps"].append(step_infos[0])
+            execution_log["failed_step"] = step.script_name
+            return False, error_msg, execution_log
+
+        for step_info in step_infos:
+            if len(step_infos) > 1:
+                step_info["stats"] = step_stats.get(step_info["script"], {})
+                if step_info is not step_infos[0]:
+                    step_info["fused_with"] = step_infos[0]["script"]
+            if step_info["script"] in skipped_scripts:
+                step_info["skipped"] = True
+            if pass_through:
+                step_info["pass_through"] = True
+            step_info["success"] = True
+            execution_log["steps"].append(step_info)
+        if capture_output:
+            step_infos[0]["stdout"] = buffer.getvalue()
+        execution_log["completed_steps"] = step_idx
+
+        if step_cache is not None:
+            with _phase(measurement, "cache"):
+                cached_path = _store_step_output(step_cache, cache_keys[step_idx - 1], step, tree,
+                                                 current_file, execution_log["cache"])
+            if current_file is None:
+                current_file = cached_path
+
+        if measurement is not None:
+            # 一括変換したステップは、まとめた計測結果を先頭のスクリプトに記録する
+            step_infos[0]["profile"] = profiler.end_step(measurement, tree.getroot(), changed)
+            if len(step_infos) > 1:
+                step_infos[0]["profile"]["scripts"] = step.script_names
+
+    # 最終結果を出力
+    try:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        last_intermediate = Path(intermediate_paths[-1]) if intermediate_paths else None
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            validation_future = None
+            if validation_report is not None:
+                with _phase(profiler, "summarize"):
+                    final_summary = compare_xml_text_content.summarize_xml_tree(tree)
+                validation_future = executor.submit(
+                    _validate_final_tree, input_path, final_summary, Path(validation_report))
+
+            with _phase(profiler, "output"):
+                if last_intermediate is not None:
+                    if last_intermediate.resolve() != output_path.resolve():
+                        shutil.copy(last_intermediate, output_path)
+                elif current_file is not None:
+                    # 最後のステップの出力がキャッシュファイル等にある場合はそのまま使う
+                    shutil.copy(current_file, output_path)
+                elif last_step is not None:
+                    last_step.write(tree, output_path)
+                else:
+                    shutil.copy(input_path, output_path)
+            execution_log["final_output"] = str(output_path)
+
+            if validation_future is not None:
+                try:
+                    with _phase(profiler, "validation"):
+                        validation = validation_future.result()
+                except Exception as e:
+                    return False, f"テキスト内容検証に失敗しました: {e}", execution_log
+                execution_log["validation"] = validation.to_dict()
+                execution_log["validation"]["report_file"] = str(validation_report)
+    except Exception as e:
+        return False, f"最終出力ファイルの書き出しに失敗しました: {e}", execution_log
+
+    if step_cache is not None:
+        try:
+            execution_log["cache"]["evicted"] = step_cache.evict()
+        except OSError:
+            pass
+    return True, None, execution_log
+
+
+def _restore_cached_steps(step_cache: StepCache, cache_keys: List[str], steps: List[PipelineStep],
+                          intermediate_paths: Optional[List[Path]],
+                          progress_callback: Optional[Callable[[int, int, str], None]],
+                          total_steps: int, execution_log: Dict) -> Tuple[etree._ElementTree, Path]:
+    """
+    キャッシュ済みのステップの出力を復元し、最後の出力をパースしたツリーとそのファイルを返す
+
+    中間ファイルを書き出す場合は、キャッシュファイルを各中間ファイルにコピーする。
+    各ステップの出力はファイルへの書き出し→再パースと同じ状態のため、
+    パースしたツリーはそのまま次のステップに渡せる。
+    """
+    for idx, (key, step) in enumerate(zip(cache_keys, steps), 1):
+        if progress_callback:
+            progress_callback(idx, total_steps, step.script_name)
+        step_output = intermediate_paths[idx - 1] if intermediate_paths is not None else None
+        if step_output is not None:
+            Path(step_output).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy(step_cache.path_for(key), step_output)
+        execution_log["steps"].append({
+            "step": idx,
+            "script": step.script_name,
+            "output": str(step_output) if step_output is not None else None,
+            "success": True,
+            "error": None,
+            "stats": {},
+            "cached": True
+        })
+
+    cached_path = step_cache.get(cache_keys[-1])
+    if cached_path is None:
+        raise FileNotFoundError(step_cache.path_for(cache_keys[-1]))
+    return etree.parse(str(cached_path)), cached_path
+
+
+def _store_step_output(step_cache: StepCache, key: str, step: PipelineStep,
+                       tree: etree._ElementTree, source_file: Optional[Path],
+                       cache_log: Dict) -> Optional[Path]:
+    """
+    ステップの出力をキャッシュに保存する（失敗しても変換は続行する）
+
+    Args:
+        source_file: ステップの出力を書き出し済みのファイル（Noneの場合はツリーを書き出す）
+
+    Returns:
+        キャッシュファイルのパス（保存に失敗した場合はNone）
+    """
+    try:
+        if source_file is not None:
+            cached_path = step_cache.put_file(key, source_file)
+        else:
+            cached_path = step_cache.put(key, lambda path: step.write(tree, path))
+        cache_log["stored_steps"] += 1
+        return cached_path
+    except OSError:
+        return None
+
+
+def _validate_final_tree(input_path: Path, final_summary, report_path: Path):
+    """入力XML（ストリーミングで走査）と最終ツリーの要約を比較し、レポートを保存する"""
+    result = compare_xml_text_content.compare_text_content(input_path, final_summary)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(result.format_report(), encoding='utf-8')
+    return result
+
+
+def build_intermediate_paths(input_path: Path, intermediate_dir: Path, script_names: List[str],
+                             name_format: str = "{stem}-{step}.xml", start_index: int = 1) -> List[Path]:
+    """
+    中間ファイルのパスを作成
+
+    Args:
+        input_path: 入力XMLファイルのパス（{stem}に使用）
+        intermediate_dir: 中間ファイル保存ディレクトリ
+        script_names: スクリプト名のリスト
+        name_format: ファイル名の書式（{stem}, {step}, {index} を使用可能）
+        start_index: {index} の開始番号
+
+    Returns:
+        中間ファイルのパスのリスト
+    """
+    stem = Path(input_path).stem
+    return [
+        Path(intermediate_dir) / name_format.format(stem=stem, step=Path(name).stem, index=index)
+        for index, name in enumerate(script_names, start_index)
+    ]
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(
+        description='インプロセス・パイプライン実行エンジン（1回のパースで全ステップを実行）',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+使用例:
+  python3 pipeline_engine.py input.xml output.xml
+  python3 pipeline_engine.py input.xml output.xml --intermediate-dir ./intermediate_files/input
+  python3 pipeline_engine.py input.xml output.xml --steps convert_item_step0.py convert_subitem1_step0.py
+  python3 pipeline_engine.py input.xml output.xml --cache-dir ~/.cache/xml-formatter/steps
+  python3 pipeline_engine.py input.xml output.xml --direction reverse
+        '''
+    )
+    parser.add_argument('input_file', help='入力XMLファイル')
+    parser.add_argument('output_file', help='出力XMLファイル')
+    parser.add_argument('--steps', nargs='+', default=None,
+                        help='実行するスクリプト名（デフォルト: 推奨順序の全ステップ）')
+    parser.add_argument('--intermediate-dir', default=None, help='中間ファイル保存ディレクトリ（省略時は書き出さない）')
+    parser.add_argument('--intermediate-format', default="{stem}-{step}.xml",
+                        help='中間ファイル名の書式（{stem}, {step}, {index} を使用可能）')
+    parser.add_argument('--start-index', type=int, default=1, help='{index} の開始番号')
+    parser.add_argument('--progress', action='store_true',
+                        help=f'進捗を「{PROGRESS_PREFIX}<TAB>現在<TAB>合計<TAB>スクリプト名」形式で出力し、各ステップの出力は取り込む')
+    parser.add_argument('--log-json', default=None, help='実行ログ（JSON）の出力先')
+    parser.add_argument('--validation-report', default=None,
+                        help='入力XMLとのテキスト内容検証を行い、レポートを保存する（compare_xml_text_content.py と同じ形式）')
+    parser.add_argument('--cache-dir', default=None,
+                        help=f'ステップ結果キャッシュのディレクトリ（省略時は環境変数 {CACHE_DIR_ENV}、未設定ならキャッシュしない）')
+    parser.add_argument('--cache-max-mb', type=float, default=None,
+                        help=f'キャッシュの合計サイズの上限（MB、デフォルト: {DEFAULT_MAX_MB}）')
+    parser.add_argument('--no-cache', action='store_true', help='ステップ結果キャッシュを使用しない')
+    parser.add_argument('--direction', choices=[step_registry.DIRECTION_FORWARD, step_registry.DIRECTION_REVERSE],
+                        default=step_registry.DIRECTION_FORWARD,
+                        help='--steps 省略時に実行する変換の方向（デフォルト: forward）')
+    parser.add_argument('--no-skip', action='store_true',
+                        help='処理対象の要素タグが文書にないステップも変換処理を実行する')
+    parser.add_argument('--set', dest='overrides', action='append', default=[], metavar='KEY=VALUE',
+                        help='label_config.json の値をこの実行だけ上書きする（ドット区切りのキー、値はJSON。複数指定可）')
+    parser.add_argument('--profile', action='store_true',
+                        help='ステップごとの処理時間・メモリ使用量・要素数を計測し、実行ログに記録して表を表示する')
+    parser.add_argument('--trace', default=None,
+                        help='計測結果をChromeのトレース形式（chrome://tracing・Perfetto）で保存する先（--profile を含む）')
+
+    args = parser.parse_args()
+
+    try:
+        settings = resolve_settings(parse_config_overrides(args.overrides))
+    except (OSError, ValueError) as e:
+        print(f"エラー: ラベル設定の読み込みに失敗しました: {e}", file=sys.stderr)
+        return 1
+
+    input_path = Path(args.input_file)
+    if not input_path.exists():
+        print(f"エラー: 入力ファイルが見つかりません: {args.input_file}", file=sys.stderr)
+        return 1
+
+    script_names = args.steps if args.steps else step_registry.get_step_order(args.direction)
+    intermediate_paths = None
+    if args.intermediate_dir:
+        intermediate_paths = build_intermediate_paths(
+            input_path, Path(args.intermediate_dir), script_names,
+            args.intermediate_format, args.start_index
+        )
+
+    step_cache = None
+    if not args.no_cache:
+        step_cache = StepCache(Path(args.cache_dir)) if args.cache_dir else StepCache.from_env()
+        if step_cache is not None and args.cache_max_mb is not None:
+            step_cache.max_bytes = int(args.cache_max_mb * 1024 * 1024)
+
+    def print_progress(current_step, total_steps, script_name):
+        if args.progress:
+            print(f"{PROGRESS_PREFIX}\t{current_step}\t{total_steps}\t{script_name}", flush=True)
+        else:
+            print(f"[{current_step}/{total_steps}] {script_name} を実行中...", flush=True)
+
+    success, error_msg, execution_log = run_steps(
+        input_path, Path(args.output_file), script_names,
+        intermediate_paths=intermediate_paths,
+        progress_callback=print_progress,
+        capture_output=args.progress,
+        validation_report=Path(args.validation_report) if args.validation_report else None,
+        step_cache=step_cache,
+        skip_absent_tags=not args.no_skip,
+        settings=settings,
+        profile=args.profile or bool(args.trace)
+    )
+
+    if args.log_json:
+        with open(args.log_json, 'w', encoding='utf-8') as f:
+            json.dump(execution_log, f, ensure_ascii=False, indent=2)
+    if args.trace:
+        write_chrome_trace(execution_log, args.trace)
+
+    if not success:
+        print(f"エラー: {error_msg}", file=sys.stderr)
+        return 1
+
+    if not args.progress:
+        print(f"\n出力ファイル: {args.output_file}")
+        cache_log = execution_log.get("cache")
+        if cache_log is not None and cache_log["reused_steps"]:
+            print(f"キャッシュ: {cache_log['reused_steps']}/{execution_log['total_steps']} ステップを再利用しました")
+        validation = execution_log.get("validation")
+        if validation is not None:
+            status = "OK" if validation["is_valid"] else "要確認"
+            print(f"テキスト内容検証: {status}（レポート: {args.validation_report}）")
+        if "profile" in execution_log:
+            print(f"\n{format_table(execution_log)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -20,6 +20,7 @@ from copy import deepcopy
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from utils.label_utils import is_label
+from utils.xml_utils import write_xml
 
 
 class ReverseConversionConfig:
@@ -37,17 +38,9 @@ class ReverseConversionConfig:
         self.script_name = script_name
 
 
-def format_xml_lxml(tree, output_path):
-    """lxmlのElementTreeをインデント整形して保存"""
-    clean_root = etree.fromstring(etree.tostring(tree.getroot()))
-    etree.indent(clean_root, space="  ", level=0)
-    new_tree = etree.ElementTree(clean_root)
-    new_tree.write(
-        output_path,
-        encoding='utf-8',
-        xml_declaration=True,
-        pretty_print=False
-    )
+def format_xml_lxml(tree, output_path, formatted=True):
+    """lxmlのElementTreeをインデント整形して保存（formatted=Falseの場合は整形せずに保存）"""
+    write_xml(tree, output_path, indent_str="  ", formatted=formatted)
 
 
 def get_element_title_text(element, config: ReverseConversionConfig) -> str:
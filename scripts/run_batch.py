@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+XML一括変換スクリプト（並列実行）
+
+入力フォルダ内の全XMLファイルを、プロセスプールで並列にパイプライン変換する。
+1ファイルを1タスクとして各ワーカープロセスで独立に処理し、あるファイルの失敗が
+他のファイルの処理に影響しないようにする。ワーカープロセス自体が異常終了した場合
+（lxmlのクラッシュ、メモリ不足による強制終了など）は、その時点で変換中だったファイルを
+1つずつ単独のプロセスで再実行して原因のファイルだけを失敗とし、未着手のファイルは
+新しいプロセスプールで変換を続ける。
+
+出力フォルダの構成は run_pipeline.sh（all モード）と同じ:
+
+    output/
+    ├── <入力名>-final.xml
+    └── intermediate_files/
+        └── <入力名>/
+            ├── <入力名>-<各ステップ>.xml
+            ├── <入力名>-parse_validation.txt
+            └── <入力名>-validation_report.txt
+
+使用例:
+  python3 run_batch.py ./input ./output
+  python3 run_batch.py ./input ./output --workers 32
+  python3 run_batch.py ./input ./output --no-intermediate
+  python3 run_batch.py ./input ./output --cache-dir ~/.cache/xml-formatter/steps
+  python3 run_batch.py ./input ./output --set conversion_behaviors.no_column_text_split_mode.enabled=false
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# scripts/をインポートパスに追加
+script_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(script_dir))
+
+from pipeline_engine import DEFAULT_STEP_ORDER, build_intermediate_paths, run_steps
+from validate_xml import validate_xml
+from utils.step_cache import StepCache
+from utils.config_registry import parse_config_overrides, resolve_settings
+from utils.label_utils import LabelSettings
+
+
+def convert_file(xml_file: str, output_folder: str, steps: Optional[List[str]] = None,
+                 write_intermediate: bool = True, cache_dir: Optional[str] = None,
+                 settings: Optional[LabelSettings] = None) -> Dict:
+    """
+    1つのXMLファイルをパース検証・変換・テキスト内容検証する（ワーカープロセスで実行）
+
+    Args:
+        xml_file: 入力XMLファイルのパス
+        output_folder: 出力フォルダのパス
+        steps: 実行するスクリプト名のリスト（Noneの場合は推奨順序の全ステップ）
+        write_intermediate: 各ステップの中間ファイルを書き出すかどうか
+        cache_dir: ステップ結果キャッシュのディレクトリ（Noneの場合は環境変数 XML_FORMATTER_STEP_CACHE）
+        settings: ラベル設定（Noneの場合は設定ファイル＋環境変数 XML_FORMATTER_CONFIG_OVERRIDES）
+
+    Returns:
+        処理結果の辞書（file, status, message, final_output, validation_ok, elapsed）
+    """
+    start_time = time.perf_counter()
+    xml_path = Path(xml_file)
+    stem = xml_path.stem
+    steps = list(steps) if steps else list(DEFAULT_STEP_ORDER)
+    intermediate_dir = Path(output_folder) / "intermediate_files" / stem
+    intermediate_dir.mkdir(parents=True, exist_ok=True)
+
+    result = {
+        "file": xml_path.name,
+        "status": "failed",
+        "message": None,
+        "final_output": None,
+        "validation_ok": None,
+        "elapsed": 0.0
+    }
+
+    try:
+        # パース検証（validate_xml.py と同じ内容のレポートを保存）
+        parse_report = intermediate_dir / f"{stem}-parse_validation.txt"
+        parse_validation = validate_xml(str(xml_path))
+        parse_report.write_text(parse_validation.format_report() + "\n", encoding='utf-8')
+        if not parse_validation.is_valid:
+            result["status"] = "skipped"
+            result["message"] = f"パース検証で問題が検出されました: {parse_report}"
+            return result
+
+        # 変換（1回のパースで全ステップを実行）とテキスト内容検証（変換後のツリーをそのまま使用）
+        last_output = intermediate_dir / f"{stem}-{Path(steps[-1]).stem}.xml"
+        intermediate_paths = build_intermediate_paths(xml_path, intermediate_dir, steps) if write_intermediate else None
+        validation_report = intermediate_dir / f"{stem}-validation_report.txt"
+        success, error_msg, execution_log = run_steps(
+            xml_path, last_output, steps,
+            intermediate_paths=intermediate_paths,
+            capture_output=True,
+            validation_report=validation_report,
+            step_cache=StepCache(Path(cache_dir)) if cache_dir else StepCache.from_env(),
+            settings=settings
+        )
+        if not success:
+            result["message"] = error_msg
+            return result
+
+        final_destination = Path(output_folder) / f"{stem}-final.xml"
+        shutil.copy(last_output, final_destination)
+        result["final_output"] = str(final_destination)
+        result["validation_ok"] = execution_log["validation"]["is_valid"]
+        result["status"] = "success"
+    except Exception as e:
+        result["message"] = f"実行エラー: {e}"
+    finally:
+        result["elapsed"] = time.perf_counter() - start_time
+
+    return result
+
+
+def _convert_file_in_worker(started_dir: Optional[str], index: int, xml_file: str, *args) -> Dict:
+    """
+    変換の開始を記録してから convert_file を実行（ワーカープロセスで実行）
+
+    開始の記録は started_dir に index の名前の空ファイルを作成して行う（プロセス間のロックを使わないため、
+    ワーカープロセスがいつ強制終了されても親プロセスの集計が止まらない）。
+    """
+    if started_dir is not None:
+        (Path(started_dir) / str(index)).touch()
+    return convert_file(xml_file, *args)
+
+
+def _crashed_result(xml_file: Path, error: Exception) -> Dict:
+    """ワーカープロセス自体が異常終了した場合の処理結果"""
+    return {
+        "file": xml_file.name,
+        "status": "failed",
+        "message": f"ワーカープロセスが異常終了しました: {error}",
+        "final_output": None,
+        "validation_ok": None,
+        "elapsed": 0.0
+    }
+
+
+def _convert_file_isolated(xml_file: Path, args: tuple) -> Dict:
+    """1つのファイルを単独のワーカープロセスで変換（プロセスが異常終了しても他のファイルに影響しない）"""
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(_convert_file_in_worker, None, 0, str(xml_file), *args)
+        try:
+            return future.result()
+        except Exception as e:
+            return _crashed_result(xml_file, e)
+
+
+def _run_pool(xml_files: List[Path], workers: int, args: tuple, record) -> tuple:
+    """
+    ファイルをプロセスプールで変換し、結果を record に渡す
+
+    Returns:
+        (in_flight, not_started): プロセスプールが異常終了した場合に、その時点で変換中だったファイルと
+        未着手のファイル（異常終了しなかった場合はどちらも空）
+    """
+    unfinished = []
+    with tempfile.TemporaryDirectory(prefix="run_batch_started_") as started_dir:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for index, xml_file in enumerate(xml_files):
+                try:
+                    future = executor.submit(_convert_file_in_worker, started_dir, index, str(xml_file), *args)
+                except BrokenProcessPool:
+                    unfinished.append(index)
+                    continue
+                futures[future] = index
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    unfinished.append(index)
+                    continue
+                except Exception as e:
+                    result = _crashed_result(xml_files[index], e)
+                record(result)
+        started = set(os.listdir(started_dir))
+
+    in_flight = [xml_files[index] for index in sorted(unfinished) if str(index) in started]
+    not_started = [xml_files[index] for index in sorted(unfinished) if str(index) not in started]
+    return in_flight, not_started
+
+
+def run_batch(input_folder: Path, output_folder: Path, workers: Optional[int] = None,
+              steps: Optional[List[str]] = None, write_intermediate: bool = True,
+              progress_callback=None, cache_dir: Optional[Path] = None,
+              settings: Optional[LabelSettings] = None) -> List[Dict]:
+    """
+    入力フォルダ内の全XMLファイルをプロセスプールで並列に変換
+
+    Args:
+        input_folder: 入力フォルダのパス
+        output_folder: 出力フォルダのパス
+        workers: ワーカープロセス数（Noneの場合はCPUコア数）
+        steps: 実行するスクリプト名のリスト（Noneの場合は推奨順序の全ステップ）
+        write_intermediate: 各ステップの中間ファイルを書き出すかどうか
+        progress_callback: 1ファイル完了ごとに呼ばれる関数（completed, total, result）
+        cache_dir: ステップ結果キャッシュのディレクトリ（Noneの場合は環境変数 XML_FORMATTER_STEP_CACHE）
+        settings: 全ファイルの変換に使うラベル設定（Noneの場合は各ワーカーで設定ファイル＋環境変数から取得）
+
+    Returns:
+        各ファイルの処理結果のリスト（入力ファイル名順）
+    """
+    xml_files = sorted(p for p in Path(input_folder).glob('*.xml') if p.is_file())
+    Path(output_folder).mkdir(parents=True, exist_ok=True)
+    total = len(xml_files)
+    results = []
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, total or 1))
+
+    def record(result):
+        results.append(result)
+        if progress_callback:
+            progress_callback(len(results), total, result)
+
+    args = (str(output_folder), steps, write_intermediate, str(cache_dir) if cache_dir else None, settings)
+    pending = xml_files
+    while pending:
+        in_flight, pending = _run_pool(pending, workers, args, record)
+        if pending and not in_flight:
+            # 変換を開始する前にワーカープロセスが異常終了した（ファイルによらない）場合は続行しない
+            for xml_file in pending:
+                record(_crashed_result(xml_file, BrokenProcessPool("変換を開始できませんでした")))
+            break
+        # 異常終了時に変換中だったファイルは、原因のファイルを特定するため1つずつ単独で再実行する
+        for xml_file in in_flight:
+            record(_convert_file_isolated(xml_file, args))
+
+    results.sort(key=lambda r: r["file"])
+    return results
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(
+        description='入力フォルダ内のXMLファイルを並列に一括変換（run_pipeline.sh と同じ出力構成）',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+使用例:
+  python3 run_batch.py ./input ./output
+  python3 run_batch.py ./input ./output --workers 32
+  python3 run_batch.py ./input ./output --no-intermediate
+  python3 run_batch.py ./input ./output --cache-dir ~/.cache/xml-formatter/steps
+        '''
+    )
+    parser.add_argument('input_folder', help='処理対象のXMLファイルを格納するフォルダ')
+    parser.add_argument('output_folder', help='処理結果を保存するフォルダ')
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help='ワーカープロセス数（デフォルト: CPUコア数）')
+    parser.add_argument('--steps', nargs='+', default=None,
+                        help='実行するスクリプト名（デフォルト: 推奨順序の全ステップ）')
+    parser.add_argument('--no-intermediate', action='store_true',
+                        help='最終ステップ以外の中間XMLを書き出さない')
+    parser.add_argument('--cache-dir', default=None,
+                        help='ステップ結果キャッシュのディレクトリ（省略時は環境変数 XML_FORMATTER_STEP_CACHE、未設定ならキャッシュしない）')
+    parser.add_argument('--set', dest='overrides', action='append', default=[], metavar='KEY=VALUE',
+                        help='label_config.json の値をこの実行だけ上書きする（ドット区切りのキー、値はJSON。複数指定可）')
+
+    args = parser.parse_args()
+
+    try:
+        settings = resolve_settings(parse_config_overrides(args.overrides))
+    except (OSError, ValueError) as e:
+        print(f"エラー: ラベル設定の読み込みに失敗しました: {e}", file=sys.stderr)
+        return 1
+
+    input_folder = Path(args.input_folder)
+    if not input_folder.is_dir():
+        print(f"エラー: 入力フォルダが見つかりません: {input_folder}", file=sys.stderr)
+        return 1
+    if not any(input_folder.glob('*.xml')):
+        print(f"エラー: 入力フォルダにXMLファイルが見つかりません: {input_folder}", file=sys.stderr)
+        return 1
+
+    input_folder = input_folder.resolve()
+    output_folder = Path(args.output_folder).resolve()
+
+    print("=" * 60)
+    print("XML一括変換（並列実行）")
+    print("=" * 60)
+    print(f"入力フォルダ: {input_folder}")
+    print(f"出力フォルダ: {output_folder}")
+    print(f"ワーカー数: {args.workers or os.cpu_count()}")
+
+    def print_progress(completed, total, result):
+        label = {"success": "成功", "skipped": "スキップ", "failed": "失敗"}[result["status"]]
+        line = f"[{completed}/{total}] {label}: {result['file']} ({result['elapsed']:.2f}秒)"
+        if result["status"] == "success" and not result["validation_ok"]:
+            line += " - テキスト検証で問題が検出されました"
+        if result["message"]:
+            line += f" - {result['message']}"
+        print(line, flush=True)
+
+    start_time = time.perf_counter()
+    results = run_batch(
+        input_folder, output_folder,
+        workers=args.workers,
+        steps=args.steps,
+        write_intermediate=not args.no_intermediate,
+        progress_callback=print_progress,
+        cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+        settings=settings
+    )
+    elapsed = time.perf_counter() - start_time
+
+    succeeded = [r for r in results if r["status"] == "success"]
+    skipped = [r for r in results if r["status"] == "skipped"]
+    failed = [r for r in results if r["status"] == "failed"]
+    validation_ng = [r for r in succeeded if not r["validation_ok"]]
+
+    print("\n" + "=" * 60)
+    print("処理結果")
+    print("=" * 60)
+    print(f"  成功: {len(succeeded)}")
+    print(f"  スキップ（パース検証エラー）: {len(skipped)}")
+    print(f"  失敗: {len(failed)}")
+    print(f"  テキスト検証で要確認: {len(validation_ng)}")
+    print(f"  処理時間: {elapsed:.2f}秒")
+
+    for r in failed:
+        print(f"  [失敗] {r['file']}: {r['message']}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -37,24 +37,18 @@ GREEN='\033[0;32m'
 YELLOW='\033[1;33m'
 NC='\033[0m'  # No Color
 
-# 変換スクリプトのリスト（実行順序が重要）
-CONVERTERS=(
-  "preprocess_non_first_sentence_to_list.py"  # 前処理: 2個目以降のSentence要素をList要素に変換
-  "convert_article_focused.py"
-  "convert_paragraph_step3.py"
-  "convert_paragraph_step4.py"
-  "convert_item_step0.py"
-  "convert_subitem1_step0.py"
-  "convert_subitem2_step0.py"
-  "convert_subitem3_step0.py"
-  "convert_subitem4_step0.py"
-  "convert_subitem5_step0.py"
-  "convert_subitem6_step0.py"
-  "convert_subitem7_step0.py"
-  "convert_subitem8_step0.py"
-  "convert_subitem9_step0.py"
-  "convert_subitem10_step0.py"
-)
+# 変換スクリプトのリスト（実行順序は step_registry.py の依存関係から決まる）
+CONVERTERS=()
+while IFS= read -r converter; do
+  CONVERTERS+=("$converter")
+done < <(python3 "$SCRIPT_DIR/step_registry.py" --direction forward)
+if [ ${#CONVERTERS[@]} -eq 0 ]; then
+  echo "エラー: 変換スクリプトの一覧を取得できませんでした: $SCRIPT_DIR/step_registry.py" >&2
+  exit 1
+fi
+
+# パイプラインエンジン（all モードで使用）
+ENGINE_SCRIPT="pipeline_engine.py"
 
 # 検証スクリプト
 VALIDATION_SCRIPT="compare_xml_text_content.py"
@@ -227,32 +221,20 @@ for xml_file in "${xml_files[@]}"; do
   current_input="$xml_file"
   final_output=""
   
-  # パイプラインのステップを実行
-  for i in "${!CONVERTERS[@]}"; do
-    converter_script="${CONVERTERS[$i]}"
-    step_num=$((i + 1))
-    total_steps=${#CONVERTERS[@]}
-    
-    # スクリプトのフルパスを作成
-    converter_path="$SCRIPT_DIR/$converter_script"
-    
-    # スクリプトが存在するか確認
-    if [ ! -f "$converter_path" ]; then
-      print_error "スクリプトが見つかりません: $converter_path"
-      exit 1
-    fi
-    
-    # 出力ファイルパスを作成
-    step_name=$(basename "$converter_script" .py)
+  if [ "$MODE" = "all" ]; then
+    # all モードでは、パイプラインエンジンで1回のパースで全ステップを実行する
+    engine_path="$SCRIPT_DIR/$ENGINE_SCRIPT"
+    step_name=$(basename "${CONVERTERS[$((${#CONVERTERS[@]} - 1))]}" .py)
     output_file="$intermediate_dir/${filename_no_ext}-${step_name}.xml"
     
-    print_info "[$step_num/$total_steps] $converter_script を実行中..."
+    print_info "$ENGINE_SCRIPT で ${#CONVERTERS[@]} ステップを実行中..."
     
-    # Pythonスクリプトを実行
-    if ! python3 "$converter_path" "$current_input" "$output_file" 2>/dev/null; then
-      print_error "$converter_script の実行中にエラーが発生しました。"
+    if ! python3 "$engine_path" "$current_input" "$output_file" \
+        --steps "${CONVERTERS[@]}" \
+        --intermediate-dir "$intermediate_dir" \
+        --intermediate-format "{stem}-{step}.xml" 2>/dev/null; then
+      print_error "$ENGINE_SCRIPT の実行中にエラーが発生しました。"
       echo "入力ファイル: $current_input"
-      echo "出力ファイル: $output_file"
       exit 1
     fi
     
@@ -262,17 +244,57 @@ for xml_file in "${xml_files[@]}"; do
       exit 1
     fi
     
-    print_success "$converter_script が完了しました"
-    
-    current_input="$output_file"
+    print_success "全ステップが完了しました"
     final_output="$output_file"
+  else
+    # パイプラインのステップを実行
+    for i in "${!CONVERTERS[@]}"; do
+      converter_script="${CONVERTERS[$i]}"
+      step_num=$((i + 1))
+      total_steps=${#CONVERTERS[@]}
     
-    # step モードの場合、各ステップ後に一時停止
-    if [ "$MODE" = "step" ] && [ $step_num -lt $total_steps ]; then
-      read -p "次のステップに進むには Enter キーを押してください..."
-      echo ""
-    fi
-  done
+      # スクリプトのフルパスを作成
+      converter_path="$SCRIPT_DIR/$converter_script"
+    
+      # スクリプトが存在するか確認
+      if [ ! -f "$converter_path" ]; then
+        print_error "スクリプトが見つかりません: $converter_path"
+        exit 1
+      fi
+    
+      # 出力ファイルパスを作成
+      step_name=$(basename "$converter_script" .py)
+      output_file="$intermediate_dir/${filename_no_ext}-${step_name}.xml"
+    
+      print_info "[$step_num/$total_steps] $converter_script を実行中..."
+    
+      # Pythonスクリプトを実行
+      if ! python3 "$converter_path" "$current_input" "$output_file" 2>/dev/null; then
+        print_error "$converter_script の実行中にエラーが発生しました。"
+        echo "入力ファイル: $current_input"
+        echo "出力ファイル: $output_file"
+        exit 1
+      fi
+    
+      # 出力ファイルが正常に作成されたか確認
+      if [ ! -f "$output_file" ]; then
+        print_error "出力ファイルが作成されませんでした: $output_file"
+        exit 1
+      fi
+    
+      print_success "$converter_script が完了しました"
+    
+      current_input="$output_file"
+      final_output="$output_file"
+    
+      # step モードの場合、各ステップ後に一時停止
+      if [ "$MODE" = "step" ] && [ $step_num -lt $total_steps ]; then
+        read -p "次のステップに進むには Enter キーを押してください..."
+        echo ""
+      fi
+    done
+  
+  fi
   
   # 最終出力ファイルを出力フォルダにコピー
   if [ -f "$final_output" ]; then
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+パイプラインのステップごとの計測（処理時間・メモリ・要素数）
+
+pipeline_engine.run_steps(..., profile=True) は、各ステップの実行ログ（execution_log["steps"]）に
+"profile" を、実行ログ全体に実行全体の計測結果（execution_log["profile"]）を記録する。
+
+ステップの "profile":
+  start            実行開始からの経過時間（秒）
+  wall_time        実時間（秒）
+  cpu_time         CPU時間（秒、プロセス全体）
+  phases           処理段階ごとの [{"name", "start", "wall_time"}]
+                   （prescan: 処理対象タグの索引作成 / convert: 変換 / finalize: 空白の正規化・整形 /
+                   serialize: 中間ファイルの書き出し / cache: キャッシュへの保存）
+  elements_before  ステップ実行前の要素数
+  elements_after   ステップ実行後の要素数
+  rss_kb           ステップ終了時の常駐メモリ（KB、/proc から取得できる環境のみ）
+  peak_rss_kb      ステップ終了時までの最大常駐メモリ（KB）
+  scripts          複数のスクリプトをまとめて実行した場合（Item〜Subitem10の一括変換）のスクリプト名
+
+実行ログはJSONのほか、Chromeのトレース形式（chrome://tracing・Perfetto で表示）に変換できる。
+このモジュールは標準ライブラリのみに依存する（Streamlitアプリからも読み込む）。
+
+使用例:
+  python3 pipeline_engine.py input.xml output.xml --profile --log-json log.json --trace trace.json
+  python3 step_profiler.py log.json                    # ステップごとの処理時間を表で表示
+  python3 step_profiler.py log.json --trace trace.json  # 保存済みの実行ログからトレースを作成
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# 常駐メモリ（/proc/self/statm）のページサイズ（KB）
+_PAGE_KB = os.sysconf('SC_PAGE_SIZE') // 1024 if hasattr(os, 'sysconf') else None
+
+# 表に表示する処理段階（列名）
+TABLE_PHASES = (('convert', '変換'), ('finalize', '整形'), ('serialize', '書き出し'))
+
+
+def memory_usage() -> Tuple[Optional[int], Optional[int]]:
+    """
+    現在の常駐メモリと最大常駐メモリを取得
+
+    Returns:
+        (rss_kb, peak_rss_kb)（取得できない値はNone）
+    """
+    rss_kb = None
+    if _PAGE_KB:
+        try:
+            with open('/proc/self/statm', 'r') as f:
+                rss_kb = int(f.read().split()[1]) * _PAGE_KB
+        except (OSError, ValueError, IndexError):
+            pass
+    peak_rss_kb = None
+    if resource is not None:
+        peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == 'darwin':
+            # macOS はバイト単位
+            peak_rss_kb //= 1024
+    return rss_kb, peak_rss_kb
+
+
+def count_elements(root) -> int:
+    """要素数（コメント・処理命令を除く）"""
+    return sum(1 for _ in root.iter('*'))
+
+
+class StepMeasurement:
+    """1ステップ分の計測"""
+
+    def __init__(self, profiler: 'StepProfiler', elements_before: Optional[int]):
+        self.profiler = profiler
+        self.start = profiler.elapsed()
+        self.start_cpu = time.process_time()
+        self.phases: List[Dict] = []
+        self.elements_before = elements_before
+
+    def phase(self, name: str):
+        """処理段階の時間を計測するコンテキストマネージャ"""
+        return self.profiler.phase(name, self.phases)
+
+    def finish(self, elements_after: Optional[int]) -> Dict:
+        """
+        計測を終了して結果を返す
+
+        Args:
+            elements_after: ステップ実行後の要素数
+        """
+        rss_kb, peak_rss_kb = memory_usage()
+        return {
+            "start": round(self.start, 6),
+            "wall_time": round(self.profiler.elapsed() - self.start, 6),
+            "cpu_time": round(time.process_time() - self.start_cpu, 6),
+            "phases": self.phases,
+            "elements_before": self.elements_before,
+            "elements_after": elements_after,
+            "rss_kb": rss_kb,
+            "peak_rss_kb": peak_rss_kb,
+        }
+
+
+class StepProfiler:
+    """
+    パイプライン1回分の計測
+
+    時刻はすべて計測開始からの経過時間（秒）で記録する。要素数は変換を実行したステップの後にのみ数え、
+    変換を省略したステップは直前の要素数をそのまま使う。
+    """
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.start_cpu = time.process_time()
+        self.phases: List[Dict] = []  # 実行全体の処理段階（parse: 入力のパース / output: 最終出力 等）
+        self.element_count: Optional[int] = None
+
+    def elapsed(self) -> float:
+        """計測開始からの経過時間（秒）"""
+        return time.perf_counter() - self.start_time
+
+    @contextmanager
+    def phase(self, name: str, phases: Optional[List[Dict]] = None):
+        """
+        処理段階の時間を計測する
+
+        Args:
+            name: 処理段階の名前
+            phases: 記録先（Noneの場合は実行全体の処理段階）
+        """
+        start = self.elapsed()
+        try:
+            yield
+        finally:
+            (self.phases if phases is None else phases).append({
+                "name": name,
+                "start": round(start, 6),
+                "wall_time": round(self.elapsed() - start, 6),
+            })
+
+    def begin_step(self, root) -> StepMeasurement:
+        """ステップの計測を開始（root: ステップ実行前のツリーのルート要素）"""
+        if self.element_count is None and root is not None:
+            self.element_count = count_elements(root)
+        return StepMeasurement(self, self.element_count)
+
+    def end_step(self, measurement: StepMeasurement, root, changed: bool) -> Dict:
+        """
+        ステップの計測を終了
+
+        Args:
+            measurement: begin_step() の戻り値
+            root: ステップ実行後のツリーのルート要素
+            changed: ステップが変換を実行したか（Falseの場合は要素数を数え直さない）
+        """
+        if changed or self.element_count is None:
+            self.element_count = count_elements(root)
+        return measurement.finish(self.element_count)
+
+    def summary(self) -> Dict:
+        """実行全体の計測結果"""
+        rss_kb, peak_rss_kb = memory_usage()
+        return {
+            "wall_time": round(self.elapsed(), 6),
+            "cpu_time": round(time.process_time() - self.start_cpu, 6),
+            "phases": self.phases,
+            "rss_kb": rss_kb,
+            "peak_rss_kb": peak_rss_kb,
+        }
+
+
+def phase_times(profile: Dict) -> Dict[str, float]:
+    """処理段階ごとの合計時間（秒）"""
+    totals = {}
+    for phase in profile.get("phases", []):
+        totals[phase["name"]] = totals.get(phase["name"], 0.0) + phase["wall_time"]
+    return totals
+
+
+def _step_state(step_info: Dict) -> str:
+    """表に表示するステップの状態"""
+    if not step_info.get("success"):
+        return "失敗"
+    if step_info.get("cached"):
+        return "キャッシュ"
+    if step_info.get("pass_through"):
+        return "省略（出力も再利用）"
+    if step_info.get("skipped"):
+        return "省略"
+    if step_info.get("fused_with"):
+        return f"一括変換（{step_info['fused_with']}）"
+    scripts = (step_info.get("profile") or {}).get("scripts")
+    if scripts:
+        return f"一括変換（{len(scripts)}ステップ）"
+    return ""
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def _mb(kilobytes: Optional[int]) -> Optional[float]:
+    return round(kilobytes / 1024, 1) if kilobytes is not None else None
+
+
+def build_table_rows(execution_log: Dict) -> List[Dict]:
+    """
+    ステップごとの計測結果を表の行（列名 → 値）に変換
+
+    計測結果のないステップ（キャッシュから復元したステップ等）は時間の列を空にする。
+    """
+    rows = []
+    for step_info in execution_log.get("steps", []):
+        profile = step_info.get("profile") or {}
+        phases = phase_times(profile)
+        row = {
+            "No": step_info.get("step"),
+            "スクリプト": step_info.get("script"),
+            "実時間(ms)": _ms(profile.get("wall_time")),
+            "CPU時間(ms)": _ms(profile.get("cpu_time")),
+        }
+        for name, label in TABLE_PHASES:
+            row[f"{label}(ms)"] = _ms(phases.get(name))
+        row["要素数(前)"] = profile.get("elements_before")
+        row["要素数(後)"] = profile.get("elements_after")
+        row["最大RSS(MB)"] = _mb(profile.get("peak_rss_kb"))
+        row["状態"] = _step_state(step_info)
+        rows.append(row)
+    return rows
+
+
+def format_table(execution_log: Dict) -> str:
+    """ステップごとの計測結果をテキストの表に整形"""
+    rows = build_table_rows(execution_log)
+    if not rows:
+        return "計測結果がありません"
+    columns = list(rows[0].keys())
+    cells = [[("" if row[col] is None else str(row[col])) for col in columns] for row in rows]
+    widths = [max(display_width(col), *(display_width(cell[i]) for cell in cells))
+              for i, col in enumerate(columns)]
+    lines = ["  ".join(pad_text(col, width) for col, width in zip(columns, widths))]
+    lines.append("  ".join("-" * width for width in widths))
+    for cell in cells:
+        lines.append("  ".join(pad_text(value, width) for value, width in zip(cell, widths)))
+
+    profile = execution_log.get("profile")
+    if profile:
+        phases = phase_times(profile)
+        summary = [f"合計: {_ms(profile.get('wall_time'))} ms"]
+        if profile.get("cpu_time") is not None:
+            summary[0] += f"（CPU {_ms(profile['cpu_time'])} ms）"
+        summary += [f"{name}: {_ms(seconds)} ms" for name, seconds in phases.items()]
+        if profile.get("peak_rss_kb") is not None:
+            summary.append(f"最大RSS: {_mb(profile['peak_rss_kb'])} MB")
+        lines.append("")
+        lines.append(" / ".join(summary))
+    return "\n".join(lines)
+
+
+def display_width(text: str) -> int:
+    """表示幅（全角文字は2）"""
+    return sum(2 if ord(c) > 0x2E7F else 1 for c in text)
+
+
+def pad_text(text: str, width: int, align_right: bool = False) -> str:
+    """表示幅が width になるように空白を補う"""
+    padding = " " * (width - display_width(text))
+    return padding + text if align_right else text + padding
+
+
+def build_chrome_trace(execution_log: Dict, process_name: str = "xml-formatter") -> Dict:
+    """
+    実行ログをChromeのトレース形式（Trace Event Format）に変換
+
+    ステップを1行目、処理段階をその下の行に完了イベント（"ph": "X"）として配置する。
+    """
+    pid = 1
+    events = [
+        {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": process_name}},
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": 1, "args": {"name": "ステップ"}},
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": 2, "args": {"name": "処理段階"}},
+    ]
+
+    def complete(name, category, tid, start, duration, args=None):
+        event = {"name": name, "cat": category, "ph": "X", "pid": pid, "tid": tid,
+                 "ts": round(start * 1e6, 1), "dur": round(duration * 1e6, 1)}
+        if args:
+            event["args"] = args
+        events.append(event)
+
+    run_profile = execution_log.get("profile") or {}
+    for phase in run_profile.get("phases", []):
+        complete(phase["name"], "pipeline", 2, phase["start"], phase["wall_time"])
+
+    for step_info in execution_log.get("steps", []):
+        profile = step_info.get("profile")
+        if not profile:
+            continue
+        args = {key: profile.get(key) for key in
+                ("cpu_time", "elements_before", "elements_after", "rss_kb", "peak_rss_kb")}
+        args["stats"] = step_info.get("stats", {})
+        if profile.get("scripts"):
+            args["scripts"] = profile["scripts"]
+        complete(step_info["script"], "step", 1, profile["start"], profile["wall_time"], args)
+        for phase in profile.get("phases", []):
+            complete(phase["name"], "phase", 2, phase["start"], phase["wall_time"],
+                     {"step": step_info["script"]})
+
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(execution_log: Dict, trace_path) -> None:
+    """実行ログをChromeのトレース形式で保存"""
+    with open(trace_path, 'w', encoding='utf-8') as f:
+        json.dump(build_chrome_trace(execution_log), f, ensure_ascii=False)
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description='実行ログ（JSON）のステップごとの処理時間を表示')
+    parser.add_argument('log_json', help='pipeline_engine.py --profile --log-json で保存した実行ログ')
+    parser.add_argument('--trace', default=None, help='Chromeのトレース形式で保存する先')
+    args = parser.parse_args()
+
+    try:
+        with open(args.log_json, 'r', encoding='utf-8') as f:
+            execution_log = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"エラー: 実行ログを読み込めません: {e}", file=sys.stderr)
+        return 1
+
+    print(format_table(execution_log))
+    if args.trace:
+        write_chrome_trace(execution_log, args.trace)
+        print(f"\nトレース: {args.trace}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+変換ステップのレジストリ
+
+順変換（run_pipeline.sh / pipeline_engine.py / Streamlitアプリ）と逆変換（reverse_app）の
+各ステップについて、次の内容を1か所で宣言する。
+- スクリプト名と説明
+- ツリー→ツリーの変換処理（ConversionConfig / ReverseConversionConfig を使うステップは
+  スクリプトの CONFIG、それ以外は pipeline_engine のステップクラス名）
+- 依存するステップ（実行順序は依存関係から決まる）
+- 処理対象の要素タグと、その親要素のタグ（文書に該当する要素がない場合、そのステップは何も変更しないためスキップできる）
+
+このモジュールは変換スクリプトを読み込まない（Streamlitアプリやシェルスクリプトからも軽量に参照できる）。
+CONFIG は load_config() で必要になった時点で読み込む。
+
+使用例:
+  python3 step_registry.py                    # 順変換のスクリプト名を実行順に1行ずつ出力
+  python3 step_registry.py --direction reverse
+  python3 step_registry.py --describe         # 説明・依存関係・処理対象タグも出力
+"""
+
+import sys
+import argparse
+import importlib
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# 変換の方向
+DIRECTION_FORWARD = 'forward'
+DIRECTION_REVERSE = 'reverse'
+
+# 各方向のスクリプトを配置するディレクトリ
+SCRIPT_DIRS = {
+    DIRECTION_FORWARD: Path(__file__).resolve().parent,
+    DIRECTION_REVERSE: Path(__file__).resolve().parent.parent / "reverse_app",
+}
+
+
+class StepSpec:
+    """1ステップの宣言"""
+
+    def __init__(self,
+                 script_name: str,                     # スクリプト名
+                 description: str,                     # 説明（Streamlitアプリ等に表示）
+                 direction: str = DIRECTION_FORWARD,   # 変換の方向
+                 config_attr: Optional[str] = None,    # ConversionConfig / ReverseConversionConfig を保持するスクリプトの属性名
+                 engine_step: Optional[str] = None,    # CONFIGを使わないステップの pipeline_engine のクラス名
+                 depends_on: Sequence[str] = (),       # 先に実行する必要があるステップのスクリプト名
+                 target_tags: Sequence[str] = (),      # 処理対象の要素タグ（空の場合はスキップしない）
+                 target_parent_tags: Sequence[str] = ()):  # 処理対象の要素の親要素タグ（空の場合は親要素を問わない）
+        self.script_name = script_name
+        self.description = description
+        self.direction = direction
+        self.config_attr = config_attr
+        self.engine_step = engine_step
+        self.depends_on = tuple(depends_on)
+        self.target_tags = tuple(target_tags)
+        self.target_parent_tags = tuple(target_parent_tags)
+
+    @property
+    def module_name(self) -> str:
+        """スクリプトのモジュール名"""
+        return Path(self.script_name).stem
+
+    @property
+    def script_path(self) -> Path:
+        """スクリプトのパス"""
+        return SCRIPT_DIRS[self.direction] / self.script_name
+
+    def load_module(self):
+        """スクリプトをモジュールとして読み込む（スクリプトのディレクトリをインポートパスに追加）"""
+        script_dir = str(SCRIPT_DIRS[self.direction])
+        if script_dir not in sys.path:
+            sys.path.insert(0, script_dir)
+        return importlib.import_module(self.module_name)
+
+    def load_config(self):
+        """
+        スクリプトの変換設定（CONFIG）を読み込む
+
+        Raises:
+            ValueError: CONFIGを使わないステップの場合
+        """
+        if self.config_attr is None:
+            raise ValueError(f"変換設定を持たないステップです: {self.script_name}")
+        return getattr(self.load_module(), self.config_attr)
+
+    @property
+    def index_tags(self) -> Tuple[str, ...]:
+        """プリスキャンで索引を作成する要素タグ（処理対象の要素タグと親要素タグ）"""
+        return self.target_tags + self.target_parent_tags
+
+
+# スクリプト名 → ステップの宣言（登録順）
+_REGISTRY: Dict[str, StepSpec] = {}
+
+
+def register_step(spec: StepSpec) -> StepSpec:
+    """
+    ステップを登録する
+
+    Raises:
+        ValueError: 同じスクリプト名が登録済みの場合、または依存先が未登録の場合
+    """
+    if spec.script_name in _REGISTRY:
+        raise ValueError(f"ステップが重複して登録されています: {spec.script_name}")
+    for dependency in spec.depends_on:
+        if dependency not in _REGISTRY:
+            raise ValueError(f"依存先のステップが登録されていません: {spec.script_name} → {dependency}")
+    _REGISTRY[spec.script_name] = spec
+    return spec
+
+
+def is_registered(script_name: str) -> bool:
+    """登録済みのステップかどうかを判定"""
+    return script_name in _REGISTRY
+
+
+def get_step_spec(script_name: str) -> StepSpec:
+    """
+    スクリプト名からステップの宣言を取得
+
+    Raises:
+        KeyError: 登録されていないスクリプトの場合
+    """
+    return _REGISTRY[script_name]
+
+
+def get_step_specs(direction: str = DIRECTION_FORWARD) -> List[StepSpec]:
+    """指定した方向のステップの宣言を実行順に取得"""
+    return [get_step_spec(name) for name in get_step_order(direction)]
+
+
+def get_step_order(direction: str = DIRECTION_FORWARD) -> List[str]:
+    """
+    指定した方向のステップを実行順（依存関係を満たす順、同順位は登録順）に取得
+
+    Returns:
+        スクリプト名のリスト
+    """
+    specs = [spec for spec in _REGISTRY.values() if spec.direction == direction]
+    order = []
+    done = set()
+    while len(order) < len(specs):
+        for spec in specs:
+            if spec.script_name not in done and all(dep in done for dep in spec.depends_on):
+                order.append(spec.script_name)
+                done.add(spec.script_name)
+                break
+    return order
+
+
+def get_step_description(script_name: str, default: str = "変換スクリプト") -> str:
+    """スクリプトの説明を取得（未登録の場合は default）"""
+    spec = _REGISTRY.get(script_name)
+    return spec.description if spec is not None else default
+
+
+def check_step_order(script_names: Sequence[str]) -> List[Tuple[str, str]]:
+    """
+    スクリプトのリストで、依存先より前に置かれているステップを検出
+
+    リストに含まれない依存先は対象外（一部のステップだけを実行する場合）。
+
+    Returns:
+        (ステップ, 依存先) のリスト
+    """
+    position = {name: idx for idx, name in enumerate(script_names)}
+    violations = []
+    for name in script_names:
+        if name not in _REGISTRY:
+            continue
+        for dependency in _REGISTRY[name].depends_on:
+            if dependency in position and position[dependency] > position[name]:
+                violations.append((name, dependency))
+    return violations
+
+
+# ============================================================================
+# ステップの宣言
+# ============================================================================
+
+register_step(StepSpec(
+    "preprocess_non_first_sentence_to_list.py",
+    "前処理: 2個目以降のSentence要素をList要素に変換",
+    engine_step="PreprocessStep",
+))
+register_step(StepSpec(
+    "convert_article_focused.py",
+    "Article要素の分割と調整",
+    engine_step="ArticleFocusedStep",
+    depends_on=["preprocess_non_first_sentence_to_list.py"],
+))
+register_step(StepSpec(
+    "convert_paragraph_step3.py",
+    "Paragraph処理（step3）",
+    engine_step="ParagraphSplitStep",
+    depends_on=["convert_article_focused.py"],
+))
+register_step(StepSpec(
+    "convert_paragraph_step4.py",
+    "Paragraph処理（step4）",
+    engine_step="ParagraphSentenceStep",
+    depends_on=["convert_paragraph_step3.py"],
+))
+
+# List→Item/Subitem変換（親要素がなければ何も変更しない）
+_FORWARD_LEVELS = ["Paragraph", "Item"] + [f"Subitem{i}" for i in range(1, 11)]
+_previous = "convert_paragraph_step4.py"
+for _parent_tag, _child_tag in zip(_FORWARD_LEVELS, _FORWARD_LEVELS[1:]):
+    _script_name = f"convert_{_child_tag.lower()}_step0.py"
+    register_step(StepSpec(
+        _script_name,
+        f"{_child_tag}変換",
+        config_attr="CONFIG",
+        depends_on=[_previous],
+        target_tags=[_parent_tag],
+    ))
+    _previous = _script_name
+
+# 逆変換（内側から外側へ。親要素の直下に子要素がなければ何も変更しない。
+# Item の逆変換は親要素を問わない）
+_previous = None
+for _parent_tag, _child_tag in reversed(list(zip(_FORWARD_LEVELS, _FORWARD_LEVELS[1:]))):
+    _script_name = f"reverse_convert_{_child_tag.lower()}.py"
+    register_step(StepSpec(
+        _script_name,
+        f"{_child_tag} → List 逆変換",
+        direction=DIRECTION_REVERSE,
+        config_attr="CONFIG",
+        depends_on=[_previous] if _previous else [],
+        target_tags=[_child_tag],
+        target_parent_tags=[] if _child_tag == "Item" else [_parent_tag],
+    ))
+    _previous = _script_name
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description='変換ステップを実行順に出力します')
+    parser.add_argument('--direction', choices=[DIRECTION_FORWARD, DIRECTION_REVERSE],
+                        default=DIRECTION_FORWARD, help='変換の方向（デフォルト: forward）')
+    parser.add_argument('--describe', action='store_true', help='説明・依存関係・処理対象タグも出力する')
+    args = parser.parse_args()
+
+    for spec in get_step_specs(args.direction):
+        if args.describe:
+            target = ', '.join(spec.target_tags) or '-'
+            if spec.target_parent_tags:
+                target += f"（親: {', '.join(spec.target_parent_tags)}）"
+            print(f"{spec.script_name}\t{spec.description}\t"
+                  f"依存: {', '.join(spec.depends_on) or '-'}\t対象タグ: {target}")
+        else:
+            print(spec.script_name)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ベンチマーク（generate_benchmark_xml.py / benchmark_pipeline.py）のテスト実行スクリプト
+
+次の点を確認する。
+- 生成した文書が同じ設定・シードで同一になり、ラベルが設定のラベルIDと判定されること
+- 生成した文書を変換すると、指定した深さ（Subitem10まで）の Item/Subitem 要素が作成されること
+- 順変換・逆変換の各ステップの時間が計測されること
+- 同じ文書・同じホストの前回の結果を読み込み、遅くなったステップを検出すること
+"""
+
+import sys
+import copy
+from pathlib import Path
+from lxml import etree
+
+# scripts/をインポートパスに追加
+script_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(script_dir))
+
+# unit_tests/（共通処理 suite_helpers.py）をインポートパスに追加
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import step_registry
+from pipeline_engine import DEFAULT_STEP_ORDER, run_steps
+from generate_benchmark_xml import BenchmarkDocumentSpec, generate_document, write_document
+from benchmark_pipeline import (
+    append_record,
+    benchmark_document,
+    find_regressions,
+    load_previous_record
+)
+from suite_helpers import check, run_suite
+
+
+def test_generate_document(work_dir):
+    """同じ設定の文書は同一になり、不正な設定はエラーになる"""
+    spec = BenchmarkDocumentSpec(articles=3, lists=3, depth=5, seed=1)
+    first = etree.tostring(generate_document(spec))
+    second = etree.tostring(generate_document(BenchmarkDocumentSpec(articles=3, lists=3, depth=5, seed=1)))
+    results = [check(first == second, "同じ設定・シードの文書は同一です")]
+
+    try:
+        generate_document(BenchmarkDocumentSpec(lists=13, depth=11))
+        rejected = False
+    except ValueError:
+        rejected = True
+    results.append(check(rejected, "ラベルの連番の上限を超える設定はエラーになります"))
+    return all(results)
+
+
+def test_converted_depth(work_dir):
+    """生成した文書を変換すると Subitem10 まで入れ子になる"""
+    spec = BenchmarkDocumentSpec(articles=2, lists=2, depth=11, no_column_ratio=0.0, three_column_ratio=0.0)
+    input_path = work_dir / "depth.xml"
+    write_document(spec, input_path)
+    output_path = work_dir / "depth_out.xml"
+    success, error_msg, _ = run_steps(input_path, output_path, list(DEFAULT_STEP_ORDER), capture_output=True)
+    if not check(success, f"変換に成功します {error_msg or ''}"):
+        return False
+
+    root = etree.parse(str(output_path)).getroot()
+    counts = {tag: len(root.findall(f'.//{tag}')) for tag in ['Article', 'Item', 'Subitem10']}
+    return check(counts == {'Article': 2, 'Item': 4, 'Subitem10': 4} and not root.findall('.//List'),
+                 f"Article・Item・Subitem10 が設定どおりに作成されます {counts}")
+
+
+def test_benchmark_document(work_dir):
+    """順変換・逆変換の全ステップが計測される"""
+    input_path = work_dir / "bench.xml"
+    write_document(BenchmarkDocumentSpec(articles=2, lists=2, depth=3), input_path)
+    results = benchmark_document(input_path, repeat=2, fused=False)
+    measured = all(
+        list(results[direction]['steps']) == step_registry.get_step_order(direction)
+        and results[direction]['wall_time'] > 0
+        for direction in (step_registry.DIRECTION_FORWARD, step_registry.DIRECTION_REVERSE)
+    )
+    return check(measured, "順変換・逆変換の全ステップの時間が計測されます")
+
+
+def test_regressions(work_dir):
+    """前回の結果との比較"""
+    results_file = work_dir / "results.jsonl"
+    record = {
+        'timestamp': '2025-01-01T00:00:00',
+        'git': {'commit': 'abc1234', 'dirty': False},
+        'host': {'hostname': 'bench-host'},
+        'document': {'size': 'small'},
+        'fused': False,
+        'results': {
+            'forward': {'wall_time': 1.0, 'steps': {'convert_item_step0.py': 0.5, 'convert_subitem1_step0.py': 0.001}},
+            'reverse': {'wall_time': 0.2, 'steps': {'reverse_convert_item.py': 0.1}},
+        },
+    }
+    other_host = copy.deepcopy(record)
+    other_host['host']['hostname'] = 'other-host'
+    other_host['results']['forward']['wall_time'] = 0.1
+    append_record(results_file, record)
+    append_record(results_file, other_host)
+
+    current = copy.deepcopy(record)
+    current['results']['forward']['wall_time'] = 1.05
+    current['results']['forward']['steps'] = {'convert_item_step0.py': 0.8, 'convert_subitem1_step0.py': 0.004}
+    previous = load_previous_record(results_file, current)
+    results = [check(previous is not None and previous['results']['forward']['wall_time'] == 1.0,
+                     "同じ文書・同じホストの前回の結果を読み込みます")]
+    results.append(check(find_regressions(current, previous, 10.0) == ['forward/convert_item_step0.py'],
+                         "しきい値以上遅くなったステップのみを検出します（短いステップの揺らぎは除外）"))
+
+    current['document'] = {'size': 'large'}
+    results.append(check(load_previous_record(results_file, current) is None,
+                         "異なる文書の結果とは比較しません"))
+    return all(results)
+
+
+TESTS = [
+    ("01_generate_document", test_generate_document),
+    ("02_converted_depth", test_converted_depth),
+    ("03_benchmark_document", test_benchmark_document),
+    ("04_regressions", test_regressions),
+]
+
+
+def main():
+    """メイン関数"""
+    return run_suite("generate_benchmark_xml.py / benchmark_pipeline.py", TESTS)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
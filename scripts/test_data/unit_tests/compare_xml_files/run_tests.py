@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+compare_xml_files.py のテスト実行スクリプト
+
+次の点を確認する。
+- 共通の先頭・末尾を除いて作成した構造の差分が、元の行番号で正しい差分になること
+- 同じパスのテキストが出現順（同じパスでの出現番号）で比較されること
+- レポートが書き出され、差異の件数が最後に出力されること
+"""
+
+import io
+import sys
+import random
+import difflib
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# scripts/をインポートパスに追加
+script_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(script_dir))
+
+# unit_tests/（共通処理 suite_helpers.py）をインポートパスに追加
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from compare_xml_files import XMLComparator, unified_diff_trimmed
+from suite_helpers import check, run_suite
+
+
+def apply_unified_diff(seq1, diff_lines):
+    """unified diff を seq1 に適用した列を返す（文脈行・削除行が一致しない場合は AssertionError）"""
+    result = []
+    index = 0
+    for line in diff_lines:
+        if line.startswith(('---', '+++')):
+            continue
+        if line.startswith('@@'):
+            start, _, length = line.split()[1][1:].partition(',')
+            start = int(start) if length == '0' else int(start) - 1
+            result.extend(seq1[index:start])
+            index = start
+        elif line[0] == '+':
+            result.append(line[1:])
+        else:
+            assert seq1[index] == line[1:]
+            if line[0] == ' ':
+                result.append(seq1[index])
+            index += 1
+    return result + seq1[index:]
+
+
+def write_xml(path, body):
+    """テスト用のXMLファイルを作成"""
+    path.write_text(f'<?xml version="1.0" encoding="UTF-8"?>\n<Law><LawBody>{body}</LawBody></Law>\n',
+                    encoding='utf-8')
+    return str(path)
+
+
+def test_structure_diff(work_dir):
+    """共通の先頭・末尾を除いた差分が元の列の差分として正しい"""
+    rng = random.Random(1)
+    valid = True
+    for _ in range(500):
+        seq1 = [rng.choice('abcd') for _ in range(rng.randint(0, 40))]
+        seq2 = list(seq1)
+        for _ in range(rng.randint(0, 4)):
+            position = rng.randint(0, len(seq2))
+            if rng.random() < 0.5 and position < len(seq2):
+                del seq2[position]
+            else:
+                seq2.insert(position, rng.choice('abcde'))
+        diff = list(unified_diff_trimmed(seq1, seq2))
+        if (not diff) != (seq1 == seq2) or apply_unified_diff(seq1, diff) != seq2:
+            valid = False
+            break
+    results = [check(valid, "差分を適用すると比較先の列になります（同じ列では差分なし）")]
+
+    seq1 = [f"Law/Article{i}" for i in range(1000)]
+    seq2 = seq1[:700] + ["Law/Extra"] + seq1[700:]
+    expected = list(difflib.unified_diff(seq1, seq2, lineterm=''))
+    results.append(check(list(unified_diff_trimmed(seq1, seq2)) == expected,
+                         "ハンク見出しの行番号が元の列の行番号になります"))
+    return all(results)
+
+
+def test_text_ordinal(work_dir):
+    """同じパスのテキストは同じ出現番号のテキストと比較される"""
+    sentences = "".join(f"<Sentence>文{i}</Sentence>" for i in range(3))
+    changed = "<Sentence>文0</Sentence><Sentence>文1</Sentence><Sentence>改変</Sentence>"
+    file1 = write_xml(work_dir / "a.xml", sentences)
+    file2 = write_xml(work_dir / "b.xml", changed)
+
+    comparator = XMLComparator(file1, file2)
+    root1 = comparator.parse_xml(file1)
+    root2 = comparator.parse_xml(file2)
+    differences = comparator.compare_text_content(root1, root2)
+    return check(
+        [(d['file1_text'], d['file2_text']) for d in differences] == [("文2", "改変")],
+        "変更された3番目のテキストのみを差異として検出します"
+    )
+
+
+def test_report(work_dir):
+    """レポートの書き出しと件数"""
+    file1 = write_xml(work_dir / "a.xml", "<Sentence>同じ</Sentence>")
+    file2 = write_xml(work_dir / "b.xml", "<Sentence>違う</Sentence><Sentence>追加</Sentence>")
+
+    with redirect_stdout(io.StringIO()):
+        same_report = XMLComparator(file1, file1).compare()
+        comparator = XMLComparator(file1, file2)
+        report = comparator.compare()
+        output = io.StringIO()
+        XMLComparator(file1, file2).write_report(output)
+
+    results = [check(same_report.endswith("✓ 差異は検出されませんでした。"), "差異がない場合はその旨を出力します")]
+    results.append(check(f"検出された差異: {comparator.difference_count}件" in report
+                         and report.index("件") > report.index("1. STRUCTURE_ORDER_DIFFERENCE"),
+                         "差異の件数を差異の一覧の後に出力します"))
+    results.append(check(output.getvalue().rstrip("\n") == report,
+                         "write_report の出力と compare() の戻り値が一致します"))
+    return all(results)
+
+
+TESTS = [
+    ("01_structure_diff", test_structure_diff),
+    ("02_text_ordinal", test_text_ordinal),
+    ("03_report", test_report),
+]
+
+
+def main():
+    """メイン関数"""
+    return run_suite("compare_xml_files.py", TESTS)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
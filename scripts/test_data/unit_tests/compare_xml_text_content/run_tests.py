@@ -12,6 +12,27 @@ import difflib
 from pathlib import Path
 from lxml import etree
 
+# scripts/をインポートパスに追加
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
+
+import compare_xml_text_content
+
+def check_streaming_parity(xml_file):
+    """scan_xml_content（ストリーミング）の結果がツリーベースの基準実装と一致するか確認"""
+    tree = etree.parse(str(xml_file))
+    expected_digests = {compare_xml_text_content.text_digest(text)
+                        for text in compare_xml_text_content.get_all_texts(tree)}
+    expected_tables = compare_xml_text_content.get_table_sequence(tree)
+
+    summary = compare_xml_text_content.scan_xml_content(xml_file)
+    if set(summary.text_counts) != expected_digests:
+        print(f"❌ テキストの集合がツリーベースの結果と一致しません: {xml_file.name}")
+        return False
+    if summary.tables != expected_tables:
+        print(f"❌ 表の識別子がツリーベースの結果と一致しません: {xml_file.name}")
+        return False
+    return True
+
 def normalize_xml(xml_content):
     """XMLを正規化して比較しやすくする"""
     # XML宣言を除去
@@ -37,6 +58,12 @@ def run_test(test_dir):
     script_dir = Path(__file__).parent.parent.parent.parent
     script_path = script_dir / "compare_xml_text_content.py"
 
+    # ストリーミング走査とツリーベースの基準実装の一致
+    for xml_file in (original_file, final_correct_file, final_incorrect_file):
+        if xml_file.exists() and not check_streaming_parity(xml_file):
+            return False
+    print("✅ ストリーミング走査の結果がツリーベースの結果と一致しました")
+
     # テストケース1: 順序が正しい場合
     if final_correct_file.exists():
         print("\n--- テストケース1: 順序が正しい場合 ---")
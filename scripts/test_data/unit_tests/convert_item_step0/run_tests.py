@@ -10,7 +10,6 @@ import os
 import subprocess
 import difflib
 import json
-import shutil
 from pathlib import Path
 from lxml import etree
 
@@ -23,55 +22,25 @@ def normalize_xml(xml_content):
     root = etree.fromstring(xml_content)
     return etree.tostring(root, encoding='unicode', pretty_print=True)
 
-def enable_split_mode_for_test(test_name):
-    """モード2のテストケースの場合、設定を有効化"""
-    # モード2のテストケースを判定
-    mode2_tests = ['39_no_column_text_split_mode_basic', 
-                   '40_no_column_text_split_mode_with_column_list',
-                   '41_no_column_text_split_mode_with_figstruct',
-                   '42_table_struct_order_preservation']
-    
-    if test_name not in mode2_tests:
-        return None, None
-    
-    # 設定ファイルのパス
-    script_dir = Path(__file__).parent.parent.parent.parent
-    config_path = script_dir / "config" / "label_config.json"
-    backup_path = config_path.with_suffix('.json.backup')
-    
-    try:
-        # 設定ファイルを読み込む
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        
-        # バックアップを作成
-        shutil.copy2(config_path, backup_path)
-        
-        # 設定を有効化
-        if 'conversion_behaviors' in config:
-            if 'no_column_text_split_mode' in config['conversion_behaviors']:
-                config['conversion_behaviors']['no_column_text_split_mode']['enabled'] = True
-        
-        # 設定ファイルを書き込む
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
-        
-        return config_path, backup_path
-    except Exception as e:
-        print(f"⚠️ 設定ファイルの変更に失敗しました: {e}")
-        return None, None
-
-def restore_config(config_path, backup_path):
-    """設定ファイルを元に戻す"""
-    if config_path is None or backup_path is None:
-        return
-    
-    try:
-        if backup_path.exists():
-            shutil.copy2(backup_path, config_path)
-            backup_path.unlink()
-    except Exception as e:
-        print(f"⚠️ 設定ファイルの復元に失敗しました: {e}")
+# テストケースごとの label_config.json の上書き（設定ファイルは書き換えず、
+# 環境変数 XML_FORMATTER_CONFIG_OVERRIDES でスクリプトに渡す）
+SPLIT_MODE_OVERRIDES = {'conversion_behaviors.no_column_text_split_mode.enabled': True}
+CONFIG_OVERRIDES = {
+    # モード2のテストケース
+    '39_no_column_text_split_mode_basic': SPLIT_MODE_OVERRIDES,
+    '40_no_column_text_split_mode_with_column_list': SPLIT_MODE_OVERRIDES,
+    '41_no_column_text_split_mode_with_figstruct': SPLIT_MODE_OVERRIDES,
+    '42_table_struct_order_preservation': SPLIT_MODE_OVERRIDES,
+}
+
+def get_script_env(test_name):
+    """スクリプト実行時の環境変数（設定の上書きがあるテストケースは XML_FORMATTER_CONFIG_OVERRIDES を設定）"""
+    env = dict(os.environ)
+    overrides = CONFIG_OVERRIDES.get(test_name)
+    if overrides:
+        env['XML_FORMATTER_CONFIG_OVERRIDES'] = ';'.join(
+            f"{key}={json.dumps(value)}" for key, value in overrides.items())
+    return env
 
 def run_test(test_dir):
     """単一のテストケースを実行"""
@@ -90,9 +59,6 @@ def run_test(test_dir):
         print(f"❌ expected.xml が見つかりません: {expected_file}")
         return False
 
-    # モード2のテストケースの場合、設定を有効化
-    config_path, backup_path = enable_split_mode_for_test(test_name)
-
     # convert_item_step0.py を実行（出力を標準出力にリダイレクト）
     # スクリプトのパスを現在のワークスペースに合わせて設定
     script_dir = Path(__file__).parent.parent.parent.parent
@@ -106,7 +72,7 @@ def run_test(test_dir):
             sys.executable, str(script_path),
             str(input_file),
             str(output_file)
-        ], capture_output=True, text=True, timeout=30)
+        ], capture_output=True, text=True, timeout=30, env=get_script_env(test_name))
 
         if result.returncode != 0:
             print(f"❌ スクリプト実行エラー (終了コード: {result.returncode})")
@@ -164,9 +130,6 @@ def run_test(test_dir):
     except Exception as e:
         print(f"❌ 予期せぬエラー: {e}")
         return False
-    finally:
-        # 設定ファイルを元に戻す（成功時も失敗時も必ず実行）
-        restore_config(config_path, backup_path)
 
 def main():
     """メイン関数"""
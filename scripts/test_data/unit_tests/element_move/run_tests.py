@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+要素の移動による再構成（xml_converter.py / reverse_xml_converter.py）のテスト実行スクリプト
+
+変換で破棄される元の要素の内容をコピーせずに移動しても、出力が変わらないことを確認する。
+- List要素の各パターン（ラベル付き・テキスト・1カラム・3カラム・ColumnなしList・学年・科目名・ルビ）で、
+  移動して作成した子要素とコピーして作成した子要素が一致し、コピーの場合は元のList要素が変わらないこと
+- split_element_at_point で分割した2つの要素が、分割前の子要素と同じ内容になること
+- 逆変換のList要素の作成で、移動とコピーの結果が一致すること
+- 各テストケースの input.xml（SHARED_INPUTS のテストケースは他のスイートの入力）を順変換・逆変換した結果が、
+  移動に変更する前の出力（expected_forward.xml / expected_reverse.xml）とバイト単位で一致すること
+"""
+
+import sys
+from collections import defaultdict
+from pathlib import Path
+from lxml import etree
+
+# scripts/ と reverse_app/ をインポートパスに追加
+script_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(script_dir))
+sys.path.insert(0, str(script_dir.parent / "reverse_app"))
+
+# unit_tests/（共通処理 suite_helpers.py）をインポートパスに追加
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import step_registry
+from pipeline_engine import build_intermediate_paths, run_steps
+from xml_converter import ConversionConfig, create_element_from_list, split_element_at_point
+import reverse_xml_converter
+from suite_helpers import check, run_suite
+
+# テストケース名 → 他のスイートと共有する入力ファイル（テストケースのディレクトリにコピーを置かない）
+SHARED_INPUTS = {
+    '02_sample': Path(__file__).resolve().parent.parent / "step_cache" / "01_sample" / "input.xml",
+}
+
+ITEM_CONFIG = ConversionConfig(
+    parent_tag='Paragraph',
+    child_tag='Item',
+    title_tag='ItemTitle',
+    sentence_tag='ItemSentence',
+    column_condition_min=2,
+    supported_types=['labeled', 'subject_name', 'instruction', 'grade'],
+    script_name='element_move_test',
+    skip_empty_parent=False
+)
+
+# List要素の各パターン（create_element_from_list の分岐ごと）
+LIST_SAMPLES = {
+    'labeled_two_columns': '<List><ListSentence><Column Num="1"><Sentence Num="1">（１）</Sentence></Column>'
+                           '<Column Num="2"><Sentence Num="1">本文<Ruby>漢<Rt>かん</Rt></Ruby>字</Sentence>'
+                           '<Sentence Num="2">二文目</Sentence></Column></ListSentence></List>',
+    'labeled_three_columns': '<List><ListSentence><Column Num="1"><Sentence Num="1">ア</Sentence></Column>'
+                             '<Column Num="2"><Sentence Num="1">二列目</Sentence></Column>'
+                             '<Column Num="3"><Sentence Num="1">三列目</Sentence></Column></ListSentence></List>',
+    'text_two_columns': '<List><ListSentence><Column Num="1"><Sentence Num="1">用語</Sentence></Column>'
+                        '<Column Num="2"><Sentence Num="1">説明</Sentence></Column></ListSentence></List>',
+    'text_three_columns': '<List><ListSentence><Column Num="1"><Sentence Num="1">用語</Sentence></Column>'
+                          '<Column Num="2"><Sentence Num="1">説明</Sentence></Column>'
+                          '<Column Num="3"><Sentence Num="1">備考</Sentence></Column></ListSentence></List>',
+    'single_column': '<List><ListSentence><Column Num="1"><Sentence Num="1">一文目</Sentence>'
+                     '<Sentence Num="2">二文目</Sentence></Column></ListSentence></List>',
+    'no_column': '<List><ListSentence><Sentence Num="1" WritingMode="vertical">本文<Ruby>漢<Rt>かん</Rt></Ruby>字'
+                 '</Sentence></ListSentence></List>',
+    'grade': '<List><ListSentence><Sentence Num="1">〔第１学年〕</Sentence></ListSentence></List>',
+    'subject_name': '<List><ListSentence><Sentence Num="1">〔国語〕</Sentence></ListSentence></List>',
+    'instruction': '<List><ListSentence><Sentence Num="1">〔指導事項〕</Sentence></ListSentence></List>',
+}
+
+# 逆変換する子要素の各パターン（convert_child_to_list の分岐ごと）
+ITEM_SAMPLES = {
+    'title_and_sentence': '<Item Num="1"><ItemTitle>（１）</ItemTitle><ItemSentence>'
+                          '<Sentence Num="1">本文<Ruby>漢<Rt>かん</Rt></Ruby>字</Sentence></ItemSentence>'
+                          '<List><ListSentence><Sentence Num="1">続き</Sentence></ListSentence></List></Item>',
+    'no_title': '<Item Num="1"><ItemTitle/><ItemSentence><Sentence Num="1" WritingMode="vertical">本文</Sentence>'
+                '</ItemSentence></Item>',
+    'title_and_sentences': '<Item Num="1"><ItemTitle>ア</ItemTitle><ItemSentence><Sentence Num="1">一文目</Sentence>'
+                           '<Sentence Num="2">二文目</Sentence></ItemSentence></Item>',
+    'sentences': '<Item Num="1"><ItemTitle/><ItemSentence><Sentence Num="1">一文目</Sentence>'
+                 '<Sentence Num="2">二文目</Sentence></ItemSentence></Item>',
+    'title_and_columns': '<Item Num="1"><ItemTitle>ア</ItemTitle><ItemSentence>'
+                         '<Column Num="1"><Sentence Num="1">二列目</Sentence></Column>'
+                         '<Column Num="2"><Sentence Num="1">三列目</Sentence></Column></ItemSentence></Item>',
+    'columns': '<Item Num="1"><ItemTitle/><ItemSentence><Column Num="1"><Sentence Num="1">用語</Sentence></Column>'
+               '<Column Num="2"><Sentence Num="1">説明</Sentence></Column></ItemSentence>'
+               '<Subitem1 Num="1"><Subitem1Title>（ア）</Subitem1Title><Subitem1Sentence>'
+               '<Sentence Num="1">子要素</Sentence></Subitem1Sentence></Subitem1></Item>',
+}
+
+ITEM_REVERSE_CONFIG = reverse_xml_converter.ReverseConversionConfig(
+    parent_tag='Paragraph',
+    child_tag='Item',
+    title_tag='ItemTitle',
+    sentence_tag='ItemSentence',
+    script_name='element_move_test'
+)
+
+
+def to_bytes(elements):
+    """要素（のリスト）をシリアライズ"""
+    if not isinstance(elements, list):
+        elements = [elements]
+    return b''.join(etree.tostring(elem, encoding='utf-8') for elem in elements)
+
+
+def test_create_element_from_list(work_dir):
+    """List要素を子要素に変換する場合、移動とコピーの結果が一致する"""
+    results = []
+    for name, xml in LIST_SAMPLES.items():
+        copied_source = etree.fromstring(xml)
+        copied, _ = create_element_from_list(copied_source, ITEM_CONFIG, defaultdict(int))
+        moved, _ = create_element_from_list(etree.fromstring(xml), ITEM_CONFIG, defaultdict(int), move=True)
+        same = copied is not None and moved is not None and to_bytes(copied) == to_bytes(moved)
+        unchanged = to_bytes(copied_source) == to_bytes(etree.fromstring(xml))
+        results.append(check(same and unchanged, f"{name}: 移動とコピーの結果が一致し、コピーでは元の要素が変わりません"))
+    return all(results)
+
+
+def test_split_element_at_point(work_dir):
+    """分割した2つの要素が分割前の子要素と同じ内容になる"""
+    elem = etree.fromstring(
+        '<Item Num="3"><ItemTitle>（１）</ItemTitle><ItemSentence><Sentence Num="1">本文</Sentence></ItemSentence>'
+        '<List><ListSentence><Sentence Num="1">一</Sentence></ListSentence></List>'
+        '<List><ListSentence><Sentence Num="1">二</Sentence></ListSentence></List></Item>'
+    )
+    children = [to_bytes(child) for child in elem]
+    original_elem, new_elem = split_element_at_point(elem, 3, ITEM_CONFIG)
+    results = [
+        check([to_bytes(child) for child in original_elem] == children[:3] and original_elem.get('Num') == '3',
+              "分割位置より前の子要素と属性が元の要素に残ります"),
+        check([to_bytes(child) for child in list(new_elem)[-1:]] == children[3:],
+              "分割位置以降の子要素が新しい要素に移ります"),
+    ]
+    return all(results)
+
+
+def test_reverse_convert_child_to_list(work_dir):
+    """逆変換で子要素をList要素に変換する場合、内容を失わずに移動し、移動とコピーの結果が一致する"""
+    results = []
+    for name, xml in ITEM_SAMPLES.items():
+        source = etree.fromstring(xml)
+        text_before = "".join(source.itertext())
+        grandchildren_before = [to_bytes(child) for child in source
+                                if child.tag not in (ITEM_REVERSE_CONFIG.title_tag, ITEM_REVERSE_CONFIG.sentence_tag)]
+
+        list_elements, grandchildren = reverse_xml_converter.convert_child_to_list(
+            source, ITEM_REVERSE_CONFIG, defaultdict(int)
+        )
+        parent = etree.Element('Paragraph')
+        for elem in list_elements + grandchildren:
+            parent.append(elem)
+        preserved = ("".join(parent.itertext()) == text_before
+                     and [to_bytes(child) for child in grandchildren] == grandchildren_before)
+        results.append(check(len(list_elements) == 1 and preserved,
+                             f"{name}: テキストと孫要素のサブツリーがそのまま移動します"))
+
+    # List要素の作成関数ごとに、移動とコピーの結果を比較
+    def sentence_of(name):
+        return etree.fromstring(ITEM_SAMPLES[name]).find('ItemSentence/Sentence')
+
+    def sentences_of(name):
+        return etree.fromstring(ITEM_SAMPLES[name]).findall('ItemSentence/Sentence')
+
+    def columns_of(name):
+        return etree.fromstring(ITEM_SAMPLES[name]).findall('ItemSentence/Column')
+
+    builders = {
+        'create_list_element_with_columns': lambda move: reverse_xml_converter.create_list_element_with_columns(
+            '（１）', '', sentence_of('title_and_sentence'), move=move),
+        'create_list_element_no_columns': lambda move: reverse_xml_converter.create_list_element_no_columns(
+            '', sentence_of('no_title'), move=move),
+        'create_list_element_with_columns_and_multiple_sentences':
+            lambda move: reverse_xml_converter.create_list_element_with_columns_and_multiple_sentences(
+                'ア', sentences_of('title_and_sentences'), move=move),
+        'create_list_element_with_column_and_multiple_sentences':
+            lambda move: reverse_xml_converter.create_list_element_with_column_and_multiple_sentences(
+                sentences_of('sentences'), move=move),
+        'create_list_element_with_title_and_multiple_columns':
+            lambda move: reverse_xml_converter.create_list_element_with_title_and_multiple_columns(
+                'ア', columns_of('title_and_columns'), move=move),
+        'create_list_element_with_multiple_columns':
+            lambda move: reverse_xml_converter.create_list_element_with_multiple_columns(
+                columns_of('columns'), move=move),
+    }
+    for name, build in builders.items():
+        results.append(check(to_bytes(build(False)) == to_bytes(build(True)), f"{name}: 移動とコピーの結果が一致します"))
+    return all(results)
+
+
+def run_direction(input_path, output_path, direction, work_dir, sequential=False):
+    """順変換または逆変換の全ステップを実行（sequential=Trueの場合は中間ファイルを書き出す）"""
+    script_names = step_registry.get_step_order(direction)
+    intermediate_paths = (build_intermediate_paths(input_path, work_dir / f"{direction}_steps", script_names)
+                          if sequential else None)
+    success, error_msg, _ = run_steps(input_path, output_path, script_names,
+                                      intermediate_paths=intermediate_paths, capture_output=True)
+    if not success:
+        raise RuntimeError(f"{direction} の変換に失敗しました: {error_msg}")
+    return output_path.read_bytes()
+
+
+def test_pipeline_output(work_dir):
+    """各テストケースの順変換・逆変換の出力が、移動に変更する前の出力と一致する"""
+    results = []
+    for case_dir in sorted(path for path in Path(__file__).parent.iterdir()
+                           if (path / "expected_forward.xml").exists()):
+        input_path = SHARED_INPUTS.get(case_dir.name, case_dir / "input.xml")
+        expected_forward = (case_dir / "expected_forward.xml").read_bytes()
+        expected_reverse = (case_dir / "expected_reverse.xml").read_bytes()
+        for sequential in (False, True):
+            mode = "ステップごと" if sequential else "一括変換"
+            forward_path = work_dir / f"{case_dir.name}_{int(sequential)}_forward.xml"
+            forward = run_direction(input_path, forward_path, step_registry.DIRECTION_FORWARD,
+                                    work_dir, sequential)
+            results.append(check(forward == expected_forward, f"{case_dir.name}: 順変換（{mode}）の出力が一致します"))
+
+        reverse_path = work_dir / f"{case_dir.name}_reverse.xml"
+        reverse = run_direction(case_dir / "expected_forward.xml", reverse_path, step_registry.DIRECTION_REVERSE,
+                                work_dir, sequential=True)
+        results.append(check(reverse == expected_reverse, f"{case_dir.name}: 逆変換の出力が一致します"))
+    return all(results)
+
+
+TESTS = [
+    ("01_create_element_from_list", test_create_element_from_list),
+    ("02_split_element_at_point", test_split_element_at_point),
+    ("03_reverse_convert_child_to_list", test_reverse_convert_child_to_list),
+    ("04_pipeline_output", test_pipeline_output),
+]
+
+
+def main():
+    """メイン関数"""
+    return run_suite("要素の移動による再構成", TESTS)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
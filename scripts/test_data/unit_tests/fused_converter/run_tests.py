@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+xml_converter.convert_tree_fused の一致テスト
+
+convert_item_step0 ～ convert_subitem10_step0 の各テストケースの input.xml について、
+11個の変換スクリプトを順番に実行した結果（ファイル経由）と、1回の走査でまとめて変換した結果が
+バイト単位で一致することを確認する。
+"""
+
+import io
+import sys
+import difflib
+import tempfile
+import importlib
+from contextlib import redirect_stdout
+from pathlib import Path
+from lxml import etree
+
+# scripts/をインポートパスに追加
+script_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(script_dir))
+
+import xml_converter
+
+# 変換スクリプト（実行順）
+CONVERTER_MODULES = ['convert_item_step0'] + [f'convert_subitem{i}_step0' for i in range(1, 11)]
+
+
+def collect_input_files(unit_tests_dir):
+    """各変換スクリプトのテストケースのinput.xmlを収集"""
+    input_files = []
+    for module_name in CONVERTER_MODULES:
+        test_root = unit_tests_dir / module_name
+        if test_root.is_dir():
+            input_files.extend(sorted(test_root.glob('*/input.xml')))
+    return input_files
+
+
+def run_sequential(input_file, configs, work_dir):
+    """変換スクリプトを順番に実行した場合の出力（各ステップでファイルに書き出して再パース）"""
+    current_input = input_file
+    for i, config in enumerate(configs):
+        output_file = work_dir / f"step_{i:02d}.xml"
+        with redirect_stdout(io.StringIO()):
+            result = xml_converter.process_xml_file(str(current_input), str(output_file), config)
+        if result != 0:
+            raise RuntimeError(f"{config.script_name} の実行に失敗しました")
+        current_input = output_file
+    return current_input.read_bytes()
+
+
+def run_fused(input_file, configs, work_dir):
+    """1回の走査でまとめて変換した場合の出力"""
+    tree = etree.parse(str(input_file))
+    with redirect_stdout(io.StringIO()):
+        xml_converter.convert_tree_fused(tree, configs)
+    output_file = work_dir / "fused.xml"
+    xml_converter.format_xml_lxml(tree, str(output_file))
+    return output_file.read_bytes()
+
+
+def run_test(input_file, configs, unit_tests_dir):
+    """単一のテストケースを実行"""
+    test_name = str(input_file.parent.relative_to(unit_tests_dir))
+    print(f"\n=== テスト実行: {test_name} ===")
+
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            work_dir = Path(temp_dir)
+            expected = run_sequential(input_file, configs, work_dir)
+            actual = run_fused(input_file, configs, work_dir)
+    except Exception as e:
+        print(f"❌ 予期せぬエラー: {e}")
+        return False
+
+    if actual == expected:
+        print("✅ テスト成功: 順次実行の出力と一致します")
+        return True
+
+    print("❌ テスト失敗: 順次実行の出力と一致しません")
+    print("\n差分:")
+    diff = difflib.unified_diff(
+        expected.decode('utf-8').splitlines(keepends=True),
+        actual.decode('utf-8').splitlines(keepends=True),
+        fromfile='sequential.xml',
+        tofile='fused.xml'
+    )
+    print(''.join(diff))
+    return False
+
+
+def main():
+    """メイン関数"""
+    unit_tests_dir = Path(__file__).resolve().parent.parent
+    configs = [importlib.import_module(name).CONFIG for name in CONVERTER_MODULES]
+
+    print("xml_converter.convert_tree_fused 一致テスト実行")
+    print("=" * 50)
+
+    input_files = collect_input_files(unit_tests_dir)
+    total_tests = len(input_files)
+    passed_tests = 0
+
+    for input_file in input_files:
+        if run_test(input_file, configs, unit_tests_dir):
+            passed_tests += 1
+
+    print("\n" + "=" * 50)
+    print(f"テスト結果: {passed_tests}/{total_tests} 成功")
+
+    if passed_tests == total_tests:
+        print("🎉 すべてのテストが成功しました！")
+        return 0
+    else:
+        print("⚠️ 一部のテストが失敗しました。")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
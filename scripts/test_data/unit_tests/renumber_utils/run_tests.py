@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+utils/renumber_utils.py の単体テスト実行スクリプト
+
+各テストケースの input.xml をデフォルトマッピングで振り直し、
+- ElementTreeベース処理: 正規化したXMLが expected.xml と一致すること
+- テキストベース処理（preserve_formatting=True）: 出力が expected.xml とバイト単位で一致すること
+を確認する。
+"""
+
+import sys
+import difflib
+import tempfile
+from pathlib import Path
+from lxml import etree
+
+# scripts/をインポートパスに追加
+script_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(script_dir))
+
+from utils.renumber_utils import renumber_nums_in_file, get_default_mappings
+
+
+def normalize_xml(xml_bytes):
+    """XMLを正規化して比較しやすくする"""
+    parser = etree.XMLParser(remove_blank_text=True)
+    root = etree.fromstring(xml_bytes, parser)
+    return etree.tostring(root, encoding='unicode', pretty_print=True)
+
+
+def print_diff(expected, actual):
+    """差分を表示"""
+    print("\n差分:")
+    diff = difflib.unified_diff(
+        expected.splitlines(keepends=True),
+        actual.splitlines(keepends=True),
+        fromfile='expected.xml',
+        tofile='output.xml'
+    )
+    print(''.join(diff))
+
+
+def run_test(test_dir):
+    """単一のテストケースを実行"""
+    test_name = test_dir.name
+    input_file = test_dir / "input.xml"
+    expected_file = test_dir / "expected.xml"
+
+    print(f"\n=== テスト実行: {test_name} ===")
+
+    if not input_file.exists() or not expected_file.exists():
+        print(f"❌ input.xml または expected.xml が見つかりません: {test_dir}")
+        return False
+
+    expected_bytes = expected_file.read_bytes()
+    success = True
+
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tree_output = Path(temp_dir) / "tree.xml"
+            text_output = Path(temp_dir) / "text.xml"
+            renumber_nums_in_file(input_file, tree_output, get_default_mappings())
+            renumber_nums_in_file(input_file, text_output, get_default_mappings(),
+                                  preserve_formatting=True)
+            tree_bytes = tree_output.read_bytes()
+            text_bytes = text_output.read_bytes()
+    except Exception as e:
+        print(f"❌ 予期せぬエラー: {e}")
+        return False
+
+    expected_normalized = normalize_xml(expected_bytes)
+    tree_normalized = normalize_xml(tree_bytes)
+    if tree_normalized == expected_normalized:
+        print("✅ ElementTreeベース: 出力が期待値と一致します")
+    else:
+        print("❌ ElementTreeベース: 出力が期待値と一致しません")
+        print_diff(expected_normalized, tree_normalized)
+        success = False
+
+    if text_bytes == expected_bytes:
+        print("✅ テキストベース: 出力が期待値とバイト単位で一致します")
+    else:
+        print("❌ テキストベース: 出力が期待値と一致しません")
+        print_diff(expected_bytes.decode('utf-8'), text_bytes.decode('utf-8'))
+        success = False
+
+    return success
+
+
+def main():
+    """メイン関数"""
+    test_root = Path(__file__).parent
+
+    print("utils/renumber_utils.py 単体テスト実行")
+    print("=" * 50)
+
+    test_dirs = sorted(item for item in test_root.iterdir()
+                       if item.is_dir() and item.name[:2].isdigit())
+
+    total_tests = len(test_dirs)
+    passed_tests = 0
+
+    for test_dir in test_dirs:
+        if run_test(test_dir):
+            passed_tests += 1
+
+    print("\n" + "=" * 50)
+    print(f"テスト結果: {passed_tests}/{total_tests} 成功")
+
+    if passed_tests == total_tests:
+        print("🎉 すべてのテストが成功しました！")
+        return 0
+    else:
+        print("⚠️ 一部のテストが失敗しました。")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
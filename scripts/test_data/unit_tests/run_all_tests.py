@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+単体テストの一括実行スクリプト（並列・インプロセス）
+
+unit_tests/ 配下（と reverse_app/test_data/unit_tests）のテストスイートを探索し、
+まとめて実行する。
+
+- 変換スクリプトのスイート（SUITE_SCRIPTS）: 各テストケースの input.xml を、ワーカープロセス内で
+  pipeline_engine.run_steps により変換する（変換スクリプトの読み込みはワーカーごとに1回）。
+  出力と expected.xml は C14N（正規化XML）で比較する（属性の順序・空要素の表記等の違いは無視）。
+- その他のスイート: スイートの run_tests.py をワーカーから実行し、「テスト結果: x/y 成功」を集計する。
+
+スイートの run_tests.py にテストケースごとの設定の上書き（CONFIG_OVERRIDES）がある場合は、
+上書きを適用したラベル設定を run_steps に渡す（label_config.json は書き換えないため、他のテストケースと並列に実行できる）。
+
+結果はテストケースごとの実行時間とともに、JUnit XML・JSON 形式で出力できる。
+
+使用例:
+  python3 run_all_tests.py
+  python3 run_all_tests.py --workers 8 --junit report.xml --json report.json
+  python3 run_all_tests.py --suite convert_subitem3_step0 -k 30_
+  python3 run_all_tests.py --fixtures-only --keep-output
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import difflib
+import argparse
+import tempfile
+import subprocess
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from lxml import etree
+
+# scripts/をインポートパスに追加
+unit_tests_dir = Path(__file__).resolve().parent
+script_dir = unit_tests_dir.parent.parent
+sys.path.insert(0, str(script_dir))
+
+import step_registry
+
+
+# スイート名 → 変換するスクリプト（実行順。テストケースの input.xml を変換して expected.xml と比較する）
+SUITE_SCRIPTS: Dict[str, List[str]] = {
+    'preprocess_non_first_sentence_to_list': ['preprocess_non_first_sentence_to_list.py'],
+    'article_focused': ['convert_article_focused.py'],
+    'paragraph_step3': ['convert_paragraph_step3.py'],
+    'convert_item_step0': ['convert_item_step0.py'],
+    **{f'convert_subitem{i}_step0': [f'convert_subitem{i}_step0.py'] for i in range(1, 11)},
+    'reverse_app': step_registry.get_step_order(step_registry.DIRECTION_REVERSE),
+}
+
+# unit_tests/ 以外にあるスイートのディレクトリ
+SUITE_DIRS = {
+    'reverse_app': script_dir.parent / "reverse_app" / "test_data" / "unit_tests",
+}
+
+# スイートの run_tests.py に定義されている、テストケース名 → label_config.json の上書き
+# （ドット区切りのキー → 値）の辞書
+CONFIG_OVERRIDES_NAME = 'CONFIG_OVERRIDES'
+
+# run_tests.py の集計行
+SUMMARY_PATTERN = re.compile(r'テスト結果: (\d+)/(\d+) 成功')
+
+# 結果の状態
+STATUS_PASSED = 'passed'
+STATUS_FAILED = 'failed'
+STATUS_ERROR = 'error'
+
+
+# ============================================================================
+# 探索
+# ============================================================================
+
+class TestCase:
+    """1つのテストケース（変換スクリプトのスイートのテストケース、または run_tests.py 全体）"""
+
+    def __init__(self, suite: str, name: str, path: Path, script_names: Optional[List[str]] = None):
+        self.suite = suite
+        self.name = name
+        self.path = path                  # テストケースのディレクトリ（run_tests.py の場合はそのパス）
+        self.script_names = script_names  # Noneの場合は run_tests.py を実行する
+        self.config_overrides: Dict = {}  # label_config.json の上書き（ドット区切りのキー → 値）
+
+    @property
+    def is_fixture(self) -> bool:
+        return self.script_names is not None
+
+
+def get_suite_dirs() -> Dict[str, Path]:
+    """スイート名 → ディレクトリ（run_tests.py があるもの）"""
+    suites = {}
+    for item in sorted(unit_tests_dir.iterdir()):
+        if item.is_dir() and (item / "run_tests.py").exists():
+            suites[item.name] = item
+    for name, path in SUITE_DIRS.items():
+        if (path / "run_tests.py").exists():
+            suites[name] = path
+    return suites
+
+
+def load_config_overrides(suite_dir: Path) -> Dict[str, Dict]:
+    """
+    スイートの run_tests.py からテストケースごとの設定の上書きを読み込む
+
+    Returns:
+        テストケース名 → 上書きの辞書（定義されていない場合は空の辞書）
+    """
+    run_tests = suite_dir / "run_tests.py"
+    if CONFIG_OVERRIDES_NAME not in run_tests.read_text(encoding='utf-8'):
+        return {}
+    spec = importlib.util.spec_from_file_location(f"{suite_dir.name}_run_tests", run_tests)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, CONFIG_OVERRIDES_NAME)
+
+
+def discover_cases(suite_names: Optional[List[str]] = None, keyword: Optional[str] = None,
+                   fixtures_only: bool = False) -> List[TestCase]:
+    """
+    テストケースを探索
+
+    Args:
+        suite_names: 対象のスイート名（Noneの場合はすべて）
+        keyword: テストケース名に含まれる文字列で絞り込む
+        fixtures_only: 変換スクリプトのスイートのみを対象にする
+    """
+    cases = []
+    for suite, suite_dir in get_suite_dirs().items():
+        if suite_names and suite not in suite_names:
+            continue
+        script_names = SUITE_SCRIPTS.get(suite)
+        if script_names is None:
+            if not fixtures_only and not keyword:
+                cases.append(TestCase(suite, "run_tests.py", suite_dir / "run_tests.py"))
+            continue
+
+        config_overrides = load_config_overrides(suite_dir)
+        for case_dir in sorted(suite_dir.iterdir()):
+            if not (case_dir.is_dir() and case_dir.name[:2].isdigit()):
+                continue
+            if keyword and keyword not in case_dir.name:
+                continue
+            case = TestCase(suite, case_dir.name, case_dir, script_names)
+            case.config_overrides = config_overrides.get(case_dir.name, {})
+            cases.append(case)
+    return cases
+
+
+# ============================================================================
+# 実行
+# ============================================================================
+
+def canonicalize(xml_path: Path) -> str:
+    """ルート要素をC14N（正規化XML）で文字列化"""
+    root = etree.parse(str(xml_path)).getroot()
+    return etree.tostring(root, method='c14n').decode('utf-8')
+
+
+def _init_worker() -> None:
+    """ワーカープロセスの初期化（変換スクリプトを1回だけ読み込む）"""
+    import pipeline_engine  # noqa: F401
+
+
+def run_fixture_case(case: TestCase, keep_output: bool = False) -> Dict:
+    """
+    変換スクリプトのテストケースを実行
+
+    Args:
+        case: テストケース
+        keep_output: 出力をテストケースのディレクトリに output.xml として残すか
+    """
+    from pipeline_engine import run_steps
+    from utils.config_registry import resolve_settings
+
+    result = {"suite": case.suite, "name": case.name, "status": STATUS_ERROR,
+              "time": 0.0, "message": None, "diff": None}
+    start = time.perf_counter()
+    input_file = case.path / "input.xml"
+    expected_file = case.path / "expected.xml"
+    try:
+        if not input_file.exists() or not expected_file.exists():
+            result["message"] = f"input.xml / expected.xml が見つかりません: {case.path}"
+            return result
+
+        settings = resolve_settings(case.config_overrides) if case.config_overrides else None
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_file = case.path / "output.xml" if keep_output else Path(temp_dir) / "output.xml"
+            with redirect_stdout(io.StringIO()):
+                success, error_msg, _ = run_steps(input_file, output_file, case.script_names,
+                                                  capture_output=True, settings=settings)
+            if not success:
+                result["message"] = error_msg
+                return result
+
+            actual = canonicalize(output_file)
+        expected = canonicalize(expected_file)
+        if actual == expected:
+            result["status"] = STATUS_PASSED
+        else:
+            result["status"] = STATUS_FAILED
+            result["message"] = "出力が期待値と一致しません"
+            result["diff"] = ''.join(difflib.unified_diff(
+                expected.splitlines(keepends=True), actual.splitlines(keepends=True),
+                fromfile='expected.xml', tofile='output.xml'))
+    except Exception as e:
+        result["status"] = STATUS_ERROR
+        result["message"] = f"予期せぬエラー: {e}"
+    finally:
+        result["time"] = time.perf_counter() - start
+    return result
+
+
+def run_script_suite(case: TestCase, timeout: int = 1800) -> Dict:
+    """スイートの run_tests.py を実行し、集計行から結果を取得"""
+    result = {"suite": case.suite, "name": case.name, "status": STATUS_ERROR,
+              "time": 0.0, "message": None, "diff": None}
+    start = time.perf_counter()
+    try:
+        completed = subprocess.run([sys.executable, str(case.path)], cwd=str(case.path.parent),
+                                   capture_output=True, text=True, timeout=timeout)
+        matches = SUMMARY_PATTERN.findall(completed.stdout)
+        if matches:
+            passed, total = (int(value) for value in matches[-1])
+            result["passed"] = passed
+            result["total"] = total
+            result["message"] = f"テスト結果: {passed}/{total} 成功"
+        if completed.returncode == 0:
+            result["status"] = STATUS_PASSED
+        else:
+            result["status"] = STATUS_FAILED if matches else STATUS_ERROR
+            result["output"] = (completed.stdout + completed.stderr)[-20000:]
+    except subprocess.TimeoutExpired:
+        result["message"] = f"タイムアウト（{timeout}秒）"
+    finally:
+        result["time"] = time.perf_counter() - start
+    return result
+
+
+def run_case(case: TestCase, keep_output: bool = False) -> Dict:
+    """テストケースを実行（ワーカープロセスから呼び出す）"""
+    if case.is_fixture:
+        return run_fixture_case(case, keep_output)
+    return run_script_suite(case)
+
+
+def run_cases(cases: List[TestCase], workers: int, keep_output: bool = False) -> List[Dict]:
+    """
+    テストケースを並列に実行
+
+    Returns:
+        テストケースと同じ順序の結果のリスト
+    """
+    if not cases:
+        return []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = [executor.submit(run_case, case, keep_output) for case in cases]
+        return [future.result() for future in futures]
+
+
+# ============================================================================
+# 出力
+# ============================================================================
+
+def count_results(results: List[Dict]) -> Dict[str, int]:
+    """結果の件数を集計"""
+    return {
+        "tests": len(results),
+        "passed": sum(1 for r in results if r["status"] == STATUS_PASSED),
+        "failures": sum(1 for r in results if r["status"] == STATUS_FAILED),
+        "errors": sum(1 for r in results if r["status"] == STATUS_ERROR),
+        "time": sum(r["time"] for r in results),
+    }
+
+
+def group_by_suite(results: List[Dict]) -> Dict[str, List[Dict]]:
+    """スイートごとに結果をまとめる（実行順）"""
+    suites: Dict[str, List[Dict]] = {}
+    for result in results:
+        suites.setdefault(result["suite"], []).append(result)
+    return suites
+
+
+def print_results(results: List[Dict], diff_lines: int) -> None:
+    """結果を表示"""
+    for suite, suite_results in group_by_suite(results).items():
+        print(f"\n=== {suite} ===")
+        for result in suite_results:
+            mark = '✅' if result["status"] == STATUS_PASSED else '❌'
+            message = f" - {result['message']}" if result["message"] else ""
+            print(f"{mark} {result['name']} ({result['time']:.2f}秒){message}")
+            if result["status"] != STATUS_PASSED and result.get("diff"):
+                lines = result["diff"].splitlines()
+                print('\n'.join(lines[:diff_lines]))
+                if len(lines) > diff_lines:
+                    print(f"...（差分 {len(lines) - diff_lines} 行を省略）")
+        if len(suite_results) == 1 and "total" in suite_results[0]:
+            # run_tests.py のスイートは、その集計行の件数を表示する
+            passed, total = suite_results[0]["passed"], suite_results[0]["total"]
+        else:
+            counts = count_results(suite_results)
+            passed, total = counts["passed"], counts["tests"]
+        print(f"{suite}: テスト結果: {passed}/{total} 成功")
+
+
+def build_junit(results: List[Dict]) -> etree._ElementTree:
+    """JUnit XML 形式の結果を作成"""
+    counts = count_results(results)
+    testsuites = etree.Element("testsuites", tests=str(counts["tests"]), failures=str(counts["failures"]),
+                               errors=str(counts["errors"]), time=f"{counts['time']:.3f}")
+    for suite, suite_results in group_by_suite(results).items():
+        suite_counts = count_results(suite_results)
+        testsuite = etree.SubElement(testsuites, "testsuite", name=suite, tests=str(suite_counts["tests"]),
+                                     failures=str(suite_counts["failures"]),
+                                     errors=str(suite_counts["errors"]), time=f"{suite_counts['time']:.3f}")
+        for result in suite_results:
+            testcase = etree.SubElement(testsuite, "testcase", classname=suite, name=result["name"],
+                                        time=f"{result['time']:.3f}")
+            if result["status"] != STATUS_PASSED:
+                tag = "failure" if result["status"] == STATUS_FAILED else "error"
+                detail = etree.SubElement(testcase, tag, message=result["message"] or "")
+                detail.text = result.get("diff") or result.get("output") or ""
+            elif result["message"]:
+                etree.SubElement(testcase, "system-out").text = result["message"]
+    etree.indent(testsuites, space="  ")
+    return etree.ElementTree(testsuites)
+
+
+def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description='単体テストを並列・インプロセスで一括実行します')
+    parser.add_argument('--suite', nargs='+', default=None, help='実行するスイート名（デフォルト: すべて）')
+    parser.add_argument('-k', '--keyword', default=None,
+                        help='テストケース名に含まれる文字列で絞り込む（run_tests.py のスイートは除外）')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='ワーカープロセス数（デフォルト: CPUコア数）')
+    parser.add_argument('--fixtures-only', action='store_true', help='変換スクリプトのスイートのみ実行する')
+    parser.add_argument('--keep-output', action='store_true',
+                        help='出力をテストケースのディレクトリに output.xml として残す')
+    parser.add_argument('--junit', default=None, help='JUnit XML 形式の結果の出力先')
+    parser.add_argument('--json', default=None, help='JSON 形式の結果の出力先')
+    parser.add_argument('--diff-lines', type=int, default=40, help='失敗時に表示する差分の最大行数')
+    args = parser.parse_args()
+
+    print("単体テスト一括実行")
+    print("=" * 50)
+
+    cases = discover_cases(args.suite, args.keyword, args.fixtures_only)
+    if not cases:
+        print("❌ 実行するテストケースがありません")
+        return 1
+
+    start = time.perf_counter()
+    results = run_cases(cases, max(1, args.workers), args.keep_output)
+    elapsed = time.perf_counter() - start
+
+    print_results(results, args.diff_lines)
+
+    counts = count_results(results)
+    if args.junit:
+        build_junit(results).write(args.junit, encoding='utf-8', xml_declaration=True)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"summary": {**counts, "elapsed": elapsed}, "results": results},
+                      f, ensure_ascii=False, indent=2)
+
+    print("\n" + "=" * 50)
+    print(f"テスト結果: {counts['passed']}/{counts['tests']} 成功（{elapsed:.1f}秒）")
+
+    if counts["passed"] == counts["tests"]:
+        print("🎉 すべてのテストが成功しました！")
+        return 0
+    else:
+        print("⚠️ 一部のテストが失敗しました。")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+run_batch.py（入力フォルダの並列一括変換）のテスト実行スクリプト
+
+変換中にワーカープロセスが異常終了する（os._exit で終了する）ファイルを含むフォルダを変換し、
+次の点を確認する。
+- 異常終了の原因のファイルだけが失敗になり、他のファイルは変換されること
+- 原因のファイルが複数ある場合も、それぞれのファイルだけが失敗になること
+- すべてのファイルについて1回ずつ進捗が通知されること
+
+入力には step_cache スイートのテストケースを使う。
+ワーカープロセスの convert_file を置き換えるため、プロセスの開始方法は fork を使う。
+"""
+
+import os
+import sys
+import shutil
+import multiprocessing
+from pathlib import Path
+
+# scripts/をインポートパスに追加
+script_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(script_dir))
+
+# unit_tests/（共通処理 suite_helpers.py）をインポートパスに追加
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import run_batch
+from suite_helpers import check, run_suite
+
+# 入力ファイル（step_cache スイートのテストケース）
+SAMPLE_INPUT = Path(__file__).resolve().parent.parent / "step_cache" / "01_sample" / "input.xml"
+
+# ファイル名にこの文字列を含むファイルの変換中にワーカープロセスを異常終了させる
+CRASH_MARKER = "crash"
+
+_convert_file = run_batch.convert_file
+
+
+def convert_or_crash(xml_file, *args, **kwargs):
+    """CRASH_MARKER を含むファイルではワーカープロセスを異常終了させる"""
+    if CRASH_MARKER in Path(xml_file).name:
+        os._exit(1)
+    return _convert_file(xml_file, *args, **kwargs)
+
+
+def convert_folder(work_dir, names, workers):
+    """names のファイルを作成して一括変換し、(ファイル名 → 結果, 進捗の通知) を返す"""
+    input_folder = work_dir / "input"
+    input_folder.mkdir()
+    for name in names:
+        shutil.copy(SAMPLE_INPUT, input_folder / name)
+
+    progress = []
+    run_batch.convert_file = convert_or_crash
+    try:
+        results = run_batch.run_batch(input_folder, work_dir / "output", workers=workers,
+                                      write_intermediate=False,
+                                      progress_callback=lambda completed, total, result: progress.append(completed))
+    finally:
+        run_batch.convert_file = _convert_file
+    return {result["file"]: result for result in results}, progress
+
+
+def check_results(results, progress, names):
+    """原因のファイルだけが失敗になり、他のファイルは変換されたことを確認"""
+    crashed = sorted(name for name in names if CRASH_MARKER in name)
+    failed = sorted(name for name, result in results.items() if result["status"] == "failed")
+    succeeded = sorted(name for name, result in results.items() if result["status"] == "success")
+    return all([
+        check(failed == crashed and all("異常終了" in results[name]["message"] for name in failed),
+              f"異常終了の原因のファイルだけが失敗になります（{', '.join(failed)}）"),
+        check(succeeded == sorted(set(names) - set(crashed)),
+              f"他のファイルは変換されます（{len(succeeded)}/{len(names) - len(crashed)}）"),
+        check(progress == list(range(1, len(names) + 1)), "すべてのファイルの進捗が1回ずつ通知されます"),
+    ])
+
+
+def test_single_crash(work_dir):
+    """1つのファイルでワーカープロセスが異常終了する"""
+    names = ["a.xml", "b.xml", "c_crash.xml", "d.xml", "e.xml", "f.xml"]
+    results, progress = convert_folder(work_dir, names, workers=2)
+    return check_results(results, progress, names)
+
+
+def test_multiple_crashes(work_dir):
+    """複数のファイルでワーカープロセスが異常終了する"""
+    names = ["a_crash.xml", "b.xml", "c.xml", "d_crash.xml", "e.xml", "f.xml", "g_crash.xml"]
+    results, progress = convert_folder(work_dir, names, workers=3)
+    return check_results(results, progress, names)
+
+
+TESTS = [
+    ("01_single_crash", test_single_crash),
+    ("02_multiple_crashes", test_multiple_crashes),
+]
+
+
+def main():
+    """メイン関数"""
+    multiprocessing.set_start_method("fork", force=True)
+    return run_suite("run_batch.py", TESTS)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
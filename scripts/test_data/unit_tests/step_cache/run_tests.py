@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+pipeline_engine.run_steps のステップ結果キャッシュ（utils/step_cache.py）のテスト実行スクリプト
+
+各テストケースの input.xml について、次の点を確認する。
+- キャッシュなしの実行と、キャッシュありの初回・2回目の実行で最終出力・中間ファイルがバイト単位で一致すること
+- 2回目の実行では全ステップがキャッシュから再利用されること
+- 先頭の一部のステップだけを実行した後の全ステップ実行では、キャッシュ済みのステップから再開すること
+- 中間ファイルを書き出さない実行（融合ステップ）の出力もキャッシュされ、同じ結果になること
+- サイズ上限を超えた場合、最終使用時刻の古いエントリから削除されること
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# scripts/をインポートパスに追加
+script_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(script_dir))
+
+# unit_tests/（共通処理 suite_helpers.py）をインポートパスに追加
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from pipeline_engine import DEFAULT_STEP_ORDER, build_intermediate_paths, run_steps
+from utils.step_cache import StepCache
+from suite_helpers import check, print_summary
+
+
+def run_pipeline(input_file, work_dir, name, script_names=DEFAULT_STEP_ORDER,
+                 write_intermediate=True, step_cache=None):
+    """
+    エンジンで変換し、出力ファイルの内容と実行ログを返す
+
+    Returns:
+        (outputs: {ファイル名: バイト列}, execution_log)
+    """
+    run_dir = work_dir / name
+    intermediate_paths = (build_intermediate_paths(input_file, run_dir, script_names)
+                          if write_intermediate else None)
+    success, error_msg, execution_log = run_steps(
+        input_file, run_dir / "final.xml", list(script_names),
+        intermediate_paths=intermediate_paths,
+        capture_output=True,
+        step_cache=step_cache
+    )
+    if not success:
+        raise RuntimeError(error_msg)
+    outputs = {path.name: path.read_bytes() for path in sorted(run_dir.iterdir())}
+    return outputs, execution_log
+
+
+def run_test(test_dir):
+    """単一のテストケースを実行"""
+    input_file = test_dir / "input.xml"
+    print(f"\n=== テスト実行: {test_dir.name} ===")
+
+    if not input_file.exists():
+        print(f"❌ input.xml が見つかりません: {test_dir}")
+        return False
+
+    total_steps = len(DEFAULT_STEP_ORDER)
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            work_dir = Path(temp_dir)
+            cache = StepCache(work_dir / "cache")
+
+            expected, _ = run_pipeline(input_file, work_dir, "no_cache")
+            cold, cold_log = run_pipeline(input_file, work_dir, "cold", step_cache=cache)
+            warm, warm_log = run_pipeline(input_file, work_dir, "warm", step_cache=cache)
+            results.append(check(cold == expected and warm == expected,
+                                 "キャッシュあり（初回・2回目）の出力がキャッシュなしと一致します"))
+            results.append(check(cold_log["cache"]["reused_steps"] == 0
+                                 and cold_log["cache"]["stored_steps"] == total_steps,
+                                 "初回は全ステップを実行してキャッシュに保存します"))
+            results.append(check(warm_log["cache"]["reused_steps"] == total_steps
+                                 and all(step.get("cached") for step in warm_log["steps"]),
+                                 "2回目は全ステップをキャッシュから再利用します"))
+
+            fused, fused_log = run_pipeline(input_file, work_dir, "fused", write_intermediate=False,
+                                            step_cache=StepCache(work_dir / "fused_cache"))
+            results.append(check(fused["final.xml"] == expected["final.xml"]
+                                 and fused_log["cache"]["stored_steps"] == 5,
+                                 "中間ファイルなし（融合ステップ）の出力も一致し、融合単位でキャッシュされます"))
+
+            prefix_cache = StepCache(work_dir / "prefix_cache")
+            run_pipeline(input_file, work_dir, "prefix", DEFAULT_STEP_ORDER[:4], step_cache=prefix_cache)
+            resumed, resumed_log = run_pipeline(input_file, work_dir, "resumed", step_cache=prefix_cache)
+            results.append(check(resumed == expected and resumed_log["cache"]["reused_steps"] == 4,
+                                 "キャッシュ済みの4ステップを再利用し、5ステップ目から再開します"))
+
+            # 最初のエントリだけ最終使用時刻を新しくし、上限を1エントリ分にする
+            entries = sorted(cache.cache_dir.glob("*/*.xml"), key=lambda p: p.stat().st_mtime_ns)
+            recent = entries[0]
+            past = time.time() - 60
+            for entry in entries[1:]:
+                os.utime(entry, (past, past))
+            cache.get(recent.stem)
+            cache.max_bytes = recent.stat().st_size
+            removed = cache.evict()
+            remaining = list(cache.cache_dir.glob("*/*.xml"))
+            results.append(check(removed == len(entries) - 1 and remaining == [recent],
+                                 "サイズ上限を超えた分を最終使用時刻の古い順に削除します"))
+    except Exception as e:
+        print(f"❌ 予期せぬエラー: {e}")
+        return False
+
+    return all(results)
+
+
+def main():
+    """メイン関数"""
+    test_root = Path(__file__).parent
+
+    print("utils/step_cache.py テスト実行")
+    print("=" * 50)
+
+    test_dirs = sorted(item for item in test_root.iterdir()
+                       if item.is_dir() and item.name[:2].isdigit())
+
+    total_tests = len(test_dirs)
+    passed_tests = 0
+
+    for test_dir in test_dirs:
+        if run_test(test_dir):
+            passed_tests += 1
+
+    return print_summary(passed_tests, total_tests)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+pipeline_engine.run_steps のステップごとの計測（step_profiler.py）のテスト実行スクリプト
+
+次の点を確認する。
+- 計測しても最終出力・中間ファイルが変わらないこと
+- 各ステップに計測結果（実時間・処理段階・要素数）が記録され、要素数が前後のステップで連続すること
+- 中間ファイルを書き出さない実行（融合ステップ）では、融合した先頭のステップにまとめて記録されること
+- 実行ログを表とChromeのトレース形式に変換できること（計測結果のないステップの扱いを含む）
+
+入力には step_cache スイートのテストケースを使う。
+"""
+
+import sys
+from pathlib import Path
+
+# scripts/をインポートパスに追加
+script_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(script_dir))
+
+# unit_tests/（共通処理 suite_helpers.py）をインポートパスに追加
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from pipeline_engine import DEFAULT_STEP_ORDER, build_intermediate_paths, run_steps
+from step_profiler import build_chrome_trace, build_table_rows, format_table
+from suite_helpers import check, run_suite
+
+# 入力ファイル（step_cache スイートのテストケース）
+SAMPLE_INPUT = Path(__file__).resolve().parent.parent / "step_cache" / "01_sample" / "input.xml"
+
+
+def convert(run_dir, profile, write_intermediate=True):
+    """
+    SAMPLE_INPUT を全ステップ変換し、出力ファイルの内容と実行ログを返す
+
+    Returns:
+        (outputs: {ファイル名: バイト列}, execution_log)
+    """
+    intermediate_paths = (build_intermediate_paths(SAMPLE_INPUT, run_dir, DEFAULT_STEP_ORDER)
+                          if write_intermediate else None)
+    success, error_msg, execution_log = run_steps(
+        SAMPLE_INPUT, run_dir / "final.xml", list(DEFAULT_STEP_ORDER),
+        intermediate_paths=intermediate_paths, capture_output=True, profile=profile
+    )
+    if not success:
+        raise RuntimeError(error_msg)
+    return {path.name: path.read_bytes() for path in sorted(run_dir.iterdir())}, execution_log
+
+
+def test_step_profiles(work_dir):
+    """計測しても出力は変わらず、全ステップの計測結果が記録される"""
+    expected, _ = convert(work_dir / "plain", profile=False)
+    outputs, log = convert(work_dir / "profiled", profile=True)
+    results = [check(outputs == expected, "計測ありの出力・中間ファイルが計測なしと一致します")]
+
+    profiles = [step.get("profile") for step in log["steps"]]
+    results.append(check(len(profiles) == len(DEFAULT_STEP_ORDER)
+                         and all(p and p["wall_time"] >= 0 and p["phases"] for p in profiles),
+                         "全ステップに実時間と処理段階が記録されます"))
+    chained = all(prev["elements_after"] == cur["elements_before"] for prev, cur in zip(profiles, profiles[1:]))
+    results.append(check(chained and profiles[0]["elements_before"] > 0, "要素数が前後のステップで連続します"))
+    run_phases = {phase["name"] for phase in log["profile"]["phases"]}
+    results.append(check({"parse", "output"} <= run_phases and log["profile"]["wall_time"] > 0,
+                         "実行全体の計測結果（パース・出力）が記録されます"))
+    return all(results)
+
+
+def test_fused_profiles(work_dir):
+    """融合ステップは先頭のステップにまとめて記録される"""
+    _, log = convert(work_dir / "fused", profile=True, write_intermediate=False)
+    leaders = {step["script"]: step["profile"]["scripts"] for step in log["steps"]
+               if (step.get("profile") or {}).get("scripts")}
+    followers = [step for step in log["steps"] if step.get("fused_with")]
+    grouped = all(step["fused_with"] in leaders and step["script"] in leaders[step["fused_with"]]
+                  and not step.get("profile") for step in followers)
+    return check(followers and grouped, "融合したステップの計測結果は先頭のステップの scripts にまとめられます")
+
+
+def test_trace_and_table(work_dir):
+    """実行ログを表とChromeのトレース形式に変換できる"""
+    phase = {"name": "convert", "start": 0.1, "wall_time": 0.2}
+    log = {
+        "profile": {"wall_time": 0.5, "phases": [{"name": "parse", "start": 0.0, "wall_time": 0.1}]},
+        "steps": [
+            {"step": 1, "script": "a.py", "success": True,
+             "profile": {"start": 0.1, "wall_time": 0.25, "cpu_time": 0.2, "phases": [phase],
+                         "elements_before": 10, "elements_after": 12, "scripts": ["a.py", "b.py"]}},
+            {"step": 2, "script": "b.py", "success": True, "fused_with": "a.py"},
+            {"step": 3, "script": "c.py", "success": True, "cached": True},
+        ],
+    }
+
+    rows = build_table_rows(log)
+    results = [check([row["状態"] for row in rows] == ["一括変換（2ステップ）", "一括変換（a.py）", "キャッシュ"]
+                     and rows[0]["実時間(ms)"] == 250.0 and rows[0]["変換(ms)"] == 200.0
+                     and rows[2]["実時間(ms)"] is None,
+                     "表の行に状態・ミリ秒単位の時間が入り、計測結果のないステップは空になります")]
+    results.append(check("合計: 500.0 ms" in format_table(log), "表に実行全体の合計時間を出力します"))
+
+    events = [event for event in build_chrome_trace(log)["traceEvents"] if event["ph"] == "X"]
+    step_events = [event for event in events if event["cat"] == "step"]
+    results.append(check(
+        [(event["name"], event["ts"], event["dur"]) for event in step_events] == [("a.py", 100000.0, 250000.0)]
+        and step_events[0]["args"]["scripts"] == ["a.py", "b.py"]
+        and any(event["cat"] == "phase" and event["args"] == {"step": "a.py"} for event in events)
+        and any(event["cat"] == "pipeline" and event["name"] == "parse" for event in events),
+        "トレースには計測結果のあるステップと処理段階をマイクロ秒単位で配置します"
+    ))
+    return all(results)
+
+
+TESTS = [
+    ("01_step_profiles", test_step_profiles),
+    ("02_fused_profiles", test_fused_profiles),
+    ("03_trace_and_table", test_trace_and_table),
+]
+
+
+def main():
+    """メイン関数"""
+    return run_suite("step_profiler.py", TESTS)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+step_registry.py とパイプラインエンジンのステップ省略のテスト実行スクリプト
+
+- レジストリの実行順序が従来の順序（run_pipeline.sh / reverse_app の固定リスト）と一致すること
+各テストケースの input.xml（と SAMPLE_CASES のリポジトリ内のサンプル）について、
+- 順変換: 処理対象タグのないステップを省略した場合と省略しない場合で、最終出力・中間ファイルがバイト単位で一致すること
+  （省略したステップは再シリアライズせず、直前の出力をそのまま使うこと）
+- 逆変換: 順変換の結果をエンジンで逆変換した場合と、reverse_app の各スクリプトを順番に実行した場合で出力が一致すること
+を確認する。
+"""
+
+import io
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# scripts/をインポートパスに追加
+script_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(script_dir))
+
+# unit_tests/（共通処理 suite_helpers.py）をインポートパスに追加
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import step_registry
+from pipeline_engine import build_intermediate_paths, run_steps
+from suite_helpers import check, print_summary
+
+# 従来の実行順序
+EXPECTED_FORWARD_ORDER = (
+    ["preprocess_non_first_sentence_to_list.py", "convert_article_focused.py",
+     "convert_paragraph_step3.py", "convert_paragraph_step4.py", "convert_item_step0.py"]
+    + [f"convert_subitem{i}_step0.py" for i in range(1, 11)]
+)
+EXPECTED_REVERSE_ORDER = [f"reverse_convert_subitem{i}.py" for i in range(10, 0, -1)] + ["reverse_convert_item.py"]
+
+# テストケース名 → 入力に使う sample/ のファイル（テストケースのディレクトリにコピーを置かない）
+SAMPLE_CASES = {
+    "01_deep_subitems": script_dir.parent / "sample" / "R04null[2450]1400_R04null[2450]1400_R041006_1.xml",
+}
+
+
+def run_engine(input_file, work_dir, name, script_names, skip_absent_tags=True):
+    """
+    エンジンで変換し、出力ファイルの内容と実行ログを返す
+
+    Returns:
+        (outputs: {ファイル名: バイト列}, execution_log)
+    """
+    run_dir = work_dir / name
+    success, error_msg, execution_log = run_steps(
+        input_file, run_dir / "final.xml", script_names,
+        intermediate_paths=build_intermediate_paths(input_file, run_dir, script_names),
+        capture_output=True,
+        skip_absent_tags=skip_absent_tags
+    )
+    if not success:
+        raise RuntimeError(error_msg)
+    outputs = {path.name: path.read_bytes() for path in sorted(run_dir.iterdir())}
+    return outputs, execution_log
+
+
+def run_reverse_scripts(input_file, work_dir):
+    """reverse_app の各スクリプトを順番に実行した場合の出力（ファイル経由）"""
+    current_input = input_file
+    for spec in step_registry.get_step_specs(step_registry.DIRECTION_REVERSE):
+        output_file = work_dir / f"sequential_{spec.module_name}.xml"
+        config = spec.load_config()
+        reverse_xml_converter = sys.modules['reverse_xml_converter']
+        with redirect_stdout(io.StringIO()):
+            result = reverse_xml_converter.process_xml_file(current_input, output_file, config)
+        if result != 0:
+            raise RuntimeError(f"{spec.script_name} の実行に失敗しました")
+        current_input = output_file
+    return current_input.read_bytes()
+
+
+def test_registry_order():
+    """レジストリの実行順序を確認"""
+    print("\n=== テスト実行: レジストリの実行順序 ===")
+    results = [
+        check(step_registry.get_step_order(step_registry.DIRECTION_FORWARD) == EXPECTED_FORWARD_ORDER,
+              "順変換の実行順序が従来の順序と一致します"),
+        check(step_registry.get_step_order(step_registry.DIRECTION_REVERSE) == EXPECTED_REVERSE_ORDER,
+              "逆変換の実行順序が従来の順序と一致します"),
+        check(step_registry.check_step_order(list(reversed(EXPECTED_FORWARD_ORDER[:2])))
+              == [(EXPECTED_FORWARD_ORDER[1], EXPECTED_FORWARD_ORDER[0])],
+              "依存先より前に置かれたステップを検出します"),
+    ]
+    return all(results)
+
+
+def run_test(name, input_file):
+    """単一のテストケースを実行"""
+    print(f"\n=== テスト実行: {name} ===")
+
+    if not input_file.exists():
+        print(f"❌ 入力ファイルが見つかりません: {input_file}")
+        return False
+
+    forward_order = step_registry.get_step_order(step_registry.DIRECTION_FORWARD)
+    reverse_order = step_registry.get_step_order(step_registry.DIRECTION_REVERSE)
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            work_dir = Path(temp_dir)
+
+            expected, _ = run_engine(input_file, work_dir, "no_skip", forward_order, skip_absent_tags=False)
+            actual, log = run_engine(input_file, work_dir, "skip", forward_order)
+            skipped = [step["script"] for step in log["steps"] if step.get("skipped")]
+            results.append(check(actual == expected,
+                                 f"順変換: ステップを省略しても出力が一致します（省略: {len(skipped)}ステップ）"))
+            passed_through = [step["script"] for step in log["steps"] if step.get("pass_through")]
+            results.append(check(passed_through == skipped,
+                                 f"順変換: 省略したステップは直前の出力をそのまま使います（{len(passed_through)}ステップ）"))
+
+            forward_final = work_dir / "skip" / "final.xml"
+            expected_reverse = run_reverse_scripts(forward_final, work_dir)
+            reverse, reverse_log = run_engine(forward_final, work_dir, "reverse", reverse_order)
+            skipped = [step["script"] for step in reverse_log["steps"] if step.get("skipped")]
+            results.append(check(reverse["final.xml"] == expected_reverse,
+                                 f"逆変換: エンジンの出力が各スクリプトの順次実行と一致します（省略: {len(skipped)}ステップ）"))
+    except Exception as e:
+        print(f"❌ 予期せぬエラー: {e}")
+        return False
+
+    return all(results)
+
+
+def main():
+    """メイン関数"""
+    test_root = Path(__file__).parent
+
+    print("step_registry.py テスト実行")
+    print("=" * 50)
+
+    test_cases = dict(SAMPLE_CASES)
+    test_cases.update((item.name, item / "input.xml") for item in test_root.iterdir()
+                      if item.is_dir() and item.name[:2].isdigit())
+
+    total_tests = len(test_cases) + 1
+    passed_tests = 1 if test_registry_order() else 0
+
+    for name, input_file in sorted(test_cases.items()):
+        if run_test(name, input_file):
+            passed_tests += 1
+
+    return print_summary(passed_tests, total_tests)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+関数ベースのテストスイート（run_tests.py）の共通処理
+
+各スイートの run_tests.py は unit_tests/ をインポートパスに追加して読み込む。
+
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+    from suite_helpers import check, run_suite
+
+集計行「テスト結果: x/y 成功」は run_all_tests.py が集計に使う。
+"""
+
+import tempfile
+from pathlib import Path
+
+
+def check(condition, message):
+    """確認結果を表示"""
+    print(f"{'✅' if condition else '❌'} {message}")
+    return condition
+
+
+def print_summary(passed_tests, total_tests):
+    """
+    テスト結果の集計行を表示
+
+    Returns:
+        終了コード（すべて成功した場合は0）
+    """
+    print("\n" + "=" * 50)
+    print(f"テスト結果: {passed_tests}/{total_tests} 成功")
+
+    if passed_tests == total_tests:
+        print("🎉 すべてのテストが成功しました！")
+        return 0
+    else:
+        print("⚠️ 一部のテストが失敗しました。")
+        return 1
+
+
+def run_suite(title, tests):
+    """
+    テスト関数を順に実行し、集計行を表示
+
+    Args:
+        title: 見出し（テスト対象の名前）
+        tests: (テスト名, テスト関数) のリスト。テスト関数は作業用の一時ディレクトリ（Path）を受け取り、
+               成功したかどうかを返す
+
+    Returns:
+        終了コード（すべて成功した場合は0）
+    """
+    print(f"{title} テスト実行")
+    print("=" * 50)
+
+    passed_tests = 0
+    for name, test in tests:
+        print(f"\n=== テスト実行: {name} ===")
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                if test(Path(temp_dir)):
+                    passed_tests += 1
+        except Exception as e:
+            print(f"❌ 予期せぬエラー: {e}")
+
+    return print_summary(passed_tests, len(tests))
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+逆変換の順序検証（reverse_app/verify_reverse_order.py）のテスト実行スクリプト
+
+次の点を確認する。
+- iterparse による走査（iter_texts_in_order）が、ツリーの走査（extract_texts_in_order）と
+  同じ順序・同じ組でテキストを返すこと（tail・コメント・処理命令を含む）
+- 2つのテキスト列を同時に読み進めた比較が、不一致の位置と件数、テキスト数の違いを検出すること
+- 不一致の件数の上限を指定すると、その件数で比較を打ち切ること
+"""
+
+import sys
+from pathlib import Path
+from lxml import etree
+
+# reverse_app/ をインポートパスに追加
+script_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(script_dir.parent / "reverse_app"))
+
+# unit_tests/（共通処理 suite_helpers.py）をインポートパスに追加
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from verify_reverse_order import (
+    compare_text_streams,
+    extract_texts_in_order,
+    format_verification_report,
+    iter_texts_in_order,
+    verify_order_files
+)
+from suite_helpers import check, run_suite
+
+MIXED_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<!-- ルート要素の外のコメント -->
+<Law>前<!-- コメント -->後<Item>項<Sentence>文</Sentence>間<?pi 命令?>末<Sentence/> 空の後 </Item>
+ 条</Law>
+"""
+
+
+def write_sentences(path, texts):
+    """テキストを Sentence 要素として並べたXMLファイルを作成"""
+    body = "".join(f"<Paragraph><Sentence>{text}</Sentence></Paragraph>" for text in texts)
+    path.write_text(f'<?xml version="1.0" encoding="UTF-8"?>\n<Law>{body}</Law>\n', encoding='utf-8')
+    return path
+
+
+def test_iter_texts(work_dir):
+    """iterparse による走査とツリーの走査が一致する"""
+    path = work_dir / "mixed.xml"
+    path.write_text(MIXED_XML, encoding='utf-8')
+    streamed = [(text, str(tag)) for text, tag in iter_texts_in_order(path)]
+    from_tree = [(text, str(tag)) for text, tag in extract_texts_in_order(etree.parse(str(path)))]
+
+    results = [check(streamed == from_tree, "iterparse とツリーの走査が同じテキストを同じ順序で返します")]
+    results.append(check([text for text, _ in streamed][:4] == ['前', 'コメント', '後', '項']
+                         and ('間', 'Item') in streamed and ('条', 'Law') in streamed,
+                         "要素の後のテキストは親要素のタグとともに文書順に返します"))
+    return all(results)
+
+
+def test_compare(work_dir):
+    """不一致の位置と件数、テキスト数の違いを検出する"""
+    original = write_sentences(work_dir / "original.xml", ["一", "二", "三", "四"])
+    same = write_sentences(work_dir / "same.xml", ["一", "二", "三", "四"])
+    swapped = write_sentences(work_dir / "swapped.xml", ["一", "三", "二", "四", "五"])
+
+    results = [check(verify_order_files(original, same)['is_order_preserved'], "同じ順序のファイルは成功します")]
+
+    result = verify_order_files(original, swapped)
+    results.append(check(
+        not result['is_order_preserved']
+        and [mismatch['index'] for mismatch in result['mismatches']] == [2, 3]
+        and (result['original_count'], result['converted_count']) == (4, 5),
+        "入れ替わった位置とテキスト数の違いを検出します"
+    ))
+    report = format_verification_report(result)
+    results.append(check("位置 2:" in report and "逆変換後: 5個" in report, "レポートに位置とテキスト数を出力します"))
+    return all(results)
+
+
+def test_stop_early(work_dir):
+    """不一致の件数の上限で比較を打ち切る"""
+    consumed = []
+
+    def converted():
+        for i in range(1000):
+            consumed.append(i)
+            yield f"変更{i}", 'Sentence'
+
+    original = ((f"元{i}", 'Sentence') for i in range(1000))
+    result = compare_text_streams(original, converted(), max_mismatches=3)
+    return check(
+        result['stopped_early'] and result['mismatch_count'] == 3
+        and [mismatch['index'] for mismatch in result['mismatches']] == [1, 2, 3]
+        and len(consumed) == 3,
+        "3件目の不一致で、残りのテキストを読まずに打ち切ります"
+    )
+
+
+TESTS = [
+    ("01_iter_texts", test_iter_texts),
+    ("02_compare", test_compare),
+    ("03_stop_early", test_stop_early),
+]
+
+
+def main():
+    """メイン関数"""
+    return run_suite("verify_reverse_order.py", TESTS)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+utils/xml_utils.py の write_xml のテスト実行スクリプト
+
+各テストケースの input.xml について、次の点を確認する。
+- ElementTreeを渡した場合の出力が expected.xml、および同じ整形をした tree.write() の出力とバイト単位で一致すること
+- DOCTYPE 宣言の内部サブセット（実体宣言など）とルート要素の前後のコメント・処理命令が保存されること
+また、ルート要素を渡した場合はXML宣言とルート要素だけを書き出すことを確認する。
+"""
+
+import sys
+from pathlib import Path
+from lxml import etree
+
+# scripts/をインポートパスに追加
+script_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.insert(0, str(script_dir))
+
+# unit_tests/（共通処理 suite_helpers.py）をインポートパスに追加
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from utils.xml_utils import write_xml
+from suite_helpers import check, run_suite
+
+TEST_ROOT = Path(__file__).resolve().parent
+
+
+def test_write_tree(work_dir):
+    """ElementTreeを渡すと文書全体を tree.write() と同じく書き出す"""
+    results = []
+    for test_dir in sorted(item for item in TEST_ROOT.iterdir() if item.is_dir() and item.name[:2].isdigit()):
+        output_file = work_dir / f"{test_dir.name}.xml"
+        write_xml(etree.parse(str(test_dir / "input.xml")), output_file)
+
+        reference = etree.parse(str(test_dir / "input.xml"))
+        etree.indent(reference.getroot(), space="  ")
+        reference_file = work_dir / f"{test_dir.name}-reference.xml"
+        reference.write(str(reference_file), encoding='UTF-8', xml_declaration=True)
+
+        output = output_file.read_bytes()
+        results.append(check(output == (test_dir / "expected.xml").read_bytes()
+                             and output == reference_file.read_bytes(),
+                             f"{test_dir.name}: 出力が expected.xml・tree.write() と一致します"))
+
+        source = etree.parse(str(test_dir / "input.xml"))
+        written = etree.parse(str(output_file))
+        if source.docinfo.internalDTD is not None:
+            entities = [entity.name for entity in source.docinfo.internalDTD.iterentities()]
+            written_entities = ([entity.name for entity in written.docinfo.internalDTD.iterentities()]
+                                if written.docinfo.internalDTD is not None else [])
+            results.append(check(written_entities == entities,
+                                 f"{test_dir.name}: DOCTYPE の内部サブセットの実体宣言が保存されます（{len(entities)}件）"))
+        siblings = len(list(source.getroot().itersiblings(preceding=True))) + len(list(source.getroot().itersiblings()))
+        written_siblings = (len(list(written.getroot().itersiblings(preceding=True)))
+                            + len(list(written.getroot().itersiblings())))
+        results.append(check(written_siblings == siblings,
+                             f"{test_dir.name}: ルート要素の前後のコメント・処理命令が保存されます（{siblings}件）"))
+    return all(results)
+
+
+def test_write_root(work_dir):
+    """ルート要素を渡すとXML宣言とルート要素だけを書き出す"""
+    tree = etree.parse(str(TEST_ROOT / "01_doctype_internal_subset" / "input.xml"))
+    output_file = work_dir / "root.xml"
+    write_xml(tree.getroot(), output_file)
+    output = output_file.read_text(encoding='utf-8')
+    return check(output.startswith("<?xml version='1.0' encoding='UTF-8'?>\n<Law ")
+                 and "<!DOCTYPE" not in output and "<!--" not in output and output.endswith("</Law>"),
+                 "DOCTYPE 宣言とルート要素の外のノードは書き出しません")
+
+
+TESTS = [
+    ("01_write_tree", test_write_tree),
+    ("02_write_root", test_write_root),
+]
+
+
+def main():
+    """メイン関数"""
+    return run_suite("utils/xml_utils.py write_xml", TESTS)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,7 +8,9 @@
 from .xml_utils import (
     indent_xml,
     indent_xml_native,
+    normalize_empty_text,
     save_xml_with_indent,
+    write_xml,
     pretty_print_xml,
     get_python_version_info
 )
@@ -22,6 +24,8 @@ from .renumber_utils import (
 
 from .label_utils import (
     LabelPattern,
+    LabelSettings,
+    use_label_settings,
     detect_label_pattern,
     is_label,
     split_label_and_content,
@@ -33,7 +37,9 @@ __all__ = [
     # XML整形関連
     'indent_xml',
     'indent_xml_native',
+    'normalize_empty_text',
     'save_xml_with_indent',
+    'write_xml',
     'pretty_print_xml',
     'get_python_version_info',
     
@@ -45,6 +51,8 @@ __all__ = [
     
     # 項目ラベル判定関連
     'LabelPattern',
+    'LabelSettings',
+    'use_label_settings',
     'detect_label_pattern',
     'is_label',
     'split_label_and_content',
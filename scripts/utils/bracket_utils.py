@@ -9,9 +9,19 @@
 
 import re
 import json
-from pathlib import Path
 from typing import Optional
 
+from .config_registry import get_active_settings
+
+
+# get_bracket_type で判定する括弧タイプのラベルID
+BRACKET_LABEL_IDS = (
+    'subject_label_square',
+    'subject_label_double_square',
+    'subject_label_corner',
+    'subject_label_round',
+)
+
 
 def is_subject_name_bracket(text: str) -> bool:
     """
@@ -41,17 +51,10 @@ def is_subject_name_bracket(text: str) -> bool:
         return False
     text = text.strip()
 
-    # label_config.jsonからsubject_labelパターンを読み込む
-    config_path = Path(__file__).parent.parent / "config" / "label_config.json"
+    # label_config.jsonのsubject_labelパターン（コンパイル済み）で判定
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-
-        subject_label = config.get('label_definitions', {}).get('subject_label', {})
-        patterns = subject_label.get('patterns', [])
-
-        for pattern in patterns:
-            if re.match(pattern, text):
+        for pattern in get_active_settings().get_patterns('subject_label'):
+            if pattern.match(text):
                 # 「指導項目」が含まれないことを確認
                 return '指導項目' not in text
 
@@ -84,17 +87,10 @@ def is_instruction_bracket(text: str) -> bool:
         return False
     text = text.strip()
 
-    # label_config.jsonからinstructionパターンを読み込む
-    config_path = Path(__file__).parent.parent / "config" / "label_config.json"
+    # label_config.jsonのinstructionパターン（コンパイル済み）で判定
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-
-        instruction_label = config.get('label_definitions', {}).get('instruction', {})
-        patterns = instruction_label.get('patterns', [])
-
-        for pattern in patterns:
-            if re.match(pattern, text):
+        for pattern in get_active_settings().get_patterns('instruction'):
+            if pattern.match(text):
                 return True
 
         return False
@@ -128,17 +124,10 @@ def is_grade_single_bracket(text: str) -> bool:
         return False
     text = text.strip()
 
-    # label_config.jsonからgrade_singleパターンを読み込む
-    config_path = Path(__file__).parent.parent / "config" / "label_config.json"
+    # label_config.jsonのgrade_singleパターン（コンパイル済み）で判定
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-
-        grade_single_label = config.get('label_definitions', {}).get('grade_single', {})
-        patterns = grade_single_label.get('patterns', [])
-
-        for pattern in patterns:
-            if re.match(pattern, text):
+        for pattern in get_active_settings().get_patterns('grade_single'):
+            if pattern.match(text):
                 return True
 
         return False
@@ -172,17 +161,10 @@ def is_grade_double_bracket(text: str) -> bool:
         return False
     text = text.strip()
 
-    # label_config.jsonからgrade_doubleパターンを読み込む
-    config_path = Path(__file__).parent.parent / "config" / "label_config.json"
+    # label_config.jsonのgrade_doubleパターン（コンパイル済み）で判定
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-
-        grade_double_label = config.get('label_definitions', {}).get('grade_double', {})
-        patterns = grade_double_label.get('patterns', [])
-
-        for pattern in patterns:
-            if re.match(pattern, text):
+        for pattern in get_active_settings().get_patterns('grade_double'):
+            if pattern.match(text):
                 return True
 
         return False
@@ -214,27 +196,17 @@ def get_bracket_type(text: str) -> Optional[str]:
     if '指導項目' in text:
         return None
     
-    # label_config.jsonから各括弧タイプのパターンを読み込む
-    config_path = Path(__file__).parent.parent / "config" / "label_config.json"
+    # label_config.jsonの各括弧タイプのパターン（コンパイル済み）で判定
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        
-        label_definitions = config.get('label_definitions', {})
+        settings = get_active_settings()
         
         # 優先順位に従ってチェック（pattern_priorityの順序）
-        pattern_priority = config.get('pattern_priority', [])
-        
-        for label_id in pattern_priority:
-            if label_id not in ['subject_label_square', 'subject_label_double_square', 
-                               'subject_label_corner', 'subject_label_round']:
+        for label_id in settings.get_pattern_priority():
+            if label_id not in BRACKET_LABEL_IDS:
                 continue
-                
-            label_def = label_definitions.get(label_id, {})
-            patterns = label_def.get('patterns', [])
             
-            for pattern in patterns:
-                if re.match(pattern, text):
+            for pattern in settings.get_patterns(label_id):
+                if pattern.match(text):
                     return label_id
         
         return None
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+List要素のColumnの1つ目の値のストリーミング抽出
+
+XMLファイルを iterparse(tag='List') で先頭から読み、List要素の終了タグごとに
+Columnの1つ目のSentenceのテキストを取り出して、処理済みの要素をツリーから解放する
+（文書全体のツリーを保持しないため、大きな文書でもメモリ使用量は最も大きいList要素の程度に収まる）。
+値は異なるテキストごとに出現回数と出現行をまとめ、ラベル判定は異なるテキストごとに1回だけ行う。
+
+utils/label_analyzer.py（Streamlitアプリ）からファイル単位で読み込まれるため、
+このモジュールは lxml と標準ライブラリのみに依存する（相対インポートを使わない）。
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+from lxml import etree
+
+
+# 抽出方法
+MODE_FIRST_COLUMN = 'first_column'  # 各List要素の最初のColumn要素（label_analyzer）
+MODE_NUM1_COLUMNS = 'num1_columns'  # 各List要素の Num="1" のColumn要素すべて（analyze_list_column_labels）
+
+
+class ColumnValue:
+    """1種類の値の集計（出現行は文書順）"""
+
+    __slots__ = ('text', 'line_numbers')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.line_numbers: List[Optional[int]] = []       # 出現した行番号
+
+    @property
+    def count(self) -> int:
+        """出現回数"""
+        return len(self.line_numbers)
+
+    @property
+    def first_line(self) -> Optional[int]:
+        """最初に出現した行番号"""
+        return self.line_numbers[0] if self.line_numbers else None
+
+
+class ColumnValueSummary:
+    """文書内のColumnの1つ目の値の集計結果"""
+
+    def __init__(self):
+        self.values: Dict[str, ColumnValue] = {}  # テキスト → 集計（最初に出現した順）
+        self.total_count = 0                      # 値の出現回数の合計
+        self.list_count = 0                       # List要素の数
+        self.has_column_list = False              # ColumnありのList要素があるか
+
+    def add(self, text: str, line_number: Optional[int]) -> None:
+        """値の出現を1件追加"""
+        value = self.values.get(text)
+        if value is None:
+            value = ColumnValue(text)
+            self.values[text] = value
+        value.line_numbers.append(line_number)
+        self.total_count += 1
+
+    def classify(self, detect: Callable[[str], Optional[str]]) -> Dict[str, Optional[str]]:
+        """
+        異なる値ごとに1回だけラベル判定を行う
+
+        Args:
+            detect: テキスト → ラベルID（判定できない場合はNone）の関数（LabelConfig.detect_label_id 等）
+
+        Returns:
+            テキスト → ラベルID
+        """
+        return {text: detect(text) for text in self.values}
+
+
+def _release(elem, ancestors) -> None:
+    """処理済みの要素と、それより前にある要素（祖先の兄弟を含む）をツリーから解放"""
+    elem.clear()
+    node = elem
+    for parent in ancestors:
+        while node.getprevious() is not None:
+            del parent[0]
+        node = parent
+
+
+def scan_list_column1_values(xml_path: Union[str, Path], mode: str = MODE_FIRST_COLUMN) -> ColumnValueSummary:
+    """
+    XMLファイルからList要素のColumnの1つ目の値をストリーミングで抽出して集計
+
+    List要素の中にList要素がある場合も、外側のList要素の処理が終わるまでは解放しないため、
+    ツリー全体を読み込んで `.//Column` を検索した場合と同じ結果になる。
+
+    Args:
+        xml_path: XMLファイルのパス
+        mode: MODE_FIRST_COLUMN（各List要素の最初のColumn）/ MODE_NUM1_COLUMNS（Num="1" のColumnすべて）
+
+    Returns:
+        ColumnValueSummary: 集計結果
+
+    Raises:
+        etree.XMLSyntaxError: XMLの構文エラーの場合
+        OSError: ファイルが読み込めない場合
+    """
+    summary = ColumnValueSummary()
+    for _, list_elem in etree.iterparse(str(xml_path), events=('end',), tag='List'):
+        summary.list_count += 1
+        if mode == MODE_FIRST_COLUMN:
+            columns = [next(list_elem.iter('Column'), None)]
+            if columns[0] is None:
+                columns = []
+        else:
+            columns = [column for column in list_elem.iter('Column') if column.get('Num') == '1']
+
+        if columns:
+            summary.has_column_list = True
+        for column in columns:
+            # Column要素内の最初のSentence要素のテキスト
+            sentence = next(column.iter('Sentence'), None)
+            if sentence is not None:
+                text = "".join(sentence.itertext()).strip()
+                if text:
+                    summary.add(text, sentence.sourceline)
+
+        # 外側のList要素の処理が終わった時点で解放する
+        if next(list_elem.iterancestors('List'), None) is None:
+            _release(list_elem, list(list_elem.iterancestors()))
+    return summary
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+label_config.json の共有レジストリ
+
+設定ファイルの読み込み結果とコンパイル済みの正規表現パターンをキャッシュし、
+bracket_utils や xml_converter から共通で利用する。
+ファイルの更新（mtime・サイズの変化）を検出した場合は自動的に再読み込みする。
+設定ファイルは label_utils.load_label_config() で読み込む（検証済みの内容であればパターンの検証を省略）。
+正規表現は実際に使われるラベルIDの分だけ、初回の参照時にコンパイルする。
+
+読み込んだ内容は不変な LabelSettings として保持する。実行ごとに設定を変える場合は、設定ファイルを
+書き換えずに上書き（CLIの --set、環境変数 XML_FORMATTER_CONFIG_OVERRIDES、API の overrides 引数）を
+resolve_settings() で適用した LabelSettings を作り、ConversionConfig や pipeline_engine.run_steps に渡す。
+"""
+
+import os
+import re
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .label_utils import (
+    DEFAULT_CONFIG_PATH, LabelSettings, get_active_label_settings, load_label_config, use_label_settings
+)
+
+
+# 設定の上書きを指定する環境変数（「キー=値」を ; または改行で区切る）
+CONFIG_OVERRIDES_ENV = "XML_FORMATTER_CONFIG_OVERRIDES"
+
+
+class ConfigRegistry:
+    """設定ファイルの内容とコンパイル済みパターンを保持するレジストリ"""
+
+    def __init__(self, config_path: Optional[Path] = None):
+        """
+        ConfigRegistryの初期化
+
+        Args:
+            config_path: 設定ファイルのパス（Noneの場合はデフォルトパス）
+        """
+        self.config_path = Path(config_path) if config_path is not None else DEFAULT_CONFIG_PATH
+        self._signature: Optional[Tuple[int, int]] = None
+        self._settings: Optional[LabelSettings] = None
+
+    def _refresh(self) -> None:
+        """
+        設定ファイルが更新されていれば再読み込みする
+
+        Raises:
+            FileNotFoundError: 設定ファイルが見つからない場合
+            json.JSONDecodeError: JSON構文エラーの場合
+            ValueError: 無効な正規表現パターンがある場合
+        """
+        stat = self.config_path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return
+
+        self._settings = LabelSettings(load_label_config(self.config_path), source=str(self.config_path),
+                                       validate=False)
+        self._signature = signature
+
+    def get_signature(self) -> Optional[Tuple[int, int]]:
+        """
+        設定ファイルの現在のシグネチャ（mtime, サイズ）を取得
+
+        設定内容に依存する結果をキャッシュする側が、キャッシュキーに含めるために使用する。
+        設定ファイルが読み込めない場合はNoneを返す。
+        """
+        try:
+            self._refresh()
+        except (OSError, ValueError):
+            return None
+        return self._signature
+
+    def get_settings(self) -> LabelSettings:
+        """
+        設定ファイルの現在の内容を取得
+
+        Raises:
+            FileNotFoundError: 設定ファイルが見つからない場合
+            json.JSONDecodeError: JSON構文エラーの場合
+        """
+        self._refresh()
+        return self._settings
+
+    def get_config(self) -> Mapping:
+        """
+        設定全体を取得（変更できない辞書）
+
+        Raises:
+            FileNotFoundError: 設定ファイルが見つからない場合
+            json.JSONDecodeError: JSON構文エラーの場合
+        """
+        return self.get_settings().config
+
+    def get_patterns(self, label_id: str) -> List[re.Pattern]:
+        """
+        ラベルIDのコンパイル済みパターンを取得
+
+        Args:
+            label_id: ラベルID
+
+        Returns:
+            コンパイル済みパターンのリスト（定義がない場合は空リスト）
+        """
+        return self.get_settings().get_patterns(label_id)
+
+    def get_pattern_priority(self) -> Tuple[str, ...]:
+        """パターンの優先順位（pattern_priority）を取得"""
+        return self.get_settings().get_pattern_priority()
+
+    def get_conversion_behaviors(self) -> Mapping:
+        """変換動作設定（conversion_behaviors）を取得"""
+        return self.get_settings().get_conversion_behaviors()
+
+
+# 設定ファイルパスごとのレジストリ
+_registries: Dict[Path, ConfigRegistry] = {}
+
+
+def get_config_registry(config_path: Optional[Path] = None) -> ConfigRegistry:
+    """
+    設定ファイルのレジストリを取得
+
+    Args:
+        config_path: 設定ファイルのパス（Noneの場合はデフォルトパス）
+
+    Returns:
+        ConfigRegistry: 設定ファイルパスごとに共有されるレジストリ
+    """
+    path = Path(config_path).resolve() if config_path is not None else DEFAULT_CONFIG_PATH
+    registry = _registries.get(path)
+    if registry is None:
+        registry = ConfigRegistry(path)
+        _registries[path] = registry
+    return registry
+
+
+# ============================================================================
+# 設定の上書き
+# ============================================================================
+
+def parse_config_override(text: str) -> Tuple[str, Any]:
+    """
+    「キー=値」形式の上書きを解析
+
+    キーはドット区切り（例: conversion_behaviors.no_column_text_split_mode.enabled）。
+    値はJSONとして解釈し（true / 3 / ["Item"] など）、解釈できない場合は文字列として扱う。
+
+    Raises:
+        ValueError: 「キー=値」形式でない場合
+    """
+    key, sep, value = text.partition('=')
+    key = key.strip()
+    if not sep or not key:
+        raise ValueError(f"設定の上書きは「キー=値」の形式で指定してください: '{text}'")
+    value = value.strip()
+    try:
+        return key, json.loads(value)
+    except json.JSONDecodeError:
+        return key, value
+
+
+def parse_config_overrides(items: Optional[Iterable[str]]) -> Dict[str, Any]:
+    """「キー=値」形式の上書きのリストを辞書に変換（同じキーは後の指定が優先）"""
+    return dict(parse_config_override(item) for item in (items or ()) if item.strip())
+
+
+def get_env_overrides() -> Dict[str, Any]:
+    """
+    環境変数 XML_FORMATTER_CONFIG_OVERRIDES の上書きを取得
+
+    Raises:
+        ValueError: 「キー=値」形式でない指定がある場合
+    """
+    value = os.environ.get(CONFIG_OVERRIDES_ENV, "")
+    return parse_config_overrides(value.replace('\n', ';').split(';'))
+
+
+def format_config_overrides(overrides: Mapping[str, Any]) -> str:
+    """上書きを環境変数 XML_FORMATTER_CONFIG_OVERRIDES の形式に変換（子プロセスに渡す場合に使用）"""
+    return ';'.join(f"{key}={json.dumps(value, ensure_ascii=False)}" for key, value in overrides.items())
+
+
+# 環境変数の上書きを適用した既定の設定（(設定ファイルの設定, 環境変数の値) → 設定。直近の1件のみ保持）
+_env_settings_cache: Dict[Tuple[LabelSettings, str], LabelSettings] = {}
+
+
+def get_default_settings(config_path: Optional[Path] = None) -> LabelSettings:
+    """
+    設定ファイルの内容に環境変数の上書きを適用した既定の設定を取得
+
+    Raises:
+        FileNotFoundError: 設定ファイルが見つからない場合
+        json.JSONDecodeError: JSON構文エラーの場合
+        ValueError: 上書きの形式が不正な場合
+    """
+    base = get_config_registry(config_path).get_settings()
+    env_value = os.environ.get(CONFIG_OVERRIDES_ENV, "")
+    if not env_value:
+        return base
+    key = (base, env_value)
+    settings = _env_settings_cache.get(key)
+    if settings is None:
+        settings = base.with_overrides(get_env_overrides())
+        _env_settings_cache.clear()
+        _env_settings_cache[key] = settings
+    return settings
+
+
+def resolve_settings(overrides: Optional[Mapping[str, Any]] = None,
+                     config_path: Optional[Path] = None) -> LabelSettings:
+    """
+    既定の設定（設定ファイル＋環境変数）に、呼び出し側の上書きを適用した設定を取得
+
+    Args:
+        overrides: ドット区切りのキー → 値（CLIの --set や API から指定。環境変数より優先）
+        config_path: 設定ファイルのパス（Noneの場合はデフォルトパス）
+
+    Raises:
+        FileNotFoundError: 設定ファイルが見つからない場合
+        json.JSONDecodeError: JSON構文エラーの場合
+        ValueError: 上書きの形式が不正な場合
+    """
+    return get_default_settings(config_path).with_overrides(overrides)
+
+
+def get_active_settings() -> LabelSettings:
+    """
+    現在有効な設定を取得
+
+    use_label_settings() の範囲内ではその設定、範囲外では既定の設定（設定ファイル＋環境変数）を返す。
+
+    Raises:
+        FileNotFoundError: 設定ファイルが見つからない場合
+        json.JSONDecodeError: JSON構文エラーの場合
+    """
+    settings = get_active_label_settings()
+    return settings if settings is not None else get_default_settings()
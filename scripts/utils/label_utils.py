@@ -5,16 +5,310 @@
 項目ラベル（１、（１）、ア、（ア）等）のパターン判定と
 階層レベル判定機能を提供します。
 
+ラベル設定ファイル（label_config.json）は、全パターンがコンパイルできることを確認した内容のハッシュを
+設定ファイルと同じディレクトリの __pycache__ に記録し、内容が変わるまで検証を省略します。
+正規表現は実際に判定に使うラベルIDの分だけ、初回の参照時にコンパイルします。
+設定の内容は不変・ハッシュ可能な LabelSettings として扱い、実行ごとの上書き（with_overrides）は
+新しい LabelSettings を作成します（設定ファイルは書き換えない）。use_label_settings() の範囲内では、
+detect_label_id 等のモジュール関数もその設定で判定します。
+（このモジュールは標準ライブラリのみに依存し、Streamlitアプリからファイル単位で読み込まれる）
+
 参照: logic2_2_Paragraph_text.md
 """
 
+import os
 import re
 import json
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum
-from typing import Tuple, Optional, Dict, List
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping, Tuple, Optional, Dict, List
 from pathlib import Path
 
 
+# デフォルトの設定ファイルパス
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent.parent / "config" / "label_config.json"
+
+# 検証済みの記録を保存するディレクトリ名（設定ファイルと同じディレクトリに作成）
+CONFIG_CACHE_DIR_NAME = "__pycache__"
+
+# 検証済みの記録の形式のバージョン（形式や検証内容を変更した場合は更新する）
+CONFIG_CACHE_VERSION = 2
+
+
+def _config_cache_path(config_path: Path) -> Path:
+    """検証済みの記録（最後に検証した設定ファイルの内容のハッシュ。JSON）のパス"""
+    return config_path.parent / CONFIG_CACHE_DIR_NAME / f"{config_path.name}.validated"
+
+
+def _validate_patterns(config: Dict) -> None:
+    """
+    全ラベル定義のパターンがコンパイルできることを確認
+
+    Raises:
+        ValueError: 無効な正規表現パターンがある場合
+    """
+    for label_id, definition in config.get('label_definitions', {}).items():
+        for pattern in definition.get('patterns', []):
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"無効な正規表現パターン '{pattern}' in {label_id}: {e}")
+
+
+def load_label_config(config_path: Optional[Path] = None) -> Dict:
+    """
+    設定ファイルを読み込む（検証済みの内容であればパターンの検証を省略）
+
+    最後に検証した設定ファイルの内容のSHA-256を記録し、設定ファイルを変更した場合にのみ
+    パターンの検証をやり直す。記録はハッシュのみのJSONで、読み込んだ値を設定として使うことはない。
+    記録を書き込めない場合は毎回検証する。
+
+    Args:
+        config_path: 設定ファイルのパス（Noneの場合はデフォルトパス）
+
+    Returns:
+        設定全体の辞書
+
+    Raises:
+        FileNotFoundError: 設定ファイルが見つからない場合
+        json.JSONDecodeError: JSON構文エラーの場合
+        ValueError: 無効な正規表現パターンがある場合
+    """
+    config_path = Path(config_path) if config_path is not None else DEFAULT_CONFIG_PATH
+    data = config_path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    config = json.loads(data.decode('utf-8'))
+    marker = {'version': CONFIG_CACHE_VERSION, 'digest': digest}
+    cache_path = _config_cache_path(config_path)
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            if json.load(f) == marker:
+                return config
+    except Exception:
+        # 記録がない・壊れている場合は検証する
+        pass
+
+    _validate_patterns(config)
+
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(marker, f)
+            os.replace(temp_name, cache_path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+    except OSError:
+        pass
+    return config
+
+
+def _freeze(value: Any) -> Any:
+    """JSONの値を変更できない形（辞書は MappingProxyType、リストはタプル）に変換"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def apply_config_overrides(config: Dict, overrides: Mapping[str, Any]) -> Dict:
+    """
+    設定に上書きを適用した新しい辞書を返す（元の辞書は変更しない）
+
+    Args:
+        config: 設定全体の辞書
+        overrides: ドット区切りのキー → 値（例: {'conversion_behaviors.no_column_text_split_mode.enabled': False}）。
+                   値が辞書の場合は既存の辞書に再帰的にマージする
+
+    Returns:
+        上書き後の設定の辞書
+
+    Raises:
+        ValueError: キーが空の場合、または途中のキーが辞書でない場合
+    """
+    result = json.loads(json.dumps(config))
+    for dotted_key, value in overrides.items():
+        keys = dotted_key.split('.')
+        if not all(keys):
+            raise ValueError(f"無効な設定キーです: '{dotted_key}'")
+        target = result
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+            if not isinstance(target, dict):
+                raise ValueError(f"設定キー '{dotted_key}' の '{key}' は辞書ではありません")
+        _merge_value(target, keys[-1], json.loads(json.dumps(value)))
+    return result
+
+
+def _merge_value(target: Dict, key: str, value: Any) -> None:
+    """辞書同士は再帰的にマージし、それ以外は置き換える"""
+    if isinstance(value, dict) and isinstance(target.get(key), dict):
+        for sub_key, sub_value in value.items():
+            _merge_value(target[key], sub_key, sub_value)
+    else:
+        target[key] = value
+
+
+class LabelSettings:
+    """
+    ラベル設定（label_config.json の内容）の不変なスナップショット
+
+    内容の正規化JSONのSHA-256（digest）で比較・ハッシュするため、キャッシュのキーや
+    プロセスプールのタスクの引数にそのまま使える（pickle では正規化JSONだけを送る）。
+    設定を変える場合は with_overrides() で新しいインスタンスを作る。
+    """
+
+    __slots__ = ('_canonical', '_config', '_patterns', '_label_config', 'digest', 'source')
+
+    def __init__(self, config: Mapping, source: Optional[str] = None, validate: bool = True):
+        """
+        LabelSettingsの初期化
+
+        Args:
+            config: 設定全体の辞書（コピーして保持する）
+            source: 設定の出所（設定ファイルのパス等。表示用で、比較には使わない）
+            validate: 全パターンがコンパイルできることを確認するか（読み込み時に確認済みの場合はFalse）
+
+        Raises:
+            ValueError: 無効な正規表現パターンがある場合
+        """
+        canonical = json.dumps(config, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        plain = json.loads(canonical)
+        if validate:
+            _validate_patterns(plain)
+        object.__setattr__(self, '_canonical', canonical)
+        object.__setattr__(self, '_config', _freeze(plain))
+        object.__setattr__(self, '_patterns', {})
+        object.__setattr__(self, '_label_config', None)
+        object.__setattr__(self, 'digest', hashlib.sha256(canonical.encode('utf-8')).hexdigest())
+        object.__setattr__(self, 'source', source)
+
+    @classmethod
+    def from_file(cls, config_path: Optional[Path] = None) -> 'LabelSettings':
+        """
+        設定ファイルから読み込む
+
+        Raises:
+            FileNotFoundError: 設定ファイルが見つからない場合
+            json.JSONDecodeError: JSON構文エラーの場合
+            ValueError: 無効な正規表現パターンがある場合
+        """
+        config_path = Path(config_path) if config_path is not None else DEFAULT_CONFIG_PATH
+        return cls(load_label_config(config_path), source=str(config_path), validate=False)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("LabelSettings は変更できません（with_overrides() で新しい設定を作成してください）")
+
+    def __delattr__(self, name):
+        raise AttributeError("LabelSettings は変更できません")
+
+    def __eq__(self, other):
+        if not isinstance(other, LabelSettings):
+            return NotImplemented
+        return self.digest == other.digest
+
+    def __hash__(self):
+        return hash(self.digest)
+
+    def __reduce__(self):
+        return (_settings_from_canonical, (self._canonical, self.source))
+
+    def __repr__(self):
+        return f"LabelSettings(digest={self.digest[:12]!r}, source={self.source!r})"
+
+    @property
+    def config(self) -> Mapping:
+        """設定全体（変更できない辞書。入れ子のリストはタプル）"""
+        return self._config
+
+    def to_dict(self) -> Dict:
+        """設定全体を通常の辞書として取得（新しいコピー）"""
+        return json.loads(self._canonical)
+
+    def with_overrides(self, overrides: Optional[Mapping[str, Any]]) -> 'LabelSettings':
+        """
+        上書きを適用した新しい設定を取得（上書きがない場合は自分自身）
+
+        Args:
+            overrides: ドット区切りのキー → 値（apply_config_overrides と同じ形式）
+
+        Raises:
+            ValueError: 無効な設定キー、または無効な正規表現パターンの場合
+        """
+        if not overrides:
+            return self
+        return LabelSettings(apply_config_overrides(self.to_dict(), overrides), source=self.source)
+
+    def get_patterns(self, label_id: str) -> List[re.Pattern]:
+        """
+        ラベルIDのコンパイル済みパターンを取得（初回の参照時にコンパイル）
+
+        Returns:
+            コンパイル済みパターンのリスト（定義がない場合は空リスト）
+        """
+        patterns = self._patterns.get(label_id)
+        if patterns is None:
+            definition = self._config.get('label_definitions', {}).get(label_id, {})
+            patterns = [re.compile(pattern) for pattern in definition.get('patterns', ())]
+            self._patterns[label_id] = patterns
+        return patterns
+
+    def get_pattern_priority(self) -> Tuple[str, ...]:
+        """パターンの優先順位（pattern_priority）を取得"""
+        return self._config.get('pattern_priority', ())
+
+    def get_conversion_behaviors(self) -> Mapping:
+        """変換動作設定（conversion_behaviors）を取得"""
+        return self._config.get('conversion_behaviors', MappingProxyType({}))
+
+    @property
+    def label_config(self) -> 'LabelConfig':
+        """この設定で判定する LabelConfig（初回の参照時に作成）"""
+        if self._label_config is None:
+            object.__setattr__(self, '_label_config', LabelConfig(settings=self))
+        return self._label_config
+
+
+def _settings_from_canonical(canonical: str, source: Optional[str]) -> LabelSettings:
+    """pickle から LabelSettings を復元（パターンは作成元で検証済み）"""
+    return LabelSettings(json.loads(canonical), source=source, validate=False)
+
+
+# use_label_settings() で有効にした設定（スレッド・非同期タスクごとに独立）
+_active_settings: ContextVar[Optional[LabelSettings]] = ContextVar('label_settings', default=None)
+
+
+@contextmanager
+def use_label_settings(settings: Optional[LabelSettings]) -> Iterator[Optional[LabelSettings]]:
+    """
+    範囲内のラベル判定（detect_label_id 等のモジュール関数）で使う設定を有効にする
+
+    settings が None の場合は何も変更しない。設定はコンテキスト変数に保持するため、
+    並行して実行する別の変換（別スレッド・別プロセス）には影響しない。
+    """
+    if settings is None:
+        yield get_active_label_settings()
+        return
+    token = _active_settings.set(settings)
+    try:
+        yield settings
+    finally:
+        _active_settings.reset(token)
+
+
+def get_active_label_settings() -> Optional[LabelSettings]:
+    """use_label_settings() で有効にした設定を取得（範囲外の場合はNone）"""
+    return _active_settings.get()
+
+
 class LabelPattern(Enum):
     """項目ラベルのパターン（後方互換性のため維持）"""
     GRADE_DOUBLE = "grade_double"                  # 〔第１学年及び第２学年〕
@@ -41,46 +335,55 @@ class LabelPattern(Enum):
 class LabelConfig:
     """JSON設定ファイルベースのラベル設定管理クラス"""
 
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, settings: Optional[LabelSettings] = None):
         """
         LabelConfigの初期化
 
         Args:
             config_path: 設定ファイルのパス（Noneの場合はデフォルトパス）
+            settings: 設定（指定した場合は設定ファイルを読み込まない）
         """
-        if config_path is None:
-            # デフォルト設定ファイルパス
-            script_dir = Path(__file__).parent.parent
-            config_path = script_dir / "config" / "label_config.json"
+        if settings is None:
+            if config_path is None:
+                # デフォルト設定ファイルパス
+                config_path = DEFAULT_CONFIG_PATH
 
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
-        except FileNotFoundError:
-            raise FileNotFoundError(f"ラベル設定ファイルが見つかりません: {config_path}")
-        except json.JSONDecodeError as e:
-            raise ValueError(f"ラベル設定ファイルのJSON構文エラー: {e}")
+            try:
+                settings = LabelSettings.from_file(Path(config_path))
+            except FileNotFoundError:
+                raise FileNotFoundError(f"ラベル設定ファイルが見つかりません: {config_path}")
+            except json.JSONDecodeError as e:
+                raise ValueError(f"ラベル設定ファイルのJSON構文エラー: {e}")
+
+        self.settings = settings
+        self.config = settings.config
 
         self._build_pattern_cache()
 
     def _build_pattern_cache(self):
-        """正規表現パターンをコンパイルしてキャッシュ"""
+        """ラベル定義のキャッシュを作成（パターンは get_patterns() の初回参照時に LabelSettings がコンパイル）"""
         self.pattern_cache: Dict[str, Dict] = {}
-        self.pattern_priority: List[str] = self.config.get('pattern_priority', [])
+        self.pattern_priority = self.settings.get_pattern_priority()
 
         for label_id, definition in self.config['label_definitions'].items():
-            compiled_patterns = []
-            for pattern in definition.get('patterns', []):
-                try:
-                    compiled_patterns.append(re.compile(pattern))
-                except re.error as e:
-                    raise ValueError(f"無効な正規表現パターン '{pattern}' in {label_id}: {e}")
-
             self.pattern_cache[label_id] = {
-                'patterns': compiled_patterns,
                 'definition': definition
             }
 
+    def get_patterns(self, label_id: str) -> List[re.Pattern]:
+        """
+        ラベルIDのコンパイル済みパターンを取得
+
+        Args:
+            label_id: ラベルID
+
+        Returns:
+            コンパイル済みパターンのリスト（定義がない場合は空リスト）
+        """
+        if label_id not in self.pattern_cache:
+            return []
+        return self.settings.get_patterns(label_id)
+
     def detect_label_id(self, text: str, exclude_label_ids: Optional[List[str]] = None) -> Optional[str]:
         """
         テキストからラベルIDを判定
@@ -106,11 +409,9 @@ class LabelConfig:
             if label_id in exclude_label_ids:
                 continue
                 
-            if label_id in self.pattern_cache:
-                cache_item = self.pattern_cache[label_id]
-                for pattern in cache_item['patterns']:
-                    if pattern.match(text):
-                        return label_id
+            for pattern in self.get_patterns(label_id):
+                if pattern.match(text):
+                    return label_id
 
         return None
 
@@ -146,7 +447,14 @@ class LabelConfig:
 _label_config: Optional[LabelConfig] = None
 
 def get_label_config() -> LabelConfig:
-    """グローバルLabelConfigインスタンスを取得"""
+    """
+    LabelConfigインスタンスを取得
+
+    use_label_settings() の範囲内ではその設定の LabelConfig、範囲外ではグローバルインスタンスを返す。
+    """
+    settings = _active_settings.get()
+    if settings is not None:
+        return settings.label_config
     global _label_config
     if _label_config is None:
         _label_config = LabelConfig()
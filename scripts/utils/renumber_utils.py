@@ -9,6 +9,8 @@ Num属性の連番付け直し機能を提供します。
 1. ElementTreeベース: DOM解析による安全な連番付け（推奨）
 2. テキストベース: 元のインデント・コメントを完全保持
 
+どちらも全マッピングを1回の走査で処理します（親要素ごとのカウンタをスタックで管理）。
+
 【使用例】
 ```python
 from utils import renumber_nums_in_tree, renumber_nums_in_file
@@ -29,6 +31,77 @@ from pathlib import Path
 from typing import List, Tuple, Optional, Dict, Set, Union
 
 
+# テキストベース処理で使用するトークン（コメント・CDATA・処理命令・DOCTYPE・終了タグ・開始タグ）
+# 1回の走査で先頭から順に読み進めるだけで、要素ブロック単位のバックトラックは行わない
+_MARKUP_TOKEN_PATTERN = re.compile(
+    r'<!--.*?-->'
+    r'|<!\[CDATA\[.*?\]\]>'
+    r'|<\?.*?\?>'
+    r'|<!(?:[^>\[]|\[[^\]]*\])*>'
+    r'|</(?P<end>[^\s>]+)\s*>'
+    r'|<(?P<start>[^\s/>!?]+)(?P<attrs>(?:[^>"\']|"[^"]*"|\'[^\']*\')*?)(?P<empty>/?)>',
+    re.DOTALL
+)
+_NUM_ATTR_PATTERN = re.compile(r'(?:^|\s)Num\s*=\s*(?:"(?P<dq>[^"]*)"|\'(?P<sq>[^\']*)\')')
+
+
+class _RenumberState:
+    """1回の走査で全マッピングの連番を振るためのカウンタ管理（内部用）
+    
+    親要素の開始で親ごとのカウンタをスタックに積み、終了で取り除きます。
+    子要素は、その要素を対象とするマッピングのうちリストの後方にあるもの
+    （従来の複数パス処理で最後に上書きしていたもの）で、親要素が開いているものを採用し、
+    最も内側の親要素のカウンタで番号を振ります。親要素を指定しないマッピングは
+    文書全体で1つのカウンタを使います。
+    """
+    
+    def __init__(self, mappings: List[Tuple[str, Optional[str]]], start_num: int = 1):
+        self.start_num = start_num
+        self.stats: Dict[str, int] = {}
+        # 子要素タグ -> 親要素タグ（Noneは文書全体）のリスト（優先度の高い順）
+        self.scopes_by_tag: Dict[str, List[Optional[str]]] = {}
+        for parent_tag, child_tag in mappings:
+            target_tag, scope = (parent_tag, None) if child_tag is None else (child_tag, parent_tag)
+            scopes = self.scopes_by_tag.setdefault(target_tag, [])
+            if scope in scopes:
+                scopes.remove(scope)
+            scopes.insert(0, scope)
+        self.parent_tags: Set[str] = {p for p, c in mappings if c is not None}
+        # 親要素タグ -> 開いている親要素ごとのカウンタ（子要素タグ -> 次の番号）のスタック
+        self.open_parents: Dict[str, List[Dict[str, int]]] = {tag: [] for tag in self.parent_tags}
+        self.global_counters: Dict[str, int] = {}
+    
+    @property
+    def tags(self) -> Set[str]:
+        """走査対象の要素タグ"""
+        return self.parent_tags | set(self.scopes_by_tag)
+    
+    def start(self, tag: str, has_num: bool) -> Optional[int]:
+        """要素の開始。番号を振る場合はその番号を返す"""
+        number = None
+        scopes = self.scopes_by_tag.get(tag)
+        if scopes and has_num:
+            for scope in scopes:
+                if scope is None:
+                    counters = self.global_counters
+                elif self.open_parents[scope]:
+                    counters = self.open_parents[scope][-1]
+                else:
+                    continue
+                number = counters.get(tag, self.start_num)
+                counters[tag] = number + 1
+                self.stats[tag] = self.stats.get(tag, 0) + 1
+                break
+        if tag in self.parent_tags:
+            self.open_parents[tag].append({})
+        return number
+    
+    def end(self, tag: str) -> None:
+        """要素の終了"""
+        if tag in self.parent_tags and self.open_parents[tag]:
+            self.open_parents[tag].pop()
+
+
 def renumber_nums_in_tree(
     tree: ET.ElementTree, 
     mappings: List[Tuple[str, Optional[str]]],
@@ -38,6 +111,9 @@ def renumber_nums_in_tree(
     
     親子関係を指定することで、親要素が切り替わるたびに子要素のカウンタをリセットします。
     親を指定しない場合（None）は、全体で連番を振ります。
+    全マッピングを文書の1回の走査で処理します。同じ名前の親要素が入れ子になっている場合、
+    子要素は最も内側の親要素ごとに連番になります。1つの要素に複数のマッピングが
+    該当する場合は、リストの後方にあるマッピングが優先されます。
     
     Args:
         tree: 処理対象のElementTree
@@ -62,30 +138,20 @@ def renumber_nums_in_tree(
         >>> stats = renumber_nums_in_tree(tree, [('Paragraph', 'Item')])
         >>> print(stats)  # {'Item': 125}
     """
-    root = tree.getroot()
-    stats: Dict[str, int] = {}
-    
-    for parent_tag, child_tag in mappings:
-        if child_tag is None:
-            # 親を指定しない場合: 全体で連番
-            counter = start_num
-            for elem in root.iter(parent_tag):
-                if 'Num' in elem.attrib:
-                    elem.set('Num', str(counter))
-                    counter += 1
-                    stats[parent_tag] = stats.get(parent_tag, 0) + 1
+    state = _RenumberState(mappings, start_num)
+    tags = state.tags
+    if not tags:
+        return state.stats
+    
+    for event, elem in ET.iterwalk(tree.getroot(), events=('start', 'end'), tag=list(tags)):
+        if event == 'start':
+            number = state.start(elem.tag, 'Num' in elem.attrib)
+            if number is not None:
+                elem.set('Num', str(number))
         else:
-            # 親子関係を指定した場合: 親ごとにカウンタリセット
-            for parent_elem in root.iter(parent_tag):
-                counter = start_num
-                for child_elem in parent_elem.iter(child_tag):
-                    # 親要素の直接/間接の子要素であることを確認
-                    if 'Num' in child_elem.attrib:
-                        child_elem.set('Num', str(counter))
-                        counter += 1
-                        stats[child_tag] = stats.get(child_tag, 0) + 1
-    
-    return stats
+            state.end(elem.tag)
+    
+    return state.stats
 
 
 def renumber_nums_in_file(
@@ -151,6 +217,8 @@ def _renumber_text_based(
     """テキストベースのNum属性振り直し（内部用）
     
     元のインデント・コメントを完全に保持します。
+    タグを先頭から1回だけ読み進め（コメント・CDATA内は対象外）、
+    renumber_nums_in_tree と同じ規則で振った番号でNum属性の値の部分だけを置き換えます。
     
     Args:
         content: XML文字列
@@ -160,54 +228,37 @@ def _renumber_text_based(
     Returns:
         Tuple[str, Dict[str, int]]: (新しいXML文字列, 統計)
     """
-    stats: Dict[str, int] = {}
-    new_content = content
-    
-    for parent_tag, child_tag in mappings:
-        if child_tag is None:
-            # 親を指定しない場合: 全体で連番
-            counter = start_num
-            pattern = re.compile(
-                rf'(<{re.escape(parent_tag)}\b[^>]*?\bNum\s*=\s*")([^"]*?)(")',
-                re.DOTALL
-            )
-            
-            def replace_func(match):
-                nonlocal counter
-                result = f"{match.group(1)}{counter}{match.group(3)}"
-                counter += 1
-                stats[parent_tag] = stats.get(parent_tag, 0) + 1
-                return result
-            
-            new_content = pattern.sub(replace_func, new_content)
-        else:
-            # 親子関係を指定した場合: 親ブロックごとにカウンタリセット
-            parent_block_pattern = re.compile(
-                rf'(<{re.escape(parent_tag)}\b[\s\S]*?</{re.escape(parent_tag)}>)',
-                re.DOTALL
-            )
-            
-            def replace_block(match):
-                block_text = match.group(1)
-                counter = start_num
-                
-                child_pattern = re.compile(
-                    rf'(<{re.escape(child_tag)}\b[^>]*?\bNum\s*=\s*")([^"]*?)(")',
-                    re.DOTALL
-                )
-                
-                def replace_child(child_match):
-                    nonlocal counter
-                    result = f"{child_match.group(1)}{counter}{child_match.group(3)}"
-                    counter += 1
-                    stats[child_tag] = stats.get(child_tag, 0) + 1
-                    return result
-                
-                return child_pattern.sub(replace_child, block_text)
-            
-            new_content = parent_block_pattern.sub(replace_block, new_content)
-    
-    return new_content, stats
+    state = _RenumberState(mappings, start_num)
+    tags = state.tags
+    parts: List[str] = []
+    pos = 0
+    
+    for token in _MARKUP_TOKEN_PATTERN.finditer(content):
+        end_tag = token.group('end')
+        if end_tag is not None:
+            if end_tag in tags:
+                state.end(end_tag)
+            continue
+        
+        tag = token.group('start')
+        if tag is None or tag not in tags:
+            continue
+        
+        attrs = token.group('attrs')
+        num_match = _NUM_ATTR_PATTERN.search(attrs)
+        number = state.start(tag, num_match is not None)
+        if number is not None:
+            group = 'dq' if num_match.group('dq') is not None else 'sq'
+            value_start = token.start('attrs') + num_match.start(group)
+            value_end = token.start('attrs') + num_match.end(group)
+            parts.append(content[pos:value_start])
+            parts.append(str(number))
+            pos = value_end
+        if token.group('empty'):
+            state.end(tag)
+    
+    parts.append(content[pos:])
+    return ''.join(parts), state.stats
 
 
 def get_default_mappings() -> List[Tuple[str, Optional[str]]]:
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+パイプラインのステップ結果キャッシュ（内容アドレス方式）
+
+各ステップの出力XMLを、次の内容から計算したキーで保存する。
+- 直前のステップのキー（先頭のステップは入力XMLのバイト列のハッシュ）
+- ステップのスクリプトのソース
+- label_config.json の内容
+- ステップのパラメータ
+
+キーは前段のキーを含む連鎖になっているため、あるステップのキーが一致すれば
+そこまでの出力はすべて再利用でき、最初に無効になったステップから変換を再開できる。
+
+キャッシュの合計サイズには上限があり、超えた場合は最後に使用された時刻（mtime）が
+古いものから削除する（LRU）。複数プロセスから同じディレクトリを共有できるよう、
+書き込みは一時ファイル→os.replace で行う。
+"""
+
+import os
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+
+# キャッシュディレクトリ・サイズ上限を指定する環境変数
+CACHE_DIR_ENV = "XML_FORMATTER_STEP_CACHE"
+CACHE_MAX_MB_ENV = "XML_FORMATTER_STEP_CACHE_MAX_MB"
+
+# デフォルトのサイズ上限（MB）
+DEFAULT_MAX_MB = 1024
+
+# キャッシュファイルの拡張子
+ENTRY_SUFFIX = ".xml"
+
+# ファイルのハッシュのキャッシュ（パス → ((mtime_ns, サイズ), ハッシュ)）
+_file_digest_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+
+def file_digest(path: Path) -> str:
+    """
+    ファイル内容のSHA-256を取得（同一プロセス内ではmtime・サイズが変わらない限り再計算しない）
+
+    Args:
+        path: 対象ファイルのパス
+
+    Returns:
+        16進数のハッシュ文字列
+    """
+    path = Path(path)
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cache_key = str(path.resolve())
+    cached = _file_digest_cache.get(cache_key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    result = digest.hexdigest()
+    _file_digest_cache[cache_key] = (signature, result)
+    return result
+
+
+def files_digest(paths: Iterable[Path]) -> str:
+    """複数ファイルの内容をまとめたハッシュを取得（パスの順序に依存しないようソートする）"""
+    digest = hashlib.sha256()
+    for path in sorted(Path(p) for p in paths):
+        digest.update(path.name.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(file_digest(path).encode('ascii'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def chain_key(previous_key: str, *parts: str) -> str:
+    """
+    直前のキーとステップ固有の要素から次のキーを計算
+
+    Args:
+        previous_key: 直前のステップのキー（先頭のステップは入力XMLのハッシュ）
+        parts: ステップのソース・設定・パラメータ等を表す文字列
+
+    Returns:
+        16進数のキー文字列
+    """
+    digest = hashlib.sha256(previous_key.encode('ascii'))
+    for part in parts:
+        digest.update(b'\0')
+        digest.update(part.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class StepCache:
+    """ステップの出力XMLを保存するキャッシュディレクトリ"""
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        """
+        StepCacheの初期化
+
+        Args:
+            cache_dir: キャッシュディレクトリ（存在しない場合は作成する）
+            max_bytes: キャッシュの合計サイズの上限（バイト）
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_env(cls) -> Optional['StepCache']:
+        """
+        環境変数からキャッシュを作成
+
+        XML_FORMATTER_STEP_CACHE が未設定の場合はNone（キャッシュを使わない）。
+        サイズ上限は XML_FORMATTER_STEP_CACHE_MAX_MB（MB）で指定できる。
+        """
+        cache_dir = os.environ.get(CACHE_DIR_ENV)
+        if not cache_dir:
+            return None
+        max_mb = float(os.environ.get(CACHE_MAX_MB_ENV) or DEFAULT_MAX_MB)
+        return cls(Path(cache_dir), int(max_mb * 1024 * 1024))
+
+    def path_for(self, key: str) -> Path:
+        """キーに対応するキャッシュファイルのパス"""
+        return self.cache_dir / key[:2] / f"{key}{ENTRY_SUFFIX}"
+
+    def contains(self, key: str) -> bool:
+        """キーに対応するエントリがあるかどうか（最終使用時刻は更新しない）"""
+        return self.path_for(key).is_file()
+
+    def get(self, key: str) -> Optional[Path]:
+        """
+        キーに対応するキャッシュファイルを取得し、最終使用時刻を更新する
+
+        Returns:
+            キャッシュファイルのパス（エントリがない場合はNone）
+        """
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, write_func: Callable[[Path], None]) -> Path:
+        """
+        エントリを書き込む
+
+        Args:
+            key: キャッシュキー
+            write_func: 渡されたパスに出力XMLを書き出す関数
+
+        Returns:
+            キャッシュファイルのパス
+        """
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        os.close(fd)
+        try:
+            write_func(Path(temp_name))
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        return path
+
+    def put_file(self, key: str, source_path: Path) -> Path:
+        """既存のファイル（中間ファイル等）の内容をエントリとして書き込む"""
+        def copy(temp_path: Path) -> None:
+            with open(source_path, 'rb') as src, open(temp_path, 'wb') as dst:
+                for chunk in iter(lambda: src.read(1 << 20), b''):
+                    dst.write(chunk)
+        return self.put(key, copy)
+
+    def _entries(self):
+        """(最終使用時刻, サイズ, パス) のリスト"""
+        entries = []
+        if not self.cache_dir.is_dir():
+            return entries
+        for path in self.cache_dir.glob(f"*/*{ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return entries
+
+    def total_size(self) -> int:
+        """キャッシュの合計サイズ（バイト）"""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        """
+        合計サイズが上限を超えている場合、最終使用時刻の古いエントリから削除する
+
+        Returns:
+            削除したエントリ数
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+テキスト分類ユーティリティ
+
+ラベル判定（label_utils）と括弧判定（bracket_utils）の結果を1回の呼び出しでまとめて返す。
+同じラベルテキスト（「（１）」「ア」など）は全階層の変換で繰り返し判定されるため、
+分類結果を件数上限付きのキャッシュに保持する。
+
+キャッシュキーは「strip後のテキスト」「除外ラベルIDの集合」「現在有効な設定（LabelSettings）」で、
+label_config.json が更新された場合や、実行ごとに上書きした設定で変換する場合は古い結果を使わない。
+"""
+
+import re
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional
+
+from .label_utils import LabelSettings, detect_label_id, get_alphabet_type, get_number_type
+from .bracket_utils import (
+    is_subject_name_bracket,
+    is_instruction_bracket,
+    is_grade_single_bracket,
+    is_grade_double_bracket,
+    get_bracket_type
+)
+from .config_registry import get_active_settings
+
+
+# 分類結果キャッシュの最大件数
+CLASSIFY_CACHE_SIZE = 8192
+
+# ラベルとして扱わないラベルID
+NON_LABEL_IDS = ('empty', 'text_non_label')
+
+# 漢数字ラベル（一, 二などの漢数字）
+KANJI_NUMBER_LABELS = ('一', '二', '三', '四', '五', '六', '七', '八', '九', '十')
+
+# 学年パターン（〔第...学年...〕形式）
+GRADE_PATTERN = re.compile(r'^[〔【]第.+学年.*[〕】]$')
+
+
+class TextClassification:
+    """テキストの分類結果"""
+
+    __slots__ = (
+        'text', 'label_id', 'is_label', 'bracket_type', 'is_subject_name', 'is_instruction',
+        'is_grade_pattern', 'is_grade_single', 'is_grade_double', 'is_kanji_number',
+        'alphabet_type', 'number_type'
+    )
+
+    def __init__(self, text: str, exclude_label_ids: FrozenSet[str]):
+        """
+        テキストを分類
+
+        Args:
+            text: strip済みのテキスト
+            exclude_label_ids: ラベル判定から除外するラベルIDの集合
+        """
+        self.text = text
+        self.label_id: Optional[str] = detect_label_id(text, list(exclude_label_ids))
+        self.is_label = self.label_id is not None and self.label_id not in NON_LABEL_IDS
+        self.bracket_type: Optional[str] = get_bracket_type(text)
+        self.is_subject_name = is_subject_name_bracket(text)
+        self.is_instruction = is_instruction_bracket(text)
+        self.is_grade_pattern = bool(GRADE_PATTERN.match(text))
+        self.is_grade_single = is_grade_single_bracket(text)
+        self.is_grade_double = is_grade_double_bracket(text)
+        self.is_kanji_number = text in KANJI_NUMBER_LABELS
+        # 数字・アルファベットの種類はラベルの場合のみ判定
+        self.alphabet_type = get_alphabet_type(text) if self.is_label else 'unknown'
+        self.number_type = get_number_type(text) if self.is_label else 'unknown'
+
+    @property
+    def grade_kind(self) -> Optional[str]:
+        """学年括弧の種類（'grade_double' / 'grade_single' / None）"""
+        if self.is_grade_double:
+            return 'grade_double'
+        if self.is_grade_single:
+            return 'grade_single'
+        return None
+
+    def __repr__(self):
+        return f"TextClassification(text={self.text!r}, label_id={self.label_id!r}, bracket_type={self.bracket_type!r})"
+
+
+@lru_cache(maxsize=CLASSIFY_CACHE_SIZE)
+def _classify_cached(text: str, exclude_label_ids: FrozenSet[str],
+                     settings: Optional[LabelSettings]) -> TextClassification:
+    """分類結果をキャッシュ（settingsは設定の内容が異なる結果を区別するためのキー）"""
+    return TextClassification(text, exclude_label_ids)
+
+
+def classify_text(text: Optional[str], exclude_label_ids: Optional[Iterable[str]] = None) -> TextClassification:
+    """
+    テキストのラベル・括弧・学年・漢数字・数字/アルファベット種類をまとめて判定
+
+    Args:
+        text: 判定するテキスト（前後の空白は無視する）
+        exclude_label_ids: ラベル判定から除外するラベルIDのリスト（文脈依存の判定用）
+
+    Returns:
+        TextClassification: 分類結果（キャッシュされるため変更しないこと）
+
+    Examples:
+        >>> classify_text("（１）").is_label
+        True
+
+        >>> classify_text("〔第１学年〕").grade_kind
+        'grade_single'
+    """
+    text = text.strip() if text else ""
+    excluded = frozenset(exclude_label_ids) if exclude_label_ids else frozenset()
+    try:
+        settings = get_active_settings()
+    except (OSError, ValueError):
+        settings = None
+    return _classify_cached(text, excluded, settings)
+
+
+def clear_classify_cache() -> None:
+    """分類結果のキャッシュをクリア"""
+    _classify_cached.cache_clear()
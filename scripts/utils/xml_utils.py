@@ -8,6 +8,7 @@ XML処理関数を提供します。
 
 from lxml import etree as ET
 import sys
+from copy import deepcopy
 from pathlib import Path
 from typing import Union
 
@@ -27,11 +28,27 @@ def create_element_with_text(tag: str, text: str, attrib: dict = None) -> ET.Ele
     return element
 
 
+def transfer_element(element: ET.Element, move: bool = False) -> ET.Element:
+    """別の親要素に追加するための要素を返す
+
+    move=Trueの場合は要素そのものを返し、追加すると元の位置から移動する（tailも一緒に移動する）。
+    move=Falseの場合はコピーを返す。移動は元の要素が変換後に破棄される場合のみ使用する。
+    """
+    return element if move else deepcopy(element)
+
+
+def transfer_children(source: ET.Element, target: ET.Element, move: bool = False) -> None:
+    """sourceの子要素をtargetの末尾に追加する（move=Trueの場合は移動、Falseの場合はコピー）"""
+    for child in list(source):
+        target.append(child if move else deepcopy(child))
+
+
 def indent_xml(elem: ET.Element, level: int = 0, indent_str: str = "  ") -> None:
-    """XML要素を再帰的にインデント整形
+    """XML要素をインデント整形
     
-    Python 3.9以降のET.indent()と同等の機能を提供。
-    Python 3.9未満でも動作するように独自実装。
+    lxmlのetree.indent()（C実装）で子孫要素を整形し、要素自身のtailを
+    従来の再帰実装と同じ規則で設定します。空白のみ（または空）のtext/tailだけを
+    置き換え、テキストを含むtext/tailは変更しません。
     
     Args:
         elem: 整形対象のElement
@@ -44,36 +61,31 @@ def indent_xml(elem: ET.Element, level: int = 0, indent_str: str = "  ") -> None
         indent_xml(root)
         tree.write('output.xml', encoding='utf-8', xml_declaration=True)
     """
-    # 現在のレベルのインデント
-    current_indent = "\n" + (indent_str * level)
-    
-    # 子要素が存在する場合
-    if len(elem):
-        # 最初の子要素の前にインデントを追加
-        if not elem.text or not elem.text.strip():
-            elem.text = current_indent + indent_str
-        
-        # 各子要素を再帰的に処理
-        for i, child in enumerate(elem):
-            indent_xml(child, level + 1, indent_str)
-            
-            # 子要素の後にインデントを追加
-            if i < len(elem) - 1:
-                # 最後以外の子要素
-                if not child.tail or not child.tail.strip():
-                    child.tail = current_indent + indent_str
-            else:
-                # 最後の子要素
-                if not child.tail or not child.tail.strip():
-                    child.tail = current_indent
-        
-        # 閉じタグの前のインデント調整
+    # 子孫要素のtext/tailはetree.indent()で設定
+    ET.indent(elem, space=indent_str, level=level)
+    
+    # 要素自身のtail（子要素がある場合、またはルート以外の場合）
+    if len(elem) or level > 0:
         if not elem.tail or not elem.tail.strip():
-            elem.tail = current_indent
-    else:
-        # 子要素がない場合
-        if level > 0 and (not elem.tail or not elem.tail.strip()):
-            elem.tail = current_indent
+            elem.tail = "\n" + (indent_str * level)
+
+
+def normalize_empty_text(elem: ET.Element) -> None:
+    """空文字列のtext/tailをNoneにする
+    
+    空文字列のtextは `<a></a>` として書き出され、再パースするとNoneになるため、
+    ファイルに書き出して再パースした場合と同じ状態にメモリ上で揃える。
+    
+    Args:
+        elem: 対象の要素（子孫要素も含めて処理）
+    """
+    for e in elem.iter():
+        if not isinstance(e.tag, str):
+            continue
+        if e.text == '':
+            e.text = None
+        if e.tail == '':
+            e.tail = None
 
 
 def indent_xml_native(elem: ET.Element, space: str = "  ") -> None:
@@ -130,6 +142,49 @@ def save_xml_with_indent(tree: ET.ElementTree, output_path: Union[str, Path],
     )
 
 
+def write_xml(tree: Union[ET.ElementTree, ET.Element], output_path: Union[str, Path],
+              indent_str: str = "  ", formatted: bool = True) -> None:
+    """XMLツリーをetree.indent()で整形し、ストリーミングで保存
+    
+    従来の format_xml_lxml() が行っていた tostring()→fromstring() の往復（文書全体の
+    コピーと再パース）を行わず、ツリーをその場で正規化してファイルに直接書き出します。
+    ルート要素の出力は往復した場合とバイト単位で同一です。
+    ElementTreeを渡した場合は tree.write() で書き出し、DOCTYPE 宣言（内部サブセットを含む）と
+    ルート要素の前後のコメント・処理命令も保存します（ルート要素を渡した場合はルート要素のみ）。
+    
+    Args:
+        tree: 保存するElementTreeまたはルート要素
+        output_path: 出力ファイルパス
+        indent_str: インデント文字列（デフォルト: 2スペース）
+        formatted: Falseの場合はインデント整形を行わずにそのまま書き出す
+                   （インデント済みのツリーや、整形不要な中間ファイル向け）
+    
+    Note:
+        ツリーはその場で変更されます（空文字列のtext/tailとルート要素のtailはNoneになり、
+        formatted=Trueの場合は空白のみのtext/tailがインデントで置き換えられます）。
+    """
+    is_tree = isinstance(tree, ET._ElementTree)
+    root = tree.getroot() if is_tree else tree
+    
+    # 再パースした場合と同じく、空文字列のtext/tailを除去（<a></a> → <a/>）
+    normalize_empty_text(root)
+    if formatted:
+        ET.indent(root, space=indent_str, level=0)
+    
+    if is_tree:
+        # 文書全体（DOCTYPE宣言と内部サブセット、ルート要素の前後のコメント・処理命令）を
+        # tree.write() でそのまま書き出す（ルート要素のtailは再パースで失われるため書き出さない）
+        root.tail = None
+        tree.write(str(output_path), encoding='UTF-8', xml_declaration=True)
+        return
+    
+    # XML宣言付きでルート要素のみを保存
+    with open(output_path, 'wb') as f:
+        with ET.xmlfile(f, encoding='UTF-8') as xf:
+            xf.write_declaration()
+            xf.write(root, with_tail=False)
+
+
 def pretty_print_xml(input_path: Union[str, Path], output_path: Union[str, Path], 
                      indent_str: str = "  ") -> None:
     """XMLファイルを読み込んでインデント整形して保存
@@ -2,21 +2,53 @@
 import xml.etree.ElementTree as ET
 import sys
 
+
+class XMLSyntaxValidation:
+    """
+    Result of validate_xml().
+
+    Attributes:
+        file_path (str): The validated file.
+        error (str or None): The parse error message (None if the file is well-formed).
+        file_not_found (bool): True if the file does not exist.
+    """
+
+    def __init__(self, file_path, error=None, file_not_found=False):
+        self.file_path = file_path
+        self.error = error
+        self.file_not_found = file_not_found
+
+    @property
+    def is_valid(self):
+        """True if the file exists and is well-formed."""
+        return self.error is None and not self.file_not_found
+
+    def format_report(self):
+        """The report printed by the command line (without the final newline)."""
+        if self.file_not_found:
+            return f"ERROR: File not found at '{self.file_path}'."
+        if self.error is not None:
+            return f"ERROR: XML parsing failed for file '{self.file_path}'.\nError message: {self.error}"
+        return f"SUCCESS: XML file '{self.file_path}' is well-formed."
+
+
 def validate_xml(file_path):
     """
     Validates an XML file by attempting to parse it.
 
     Args:
         file_path (str): The path to the XML file.
+
+    Returns:
+        XMLSyntaxValidation: The result (use format_report() for the printed report).
     """
     try:
-        tree = ET.parse(file_path)
-        print(f"SUCCESS: XML file '{file_path}' is well-formed.")
+        ET.parse(file_path)
+        return XMLSyntaxValidation(file_path)
     except ET.ParseError as e:
-        print(f"ERROR: XML parsing failed for file '{file_path}'.")
-        print(f"Error message: {e}")
+        return XMLSyntaxValidation(file_path, error=str(e))
     except FileNotFoundError:
-        print(f"ERROR: File not found at '{file_path}'.")
+        return XMLSyntaxValidation(file_path, file_not_found=True)
 
 if __name__ == "__main__":
     if len(sys.argv) != 2:
@@ -24,4 +56,4 @@ if __name__ == "__main__":
         sys.exit(1)
     
     xml_file = sys.argv[1]
-    validate_xml(xml_file)
+    print(validate_xml(xml_file).format_report())
@@ -16,13 +16,17 @@ from enum import Enum
 from pathlib import Path
 from lxml import etree
 from typing import Optional, Tuple, Dict, List
-from copy import deepcopy
+from copy import copy, deepcopy
 
 # scripts/utils/をインポートパスに追加
 script_dir = Path(__file__).resolve().parent
 sys.path.insert(0, str(script_dir))
 
 from utils.label_utils import is_label, detect_label_id, get_number_type, get_alphabet_type, is_valid_label_id, get_exclude_label_ids_for_context
+from utils.label_utils import LabelSettings, use_label_settings
+from utils.xml_utils import normalize_empty_text, write_xml, transfer_element, transfer_children
+from utils.config_registry import get_active_settings
+from utils.text_classifier import classify_text, GRADE_PATTERN, KANJI_NUMBER_LABELS
 from utils.bracket_utils import is_subject_name_bracket, is_instruction_bracket, is_grade_single_bracket, is_grade_double_bracket, get_bracket_type
 
 
@@ -72,22 +76,24 @@ DOT_SEPARATED_NUMBER_LABEL_IDS = [
 # 設定読み込み関数
 # ============================================================================
 
-def load_conversion_behaviors_config() -> Dict:
-    """変換動作設定を読み込む"""
-    script_dir = Path(__file__).resolve().parent
-    config_path = script_dir / "config" / "label_config.json"
-    
+def load_conversion_behaviors_config(settings: Optional[LabelSettings] = None) -> Dict:
+    """
+    変換動作設定を読み込む
+
+    Args:
+        settings: 設定（Noneの場合は現在有効な設定。設定ファイルは更新された場合のみ再読み込み）
+    """
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        return config.get('conversion_behaviors', {})
-    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        if settings is None:
+            settings = get_active_settings()
+        return settings.get_conversion_behaviors()
+    except (FileNotFoundError, json.JSONDecodeError, KeyError, ValueError):
         return {}
 
 
-def should_convert_text_first_column_to_sentences(child_tag: str) -> bool:
+def should_convert_text_first_column_to_sentences(child_tag: str, settings: Optional[LabelSettings] = None) -> bool:
     """Columnが2つあり、かつ1つ目がテキストの場合にSentence要素を2つ作成するかどうかを判定"""
-    behaviors = load_conversion_behaviors_config()
+    behaviors = load_conversion_behaviors_config(settings)
     behavior = behaviors.get('column_list_text_first_column', {})
     
     if not behavior.get('enabled', False):
@@ -97,9 +103,9 @@ def should_convert_text_first_column_to_sentences(child_tag: str) -> bool:
     return child_tag in target_levels
 
 
-def should_split_no_column_text_lists(child_tag: str) -> bool:
+def should_split_no_column_text_lists(child_tag: str, settings: Optional[LabelSettings] = None) -> bool:
     """no_column_textタイプのItemの後、カラムなしリストを並列分割するかどうかを判定"""
-    behaviors = load_conversion_behaviors_config()
+    behaviors = load_conversion_behaviors_config(settings)
     behavior = behaviors.get('no_column_text_split_mode', {})
     
     if not behavior.get('enabled', False):
@@ -119,7 +125,8 @@ class ConversionConfig:
                  column_condition_min: int, # Column数の最小条件
                  supported_types: List[str], # サポートするタイプリスト
                  script_name: str,          # スクリプト名
-                 skip_empty_parent: bool = False):  # 親要素空チェックを行うか
+                 skip_empty_parent: bool = False,  # 親要素空チェックを行うか
+                 settings: Optional[LabelSettings] = None):  # ラベル設定（Noneの場合は現在有効な設定）
         self.parent_tag = parent_tag
         self.child_tag = child_tag
         self.title_tag = title_tag
@@ -128,6 +135,13 @@ class ConversionConfig:
         self.supported_types = supported_types
         self.script_name = script_name
         self.skip_empty_parent = skip_empty_parent
+        self.settings = settings
+
+    def with_settings(self, settings: Optional[LabelSettings]) -> 'ConversionConfig':
+        """ラベル設定だけを差し替えた設定を取得（スクリプトの CONFIG は変更しない）"""
+        config = copy(self)
+        config.settings = settings
+        return config
 
 
 def is_grade_pattern(text: str) -> bool:
@@ -135,7 +149,7 @@ def is_grade_pattern(text: str) -> bool:
     if not text:
         return False
     text = text.strip()
-    return bool(re.match(r'^[〔【]第.+学年.*[〕】]$', text))
+    return bool(GRADE_PATTERN.match(text))
 
 
 def count_grades(text: str) -> int:
@@ -149,22 +163,14 @@ def count_grades(text: str) -> int:
     return len(matches)
 
 
-def format_xml_lxml(tree, output_path):
-    """lxmlのElementTreeをインデント整形して保存"""
-    clean_root = etree.fromstring(etree.tostring(tree.getroot()))
-    etree.indent(clean_root, space="  ", level=0)
-    new_tree = etree.ElementTree(clean_root)
-    new_tree.write(
-        output_path,
-        encoding='utf-8',
-        xml_declaration=True,
-        pretty_print=False
-    )
+def format_xml_lxml(tree, output_path, formatted=True):
+    """lxmlのElementTreeをインデント整形して保存（formatted=Falseの場合は整形せずに保存）"""
+    write_xml(tree, output_path, indent_str="  ", formatted=formatted)
 
 
 def is_kanji_number_label(text: str) -> bool:
     """漢数字ラベルかどうかを判定（一, 二などの漢数字）"""
-    return text in ['一', '二', '三', '四', '五', '六', '七', '八', '九', '十']
+    return text in KANJI_NUMBER_LABELS
 
 
 def is_label_text(text: str, col_count: int = 0) -> bool:
@@ -357,6 +363,53 @@ def is_list_element(element) -> bool:
     return element.tag == 'List'
 
 
+class ListFeatures:
+    """
+    List要素の判定に使う特徴量（Column数・Columnのテキスト・ColumnなしListのテキストとその分類結果）
+
+    1つの親要素の処理（process_elements_recursive）の前に1回だけ計算し、階層判定・タイプ判定・各処理関数で共有する。
+    値は get_list_columns / get_column_text / get_list_text / is_label_text / detect_label_id の結果と同じ。
+
+    特徴量が有効なのは、そのList要素を変換するまでの間に限る。create_element_from_list(..., move=True) は
+    SentenceやColumnをList要素から作成した子要素へ移動するため、変換後の col1_sentence / col2_sentence は
+    新しい子要素の中を指すことがある。List要素の特徴量はそのList要素の処理中と、直前の要素の処理中の
+    先読み（has_following_alphabet_label_list など。先読みの時点ではまだ変換していない）にだけ参照し、
+    変換後に参照する呼び出し元はない。
+    """
+
+    __slots__ = ('col1_sentence', 'col2_sentence', 'col_count', 'col1_text', 'list_text',
+                 'col1', 'list', 'has_label')
+
+    def __init__(self, list_elem):
+        self.col1_sentence, self.col2_sentence, self.col_count = get_list_columns(list_elem)
+        self.col1_text = get_column_text(self.col1_sentence)
+        # ColumnなしList要素のテキスト（ColumnありのList要素はNone）
+        if self.col_count:
+            self.list_text = None
+        else:
+            sentence = list_elem.find('.//Sentence')
+            self.list_text = "".join(sentence.itertext()).strip() if sentence is not None else None
+        # テキストの分類（ラベルID・括弧/学年の種類・漢数字・数字/アルファベットの種類）
+        self.col1 = classify_text(self.col1_text)
+        self.list = classify_text(self.list_text)
+        self.has_label = bool(self.col1_text) and (self.col1.is_label or self.col1.is_kanji_number)
+
+    @property
+    def label_id(self) -> Optional[str]:
+        """Column1のテキストのラベルID"""
+        return self.col1.label_id
+
+
+def build_list_features(children: List) -> List[Optional[ListFeatures]]:
+    """
+    子要素ごとの ListFeatures を作成
+
+    Returns:
+        children と同じ順序のリスト（List要素以外はNone）
+    """
+    return [ListFeatures(child) if is_list_element(child) else None for child in children]
+
+
 def create_empty_element(config: ConversionConfig) -> etree.Element:
     """空の子要素を作成"""
     element = etree.Element(config.child_tag)
@@ -370,8 +423,12 @@ def create_empty_element(config: ConversionConfig) -> etree.Element:
 def create_element_with_two_sentences(col1_sentence: Optional[etree.Element],
                                      col2_sentence: Optional[etree.Element],
                                      config: ConversionConfig,
-                                     list_elem: Optional[etree.Element] = None) -> etree.Element:
-    """2つのColumn要素を持つ子要素を作成（Columnが2つで1つ目がテキストの場合）"""
+                                     list_elem: Optional[etree.Element] = None,
+                                     move: bool = False) -> etree.Element:
+    """
+    2つのColumn要素を持つ子要素を作成（Columnが2つで1つ目がテキストの場合）
+    move=Trueの場合はlist_elemのColumn要素をコピーせずに移動する（list_elemは破棄される前提）
+    """
     element = etree.Element(config.child_tag)
     # Titleは空
     etree.SubElement(element, config.title_tag)
@@ -382,7 +439,7 @@ def create_element_with_two_sentences(col1_sentence: Optional[etree.Element],
         all_columns = get_all_list_column_elements(list_elem)
         for idx, column in enumerate(all_columns, start=1):
             # Column要素をコピーして追加（Num属性を設定）
-            new_column = deepcopy(column)
+            new_column = transfer_element(column, move)
             new_column.set('Num', str(idx))
             sentence_elem.append(new_column)
     else:
@@ -410,8 +467,12 @@ def create_element_with_two_sentences(col1_sentence: Optional[etree.Element],
 
 def create_element_with_single_column(col_sentence: Optional[etree.Element],
                                       config: ConversionConfig,
-                                      list_elem: Optional[etree.Element] = None) -> etree.Element:
-    """1つのColumn要素を持つ子要素を作成（Columnが1つでその中に複数のSentenceがある場合）"""
+                                      list_elem: Optional[etree.Element] = None,
+                                      move: bool = False) -> etree.Element:
+    """
+    1つのColumn要素を持つ子要素を作成（Columnが1つでその中に複数のSentenceがある場合）
+    move=Trueの場合はlist_elemのSentence要素をコピーせずに移動する（list_elemは破棄される前提）
+    """
     element = etree.Element(config.child_tag)
     # Titleは空
     etree.SubElement(element, config.title_tag)
@@ -425,7 +486,7 @@ def create_element_with_single_column(col_sentence: Optional[etree.Element],
             first_column = all_columns[0]
             sentences_in_column = first_column.findall('Sentence')
             for idx, sentence in enumerate(sentences_in_column, start=1):
-                new_sentence = deepcopy(sentence)
+                new_sentence = transfer_element(sentence, move)
                 new_sentence.set('Num', str(idx))
                 sentence_elem.append(new_sentence)
     else:
@@ -442,8 +503,13 @@ def create_element_with_single_column(col_sentence: Optional[etree.Element],
 def create_element_with_title_and_sentence(title_sentence_elem: Optional[etree.Element],
                                          content_sentence_elem: Optional[etree.Element],
                                          config: ConversionConfig,
-                                         list_elem: Optional[etree.Element] = None) -> etree.Element:
-    """タイトルとセンテンスを持つ子要素を作成"""
+                                         list_elem: Optional[etree.Element] = None,
+                                         move: bool = False) -> etree.Element:
+    """
+    タイトルとセンテンスを持つ子要素を作成
+    move=Trueの場合はlist_elemのSentence要素をコピーせずに移動する（list_elemは破棄される前提）。
+    タイトル（ラベル）はColumnが1つの場合にSentenceと同じ要素から取得するため、常にコピーする。
+    """
     element = etree.Element(config.child_tag)
     title_elem = etree.SubElement(element, config.title_tag)
     if title_sentence_elem is not None:
@@ -460,7 +526,7 @@ def create_element_with_title_and_sentence(title_sentence_elem: Optional[etree.E
             second_column = all_columns[1]
             sentences_in_column = second_column.findall('Sentence')
             for idx, sentence in enumerate(sentences_in_column, start=1):
-                new_sentence = deepcopy(sentence)
+                new_sentence = transfer_element(sentence, move)
                 new_sentence.set('Num', str(idx))
                 sentence_elem.append(new_sentence)
         elif len(all_columns) == 1:
@@ -468,7 +534,7 @@ def create_element_with_title_and_sentence(title_sentence_elem: Optional[etree.E
             first_column = all_columns[0]
             sentences_in_column = first_column.findall('Sentence')
             for idx, sentence in enumerate(sentences_in_column, start=1):
-                new_sentence = deepcopy(sentence)
+                new_sentence = transfer_element(sentence, move)
                 new_sentence.set('Num', str(idx))
                 sentence_elem.append(new_sentence)
     else:
@@ -483,8 +549,12 @@ def create_element_with_title_and_sentence(title_sentence_elem: Optional[etree.E
 def create_element_with_title_and_multiple_sentences(title_sentence_elem: Optional[etree.Element],
                                                      content_sentences: List[Optional[etree.Element]],
                                                      config: ConversionConfig,
-                                                     list_elem: Optional[etree.Element] = None) -> etree.Element:
-    """タイトルと複数のColumn要素を持つ子要素を作成（Columnが3つ以上で最初がラベルの場合）"""
+                                                     list_elem: Optional[etree.Element] = None,
+                                                     move: bool = False) -> etree.Element:
+    """
+    タイトルと複数のColumn要素を持つ子要素を作成（Columnが3つ以上で最初がラベルの場合）
+    move=Trueの場合はlist_elemの2つ目以降のColumn要素をコピーせずに移動する（list_elemは破棄される前提）
+    """
     element = etree.Element(config.child_tag)
     title_elem = etree.SubElement(element, config.title_tag)
     if title_sentence_elem is not None:
@@ -498,7 +568,7 @@ def create_element_with_title_and_multiple_sentences(title_sentence_elem: Option
         all_columns = get_all_list_column_elements(list_elem)
         for idx, column in enumerate(all_columns[1:], start=1):
             # Column要素をコピーして追加（Num属性を設定）
-            new_column = deepcopy(column)
+            new_column = transfer_element(column, move)
             new_column.set('Num', str(idx))
             sentence_elem.append(new_column)
     else:
@@ -517,8 +587,12 @@ def create_element_with_title_and_multiple_sentences(title_sentence_elem: Option
 
 def create_element_with_text_first_column_and_multiple_sentences(all_sentences: List[Optional[etree.Element]],
                                                                  config: ConversionConfig,
-                                                                 list_elem: Optional[etree.Element] = None) -> etree.Element:
-    """ItemTitleが空で、ItemSentenceにすべてのColumnをColumn要素として含む子要素を作成（Columnが3つ以上で最初がテキストの場合）"""
+                                                                 list_elem: Optional[etree.Element] = None,
+                                                                 move: bool = False) -> etree.Element:
+    """
+    ItemTitleが空で、ItemSentenceにすべてのColumnをColumn要素として含む子要素を作成（Columnが3つ以上で最初がテキストの場合）
+    move=Trueの場合はlist_elemのColumn要素をコピーせずに移動する（list_elemは破棄される前提）
+    """
     element = etree.Element(config.child_tag)
     # Titleは空
     etree.SubElement(element, config.title_tag)
@@ -529,7 +603,7 @@ def create_element_with_text_first_column_and_multiple_sentences(all_sentences:
         all_columns = get_all_list_column_elements(list_elem)
         for idx, column in enumerate(all_columns, start=1):
             # Column要素をコピーして追加（Num属性を設定）
-            new_column = deepcopy(column)
+            new_column = transfer_element(column, move)
             new_column.set('Num', str(idx))
             sentence_elem.append(new_column)
     else:
@@ -546,10 +620,16 @@ def create_element_with_text_first_column_and_multiple_sentences(all_sentences:
     return element
 
 
-def create_element_from_list(element, config: ConversionConfig, stats, parent_elem=None) -> Tuple[Optional[etree.Element], str]:
+def create_element_from_list(element, config: ConversionConfig, stats, parent_elem=None,
+                             features: Optional[ListFeatures] = None,
+                             move: bool = False) -> Tuple[Optional[etree.Element], str]:
     """
     指定された要素を子要素化する
     返り値: (作成された子要素, コメントテキスト)
+    features: List要素の特徴量（Noneの場合は計算する）
+    move: Trueの場合はList要素の内容をコピーせずに作成した子要素に移動する。
+          子要素が作成された場合に元のList要素を破棄する呼び出し元のみ指定する
+          （子要素を作成できなかった場合は何も移動しない）。
     """
     # 親要素が空の場合は変換をスキップ
     if config.skip_empty_parent and parent_elem is not None and is_parent_empty(parent_elem, config):
@@ -559,16 +639,19 @@ def create_element_from_list(element, config: ConversionConfig, stats, parent_el
     comment_text = ""
 
     if element.tag == 'List':
-        col1_sentence, col2_sentence, col_count = get_list_columns(element)
-        col1_text = get_column_text(col1_sentence)
+        if features is None:
+            features = ListFeatures(element)
+        col1_sentence, col2_sentence, col_count = features.col1_sentence, features.col2_sentence, features.col_count
+        col1_text = features.col1_text
+        col1_is_label = features.has_label
 
         # Columnが3つ以上で、最初のColumnがラベル要素の場合の処理
-        if col_count > 2 and col1_text and (is_label(col1_text) or is_kanji_number_label(col1_text)):
+        if col_count > 2 and col1_is_label:
             all_sentences = get_all_list_columns(element)
             title_sentence = all_sentences[0] if len(all_sentences) > 0 else None
             content_sentences = all_sentences[1:] if len(all_sentences) > 1 else []
             
-            child_elem = create_element_with_title_and_multiple_sentences(title_sentence, content_sentences, config, element)
+            child_elem = create_element_with_title_and_multiple_sentences(title_sentence, content_sentences, config, element, move)
             if is_kanji_number_label(col1_text):
                 comment_text = f"*** {config.script_name}: [処理1-分岐1-2] Column3つ以上（1つ目が漢数字ラベル） List -> {config.child_tag}（Title + 複数Column） ***"
                 stats[f'CONVERTED_KANJI_LABELED_MULTI_COLUMN_LIST_TO_{config.child_tag.upper()}'] += 1
@@ -579,11 +662,11 @@ def create_element_from_list(element, config: ConversionConfig, stats, parent_el
         
         # Columnが3つ以上で、最初のColumnがラベル要素でない場合の処理
         # convert_subitem1_step0.pyのテスト30で、3列のList（1つ目がラベルでない）もSubitem1に変換される
-        if col_count > 2 and col1_text and not (is_label(col1_text) or is_kanji_number_label(col1_text)):
+        if col_count > 2 and col1_text and not col1_is_label:
             all_sentences = get_all_list_columns(element)
             
             # ItemTitleは空にして、すべてのColumnをItemSentenceに含める
-            child_elem = create_element_with_text_first_column_and_multiple_sentences(all_sentences, config, element)
+            child_elem = create_element_with_text_first_column_and_multiple_sentences(all_sentences, config, element, move)
             comment_text = f"*** {config.script_name}: [処理1-分岐1-3] Column3つ以上（1つ目がテキスト） List -> {config.child_tag}（空Title + 複数Column） ***"
             stats[f'CONVERTED_TEXT_FIRST_COLUMN_MULTI_LIST_TO_{config.child_tag.upper()}'] += 1
             return child_elem, comment_text
@@ -592,22 +675,22 @@ def create_element_from_list(element, config: ConversionConfig, stats, parent_el
         if col_count > 2:
             return None, f"*** {config.script_name}: [スキップ] Column3つ以上（1つ目が空） List -> 変換スキップ（そのままList要素として残す） ***"
         # Columnが1つで、最初のColumnがラベル要素に該当しない場合の処理
-        elif col_count == 1 and col1_text and not (is_label(col1_text) or is_kanji_number_label(col1_text)):
+        elif col_count == 1 and col1_text and not col1_is_label:
             # ItemSentenceの中にColumn要素を1つ作成
-            child_elem = create_element_with_single_column(col1_sentence, config, element)
+            child_elem = create_element_with_single_column(col1_sentence, config, element, move)
             comment_text = f"*** {config.script_name}: [処理1-分岐1-0] Column1つ（テキスト） List -> {config.child_tag}（Column要素1つ） ***"
             stats[f'CONVERTED_SINGLE_COLUMN_LIST_TO_{config.child_tag.upper()}'] += 1
             return child_elem, comment_text
         # Columnが2つ以上あり、かつ1つ目のColumnがラベル要素に該当しない場合の処理
-        elif col_count >= config.column_condition_min and col1_text and not (is_label(col1_text) or is_kanji_number_label(col1_text)):
+        elif col_count >= config.column_condition_min and col1_text and not col1_is_label:
             # 常にItemSentenceの中にColumn要素を2つ作成
-            child_elem = create_element_with_two_sentences(col1_sentence, col2_sentence, config, element)
+            child_elem = create_element_with_two_sentences(col1_sentence, col2_sentence, config, element, move)
             comment_text = f"*** {config.script_name}: [処理1-分岐1-1] Column2つ（1つ目がテキスト） List -> {config.child_tag}（Column要素2つ） ***"
             stats[f'CONVERTED_TEXT_FIRST_COLUMN_LIST_TO_{config.child_tag.upper()}'] += 1
             return child_elem, comment_text
         # Column条件はconfigによる（Columnが2つ以下の場合のみ）
-        elif col_count >= config.column_condition_min and col1_text and (is_label(col1_text) or is_kanji_number_label(col1_text)):
-            child_elem = create_element_with_title_and_sentence(col1_sentence, col2_sentence, config, element)
+        elif col_count >= config.column_condition_min and col1_is_label:
+            child_elem = create_element_with_title_and_sentence(col1_sentence, col2_sentence, config, element, move)
             if is_kanji_number_label(col1_text):
                 comment_text = f"*** {config.script_name}: [処理1-分岐1] 漢数字ラベル Columnあり List -> {config.child_tag} ***"
                 stats[f'CONVERTED_KANJI_LABELED_LIST_TO_{config.child_tag.upper()}'] += 1
@@ -615,7 +698,7 @@ def create_element_from_list(element, config: ConversionConfig, stats, parent_el
                 comment_text = f"*** {config.script_name}: [処理1-分岐1] Columnあり List -> {config.child_tag} ***"
                 stats[f'CONVERTED_LABELED_LIST_TO_{config.child_tag.upper()}'] += 1
         else:
-            list_text = get_list_text(element)
+            list_text = features.list_text
 
             # 学年パターン（subitem1基準のロジック）
             # テキストチェックは残しつつ、Sentence要素全体をコピーしてRuby要素などの子要素構造を保持
@@ -626,8 +709,7 @@ def create_element_from_list(element, config: ConversionConfig, stats, parent_el
                 if target_sentence is not None and list_sentence is not None:
                     # Sentence要素全体をコピー（属性と子要素を含む）
                     target_sentence.text = list_sentence.text
-                    for child in list_sentence:
-                        target_sentence.append(deepcopy(child))
+                    transfer_children(list_sentence, target_sentence, move)
                     # 属性をコピー
                     for attr_name, attr_value in list_sentence.attrib.items():
                         target_sentence.set(attr_name, attr_value)
@@ -638,8 +720,7 @@ def create_element_from_list(element, config: ConversionConfig, stats, parent_el
                 target_sentence = child_elem.find(f'{config.sentence_tag}/Sentence')
                 if target_sentence is not None and list_sentence is not None:
                     target_sentence.text = list_sentence.text
-                    for child in list_sentence:
-                        target_sentence.append(deepcopy(child))
+                    transfer_children(list_sentence, target_sentence, move)
                     for attr_name, attr_value in list_sentence.attrib.items():
                         target_sentence.set(attr_name, attr_value)
                 comment_text = f"*** {config.script_name}: [処理1-分岐2-1-1] 学年（2つ記載） List -> {config.child_tag} ***"
@@ -649,8 +730,7 @@ def create_element_from_list(element, config: ConversionConfig, stats, parent_el
                 target_sentence = child_elem.find(f'{config.sentence_tag}/Sentence')
                 if target_sentence is not None and list_sentence is not None:
                     target_sentence.text = list_sentence.text
-                    for child in list_sentence:
-                        target_sentence.append(deepcopy(child))
+                    transfer_children(list_sentence, target_sentence, move)
                     for attr_name, attr_value in list_sentence.attrib.items():
                         target_sentence.set(attr_name, attr_value)
                 comment_text = f"*** {config.script_name}: [処理1-分岐2-1-2] 学年（1つ記載） List -> {config.child_tag} ***"
@@ -660,8 +740,7 @@ def create_element_from_list(element, config: ConversionConfig, stats, parent_el
                 target_sentence = child_elem.find(f'{config.sentence_tag}/Sentence')
                 if target_sentence is not None and list_sentence is not None:
                     target_sentence.text = list_sentence.text
-                    for child in list_sentence:
-                        target_sentence.append(deepcopy(child))
+                    transfer_children(list_sentence, target_sentence, move)
                     for attr_name, attr_value in list_sentence.attrib.items():
                         target_sentence.set(attr_name, attr_value)
                 comment_text = f"*** {config.script_name}: [処理1-分岐2-2] 括弧付き科目名 List -> {config.child_tag} ***"
@@ -671,8 +750,7 @@ def create_element_from_list(element, config: ConversionConfig, stats, parent_el
                 target_sentence = child_elem.find(f'{config.sentence_tag}/Sentence')
                 if target_sentence is not None and list_sentence is not None:
                     target_sentence.text = list_sentence.text
-                    for child in list_sentence:
-                        target_sentence.append(deepcopy(child))
+                    transfer_children(list_sentence, target_sentence, move)
                     for attr_name, attr_value in list_sentence.attrib.items():
                         target_sentence.set(attr_name, attr_value)
                 comment_text = f"*** {config.script_name}: [処理1-分岐2-3] 括弧付き指導項目 List -> {config.child_tag} ***"
@@ -684,8 +762,7 @@ def create_element_from_list(element, config: ConversionConfig, stats, parent_el
                 target_sentence = child_elem.find(f'{config.sentence_tag}/Sentence')
                 if target_sentence is not None and list_sentence is not None:
                     target_sentence.text = list_sentence.text
-                    for child in list_sentence:
-                        target_sentence.append(deepcopy(child))
+                    transfer_children(list_sentence, target_sentence, move)
                     for attr_name, attr_value in list_sentence.attrib.items():
                         target_sentence.set(attr_name, attr_value)
                 comment_text = f"*** {config.script_name}: [処理1-分岐2-4] ColumnなしList -> {config.child_tag}Sentence ***"
@@ -717,25 +794,26 @@ def get_element_type(element, config: ConversionConfig):
     else:
         first_line = ""
 
-    if title_text and is_label(title_text):
+    if title_text and classify_text(title_text).is_label:
         return 'labeled'
 
+    first_line_class = classify_text(first_line)
+
     # gradeパターンの判定を先に（subject_nameよりも）
-    if 'grade' in config.supported_types and is_subject_name_bracket(first_line) and is_grade_pattern(first_line):
+    if 'grade' in config.supported_types and first_line_class.is_subject_name and first_line_class.is_grade_pattern:
         return 'grade'
-    if 'grade_double' in config.supported_types and is_grade_double_bracket(first_line):
+    if 'grade_double' in config.supported_types and first_line_class.is_grade_double:
         return 'grade_double'
-    if 'grade_single' in config.supported_types and is_grade_single_bracket(first_line):
+    if 'grade_single' in config.supported_types and first_line_class.is_grade_single:
         return 'grade_single'
 
     # 丸括弧見出しの判定（JSON設定を使用）- subject_nameより先にチェック
-    bracket_type = get_bracket_type(first_line)
-    if bracket_type == 'subject_label_round':
+    if first_line_class.bracket_type == 'subject_label_round':
         return 'subject_label_round'
     
-    if is_subject_name_bracket(first_line):
+    if first_line_class.is_subject_name:
         return 'subject_name'
-    if is_instruction_bracket(first_line):
+    if first_line_class.is_instruction:
         return 'instruction'
     
     # Columnが2つ以上で最初がテキスト（ラベルではない）の場合の判定
@@ -752,9 +830,10 @@ def get_element_type(element, config: ConversionConfig):
                 first_column_sentence = first_column.find('Sentence')
                 if first_column_sentence is not None:
                     first_sentence_text = "".join(first_column_sentence.itertext()).strip()
-                    if first_sentence_text and not is_label(first_sentence_text) and not is_kanji_number_label(first_sentence_text):
+                    first_sentence_class = classify_text(first_sentence_text)
+                    if first_sentence_text and not first_sentence_class.is_label and not first_sentence_class.is_kanji_number:
                         # 括弧付きテキスト（科目名、指導項目、学年）でないことを確認
-                        if not is_subject_name_bracket(first_sentence_text) and not is_instruction_bracket(first_sentence_text):
+                        if not first_sentence_class.is_subject_name and not first_sentence_class.is_instruction:
                             return 'text_first_column'
             
             # Sentence要素が直接ある場合の判定（後方互換性のため）
@@ -762,9 +841,10 @@ def get_element_type(element, config: ConversionConfig):
             if len(sentences) >= 2:
                 # 最初のSentenceの内容をチェック（ラベルではないテキストの場合）
                 first_sentence_text = "".join(sentences[0].itertext()).strip() if len(sentences) > 0 else ""
-                if first_sentence_text and not is_label(first_sentence_text) and not is_kanji_number_label(first_sentence_text):
+                first_sentence_class = classify_text(first_sentence_text)
+                if first_sentence_text and not first_sentence_class.is_label and not first_sentence_class.is_kanji_number:
                     # 括弧付きテキスト（科目名、指導項目、学年）でないことを確認
-                    if not is_subject_name_bracket(first_sentence_text) and not is_instruction_bracket(first_sentence_text):
+                    if not first_sentence_class.is_subject_name and not first_sentence_class.is_instruction:
                         return 'text_first_column'
     
     # ColumnなしListから変換された要素かどうかを判定
@@ -776,7 +856,7 @@ def get_element_type(element, config: ConversionConfig):
     # 最初のColumnなしListから変換された要素とみなす（ColumnありListが追加される前の状態）
     # ただし、List要素が子要素として存在し、Sentenceに改行が含まれていない場合は、
     # ColumnありListが追加された後の状態とみなし、no_column_textタイプと判定しない
-    if not title_text and first_line and not is_subject_name_bracket(first_line) and not is_instruction_bracket(first_line):
+    if not title_text and first_line and not first_line_class.is_subject_name and not first_line_class.is_instruction:
         # List要素が子要素として存在しない場合、ColumnなしListから変換された要素とみなす
         list_elements = element.findall('List')
         if len(list_elements) == 0:
@@ -808,30 +888,38 @@ def get_element_type(element, config: ConversionConfig):
     return 'other'
 
 
-def get_list_type(list_elem, config: ConversionConfig):
-    """List要素のタイプを判定"""
-    col1_sentence, _, col_count = get_list_columns(list_elem)
-    col1_text = get_column_text(col1_sentence)
-    list_text = get_list_text(list_elem)
+def get_list_type(list_elem, config: ConversionConfig, features: Optional[ListFeatures] = None):
+    """
+    List要素のタイプを判定
+    features: List要素の特徴量（Noneの場合は計算する）
+    """
+    if features is None:
+        features = ListFeatures(list_elem)
+    col_count = features.col_count
+    col1_text = features.col1_text
+    list_text = features.list_text
+
+    col1_class = features.col1
+    list_class = features.list
 
-    if col_count >= config.column_condition_min and col1_text and is_label(col1_text):
+    if col_count >= config.column_condition_min and col1_text and col1_class.is_label:
         return 'labeled'
 
     # gradeパターンの判定を先に
-    if 'grade' in config.supported_types and list_text and is_subject_name_bracket(list_text) and is_grade_pattern(list_text):
+    if 'grade' in config.supported_types and list_text and list_class.is_subject_name and list_class.is_grade_pattern:
         return 'grade'
-    if 'grade_double' in config.supported_types and list_text and is_grade_double_bracket(list_text):
+    if 'grade_double' in config.supported_types and list_text and list_class.is_grade_double:
         return 'grade_double'
-    if 'grade_single' in config.supported_types and list_text and is_grade_single_bracket(list_text):
+    if 'grade_single' in config.supported_types and list_text and list_class.is_grade_single:
         return 'grade_single'
 
-    if list_text and is_subject_name_bracket(list_text):
+    if list_text and list_class.is_subject_name:
         return 'subject_name'
-    if list_text and is_instruction_bracket(list_text):
+    if list_text and list_class.is_instruction:
         return 'instruction'
     
     # Columnが2つ以上で最初がテキスト（ラベルではない）の場合
-    if col_count >= config.column_condition_min and col1_text and not (is_label(col1_text) or is_kanji_number_label(col1_text)):
+    if col_count >= config.column_condition_min and col1_text and not (col1_class.is_label or col1_class.is_kanji_number):
         return 'text_first_column'
     
     return 'no_column_text'
@@ -856,39 +944,50 @@ def get_title_text(element, config: ConversionConfig) -> str:
     return "".join(title_elem.itertext()).strip()
 
 
-def has_following_alphabet_label_list(children_to_process: List, current_idx: int) -> bool:
+def _following_list_features(children_to_process: List, current_idx: int,
+                             list_features: Optional[List[Optional[ListFeatures]]]) -> Optional[ListFeatures]:
+    """
+    次の要素がList要素の場合、その特徴量を返す（List要素でない場合・後続の要素がない場合はNone）
+
+    次のList要素はまだ変換していないため、list_features の値をそのまま使える。
+    """
+    next_idx = current_idx + 1
+    if next_idx >= len(children_to_process):
+        return None
+    if list_features is not None:
+        return list_features[next_idx]
+    next_child = children_to_process[next_idx]
+    return ListFeatures(next_child) if is_list_element(next_child) else None
+
+
+def has_following_alphabet_label_list(children_to_process: List, current_idx: int,
+                                      list_features: Optional[List[Optional[ListFeatures]]] = None) -> bool:
     """
     後続の要素にアルファベットラベル付きListがあるかチェック
 
     Args:
         children_to_process: 処理対象の子要素リスト
         current_idx: 現在のインデックス
+        list_features: children_to_process の ListFeatures（build_list_features の結果。
+                       Noneの場合は次の要素から計算する）
 
     Returns:
         アルファベットラベル付きListがある場合True
     """
-    if current_idx + 1 >= len(children_to_process):
-        return False
-
-    next_child = children_to_process[current_idx + 1]
-    if not is_list_element(next_child):
-        return False
-
-    next_col1_sentence, _, _ = get_list_columns(next_child)
-    next_col1_text = get_column_text(next_col1_sentence)
-    if not next_col1_text:
+    next_features = _following_list_features(children_to_process, current_idx, list_features)
+    if next_features is None or not next_features.col1_text:
         return False
 
-    # detect_label_idを使用してアルファベットラベルかチェック
-    next_list_label_id = detect_label_id(next_col1_text)
-    if is_alphabet_label(next_list_label_id):
+    # detect_label_idの結果（ラベルID）でアルファベットラベルかチェック
+    if is_alphabet_label(next_features.label_id):
         return True
 
     # 正規表現パターンでもチェック（detect_label_idが失敗した場合のフォールバック）
-    return bool(re.match(r'^[（(]?[ａ-ｚA-ZＡ-Ｚ]+[）)]$', next_col1_text))
+    return bool(re.match(r'^[（(]?[ａ-ｚA-ZＡ-Ｚ]+[）)]$', next_features.col1_text))
 
 
-def has_following_non_label_two_column_list(children_to_process: List, current_idx: int, config: ConversionConfig) -> bool:
+def has_following_non_label_two_column_list(children_to_process: List, current_idx: int, config: ConversionConfig,
+                                            list_features: Optional[List[Optional[ListFeatures]]] = None) -> bool:
     """
     後続の要素にラベルのない2カラムListがあるかチェック
 
@@ -896,30 +995,22 @@ def has_following_non_label_two_column_list(children_to_process: List, current_i
         children_to_process: 処理対象の子要素リスト
         current_idx: 現在のインデックス
         config: 変換設定
+        list_features: children_to_process の ListFeatures（build_list_features の結果。
+                       Noneの場合は次の要素から計算する）
 
     Returns:
         ラベルのない2カラムListがある場合True
     """
-    if current_idx + 1 >= len(children_to_process):
-        return False
-
-    next_child = children_to_process[current_idx + 1]
-    if not is_list_element(next_child):
+    next_features = _following_list_features(children_to_process, current_idx, list_features)
+    if next_features is None:
         return False
 
-    next_col1_sentence, _, next_col_count = get_list_columns(next_child)
-    next_col1_text = get_column_text(next_col1_sentence)
-    
     # Columnが2つで、1つ目のColumnがラベルでない場合
-    if next_col_count == 2 and next_col1_text:
-        next_has_label = is_label_text(next_col1_text, next_col_count)
-        if not next_has_label:
-            return True
-    
-    return False
+    return next_features.col_count == 2 and bool(next_features.col1_text) and not next_features.has_label
 
 
-def should_append_alphabet_label_as_child(last_child, child, col1_text, config: ConversionConfig) -> bool:
+def should_append_alphabet_label_as_child(last_child, child, col1_text, config: ConversionConfig,
+                                          features: Optional[ListFeatures] = None) -> bool:
     """
     アルファベットラベル付きListを子要素として取り込むべきか判定
     
@@ -928,6 +1019,7 @@ def should_append_alphabet_label_as_child(last_child, child, col1_text, config:
         child: 現在処理中のList要素
         col1_text: Column1のテキスト
         config: 変換設定
+        features: 現在処理中のList要素の特徴量（Noneの場合はcol1_textから判定する）
     
     Returns:
         子要素として取り込むべき場合True
@@ -936,7 +1028,7 @@ def should_append_alphabet_label_as_child(last_child, child, col1_text, config:
         return False
     
     current_title_text = get_title_text(last_child, config)
-    list_label_id = detect_label_id(col1_text)
+    list_label_id = features.label_id if features is not None else classify_text(col1_text).label_id
     
     if not is_alphabet_label(list_label_id):
         return False
@@ -947,7 +1039,7 @@ def should_append_alphabet_label_as_child(last_child, child, col1_text, config:
     
     # Itemの場合の処理
     if config.parent_tag == 'Item' and current_title_text:
-        current_title_label_id = detect_label_id(current_title_text)
+        current_title_label_id = classify_text(current_title_text).label_id
         is_current_title_label = current_title_label_id is not None
         
         if is_alphabet_label(current_title_label_id):
@@ -961,12 +1053,14 @@ def should_append_alphabet_label_as_child(last_child, child, col1_text, config:
 def rebuild_parent_element(parent_elem, parent_sentence, parent_caption_elem_copy, parent_title_elem_copy, new_children, config: ConversionConfig):
     """
     親要素を再構築する
+
+    親要素をclear()した後、渡された要素を付け直す。clear()で外れた元の子要素もそのまま渡せる。
     
     Args:
         parent_elem: 親要素
         parent_sentence: 親要素のSentence要素
-        parent_caption_elem_copy: 親要素のCaption要素のコピー（存在する場合）
-        parent_title_elem_copy: 親要素のタイトル要素のコピー
+        parent_caption_elem_copy: 親要素のCaption要素またはそのコピー（存在する場合）
+        parent_title_elem_copy: 親要素のタイトル要素またはそのコピー
         new_children: 新しい子要素のリスト
         config: 変換設定
     """
@@ -999,6 +1093,8 @@ class ProcessingState:
         self.new_children = []
         self.made_changes = False
         self.split_mode_terminated = False  # モード2の並列分割が終了したかどうか
+        self.last_child_generation = 0  # last_childの変更回数（要素タイプのキャッシュの無効化に使用）
+        self._last_child_type = None  # (要素, 変更回数, 要素タイプ)
     
     def add_seen_label(self, label_text: str):
         """出現したラベルを記録"""
@@ -1018,6 +1114,7 @@ class ProcessingState:
         if self.last_child is not None:
             self.last_child.append(child)
             self.made_changes = True
+            self.mark_last_child_modified()
         else:
             self.append_child(child)
     
@@ -1025,9 +1122,29 @@ class ProcessingState:
         """最後の子要素を設定"""
         self.last_child = child
         self.append_child(child)
+        self.mark_last_child_modified()
+
+    def mark_last_child_modified(self):
+        """last_childの内容を変更したことを記録（append_to_last_child以外で変更した場合に呼び出す）"""
+        self.last_child_generation += 1
+
+    def get_last_child_type(self, config: ConversionConfig) -> str:
+        """
+        last_childの要素タイプを取得（get_element_typeの結果をキャッシュ）
 
+        後続のList要素ごとに同じlast_childのタイプを判定するため、last_childとその変更回数が
+        前回と同じ場合は前回の結果を返す。
+        """
+        cached = self._last_child_type
+        if cached is not None and cached[0] is self.last_child and cached[1] == self.last_child_generation:
+            return cached[2]
+        element_type = get_element_type(self.last_child, config)
+        self._last_child_type = (self.last_child, self.last_child_generation, element_type)
+        return element_type
 
-def process_first_child_mode(child, state: ProcessingState, config: ConversionConfig, stats, parent_elem) -> bool:
+
+def process_first_child_mode(child, state: ProcessingState, config: ConversionConfig, stats, parent_elem,
+                             features: Optional[ListFeatures] = None) -> bool:
     """
     最初の子要素モードでの処理
     
@@ -1037,6 +1154,7 @@ def process_first_child_mode(child, state: ProcessingState, config: ConversionCo
         config: 変換設定
         stats: 統計情報
         parent_elem: 親要素
+        features: List要素の特徴量（Noneの場合は計算する）
     
     Returns:
         処理が完了した場合True（モード変更が必要な場合）
@@ -1049,13 +1167,14 @@ def process_first_child_mode(child, state: ProcessingState, config: ConversionCo
             state.mode = ProcessingMode.NORMAL_PROCESSING
             return True
 
-        col1_sentence, _, col_count = get_list_columns(child)
-        col1_text = get_column_text(col1_sentence)
-        list_text = get_list_text(child)
+        if features is None:
+            features = ListFeatures(child)
+        col_count = features.col_count
+        col1_text = features.col1_text
 
         if col_count == 0:  # ColumnなしList
             # LOOKING_FOR_FIRST_CHILDモードでもColumnなしListを常に処理
-            new_child, comment = create_element_from_list(child, config, stats, parent_elem)
+            new_child, comment = create_element_from_list(child, config, stats, parent_elem, features, move=True)
             if new_child is not None:
                 state.set_last_child(new_child)
             else:
@@ -1064,7 +1183,7 @@ def process_first_child_mode(child, state: ProcessingState, config: ConversionCo
             return True
         else:  # ColumnありList
             # ラベルのテキストを取得して、既に出現したラベルかチェック
-            has_label = is_label_text(col1_text, col_count)
+            has_label = features.has_label
             
             # 既に出現したラベルの場合、変換せずにListのまま取り込む
             if has_label and state.has_seen_label(col1_text):
@@ -1072,7 +1191,7 @@ def process_first_child_mode(child, state: ProcessingState, config: ConversionCo
                 state.mode = ProcessingMode.NORMAL_PROCESSING
                 return True
             
-            new_child, comment = create_element_from_list(child, config, stats, parent_elem)
+            new_child, comment = create_element_from_list(child, config, stats, parent_elem, features, move=True)
             if new_child is not None:
                 state.set_last_child(new_child)
                 # ラベルのテキストを記録
@@ -1093,22 +1212,27 @@ def process_first_child_mode(child, state: ProcessingState, config: ConversionCo
         return True
 
 
-def are_same_hierarchy(current_elem, list_elem, config: ConversionConfig) -> bool:
+def are_same_hierarchy(current_elem, list_elem, config: ConversionConfig,
+                       features: Optional[ListFeatures] = None, current_type: Optional[str] = None) -> bool:
     """
     階層判定（subitem1のロジックを基準）
+    features: list_elemの特徴量（Noneの場合は計算する）
+    current_type: current_elemの要素タイプ（Noneの場合は判定する）
     """
     if current_elem is None:
         return False
 
-    current_type = get_element_type(current_elem, config)
-    list_type = get_list_type(list_elem, config)
+    if features is None:
+        features = ListFeatures(list_elem)
+    if current_type is None:
+        current_type = get_element_type(current_elem, config)
+    list_type = get_list_type(list_elem, config, features)
 
     # ColumnありListの場合はcol1_textを使用
-    col1_sentence, _, col_count = get_list_columns(list_elem)
-    if col_count >= config.column_condition_min:
-        list_title_text = "".join(col1_sentence.itertext()).strip() if col1_sentence is not None else ""
+    if features.col_count >= config.column_condition_min:
+        list_title_text = features.col1_text
     else:
-        list_title_text = get_list_text(list_elem) or ""
+        list_title_text = features.list_text or ""
 
     # current_title_textを最初に取得（重複を避けるため）
     current_title_text = "".join(current_elem.find(config.title_tag).itertext()).strip() if current_elem.find(config.title_tag) is not None else ""
@@ -1133,7 +1257,7 @@ def are_same_hierarchy(current_elem, list_elem, config: ConversionConfig) -> boo
             parent_title_elem = item_elem.find('ItemTitle')
             if parent_title_elem is not None:
                 parent_title_text = "".join(parent_title_elem.itertext()).strip()
-                if parent_title_text and is_label(parent_title_text):
+                if parent_title_text and classify_text(parent_title_text).is_label:
                     # 親要素のタイトルテキストを使用してラベル判定を行う
                     current_title_text = parent_title_text
                     current_type = 'labeled'  # 親要素がラベル付きなので、current_typeを'labeled'に設定
@@ -1144,7 +1268,7 @@ def are_same_hierarchy(current_elem, list_elem, config: ConversionConfig) -> boo
 
         current_sentence = current_elem.find(f'{config.sentence_tag}/Sentence')
         current_grade_count = count_grades("".join(current_sentence.itertext()).strip()) if current_sentence is not None else 0
-        list_grade_count = count_grades(get_list_text(list_elem) or "")
+        list_grade_count = count_grades(features.list_text or "")
 
         if current_grade_count == list_grade_count:
             return True
@@ -1160,11 +1284,11 @@ def are_same_hierarchy(current_elem, list_elem, config: ConversionConfig) -> boo
         return True
 
     if current_type == 'labeled' and list_type == 'labeled':
-        current_label_id = detect_label_id(current_title_text)
+        current_label_id = classify_text(current_title_text).label_id
         
         # 文脈依存のラベル判定: 最初の要素のラベルに基づいて除外リストを生成
         exclude_label_ids = get_exclude_label_ids_for_context(current_title_text)
-        list_label_id = detect_label_id(list_title_text, exclude_label_ids)
+        list_label_id = classify_text(list_title_text, exclude_label_ids).label_id
 
         # ラベルIDが取得できない場合は異なる階層
         if current_label_id is None or list_label_id is None:
@@ -1224,7 +1348,7 @@ def are_same_hierarchy(current_elem, list_elem, config: ConversionConfig) -> boo
     # 親要素のSentenceの次のList要素がno_column_textに該当する場合の処理
     if current_type == 'no_column_text' and list_type == 'no_column_text':
         # 設定で並列分割モードが有効な場合は分割、無効な場合は取り込み
-        if should_split_no_column_text_lists(config.child_tag):
+        if should_split_no_column_text_lists(config.child_tag, config.settings):
             return True  # 分割（モード2）
         else:
             return False  # 取り込み（モード1）
@@ -1233,7 +1357,8 @@ def are_same_hierarchy(current_elem, list_elem, config: ConversionConfig) -> boo
 
 
 def handle_labeled_list_with_same_hierarchy(child, col1_text, has_label, state: ProcessingState,
-                                           config: ConversionConfig, stats, parent_elem) -> bool:
+                                           config: ConversionConfig, stats, parent_elem,
+                                           features: Optional[ListFeatures] = None) -> bool:
     """
     ラベル付きListで、are_same_hierarchyがTrueの場合の処理（分割）
     
@@ -1245,11 +1370,12 @@ def handle_labeled_list_with_same_hierarchy(child, col1_text, has_label, state:
         config: 変換設定
         stats: 統計情報
         parent_elem: 親要素
+        features: List要素の特徴量（Noneの場合は計算する）
     
     Returns:
         処理が完了した場合False（通常の処理フローに戻る）
     """
-    new_child, comment = create_element_from_list(child, config, stats, parent_elem)
+    new_child, comment = create_element_from_list(child, config, stats, parent_elem, features, move=True)
     if new_child is not None:
         state.set_last_child(new_child)
         if has_label:
@@ -1303,7 +1429,8 @@ def should_split_labeled_list(current_title_text, col1_text, current_label_id, l
 
 def handle_labeled_list_with_different_hierarchy(child, col_count, col1_text, has_label,
                                                  state: ProcessingState, config: ConversionConfig,
-                                                 stats, parent_elem) -> bool:
+                                                 stats, parent_elem,
+                                                 features: Optional[ListFeatures] = None) -> bool:
     """
     ラベル付きListで、are_same_hierarchyがFalseの場合の処理
     
@@ -1316,12 +1443,15 @@ def handle_labeled_list_with_different_hierarchy(child, col_count, col1_text, ha
         config: 変換設定
         stats: 統計情報
         parent_elem: 親要素
+        features: List要素の特徴量（Noneの場合は計算する）
     
     Returns:
         処理が完了した場合False（通常の処理フローに戻る）
     """
+    if features is None:
+        features = ListFeatures(child)
     current_title_text = get_title_text(state.last_child, config)
-    current_label_id = detect_label_id(current_title_text)
+    current_label_id = classify_text(current_title_text).label_id
     
     # current_title_textが空の場合、親要素（Item要素）のタイトルテキストを参照する
     # これにより、「４．２」と「４．３」が同じラベル種類として正しく判定される
@@ -1342,12 +1472,12 @@ def handle_labeled_list_with_different_hierarchy(child, col_count, col1_text, ha
             parent_title_elem = item_elem.find('ItemTitle')
             if parent_title_elem is not None:
                 parent_title_text = "".join(parent_title_elem.itertext()).strip()
-                if parent_title_text and is_label(parent_title_text):
+                if parent_title_text and classify_text(parent_title_text).is_label:
                     # 親要素のタイトルテキストを使用してラベル判定を行う
                     current_title_text = parent_title_text
-                    current_label_id = detect_label_id(current_title_text)
+                    current_label_id = classify_text(current_title_text).label_id
     
-    list_label_id = detect_label_id(col1_text)
+    list_label_id = features.label_id
     
     # ラベルなしの2カラムListから変換された要素（Titleが空）の場合、
     # 後続のラベル付きListは常に取り込む（テストケース26, 30の仕様）
@@ -1363,7 +1493,7 @@ def handle_labeled_list_with_different_hierarchy(child, col_count, col1_text, ha
     # 3. ラベルの種類が異なる：取り込む
     if should_split_labeled_list(current_title_text, col1_text, current_label_id, list_label_id, col_count, state):
         # 別のItemとして変換する（分割）
-        new_child, comment = create_element_from_list(child, config, stats, parent_elem)
+        new_child, comment = create_element_from_list(child, config, stats, parent_elem, features, move=True)
         if new_child is not None:
             state.set_last_child(new_child)
             state.add_seen_label(col1_text)
@@ -1393,7 +1523,7 @@ def handle_no_column_list_in_normal_mode(child, state: ProcessingState, config:
     is_column_list_converted_item = bool(title_text)
     
     # last_childが括弧付き見出し系から変換されたItemかどうかを判定
-    element_type = get_element_type(state.last_child, config)
+    element_type = state.get_last_child_type(config)
     is_bracket_item = (element_type in ['subject_name', 'instruction', 'grade', 'grade_single', 'grade_double'])
     
     # last_childがColumnなしListから変換されたItem（no_column_textタイプ）かどうかを判定
@@ -1445,15 +1575,16 @@ def handle_no_column_list_in_normal_mode(child, state: ProcessingState, config:
                             pass
                 
                 # 新しいSentence要素を作成して追加（Ruby要素などの子要素構造を保持）
+                # List要素はSentenceの内容を取り込んだ後は使用しないため、子要素は移動する
                 new_sentence = etree.SubElement(sentence_container, 'Sentence', Num=str(max_num + 1))
                 new_sentence.text = list_sentence.text
-                for child_elem in list_sentence:
-                    new_sentence.append(deepcopy(child_elem))
+                transfer_children(list_sentence, new_sentence, move=True)
                 # 属性をコピー（WritingModeなど）
                 for attr_name, attr_value in list_sentence.attrib.items():
                     if attr_name != 'Num':  # Num属性は既に設定済みなのでスキップ
                         new_sentence.set(attr_name, attr_value)
                 state.made_changes = True
+                state.mark_last_child_modified()
             else:
                 # Sentenceコンテナ要素が見つからない場合は、List要素をそのまま追加
                 state.append_to_last_child(child)
@@ -1465,7 +1596,8 @@ def handle_no_column_list_in_normal_mode(child, state: ProcessingState, config:
 
 def handle_multi_column_labeled_list(child, col_count, col1_text, has_label,
                                      state: ProcessingState, config: ConversionConfig,
-                                     stats, parent_elem) -> bool:
+                                     stats, parent_elem,
+                                     features: Optional[ListFeatures] = None) -> bool:
     """
     Columnが3つ以上で最初がラベルのListの処理（NORMAL_PROCESSINGモード）
     
@@ -1481,6 +1613,7 @@ def handle_multi_column_labeled_list(child, col_count, col1_text, has_label,
         config: 変換設定
         stats: 統計情報
         parent_elem: 親要素
+        features: List要素の特徴量（Noneの場合は計算する）
     
     Returns:
         処理が完了した場合False（通常の処理フローに戻る）
@@ -1488,11 +1621,12 @@ def handle_multi_column_labeled_list(child, col_count, col1_text, has_label,
     # are_same_hierarchyの判定は呼び出し元で既に行われているため、
     # ここでは直接handle_labeled_list_with_different_hierarchyを呼び出す
     return handle_labeled_list_with_different_hierarchy(child, col_count, col1_text, has_label,
-                                                        state, config, stats, parent_elem)
+                                                        state, config, stats, parent_elem, features)
 
 
 def handle_multi_column_non_labeled_list(child, col_count, state: ProcessingState,
-                                        config: ConversionConfig, stats, parent_elem) -> bool:
+                                        config: ConversionConfig, stats, parent_elem,
+                                        features: Optional[ListFeatures] = None) -> bool:
     """
     Columnが3つ以上で最初がラベルではないListの処理（NORMAL_PROCESSINGモード、are_same_hierarchyがFalseの場合）
     
@@ -1503,13 +1637,15 @@ def handle_multi_column_non_labeled_list(child, col_count, state: ProcessingStat
         config: 変換設定
         stats: 統計情報
         parent_elem: 親要素
+        features: List要素の特徴量（Noneの場合は計算する）
     
     Returns:
         処理が完了した場合False（通常の処理フローに戻る）
     """
-    col1_sentence, _, _ = get_list_columns(child)
-    col1_text = "".join(col1_sentence.itertext()).strip() if col1_sentence is not None else ""
-    list_label_id = detect_label_id(col1_text)
+    if features is None:
+        features = ListFeatures(child)
+    col1_text = features.col1_text
+    list_label_id = features.label_id
     
     # ラベルIDが取得できない場合（ラベルではないテキストの場合）、「text_non_label」を設定
     if list_label_id is None and col1_text:
@@ -1518,12 +1654,12 @@ def handle_multi_column_non_labeled_list(child, col_count, state: ProcessingStat
     # create_element_from_listでItemに変換を試みる
     # テスト27: 「b）」はis_labelがFalseを返すが、create_element_from_listでItemに変換される
     # 「テキスト（ラベルではない）」はItemに変換されるが、子要素として取り込まれる
-    new_child, comment = create_element_from_list(child, config, stats, parent_elem)
+    new_child, comment = create_element_from_list(child, config, stats, parent_elem, features)
     if new_child is not None:
         # Itemに変換できた場合、are_same_hierarchyをチェックして分割/取り込みを判定
         if state.last_child is not None:
             # text_first_columnタイプ同士は常に分割
-            current_type = get_element_type(state.last_child, config)
+            current_type = state.get_last_child_type(config)
             if current_type == 'text_first_column':
                 # 分割する場合、新しいItemとして追加
                 state.set_last_child(new_child)
@@ -1531,7 +1667,7 @@ def handle_multi_column_non_labeled_list(child, col_count, state: ProcessingStat
             
             # 分割判定（column数に関わらず）
             current_title_text = get_title_text(state.last_child, config)
-            current_label_id = detect_label_id(current_title_text)
+            current_label_id = classify_text(current_title_text).label_id
             
             # 前のItemもテキスト（ラベルではない）の場合、current_label_idを「text_non_label」に設定
             if current_label_id is None and not current_title_text:
@@ -1539,7 +1675,7 @@ def handle_multi_column_non_labeled_list(child, col_count, state: ProcessingStat
                 sentences = state.last_child.findall(f'{config.sentence_tag}/Sentence')
                 if len(sentences) >= 2:
                     first_sentence_text = "".join(sentences[0].itertext()).strip() if len(sentences) > 0 else ""
-                    if first_sentence_text and not is_label(first_sentence_text) and not is_kanji_number_label(first_sentence_text):
+                    if first_sentence_text and not classify_text(first_sentence_text).is_label and not is_kanji_number_label(first_sentence_text):
                         if not is_subject_name_bracket(first_sentence_text) and not is_instruction_bracket(first_sentence_text):
                             current_label_id = 'text_non_label'
             
@@ -1574,7 +1710,8 @@ def handle_multi_column_non_labeled_list(child, col_count, state: ProcessingStat
 
 def handle_two_column_labeled_list(child, col_count, col1_text, has_label,
                                   state: ProcessingState, config: ConversionConfig,
-                                  stats, parent_elem) -> bool:
+                                  stats, parent_elem,
+                                   features: Optional[ListFeatures] = None) -> bool:
     """
     Columnが2つで最初がラベルのListの処理（NORMAL_PROCESSINGモード）
     
@@ -1590,6 +1727,7 @@ def handle_two_column_labeled_list(child, col_count, col1_text, has_label,
         config: 変換設定
         stats: 統計情報
         parent_elem: 親要素
+        features: List要素の特徴量（Noneの場合は計算する）
     
     Returns:
         処理が完了した場合False（通常の処理フローに戻る）
@@ -1597,12 +1735,13 @@ def handle_two_column_labeled_list(child, col_count, col1_text, has_label,
     # are_same_hierarchyの判定は呼び出し元で既に行われているため、
     # ここでは直接handle_labeled_list_with_different_hierarchyを呼び出す
     return handle_labeled_list_with_different_hierarchy(child, col_count, col1_text, has_label,
-                                                        state, config, stats, parent_elem)
+                                                        state, config, stats, parent_elem, features)
 
 
 def handle_two_column_non_labeled_list(child, col_count, col1_text, has_label, state: ProcessingState,
                                       config: ConversionConfig, stats, parent_elem, 
-                                      children_to_process: List = None, child_idx: int = None) -> bool:
+                                      children_to_process: List = None, child_idx: int = None,
+                                      features: Optional[ListFeatures] = None) -> bool:
     """
     Columnが2つで最初がラベルでない場合、またはColumnが1つ以下のListの処理
     （NORMAL_PROCESSINGモード、are_same_hierarchyがFalseの場合）
@@ -1618,27 +1757,30 @@ def handle_two_column_non_labeled_list(child, col_count, col1_text, has_label, s
         parent_elem: 親要素
         children_to_process: 処理対象の子要素リスト（後続要素チェック用）
         child_idx: 現在のインデックス（後続要素チェック用）
+        features: List要素の特徴量（Noneの場合は計算する）
     
     Returns:
         処理が完了した場合False（通常の処理フローに戻る）
     """
+    if features is None:
+        features = ListFeatures(child)
     # ラベル付きListの場合は変換を試みる
     if has_label:
         # create_element_from_listでItemに変換を試みる
-        new_child, comment = create_element_from_list(child, config, stats, parent_elem)
+        new_child, comment = create_element_from_list(child, config, stats, parent_elem, features)
         if new_child is not None:
             # Itemに変換できた場合、分割/取り込み判定を行う
             if state.last_child is not None:
                 # text_first_columnタイプ同士は常に分割
-                current_type = get_element_type(state.last_child, config)
+                current_type = state.get_last_child_type(config)
                 if current_type == 'text_first_column':
                     # 分割する場合、新しいItemとして追加
                     state.set_last_child(new_child)
                     return False
                 
                 current_title_text = get_title_text(state.last_child, config)
-                current_label_id = detect_label_id(current_title_text)
-                list_label_id = detect_label_id(col1_text)
+                current_label_id = classify_text(current_title_text).label_id
+                list_label_id = features.label_id
                 
                 # 分割判定（ラベルの種類と値、既出チェックで判定）
                 # ルール:
@@ -1673,12 +1815,12 @@ def handle_two_column_non_labeled_list(child, col_count, col1_text, has_label, s
                 return False
         
         # 前のItemがラベルなしItem、またはlast_childがNoneの場合、create_element_from_listで変換を試みる
-        new_child, comment = create_element_from_list(child, config, stats, parent_elem)
+        new_child, comment = create_element_from_list(child, config, stats, parent_elem, features)
         if new_child is not None:
             # 変換できた場合、分割/取り込み判定を行う
             if state.last_child is not None:
                 current_title_text = get_title_text(state.last_child, config)
-                current_label_id = detect_label_id(current_title_text)
+                current_label_id = classify_text(current_title_text).label_id
                 
                 # 前のItemもテキスト（ラベルではない）の場合、current_label_idを「text_non_label」に設定
                 if current_label_id is None and not current_title_text:
@@ -1686,12 +1828,12 @@ def handle_two_column_non_labeled_list(child, col_count, col1_text, has_label, s
                     sentences = state.last_child.findall(f'{config.sentence_tag}/Sentence')
                     if len(sentences) >= 2:
                         first_sentence_text = "".join(sentences[0].itertext()).strip() if len(sentences) > 0 else ""
-                        if first_sentence_text and not is_label(first_sentence_text) and not is_kanji_number_label(first_sentence_text):
+                        if first_sentence_text and not classify_text(first_sentence_text).is_label and not is_kanji_number_label(first_sentence_text):
                             if not is_subject_name_bracket(first_sentence_text) and not is_instruction_bracket(first_sentence_text):
                                 current_label_id = 'text_non_label'
                 
                 # ラベルIDが取得できない場合（ラベルではないテキストの場合）、「text_non_label」を設定
-                list_label_id = detect_label_id(col1_text)
+                list_label_id = features.label_id
                 if list_label_id is None and col1_text:
                     list_label_id = 'text_non_label'
                 
@@ -1720,7 +1862,8 @@ def handle_two_column_non_labeled_list(child, col_count, col1_text, has_label, s
 
 
 def process_normal_mode_list_element(child, child_idx, children_to_process, state: ProcessingState, 
-                                     config: ConversionConfig, stats, parent_elem):
+                                     config: ConversionConfig, stats, parent_elem,
+                                     features: Optional[ListFeatures] = None):
     """
     NORMAL_PROCESSINGモードでのList要素処理
     
@@ -1732,11 +1875,14 @@ def process_normal_mode_list_element(child, child_idx, children_to_process, stat
         config: 変換設定
         stats: 統計情報
         parent_elem: 親要素
+        features: List要素の特徴量（Noneの場合は計算する）
     
     Returns:
         処理が完了した場合True（continueが必要な場合）
     """
-    col1_sentence, _, col_count = get_list_columns(child)
+    if features is None:
+        features = ListFeatures(child)
+    col_count = features.col_count
 
     # 親要素が空の場合は常にList要素をそのまま追加（スキップ）
     if config.skip_empty_parent and is_parent_empty(parent_elem, config):
@@ -1745,12 +1891,11 @@ def process_normal_mode_list_element(child, child_idx, children_to_process, stat
         return True
 
     # ColumnありListの場合、ラベルのテキストを取得
-    col1_text = get_column_text(col1_sentence)
-    has_label = is_label_text(col1_text, col_count)
+    col1_text = features.col1_text
+    has_label = features.has_label
     
     # ColumnなしListの場合、指導項目かどうかをチェック
-    list_text = get_list_text(child) if col_count == 0 else ""
-    is_instruction = is_instruction_bracket(list_text) if list_text else False
+    is_instruction = bool(features.list_text) and features.list.is_instruction
     
     # 指導項目の場合は重複チェックをスキップ（指導項目は必ず同じラベルが続くため）
     # 既に出現したラベルの場合、変換せずにListのまま取り込む（指導項目を除く）
@@ -1760,7 +1905,7 @@ def process_normal_mode_list_element(child, child_idx, children_to_process, stat
     
     if state.last_child is None:
         # 最初の要素の場合はcreate_element_from_listを使用
-        new_child, comment = create_element_from_list(child, config, stats, parent_elem)
+        new_child, comment = create_element_from_list(child, config, stats, parent_elem, features, move=True)
         if new_child is not None:
             state.set_last_child(new_child)
             # ラベルのテキストを記録
@@ -1771,7 +1916,7 @@ def process_normal_mode_list_element(child, child_idx, children_to_process, stat
             state.append_child(child)
         return False
     
-    elif are_same_hierarchy(state.last_child, child, config):
+    elif are_same_hierarchy(state.last_child, child, config, features, state.get_last_child_type(config)):
         # モード2の並列分割が終了している場合は、通常の処理を行う
         if state.split_mode_terminated:
             # 並列分割が終了している場合、カラムなしリストは取り込む
@@ -1779,9 +1924,9 @@ def process_normal_mode_list_element(child, child_idx, children_to_process, stat
             return True
         
         # モード2の場合の処理: no_column_textタイプのItemの後、カラムありリスト（ラベル付き）が登場した場合は並列分割を終了
-        element_type = get_element_type(state.last_child, config)
+        element_type = state.get_last_child_type(config)
         is_no_column_text_item = (element_type == 'no_column_text')
-        is_split_mode_enabled = should_split_no_column_text_lists(config.child_tag)
+        is_split_mode_enabled = should_split_no_column_text_lists(config.child_tag, config.settings)
         
         if is_no_column_text_item and is_split_mode_enabled:
             # モード2が有効で、last_childがno_column_textタイプの場合
@@ -1794,20 +1939,17 @@ def process_normal_mode_list_element(child, child_idx, children_to_process, stat
         # ColumnありListの場合、ItemTitleが空で、新しいラベルがアルファベットラベルの場合は子要素として取り込む
         # （ParagraphNumにドット区切り数字がある場合の処理）
         if col_count > 0 and has_label:
-            if should_append_alphabet_label_as_child(state.last_child, child, col1_text, config):
+            if should_append_alphabet_label_as_child(state.last_child, child, col1_text, config, features):
                 state.append_to_last_child(child)
                 return True
         
         # ColumnなしListの場合、指導項目かどうかをチェック
-        list_text_for_check = get_list_text(child) if col_count == 0 else ""
-        is_instruction_for_check = is_instruction_bracket(list_text_for_check) if list_text_for_check else False
-        
         # 既に出現したラベルの場合、変換せずにListのまま取り込む（指導項目を除く）
-        if has_label and state.has_seen_label(col1_text) and not is_instruction_for_check:
+        if has_label and state.has_seen_label(col1_text) and not is_instruction:
             state.append_to_last_child(child)
             return False
         else:
-            new_child, comment = create_element_from_list(child, config, stats, parent_elem)
+            new_child, comment = create_element_from_list(child, config, stats, parent_elem, features, move=True)
             if new_child is not None:
                 state.set_last_child(new_child)
                 # ラベルのテキストを記録
@@ -1820,11 +1962,11 @@ def process_normal_mode_list_element(child, child_idx, children_to_process, stat
         # last_childが存在する場合の処理
         if state.last_child is not None:
             # last_childのタイプを取得
-            element_type = get_element_type(state.last_child, config)
+            element_type = state.get_last_child_type(config)
             
             # Item内で、Subitem1Titleが空でない場合、後続のアルファベットラベル付きListを子要素として取り込む
             if config.parent_tag == 'Item' and col_count > 0 and has_label:
-                if should_append_alphabet_label_as_child(state.last_child, child, col1_text, config):
+                if should_append_alphabet_label_as_child(state.last_child, child, col1_text, config, features):
                     state.append_to_last_child(child)
                     return True
             
@@ -1845,7 +1987,7 @@ def process_normal_mode_list_element(child, child_idx, children_to_process, stat
                 # ColumnありListの場合
                 # モード2の場合の処理: no_column_textタイプのItemの後、カラムありリスト（ラベル付き）が登場した場合は並列分割を終了
                 is_no_column_text_item = (element_type == 'no_column_text')
-                is_split_mode_enabled = should_split_no_column_text_lists(config.child_tag)
+                is_split_mode_enabled = should_split_no_column_text_lists(config.child_tag, config.settings)
                 
                 if is_no_column_text_item and is_split_mode_enabled:
                     # モード2が有効で、last_childがno_column_textタイプの場合
@@ -1855,35 +1997,33 @@ def process_normal_mode_list_element(child, child_idx, children_to_process, stat
                         state.split_mode_terminated = True  # 並列分割を終了
                         return True
                 
-                # ColumnなしListの場合、指導項目かどうかをチェック（念のため）
-                list_text_for_check2 = get_list_text(child) if col_count == 0 else ""
-                is_instruction_for_check2 = is_instruction_bracket(list_text_for_check2) if list_text_for_check2 else False
-                
                 # 既に出現したラベルの場合、変換せずにListのまま取り込む（指導項目を除く）
-                if has_label and state.has_seen_label(col1_text) and not is_instruction_for_check2:
+                if has_label and state.has_seen_label(col1_text) and not is_instruction:
                     state.append_to_last_child(child)
                     return True
                 
                 # Column数による処理分岐
                 if col_count > 2:
                     # Columnが3つ以上の場合
-                    if col1_text and (is_label(col1_text) or is_kanji_number_label(col1_text)):
+                    if has_label:
                         # Columnが3つ以上で最初がラベルの場合の処理
                         return handle_multi_column_labeled_list(child, col_count, col1_text, has_label,
-                                                                state, config, stats, parent_elem)
+                                                                state, config, stats, parent_elem, features)
                     else:
                         # Columnが3つ以上で最初がラベルではない場合の処理
-                        return handle_multi_column_non_labeled_list(child, col_count, state, config, stats, parent_elem)
+                        return handle_multi_column_non_labeled_list(child, col_count, state, config, stats, parent_elem,
+                                                                    features)
                 else:
                     # Columnが2つ以下の場合
-                    if col_count >= config.column_condition_min and col1_text and (is_label(col1_text) or is_kanji_number_label(col1_text)):
+                    if col_count >= config.column_condition_min and has_label:
                         # Columnが2つで最初がラベルの場合の処理
                         return handle_two_column_labeled_list(child, col_count, col1_text, has_label,
-                                                              state, config, stats, parent_elem)
+                                                              state, config, stats, parent_elem, features)
                     else:
                         # Columnが2つで最初がラベルでない場合、またはColumnが1つ以下の場合の処理
                         return handle_two_column_non_labeled_list(child, col_count, col1_text, has_label, state,
-                                                                config, stats, parent_elem, children_to_process, child_idx)
+                                                                config, stats, parent_elem, children_to_process, child_idx,
+                                                                features)
         else:
             state.append_child(child)
             return False
@@ -1906,14 +2046,17 @@ def process_elements_recursive(parent_elem, config: ConversionConfig, stats) ->
 
     # 親要素のSentenceの次の要素から処理を開始
     children_to_process = list(siblings)
+    # List要素の特徴量を最初に1回だけ計算する（各List要素の特徴量は、そのList要素を変換するまでの間だけ参照する）
+    list_features = build_list_features(children_to_process)
 
     for child_idx, child in enumerate(children_to_process):
         if state.mode == ProcessingMode.LOOKING_FOR_FIRST_CHILD:
-            process_first_child_mode(child, state, config, stats, parent_elem)
+            process_first_child_mode(child, state, config, stats, parent_elem, list_features[child_idx])
         
         elif state.mode == ProcessingMode.NORMAL_PROCESSING:
             if is_list_element(child):
-                if process_normal_mode_list_element(child, child_idx, children_to_process, state, config, stats, parent_elem):
+                if process_normal_mode_list_element(child, child_idx, children_to_process, state, config, stats,
+                                                    parent_elem, list_features[child_idx]):
                     continue
             elif child.tag in STRUCT_ELEMENT_TAGS:
                 # TableStruct, FigStruct, StyleStructは直前のItem要素の子要素として配置する
@@ -1929,47 +2072,41 @@ def process_elements_recursive(parent_elem, config: ConversionConfig, stats) ->
                 state.append_child(child)
 
     # 親要素の再構築
+    # Caption要素・タイトル要素はSentence要素と同様に、rebuild_parent_elementで親要素をclear()した後に
+    # そのまま付け直す（コピーしない）
     # 親要素のタグ名から対応するCaption要素のタグ名を動的に生成
     # 例: Paragraph → ParagraphCaption, Item → ItemCaption, Subitem1 → Subitem1Caption
     caption_tag_name = config.parent_tag + 'Caption'
     parent_caption_elem = parent_elem.find(caption_tag_name)
-    parent_caption_elem_copy = deepcopy(parent_caption_elem) if parent_caption_elem is not None else None
     
     # タイトル要素の取得
     if config.parent_tag == 'Paragraph':
         # Paragraphの場合はParagraphNumを保持
-        parent_title_elem_copy = deepcopy(parent_elem.find('ParagraphNum')) if parent_elem.find('ParagraphNum') is not None else None
+        parent_title_elem = parent_elem.find('ParagraphNum')
     else:
         # その他の要素の場合はTitle要素を保持
-        parent_title_elem_copy = deepcopy(parent_elem.find(config.parent_tag + 'Title')) if parent_elem.find(config.parent_tag + 'Title') is not None else None
+        parent_title_elem = parent_elem.find(config.parent_tag + 'Title')
 
-    rebuild_parent_element(parent_elem, parent_sentence, parent_caption_elem_copy, parent_title_elem_copy, state.new_children, config)
+    rebuild_parent_element(parent_elem, parent_sentence, parent_caption_elem, parent_title_elem, state.new_children, config)
 
     return state.made_changes
 
 
+def renumber_children(parent, config: ConversionConfig):
+    """1つの親要素の直下の子要素のNum属性を再採番"""
+    for i, child in enumerate(parent.findall(config.child_tag)):
+        child.set('Num', str(i + 1))
+
+
 def renumber_elements(tree, config: ConversionConfig):
     """子要素のNum属性を再採番"""
     root = tree.getroot()
     for parent in root.xpath(f'.//{config.parent_tag}'):
-        children = parent.findall(config.child_tag)
-        for i, child in enumerate(children):
-            child.set('Num', str(i + 1))
+        renumber_children(parent, config)
 
 
-def process_xml_file(input_path: Path, output_path: Path, config: ConversionConfig) -> int:
-    """XMLファイルを処理"""
-    print("=" * 80)
-    print(f"【{config.child_tag}要素変換ロジック実装】")
-    print("=" * 80)
-    print(f"入力ファイル: {input_path}")
-
-    try:
-        tree = etree.parse(str(input_path))
-    except Exception as e:
-        print(f"エラー: XMLファイルの読み込みに失敗しました: {e}", file=sys.stderr)
-        return 1
-
+def create_conversion_stats(config: ConversionConfig) -> Dict[str, int]:
+    """変換統計の辞書を初期化"""
     stats = {}
     # 統計キーを動的に生成
     stat_keys = [
@@ -1999,14 +2136,130 @@ def process_xml_file(input_path: Path, output_path: Path, config: ConversionConf
     for key in stat_keys:
         stats[key] = 0
 
+    return stats
+
+
+def convert_tree(tree, config: ConversionConfig) -> Dict[str, int]:
+    """
+    パース済みのツリーに対して変換と再採番を行う（ツリーはその場で更新される）
+
+    Args:
+        tree: lxmlのElementTree
+        config: 変換設定（変換中のラベル判定は config.settings、未指定の場合は現在有効な設定で行う）
+
+    Returns:
+        変換統計
+    """
+    stats = create_conversion_stats(config)
+
     root = tree.getroot()
     parent_elements = root.xpath(f'.//{config.parent_tag}')
 
-    for parent_elem in parent_elements:
-        process_elements_recursive(parent_elem, config, stats)
+    with use_label_settings(config.settings or get_active_settings()):
+        for parent_elem in parent_elements:
+            process_elements_recursive(parent_elem, config, stats)
 
     renumber_elements(tree, config)
 
+    return stats
+
+
+def normalize_subtree_whitespace(elem, level: int = 0):
+    """
+    format_xml_lxmlで書き出して再パースした場合と同じ空白状態に、部分木をその場で揃える
+
+    Args:
+        elem: 対象の要素
+        level: 要素の深さ（ルート要素が0）
+    """
+    etree.indent(elem, space="  ", level=level)
+    normalize_empty_text(elem)
+
+
+def is_fusable_config_chain(configs: List[ConversionConfig]) -> bool:
+    """
+    設定のリストが1回の走査でまとめて変換できる階層の連鎖かどうかを判定
+
+    各設定の子要素タグが次の設定の親要素タグと一致し（Paragraph→Item→Subitem1→…）、
+    親要素タグが重複せず、ラベル設定が同一の場合にTrueを返す。
+    """
+    parent_tags = [config.parent_tag for config in configs]
+    if len(set(parent_tags)) != len(parent_tags):
+        return False
+    if len({config.settings for config in configs}) > 1:
+        return False
+    for config, next_config in zip(configs, configs[1:]):
+        if config.child_tag != next_config.parent_tag:
+            return False
+    return bool(configs) and configs[-1].child_tag not in parent_tags
+
+
+def has_inverted_nesting(root, level_by_tag: Dict[str, int]) -> bool:
+    """
+    同じ階層以上の親要素の中に親要素がある（例: Item内の表の中のItem）かどうかを判定
+
+    このような入れ子がある場合、階層ごとの変換と上位からの一括走査とで処理順序が変わるため、
+    一括走査は使用できない。
+    """
+    tags = tuple(level_by_tag)
+    for elem in root.iter(*tags):
+        ancestor = next(elem.iterancestors(*tags), None)
+        if ancestor is not None and level_by_tag[ancestor.tag] >= level_by_tag[elem.tag]:
+            return True
+    return False
+
+
+def convert_tree_fused(tree, configs: List[ConversionConfig]) -> List[Dict[str, int]]:
+    """
+    複数階層の変換（Paragraph→Item→Subitem1→…→Subitem10）を1回のツリー走査でまとめて行う
+
+    各階層の設定で convert_tree を順番に実行し、その都度 format_xml_lxml で書き出して
+    再パースした場合とバイト単位で同一の結果になる。
+    親要素の変換はその要素の部分木だけを変更するため、上位の要素から順に1回の走査で変換する。
+    各親要素は変換直後に直下の子要素を再採番してから子孫要素に進み（階層ごとのツリー全体の
+    再採番は行わない）、空白の正規化（インデント）は最上位の変換対象の部分木ごとに、
+    その子孫の変換がすべて終わった後に1回だけ行う。
+
+    設定が階層の連鎖になっていない場合や、同じ階層以上の親要素の中に親要素がある場合は、
+    階層ごとに順番に変換する。
+
+    Args:
+        tree: lxmlのElementTree（ファイルから読み込んだ直後と同じ空白状態であること）
+        configs: 変換設定のリスト（上位の階層から順）
+
+    Returns:
+        階層ごとの変換統計のリスト
+    """
+    stats_list = [create_conversion_stats(config) for config in configs]
+    root = tree.getroot()
+    level_by_tag = {config.parent_tag: level for level, config in enumerate(configs)}
+
+    if not is_fusable_config_chain(configs) or has_inverted_nesting(root, level_by_tag):
+        for config, stats in zip(configs, stats_list):
+            stats.update(convert_tree(tree, config))
+            normalize_subtree_whitespace(root)
+        return stats_list
+
+    def walk(elem, depth, in_converted):
+        for child in list(elem):
+            if not isinstance(child.tag, str):
+                continue
+            level = level_by_tag.get(child.tag)
+            if level is not None:
+                process_elements_recursive(child, configs[level], stats_list[level])
+                renumber_children(child, configs[level])
+            walk(child, depth + 1, in_converted or level is not None)
+            if level is not None and not in_converted:
+                normalize_subtree_whitespace(child, depth + 1)
+
+    with use_label_settings(configs[0].settings or get_active_settings()):
+        walk(root, 0, False)
+
+    return stats_list
+
+
+def print_conversion_stats(stats: Dict[str, int]):
+    """変換統計を表示"""
     print("\n変換統計:")
     for key, value in stats.items():
         if value > 0:
@@ -2043,6 +2296,23 @@ def process_xml_file(input_path: Path, output_path: Path, config: ConversionConf
                 desc = key
             print(f" - {desc}: {value}箇所")
 
+
+def process_xml_file(input_path: Path, output_path: Path, config: ConversionConfig) -> int:
+    """XMLファイルを処理"""
+    print("=" * 80)
+    print(f"【{config.child_tag}要素変換ロジック実装】")
+    print("=" * 80)
+    print(f"入力ファイル: {input_path}")
+
+    try:
+        tree = etree.parse(str(input_path))
+    except Exception as e:
+        print(f"エラー: XMLファイルの読み込みに失敗しました: {e}", file=sys.stderr)
+        return 1
+
+    stats = convert_tree(tree, config)
+    print_conversion_stats(stats)
+
     format_xml_lxml(tree, str(output_path))
 
     print(f"\n出力ファイル: {output_path}")
@@ -2165,6 +2435,8 @@ def split_element_at_point(elem: etree.Element, split_index: int, config: Conver
     - 分割は1回のみ
     - 元の要素と新しい要素の2つを生成
 
+    elemの子要素は2つの要素に移動するため、呼び出し後のelemは空になる（elemは置き換えて破棄すること）。
+
     Args:
         elem: 分割する要素
         split_index: 分割位置（この位置以降が新しい要素に移動）
@@ -2183,16 +2455,16 @@ def split_element_at_point(elem: etree.Element, split_index: int, config: Conver
     for key, value in elem.attrib.items():
         original_elem.set(key, value)
 
-    # before_splitの要素を追加
+    # before_splitの要素を追加（elemは分割後に破棄されるため、コピーせずに移動する）
     for child_elem in before_split:
-        original_elem.append(deepcopy(child_elem))
+        original_elem.append(child_elem)
 
     # 新しい要素を作成
     new_elem = create_empty_element(config)
 
     # after_splitの要素を追加
     for child_elem in after_split:
-        new_elem.append(deepcopy(child_elem))
+        new_elem.append(child_elem)
 
     return original_elem, new_elem
 
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+xml-formatter の統合コマンドラインエントリポイント
+
+サブコマンドごとに対応するスクリプトを、そのサブコマンドが実行される時点で初めて読み込む。
+xmlfmt 自体は標準ライブラリの一部（sys・os・runpy）しか読み込まないため、
+ヘルプやステップ一覧の表示では lxml・xml_converter 等の読み込みコストがかからない。
+各スクリプトの引数はそのまま渡す（詳細は `xmlfmt <サブコマンド> --help`）。
+
+使用例:
+  python3 xmlfmt.py run input.xml output.xml --intermediate-dir ./intermediate_files/input
+  python3 xmlfmt.py batch ./input ./output --workers 8
+  python3 xmlfmt.py step convert_subitem3_step0.py input.xml output.xml
+  python3 xmlfmt.py step reverse_convert_item.py input.xml output.xml --no-include-class
+  python3 xmlfmt.py steps --direction reverse --describe
+  python3 xmlfmt.py compare original.xml converted.xml
+"""
+
+import os
+import sys
+import runpy
+
+
+# scripts/をインポートパスに追加（起動を速くするため pathlib は使わない）
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, script_dir)
+
+# サブコマンド → (モジュール名, 説明)
+COMMANDS = {
+    'run': ('pipeline_engine', '1ファイルを全ステップ変換（1プロセス・1回のパース）'),
+    'batch': ('run_batch', 'フォルダ内のXMLファイルを並列に変換'),
+    'step': (None, '登録済みの変換ステップ（逆変換を含む）を1つ実行'),
+    'steps': ('step_registry', '変換ステップを実行順に表示'),
+    'compare': ('compare_xml_text_content', '2つのXMLファイルのテキスト内容を比較'),
+    'compare-files': ('compare_xml_files', '2つのXMLファイルの構造を比較'),
+    'validate': ('validate_xml', 'XMLファイルの構文を検証'),
+    'labels': ('analyze_list_column_labels', 'List要素のColumnのラベル種類を集計'),
+    'profile': ('step_profiler', '実行ログ（JSON）のステップごとの処理時間を表示'),
+    'bench': ('benchmark_pipeline', '生成した大きな文書で順変換・逆変換の処理時間を計測'),
+}
+
+
+def print_usage(file=sys.stdout):
+    """使い方を表示"""
+    print("使い方: xmlfmt <サブコマンド> [引数...]\n", file=file)
+    print("サブコマンド:", file=file)
+    width = max(len(name) for name in COMMANDS)
+    for name, (_, description) in COMMANDS.items():
+        print(f"  {name.ljust(width)}  {description}", file=file)
+    print("\n各サブコマンドの引数は `xmlfmt <サブコマンド> --help` で表示します。", file=file)
+
+
+def run_module(module_name: str, prog: str, args) -> int:
+    """
+    モジュールをスクリプトとして実行（__main__ として読み込み、引数を渡す）
+
+    Returns:
+        終了コード
+    """
+    sys.argv = [prog] + list(args)
+    try:
+        runpy.run_module(module_name, run_name='__main__', alter_sys=True)
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    return 0
+
+
+def run_step(args) -> int:
+    """登録済みの変換ステップのスクリプトを実行"""
+    if not args or args[0] in ('-h', '--help'):
+        print("使い方: xmlfmt step <スクリプト名> [スクリプトの引数...]")
+        print("スクリプト名の一覧は `xmlfmt steps --direction forward|reverse` で表示します。")
+        return 0 if args else 1
+
+    import step_registry
+    script_name = args[0]
+    if not step_registry.is_registered(script_name):
+        print(f"エラー: 登録されていない変換ステップです: {script_name}", file=sys.stderr)
+        return 1
+    spec = step_registry.get_step_spec(script_name)
+    step_dir = str(step_registry.SCRIPT_DIRS[spec.direction])
+    if step_dir not in sys.path:
+        sys.path.insert(0, step_dir)
+    return run_module(spec.module_name, str(spec.script_path), args[1:])
+
+
+def main(argv=None) -> int:
+    """メイン関数"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help'):
+        print_usage()
+        return 0 if argv else 1
+
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"エラー: 不明なサブコマンドです: {command}\n", file=sys.stderr)
+        print_usage(sys.stderr)
+        return 1
+
+    if command == 'step':
+        return run_step(args)
+    module_name = COMMANDS[command][0]
+    return run_module(module_name, f"xmlfmt {command}", args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
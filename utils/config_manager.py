@@ -3,7 +3,9 @@
 
 ラベル設定ファイルの読み込み、保存、バリデーションなどの機能を提供します。
 """
+import os
 import json
+import tempfile
 from pathlib import Path
 from typing import Dict, Optional, Tuple, List
 import streamlit as st
@@ -63,10 +65,17 @@ def save_label_config(config: Dict, config_path: Optional[Path] = None) -> Tuple
             shutil.copy(config_path, backup_path)
             st.info(f"バックアップを作成しました: {backup_path.name}")
         
-        # 設定ファイルを保存
+        # 設定ファイルを保存（一時ファイルに書き出してから置き換え、実行中の変換が書きかけの内容を読まないようにする）
         config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
+        # （一時ファイル名は保存ごとに異なるため、複数のセッションから同時に保存しても内容が混ざらない）
+        fd, temp_name = tempfile.mkstemp(dir=config_path.parent, prefix=f".{config_path.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(config, f, ensure_ascii=False, indent=2)
+            os.replace(temp_name, config_path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
         
         return True, None
     except Exception as e:
@@ -0,0 +1,424 @@
+"""
+バックグラウンドジョブキュー
+
+Streamlitアプリの変換処理を、スクリプトの再実行（rerun）とは別のスレッドで実行します。
+ジョブごとに output/jobs/<ジョブID>/ を作成し、入力ファイルのコピー・進捗（status.json）・
+処理結果（result.json）・出力ファイルをそこに保存するため、ページを再読み込みしても
+ジョブIDから状態と結果を取得でき、複数のアップロードを同時に変換しても出力が衝突しません。
+変換処理そのものはサブプロセス（pipeline_engine.py・各変換スクリプト）で行うため、
+ワーカーはスレッドで十分です（ワーカー数は環境変数 XML_FORMATTER_APP_WORKERS、デフォルト: 4）。
+完了したジョブは、保持期間（環境変数 XML_FORMATTER_APP_JOB_RETENTION_HOURS、デフォルト: 24時間）を過ぎたものと、
+保持件数（環境変数 XML_FORMATTER_APP_MAX_FINISHED_JOBS、デフォルト: 100件）を超えた古いものを、
+新しいジョブの登録時にメモリとディスクから削除します。
+
+このモジュールは Streamlit に依存しません（ジョブIDの保持と表示はページ側で行います）。
+"""
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+# ジョブの保存先
+JOBS_DIR = Path(__file__).resolve().parent.parent / "output" / "jobs"
+JOB_STATUS_FILE = "status.json"
+JOB_RESULT_FILE = "result.json"
+
+# ワーカー数
+MAX_WORKERS_ENV = "XML_FORMATTER_APP_WORKERS"
+DEFAULT_MAX_WORKERS = 4
+
+# 完了したジョブの保持期間（時間）と保持件数
+JOB_RETENTION_ENV = "XML_FORMATTER_APP_JOB_RETENTION_HOURS"
+DEFAULT_JOB_RETENTION_HOURS = 24
+MAX_FINISHED_JOBS_ENV = "XML_FORMATTER_APP_MAX_FINISHED_JOBS"
+DEFAULT_MAX_FINISHED_JOBS = 100
+
+# ジョブの状態
+STATUS_QUEUED = "queued"            # 待機中
+STATUS_RUNNING = "running"          # 実行中
+STATUS_SUCCEEDED = "succeeded"      # 成功
+STATUS_FAILED = "failed"            # 失敗
+STATUS_CANCELLED = "cancelled"      # キャンセル
+STATUS_INTERRUPTED = "interrupted"  # 完了前にサーバーが再起動された
+FINISHED_STATUSES = (STATUS_SUCCEEDED, STATUS_FAILED, STATUS_CANCELLED, STATUS_INTERRUPTED)
+
+STATUS_LABELS = {
+    STATUS_QUEUED: "待機中",
+    STATUS_RUNNING: "実行中",
+    STATUS_SUCCEEDED: "完了",
+    STATUS_FAILED: "失敗",
+    STATUS_CANCELLED: "キャンセル",
+    STATUS_INTERRUPTED: "中断",
+}
+
+CANCELLED_MESSAGE = "処理がキャンセルされました"
+
+# サブプロセスのキャンセル確認間隔（秒）
+CANCEL_POLL_INTERVAL = 0.2
+
+
+class JobCancelled(Exception):
+    """ジョブがキャンセルされた"""
+
+
+def _write_json(path: Path, data: Dict) -> None:
+    """JSONファイルを書き出す（一時ファイルに書いてから置き換えるため、読み込み側が途中の内容を見ることはない）"""
+    temp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+    os.replace(temp_path, path)
+
+
+def _read_json(path: Path) -> Optional[Dict]:
+    """JSONファイルを読み込む（存在しない・壊れている場合はNone）"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class Job:
+    """1件のジョブの状態"""
+
+    def __init__(self, job_id: str, kind: str, job_dir: Path, input_path: Path, label: str = ""):
+        self.job_id = job_id
+        self.kind = kind                        # ジョブの種類（"convert" / "reverse" 等）
+        self.label = label                      # 表示名（アップロード時のファイル名等）
+        self.job_dir = job_dir                  # ジョブのディレクトリ
+        self.input_path = input_path            # 入力ファイル（ジョブのディレクトリにコピーしたもの）
+        self.status = STATUS_QUEUED
+        self.current_step = 0
+        self.total_steps = 0
+        self.step_name = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.future = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_finished(self) -> bool:
+        """完了（成功・失敗・キャンセル）したか"""
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self) -> Dict:
+        """status.json の内容"""
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "label": self.label,
+            "input_path": str(self.input_path),
+            "status": self.status,
+            "current_step": self.current_step,
+            "total_steps": self.total_steps,
+            "step_name": self.step_name,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "cancel_requested": self.cancel_event.is_set(),
+        }
+
+    def save(self) -> None:
+        """状態を status.json に書き出す"""
+        with self._lock:
+            _write_json(self.job_dir / JOB_STATUS_FILE, self.to_dict())
+
+    def update_progress(self, current_step: int, total_steps: int, step_name: str) -> None:
+        """進捗を更新（run_pipeline 等の progress_callback として渡す）"""
+        self.current_step = current_step
+        self.total_steps = total_steps
+        self.step_name = step_name
+        self.save()
+
+
+class JobQueue:
+    """スレッドプールでジョブを実行し、状態と結果をディスクに保存するキュー"""
+
+    def __init__(self, jobs_dir: Path = JOBS_DIR, max_workers: Optional[int] = None,
+                 retention_seconds: Optional[float] = None, max_finished_jobs: Optional[int] = None):
+        if max_workers is None:
+            max_workers = int(os.environ.get(MAX_WORKERS_ENV, DEFAULT_MAX_WORKERS))
+        if retention_seconds is None:
+            retention_seconds = float(os.environ.get(JOB_RETENTION_ENV, DEFAULT_JOB_RETENTION_HOURS)) * 3600
+        if max_finished_jobs is None:
+            max_finished_jobs = int(os.environ.get(MAX_FINISHED_JOBS_ENV, DEFAULT_MAX_FINISHED_JOBS))
+        self.jobs_dir = Path(jobs_dir)
+        self.max_workers = max(1, max_workers)
+        self.retention_seconds = retention_seconds    # 完了したジョブの保持期間（秒）
+        self.max_finished_jobs = max(0, max_finished_jobs)  # 完了したジョブの保持件数
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="xml-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, func: Callable, input_path: Path, label: str = "", **kwargs) -> str:
+        """
+        ジョブを登録して実行を予約
+
+        入力ファイルはジョブのディレクトリにコピーしてから実行する（アップロード時の一時ファイルが
+        削除されても、ジョブと結果はそのディレクトリだけで完結する）。
+
+        Args:
+            kind: ジョブの種類
+            func: 実行する関数。func(job, **kwargs) の形で呼び出し、結果の辞書
+                  （"success" と、失敗時は "error" を含む。JSONに変換可能な値）を返す
+            input_path: 入力ファイルのパス
+            label: 表示名
+            **kwargs: func に渡す引数
+
+        Returns:
+            ジョブID
+        """
+        self.prune()
+
+        job_id = uuid.uuid4().hex[:12]
+        job_dir = self.jobs_dir / job_id
+        job_dir.mkdir(parents=True, exist_ok=True)
+        job_input = job_dir / (Path(label).name if label else Path(input_path).name)
+        shutil.copy(input_path, job_input)
+
+        job = Job(job_id, kind, job_dir, job_input, label)
+        job.save()
+        with self._lock:
+            self._jobs[job_id] = job
+        job.future = self._executor.submit(self._run, job, func, kwargs)
+        return job_id
+
+    def _run(self, job: Job, func: Callable, kwargs: Dict) -> None:
+        """ワーカースレッドでジョブを実行し、結果と最終状態を保存"""
+        if job.cancel_event.is_set():
+            self._finish(job, STATUS_CANCELLED, CANCELLED_MESSAGE, None)
+            return
+        job.status = STATUS_RUNNING
+        job.started_at = time.time()
+        job.save()
+        try:
+            result = func(job, **kwargs)
+        except JobCancelled:
+            self._finish(job, STATUS_CANCELLED, CANCELLED_MESSAGE, None)
+            return
+        except Exception as e:
+            self._finish(job, STATUS_FAILED, f"予期しないエラー: {e}", {"success": False, "error": str(e)})
+            return
+
+        if result.get("success"):
+            self._finish(job, STATUS_SUCCEEDED, None, result)
+        elif job.cancel_event.is_set():
+            self._finish(job, STATUS_CANCELLED, CANCELLED_MESSAGE, result)
+        else:
+            self._finish(job, STATUS_FAILED, result.get("error"), result)
+
+    def _finish(self, job: Job, status: str, error: Optional[str], result: Optional[Dict]) -> None:
+        """結果（result.json）を書き出してから最終状態を保存"""
+        if result is not None:
+            _write_json(job.job_dir / JOB_RESULT_FILE, result)
+        job.status = status
+        job.error = error
+        job.finished_at = time.time()
+        job.save()
+
+    def prune(self, now: Optional[float] = None) -> List[str]:
+        """
+        完了したジョブのうち、保持期間を過ぎたものと保持件数を超えた古いものを削除
+
+        このプロセスで登録したジョブに加え、サーバーの再起動前に登録したジョブ（ディスクのみ）も対象にする。
+        待機中・実行中のジョブは削除しない。完了前の状態のままのディスク上のジョブ（中断）と、
+        status.json のないディレクトリは、最終更新時刻から保持期間を過ぎた場合のみ削除する。
+
+        Args:
+            now: 現在時刻（テスト用。Noneの場合は time.time()）
+
+        Returns:
+            削除したジョブIDのリスト
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            finished = {job_id: job.finished_at for job_id, job in self._jobs.items() if job.is_finished}
+            known = set(self._jobs)
+
+        expired = []
+        if self.jobs_dir.is_dir():
+            for job_dir in self.jobs_dir.iterdir():
+                if not job_dir.is_dir() or job_dir.name in known:
+                    continue
+                status_path = job_dir / JOB_STATUS_FILE
+                status = _read_json(status_path)
+                if status and status.get("status") in FINISHED_STATUSES and status.get("finished_at"):
+                    finished[job_dir.name] = status["finished_at"]
+                    continue
+                try:
+                    updated_at = (status_path if status is not None else job_dir).stat().st_mtime
+                except OSError:
+                    continue
+                if now - updated_at > self.retention_seconds:
+                    expired.append(job_dir.name)
+
+        # 新しいものから保持件数までを残す
+        newest_first = sorted(finished, key=lambda job_id: finished[job_id] or 0, reverse=True)
+        for index, job_id in enumerate(newest_first):
+            if index >= self.max_finished_jobs or now - (finished[job_id] or 0) > self.retention_seconds:
+                expired.append(job_id)
+
+        for job_id in expired:
+            self._remove(job_id)
+        return expired
+
+    def _remove(self, job_id: str) -> None:
+        """
+        ジョブをメモリとディスクから削除
+
+        先に status.json を削除するため、ディレクトリの削除が途中で失敗しても存在しないジョブとして扱われる
+        （status.json を削除できない場合は何もしない）。
+        """
+        job_dir = self.jobs_dir / _safe_job_id(job_id)
+        try:
+            (job_dir / JOB_STATUS_FILE).unlink(missing_ok=True)
+        except OSError:
+            return
+        with self._lock:
+            self._jobs.pop(job_id, None)
+        shutil.rmtree(job_dir, ignore_errors=True)
+
+    def get_status(self, job_id: str) -> Optional[Dict]:
+        """
+        ジョブの状態を取得
+
+        このプロセスで登録したジョブはメモリ上の状態を、それ以外（サーバーの再起動前に登録したジョブ）は
+        status.json を返す。status.json が完了前の状態のままのジョブは、実行するワーカーがないため中断扱いにする。
+
+        Returns:
+            状態の辞書（Job.to_dict() と同じ形式）。ジョブが存在しない場合（削除済みの場合を含む）はNone
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+
+        status = _read_json(self.jobs_dir / _safe_job_id(job_id) / JOB_STATUS_FILE)
+        if status is not None and status.get("status") not in FINISHED_STATUSES:
+            status["status"] = STATUS_INTERRUPTED
+            status["error"] = "サーバーの再起動により処理が中断されました"
+        return status
+
+    def get_result(self, job_id: str) -> Optional[Dict]:
+        """ジョブの結果（result.json）を取得（完了前・存在しない場合はNone）"""
+        return _read_json(self.jobs_dir / _safe_job_id(job_id) / JOB_RESULT_FILE)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        ジョブのキャンセルを要求
+
+        待機中のジョブは実行せずに終了し、実行中のジョブは実行中のサブプロセスを終了させる。
+
+        Returns:
+            キャンセルを要求できた場合はTrue（完了済み・存在しない場合はFalse）
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or job.is_finished:
+            return False
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, STATUS_CANCELLED, CANCELLED_MESSAGE, None)
+        else:
+            job.save()
+        return True
+
+    def shutdown(self, wait: bool = True) -> None:
+        """ワーカーを終了（実行中のジョブはキャンセルを要求する）"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            if not job.is_finished:
+                job.cancel_event.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _safe_job_id(job_id: str) -> str:
+    """ジョブIDをディレクトリ名として使える形に制限（URLのクエリパラメータから受け取るため）"""
+    return "".join(c for c in str(job_id) if c.isalnum())
+
+
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """
+    プロセス共通のジョブキューを取得
+
+    Streamlitはセッションごとにスクリプトを再実行するが、モジュールは再読み込みされないため、
+    全セッションで同じキュー（ワーカー）を共有する。
+    """
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue()
+        return _job_queue
+
+
+@contextmanager
+def watch_cancel(process: subprocess.Popen, cancel_event: Optional[threading.Event]):
+    """
+    キャンセルが要求されたらサブプロセスを終了させる（with ブロックの間だけ監視する）
+
+    Args:
+        process: 監視するサブプロセス
+        cancel_event: キャンセル要求（Noneの場合は監視しない）
+    """
+    if cancel_event is None:
+        yield
+        return
+
+    done = threading.Event()
+
+    def watch():
+        while not done.is_set() and process.poll() is None:
+            if cancel_event.wait(CANCEL_POLL_INTERVAL):
+                process.kill()
+                return
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    try:
+        yield
+    finally:
+        done.set()
+        watcher.join()
+
+
+def run_subprocess(
+    cmd,
+    timeout: int,
+    cancel_event: Optional[threading.Event] = None,
+    cwd: Optional[str] = None
+) -> subprocess.CompletedProcess:
+    """
+    キャンセル可能な subprocess.run(capture_output=True, text=True)
+
+    Raises:
+        subprocess.TimeoutExpired: タイムアウトした場合
+        JobCancelled: キャンセルが要求された場合
+    """
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, cwd=cwd)
+    with watch_cancel(process, cancel_event):
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            raise
+    if cancel_event is not None and cancel_event.is_set():
+        raise JobCancelled()
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
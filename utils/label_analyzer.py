@@ -3,22 +3,37 @@
 
 XMLファイルからList要素のColumn要素の1つ目を抽出し、
 ラベル種類を判定する機能を提供します。
+
+抽出は scripts/utils/column_value_scanner.py でストリーミングに行い（文書全体のツリーを作らない）、
+ラベル判定は異なる値ごとに1回だけ行います。
 """
 import sys
 import importlib.util
 from pathlib import Path
-from typing import List, Set, Tuple, Dict, Optional, TYPE_CHECKING
+from typing import List, Set, Tuple, Dict, Optional, Union, TYPE_CHECKING
 from lxml import etree
-import pandas as pd
 
-# scripts/utils/label_utils.pyを直接インポート
+# pandas は表を作成する時点で読み込む（インポート時の起動コストを避ける）
+if TYPE_CHECKING:
+    import pandas as pd
+
+# scripts/utils/label_utils.py・column_value_scanner.pyを直接インポート
 project_root = Path(__file__).resolve().parent.parent
-label_utils_path = project_root / "scripts" / "utils" / "label_utils.py"
+scripts_utils_dir = project_root / "scripts" / "utils"
+
+
+def _load_scripts_module(name: str):
+    """scripts/utils/ のモジュールをファイル単位で読み込む（utils パッケージ名の衝突を避けるため）"""
+    spec = importlib.util.spec_from_file_location(name, scripts_utils_dir / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
 
 # モジュールを動的に読み込む
-spec = importlib.util.spec_from_file_location("label_utils", label_utils_path)
-label_utils = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(label_utils)
+label_utils = _load_scripts_module("label_utils")
+column_value_scanner = _load_scripts_module("column_value_scanner")
+ColumnValueSummary = column_value_scanner.ColumnValueSummary
 
 LabelConfig = label_utils.LabelConfig
 detect_label_id = label_utils.detect_label_id
@@ -27,6 +42,23 @@ detect_label_id = label_utils.detect_label_id
 LabelConfigType = LabelConfig
 
 
+def scan_list_column1_values(xml_path: Path) -> 'ColumnValueSummary':
+    """
+    XMLファイルからすべてのList要素のColumn要素の1つ目の値をストリーミングで抽出し、
+    異なる値ごとに出現回数と最初の出現行を集計
+
+    Args:
+        xml_path: XMLファイルのパス
+
+    Returns:
+        ColumnValueSummary: 集計結果（values: 値 → 集計、has_column_list: ColumnありのList要素が存在するかどうか）
+    """
+    try:
+        return column_value_scanner.scan_list_column1_values(xml_path, column_value_scanner.MODE_FIRST_COLUMN)
+    except (etree.XMLSyntaxError, OSError) as e:
+        raise ValueError(f"XMLファイルの読み込みに失敗しました: {e}")
+
+
 def extract_list_column1_values(xml_path: Path) -> Tuple[Set[str], bool]:
     """
     XMLファイルからすべてのList要素のColumn要素の1つ目の値を抽出し、
@@ -38,71 +70,48 @@ def extract_list_column1_values(xml_path: Path) -> Tuple[Set[str], bool]:
     Returns:
         Tuple[Set[str], bool]: (Column要素の1つ目の値のセット（重複排除済み）, ColumnありのList要素が存在するかどうか)
     """
-    try:
-        tree = etree.parse(str(xml_path))
-        root = tree.getroot()
-    except Exception as e:
-        raise ValueError(f"XMLファイルの読み込みに失敗しました: {e}")
-    
-    column1_values = set()
-    has_column_list = False
-    
-    # すべてのList要素を検索
-    for list_elem in root.iter('List'):
-        # List要素からColumn要素を取得
-        columns = list_elem.findall('.//Column')
-        
-        if len(columns) >= 1:
-            has_column_list = True
-            # 1つ目のColumn要素からSentence要素を取得
-            col1 = columns[0]
-            sentence = col1.find('.//Sentence')
-            
-            if sentence is not None:
-                # テキストを取得
-                text = "".join(sentence.itertext()).strip()
-                if text:
-                    column1_values.add(text)
-    
-    return column1_values, has_column_list
+    summary = scan_list_column1_values(xml_path)
+    return set(summary.values), summary.has_column_list
 
 
-def analyze_label_types(column1_values: Set[str], label_config: Optional[LabelConfigType] = None) -> pd.DataFrame:
+def analyze_label_types(column1_values: Union[Set[str], 'ColumnValueSummary'],
+                        label_config: Optional[LabelConfigType] = None) -> 'pd.DataFrame':
     """
     セットから値を取り出し、どのラベル要素か判定し、
     すべての値に対して判定を実施
     
     Args:
-        column1_values: Column要素の1つ目の値のセット
+        column1_values: Column要素の1つ目の値のセット、または scan_list_column1_values() の集計結果
+                        （集計結果の場合は出現回数・最初の出現行の列を追加する）
         label_config: ラベル設定（Noneの場合はデフォルト設定を使用）
         
     Returns:
-        pd.DataFrame: 判定結果の表（ラベル要素、値の2列構成）
+        pd.DataFrame: 判定結果の表（ラベル要素、値の2列構成。集計結果の場合は出現回数、初出行を加えた4列構成）
     """
     if label_config is None:
         label_config = LabelConfig()
-    
-    results = []
-    
-    # すべての値に対して判定を実施
-    for value in sorted(column1_values):
-        label_id = detect_label_id(value)
-        
-        if label_id:
-            # ラベル定義から名前を取得
+
+    summary = column1_values if isinstance(column1_values, ColumnValueSummary) else None
+    values = sorted(column1_values.values if summary is not None else column1_values)
+
+    # 異なる値ごとに1回だけ判定し、ラベルIDごとに名前を1回だけ引く
+    label_names: Dict[Optional[str], str] = {None: "不明"}
+    names = []
+    for value in values:
+        label_id = label_config.detect_label_id(value)
+        if label_id not in label_names:
             label_def = label_config.get_label_definition(label_id)
-            label_name = label_def.get('name', label_id) if label_def else label_id
-        else:
-            label_id = "unknown"
-            label_name = "不明"
-        
-        results.append({
-            'ラベル要素': label_name,
-            '値': value
-        })
-    
-    # DataFrameに変換
-    df = pd.DataFrame(results)
+            label_names[label_id] = label_def.get('name', label_id) if label_def else label_id
+        names.append(label_names[label_id])
+
+    columns = {'ラベル要素': names, '値': values}
+    if summary is not None:
+        columns['出現回数'] = [summary.values[value].count for value in values]
+        columns['初出行'] = [summary.values[value].first_line for value in values]
+
+    # DataFrameに変換（列ごとにまとめて作成）
+    import pandas as pd
+    df = pd.DataFrame(columns, columns=list(columns))
     
     # ラベル要素でソート（値も併せてソート）
     df = df.sort_values(['ラベル要素', '値'], ascending=[True, True])
@@ -110,35 +119,35 @@ def analyze_label_types(column1_values: Set[str], label_config: Optional[LabelCo
     return df
 
 
-def analyze_xml_labels(xml_path: Path, label_config: Optional[LabelConfigType] = None) -> Tuple[Optional[pd.DataFrame], bool]:
+def analyze_xml_labels(xml_path: Path, label_config: Optional[LabelConfigType] = None) -> Tuple[Optional['pd.DataFrame'], bool]:
     """
     XMLファイルからList要素のColumn要素の1つ目を抽出し、
     ラベル種類を判定して表にまとめる
     
     処理の流れ:
-    1. List要素のColumn要素の1つ目を抽出
-    2. セットに格納（重複排除のため）
+    1. List要素を先頭から1つずつ読み、Column要素の1つ目を抽出（読み終えた要素は解放）
+    2. 異なる値ごとに出現回数と最初の出現行を集計
     3. すべてのList要素に対し上記実施
-    4. 作成したセットから値を取り出し、どのラベル要素か判定
+    4. 集計した値ごとに、どのラベル要素か判定
     5. すべての値に対して判定を実施
-    6. 判定結果を表にまとめる（ラベル要素、値の2列構成）
+    6. 判定結果を表にまとめる（ラベル要素、値、出現回数、初出行の4列構成）
     
     Args:
         xml_path: XMLファイルのパス
         label_config: ラベル設定（Noneの場合はデフォルト設定を使用）
         
     Returns:
-        Tuple[Optional[pd.DataFrame], bool]: (判定結果の表（ラベル要素、値の2列構成）, ColumnありのList要素が存在するかどうか)
+        Tuple[Optional[pd.DataFrame], bool]: (判定結果の表, ColumnありのList要素が存在するかどうか)
         ColumnありのList要素がない場合は (None, False) を返す
     """
-    # Column要素の1つ目の値を抽出（重複排除済み）
-    column1_values, has_column_list = extract_list_column1_values(xml_path)
+    # Column要素の1つ目の値を抽出（値ごとに集計済み）
+    summary = scan_list_column1_values(xml_path)
     
     # ColumnありのList要素がない場合
-    if not has_column_list:
+    if not summary.has_column_list:
         return None, False
     
     # ラベル種類を判定して表にまとめる
-    result_df = analyze_label_types(column1_values, label_config)
+    result_df = analyze_label_types(summary, label_config)
     
     return result_df, True
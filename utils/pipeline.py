@@ -3,37 +3,46 @@
 
 変換スクリプトを順次実行するパイプライン処理を提供します。
 """
+import json
+import shutil
 import subprocess
 import sys
+import tempfile
+import threading
+import time
 from pathlib import Path
 from typing import List, Optional, Tuple, Dict
 import streamlit as st
 
 
-# 変換スクリプトの実行順序（推奨順序）
-RECOMMENDED_SCRIPT_ORDER = [
-    "preprocess_non_first_sentence_to_list.py",
-    "convert_article_focused.py",
-    "convert_paragraph_step3.py",
-    "convert_paragraph_step4.py",
-    "convert_item_step0.py",
-    "convert_subitem1_step0.py",
-    "convert_subitem2_step0.py",
-    "convert_subitem3_step0.py",
-    "convert_subitem4_step0.py",
-    "convert_subitem5_step0.py",
-    "convert_subitem6_step0.py",
-    "convert_subitem7_step0.py",
-    "convert_subitem8_step0.py",
-    "convert_subitem9_step0.py",
-    "convert_subitem10_step0.py",
-]
+# scripts/ のステップレジストリを使用（scripts/utils と名前が衝突しないよう、パスの末尾に追加）
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.append(str(SCRIPTS_DIR))
+
+import step_registry
+from utils.job_queue import CANCELLED_MESSAGE, JobCancelled, run_subprocess, watch_cancel
+from utils.validation import validate_output, validation_results_from_engine_log
+
+# 変換スクリプトの実行順序（推奨順序。step_registry の依存関係から決まる）
+RECOMMENDED_SCRIPT_ORDER = step_registry.get_step_order(step_registry.DIRECTION_FORWARD)
+
+# インプロセス・パイプライン実行エンジン（scripts/pipeline_engine.py）
+ENGINE_SCRIPT_NAME = "pipeline_engine.py"
+ENGINE_PROGRESS_PREFIX = "PROGRESS"
+# エンジンでまとめて実行できるスクリプト
+ENGINE_SUPPORTED_SCRIPTS = set(RECOMMENDED_SCRIPT_ORDER)
+# エンジンが保存するテキスト内容検証のレポート（ジョブのディレクトリ内）
+VALIDATION_REPORT_FILENAME = "validation_report.txt"
 
 
 def get_available_scripts(script_dir: Path) -> List[str]:
     """
     利用可能な変換スクリプトのリストを取得
     
+    step_registry に登録された順変換のステップのうち、スクリプトディレクトリにあるものを推奨順序で返す
+    （パイプラインエンジン・ベンチマーク等の、入力・出力ファイルを受け取る変換スクリプトでないものは含まない）。
+    
     Args:
         script_dir: スクリプトディレクトリのパス
     
@@ -43,23 +52,7 @@ def get_available_scripts(script_dir: Path) -> List[str]:
     if not script_dir.exists():
         return []
     
-    scripts = []
-    for script_file in script_dir.glob("*.py"):
-        # テストファイルやバックアップファイルを除外
-        if not script_file.name.startswith("test_") and not script_file.name.endswith(".bak.py"):
-            scripts.append(script_file.name)
-    
-    # 推奨順序でソート
-    scripts_sorted = []
-    for recommended in RECOMMENDED_SCRIPT_ORDER:
-        if recommended in scripts:
-            scripts_sorted.append(recommended)
-            scripts.remove(recommended)
-    
-    # 残りのスクリプトを追加
-    scripts_sorted.extend(sorted(scripts))
-    
-    return scripts_sorted
+    return [script_name for script_name in RECOMMENDED_SCRIPT_ORDER if (script_dir / script_name).exists()]
 
 
 def get_script_description(script_name: str) -> str:
@@ -72,24 +65,281 @@ def get_script_description(script_name: str) -> str:
     Returns:
         スクリプトの説明
     """
-    descriptions = {
-        "preprocess_non_first_sentence_to_list.py": "前処理: 2個目以降のSentence要素をList要素に変換",
-        "convert_article_focused.py": "Article要素の分割と調整",
-        "convert_paragraph_step3.py": "Paragraph処理（step3）",
-        "convert_paragraph_step4.py": "Paragraph処理（step4）",
-        "convert_item_step0.py": "Item変換",
-        "convert_subitem1_step0.py": "Subitem1変換",
-        "convert_subitem2_step0.py": "Subitem2変換",
-        "convert_subitem3_step0.py": "Subitem3変換",
-        "convert_subitem4_step0.py": "Subitem4変換",
-        "convert_subitem5_step0.py": "Subitem5変換",
-        "convert_subitem6_step0.py": "Subitem6変換",
-        "convert_subitem7_step0.py": "Subitem7変換",
-        "convert_subitem8_step0.py": "Subitem8変換",
-        "convert_subitem9_step0.py": "Subitem9変換",
-        "convert_subitem10_step0.py": "Subitem10変換",
+    return step_registry.get_step_description(script_name, "変換スクリプト")
+
+
+def _get_step_output_path(script_dir: Path, intermediate_dir: Optional[Path], step_idx: int, script_name: str) -> Path:
+    """ステップの出力ファイルのパスを決定"""
+    if intermediate_dir:
+        intermediate_dir.mkdir(parents=True, exist_ok=True)
+        return intermediate_dir / f"step_{step_idx:02d}_{script_name.replace('.py', '.xml')}"
+    step_output = script_dir.parent / "temp" / f"step_{script_name.replace('.py', '.xml')}"
+    step_output.parent.mkdir(exist_ok=True)
+    return step_output
+
+
+def _group_scripts(scripts: List[str], use_engine: bool) -> List[Tuple[bool, List[str]]]:
+    """
+    連続するエンジン対応スクリプトを1つのグループにまとめる
+    
+    Returns:
+        (エンジンで実行するかどうか, スクリプトのリスト) のリスト
+    """
+    groups = []
+    for script_name in scripts:
+        in_engine = use_engine and script_name in ENGINE_SUPPORTED_SCRIPTS
+        if groups and groups[-1][0] == in_engine and in_engine:
+            groups[-1][1].append(script_name)
+        else:
+            groups.append((in_engine, [script_name]))
+    return groups
+
+
+def _run_script_step(
+    current_input: Path,
+    script_name: str,
+    step_idx: int,
+    total_steps: int,
+    script_dir: Path,
+    intermediate_dir: Optional[Path],
+    timeout: int,
+    progress_callback: Optional[callable],
+    execution_log: Dict[str, any],
+    cancel_event: Optional[threading.Event] = None,
+    run_start: Optional[float] = None
+) -> Tuple[bool, Optional[str], Path]:
+    """
+    スクリプトを個別のサブプロセスとして実行
+    
+    実時間（サブプロセスの起動・パース・変換・書き出しの合計）を step_info["profile"] に記録する。
+    
+    Returns:
+        (success: bool, error_message: Optional[str], step_output: Path)
+    """
+    script_path = script_dir / script_name
+    step_output = _get_step_output_path(script_dir, intermediate_dir, step_idx, script_name)
+    
+    # 進捗コールバック
+    if progress_callback:
+        progress_callback(step_idx, total_steps, script_name)
+    
+    step_info = {
+        "step": step_idx,
+        "script": script_name,
+        "input": str(current_input),
+        "output": str(step_output),
+        "success": False,
+        "error": None
     }
-    return descriptions.get(script_name, "変換スクリプト")
+    
+    step_start = time.perf_counter()
+    try:
+        # Pythonスクリプトを実行
+        result = run_subprocess(
+            [sys.executable, str(script_path), str(current_input), str(step_output)],
+            timeout,
+            cancel_event
+        )
+        
+        if result.returncode != 0:
+            error_msg = f"{script_name}の実行に失敗しました"
+            if result.stderr:
+                error_msg += f"\nエラー詳細: {result.stderr}"
+            step_info["error"] = error_msg
+            execution_log["steps"].append(step_info)
+            execution_log["failed_step"] = script_name
+            return False, error_msg, step_output
+        
+        if not step_output.exists():
+            error_msg = f"出力ファイルが作成されませんでした: {script_name}"
+            step_info["error"] = error_msg
+            execution_log["steps"].append(step_info)
+            execution_log["failed_step"] = script_name
+            return False, error_msg, step_output
+        
+        step_info["success"] = True
+        execution_log["steps"].append(step_info)
+        execution_log["completed_steps"] = step_idx
+        return True, None, step_output
+    
+    except subprocess.TimeoutExpired:
+        error_msg = f"タイムアウト: {script_name}（{timeout}秒）"
+        step_info["error"] = error_msg
+        execution_log["steps"].append(step_info)
+        execution_log["failed_step"] = script_name
+        return False, error_msg, step_output
+    
+    except JobCancelled:
+        step_info["error"] = CANCELLED_MESSAGE
+        execution_log["steps"].append(step_info)
+        execution_log["failed_step"] = script_name
+        execution_log["cancelled"] = True
+        return False, CANCELLED_MESSAGE, step_output
+    
+    except Exception as e:
+        error_msg = f"実行エラー: {script_name} - {str(e)}"
+        step_info["error"] = error_msg
+        execution_log["steps"].append(step_info)
+        execution_log["failed_step"] = script_name
+        return False, error_msg, step_output
+    
+    finally:
+        step_info["profile"] = {
+            "start": round(step_start - (run_start or step_start), 6),
+            "wall_time": round(time.perf_counter() - step_start, 6),
+            "phases": []
+        }
+
+
+def _shift_phases(phases: List[Dict], offset: float) -> List[Dict]:
+    """処理段階の開始時刻（エンジンの開始からの経過時間）をパイプラインの開始からの経過時間に変換"""
+    return [dict(phase, start=round(phase["start"] + offset, 6)) for phase in phases]
+
+
+def _run_engine_steps(
+    current_input: Path,
+    script_names: List[str],
+    start_idx: int,
+    total_steps: int,
+    script_dir: Path,
+    intermediate_dir: Optional[Path],
+    timeout: int,
+    progress_callback: Optional[callable],
+    execution_log: Dict[str, any],
+    cancel_event: Optional[threading.Event] = None,
+    run_start: Optional[float] = None,
+    validation_report: Optional[Path] = None
+) -> Tuple[bool, Optional[str], Path]:
+    """
+    連続するスクリプトをパイプラインエンジン（1プロセス・1回のパース）でまとめて実行
+    
+    中間ファイルは intermediate_dir が指定された場合のみ、個別実行時と同じ名前で書き出す。
+    validation_report が指定された場合、エンジンがメモリ上の最終ツリーと current_input のテキスト内容検証を
+    最終出力の書き出しと並行して行い（--validation-report）、結果を execution_log["validation"] に記録する。
+    cancel_event が設定されるとエンジンのプロセスを終了させる。
+    エンジンの計測結果（--profile、scripts/step_profiler.py）は、時刻をパイプラインの開始からの経過時間に
+    変換して各ステップの "profile" と execution_log["profile"]["phases"] に記録する。
+    
+    Returns:
+        (success: bool, error_message: Optional[str], step_output: Path)
+    """
+    last_idx = start_idx + len(script_names) - 1
+    step_output = _get_step_output_path(script_dir, intermediate_dir, last_idx, script_names[-1])
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_path = Path(temp_dir) / "execution_log.json"
+        cmd = [
+            sys.executable, str(script_dir / ENGINE_SCRIPT_NAME),
+            str(current_input), str(step_output),
+            "--steps", *script_names,
+            "--progress",
+            "--profile",
+            "--log-json", str(log_path),
+        ]
+        if intermediate_dir:
+            cmd += [
+                "--intermediate-dir", str(intermediate_dir),
+                "--intermediate-format", "step_{index:02d}_{step}.xml",
+                "--start-index", str(start_idx),
+            ]
+        if validation_report:
+            cmd += ["--validation-report", str(validation_report)]
+        
+        # ステップ数に応じたタイムアウト（1ステップあたり timeout 秒）
+        group_timeout = timeout * len(script_names)
+        timed_out = []
+        
+        def kill_process():
+            timed_out.append(True)
+            process.kill()
+        
+        output_lines = []
+        group_start = time.perf_counter()
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True
+            )
+            timer = threading.Timer(group_timeout, kill_process)
+            timer.start()
+            try:
+                with watch_cancel(process, cancel_event):
+                    for line in process.stdout:
+                        fields = line.rstrip("\n").split("\t")
+                        if len(fields) == 4 and fields[0] == ENGINE_PROGRESS_PREFIX:
+                            if progress_callback:
+                                progress_callback(start_idx + int(fields[1]) - 1, total_steps, fields[3])
+                        else:
+                            output_lines.append(line)
+                    returncode = process.wait()
+            finally:
+                timer.cancel()
+        except Exception as e:
+            error_msg = f"実行エラー: {ENGINE_SCRIPT_NAME} - {str(e)}"
+            execution_log["failed_step"] = script_names[0]
+            return False, error_msg, step_output
+        
+        engine_log = {}
+        if log_path.exists():
+            with open(log_path, "r", encoding="utf-8") as f:
+                engine_log = json.load(f)
+    
+    # エンジンの実行ログを統合
+    offset = group_start - (run_start or group_start)
+    engine_profile = engine_log.get("profile")
+    if engine_profile:
+        run_profile = execution_log.setdefault("profile", {"phases": []})
+        run_profile["phases"].extend(_shift_phases(engine_profile.get("phases", []), offset))
+        if engine_profile.get("peak_rss_kb") is not None:
+            run_profile["peak_rss_kb"] = max(run_profile.get("peak_rss_kb") or 0, engine_profile["peak_rss_kb"])
+    step_input = current_input
+    for engine_step in engine_log.get("steps", []):
+        step_idx = start_idx + engine_step["step"] - 1
+        step_info = {
+            "step": step_idx,
+            "script": engine_step["script"],
+            "input": str(step_input) if step_input else None,
+            "output": engine_step.get("output") or (str(step_output) if step_idx == last_idx else None),
+            "success": engine_step["success"],
+            "error": engine_step["error"],
+            "stats": engine_step.get("stats", {})
+        }
+        for key in ("skipped", "pass_through", "cached", "fused_with"):
+            if key in engine_step:
+                step_info[key] = engine_step[key]
+        if engine_step.get("profile"):
+            profile = dict(engine_step["profile"])
+            profile["start"] = round(profile["start"] + offset, 6)
+            profile["phases"] = _shift_phases(profile.get("phases", []), offset)
+            step_info["profile"] = profile
+        execution_log["steps"].append(step_info)
+        if step_info["success"]:
+            execution_log["completed_steps"] = step_idx
+        step_input = step_info["output"]
+    if "validation" in engine_log:
+        execution_log["validation"] = engine_log["validation"]
+    
+    if timed_out:
+        failed_script = script_names[min(len(engine_log.get("steps", [])), len(script_names) - 1)]
+        execution_log["failed_step"] = failed_script
+        return False, f"タイムアウト: {failed_script}（{group_timeout}秒）", step_output
+    
+    if cancel_event is not None and cancel_event.is_set():
+        execution_log["failed_step"] = script_names[min(len(engine_log.get("steps", [])), len(script_names) - 1)]
+        execution_log["cancelled"] = True
+        return False, CANCELLED_MESSAGE, step_output
+    
+    if returncode != 0 or not step_output.exists():
+        failed_script = engine_log.get("failed_step") or script_names[0]
+        execution_log["failed_step"] = failed_script
+        error_msg = f"{failed_script}の実行に失敗しました"
+        if output_lines:
+            error_msg += f"\nエラー詳細: {''.join(output_lines)}"
+        return False, error_msg, step_output
+    
+    return True, None, step_output
 
 
 def run_pipeline(
@@ -99,22 +349,34 @@ def run_pipeline(
     script_dir: Path,
     intermediate_dir: Optional[Path] = None,
     timeout: int = 300,
-    progress_callback: Optional[callable] = None
+    progress_callback: Optional[callable] = None,
+    cancel_event: Optional[threading.Event] = None,
+    validation_report: Optional[Path] = None
 ) -> Tuple[bool, Optional[str], Dict[str, any]]:
     """
     パイプラインを実行
     
+    推奨順序に含まれるスクリプトが連続する区間は、パイプラインエンジン
+    （scripts/pipeline_engine.py）で入力を1回だけパースしてまとめて実行する。
+    それ以外のスクリプトは従来どおり個別のサブプロセスで実行する。
+    
     Args:
         input_path: 入力XMLファイルのパス
         output_path: 出力XMLファイルのパス
         scripts: 実行するスクリプトのリスト
         script_dir: スクリプトディレクトリのパス
         intermediate_dir: 中間ファイル保存ディレクトリ（オプション）
-        timeout: タイムアウト時間（秒）
+        timeout: タイムアウト時間（秒、1ステップあたり）
         progress_callback: 進捗コールバック関数（current_step, total_steps, script_name）
+        cancel_event: キャンセル要求（設定されると実行中のサブプロセスを終了させ、以降のステップを実行しない）
+        validation_report: 入力XMLとのテキスト内容検証のレポートファイル（オプション）。全スクリプトを
+                           エンジンでまとめて実行する場合のみ、エンジンが変換後のツリーで検証してレポートを保存し、
+                           結果を execution_log["validation"] に記録する
     
     Returns:
         (success: bool, error_message: Optional[str], execution_log: Dict)
+        execution_log の各ステップの "profile" に処理時間（エンジンで実行したステップは
+        CPU時間・処理段階の内訳・要素数・メモリ使用量も）、"profile" に全体の処理時間を記録する。
     """
     if not input_path.exists():
         return False, f"入力ファイルが見つかりません: {input_path}", {}
@@ -129,91 +391,111 @@ def run_pipeline(
         "steps": []
     }
     
-    current_input = input_path
-    total_steps = len(scripts)
-    
-    for step_idx, script_name in enumerate(scripts, 1):
-        script_path = script_dir / script_name
-        
-        if not script_path.exists():
+    for script_name in scripts:
+        if not (script_dir / script_name).exists():
             error_msg = f"スクリプトが見つかりません: {script_name}"
             execution_log["failed_step"] = script_name
             return False, error_msg, execution_log
-        
-        # 中間ファイルのパスを決定
-        if intermediate_dir:
-            intermediate_dir.mkdir(parents=True, exist_ok=True)
-            step_output = intermediate_dir / f"step_{step_idx:02d}_{script_name.replace('.py', '.xml')}"
-        else:
-            step_output = script_dir.parent / "temp" / f"step_{script_name.replace('.py', '.xml')}"
-            step_output.parent.mkdir(exist_ok=True)
-        
-        # 進捗コールバック
-        if progress_callback:
-            progress_callback(step_idx, total_steps, script_name)
-        
-        step_info = {
-            "step": step_idx,
-            "script": script_name,
-            "input": str(current_input),
-            "output": str(step_output),
-            "success": False,
-            "error": None
-        }
-        
-        try:
-            # Pythonスクリプトを実行
-            result = subprocess.run(
-                [sys.executable, str(script_path), str(current_input), str(step_output)],
-                capture_output=True,
-                text=True,
-                timeout=timeout
+    
+    current_input = input_path
+    total_steps = len(scripts)
+    use_engine = (script_dir / ENGINE_SCRIPT_NAME).exists()
+    step_idx = 1
+    run_start = time.perf_counter()
+    execution_log["profile"] = {"phases": []}
+    
+    groups = _group_scripts(scripts, use_engine)
+    for in_engine, group in groups:
+        if in_engine:
+            # 入力XMLから最終出力までをエンジンだけで実行する場合は、エンジンのツリーで検証する
+            group_validation_report = validation_report if len(groups) == 1 else None
+            success, error_msg, current_input = _run_engine_steps(
+                current_input, group, step_idx, total_steps, script_dir,
+                intermediate_dir, timeout, progress_callback, execution_log, cancel_event, run_start,
+                group_validation_report
             )
-            
-            if result.returncode != 0:
-                error_msg = f"{script_name}の実行に失敗しました"
-                if result.stderr:
-                    error_msg += f"\nエラー詳細: {result.stderr}"
-                step_info["error"] = error_msg
-                execution_log["steps"].append(step_info)
-                execution_log["failed_step"] = script_name
+            if not success:
+                execution_log["profile"]["wall_time"] = round(time.perf_counter() - run_start, 6)
                 return False, error_msg, execution_log
-            
-            if not step_output.exists():
-                error_msg = f"出力ファイルが作成されませんでした: {script_name}"
-                step_info["error"] = error_msg
-                execution_log["steps"].append(step_info)
-                execution_log["failed_step"] = script_name
-                return False, error_msg, execution_log
-            
-            step_info["success"] = True
-            execution_log["steps"].append(step_info)
-            execution_log["completed_steps"] = step_idx
-            
-            current_input = step_output
-        
-        except subprocess.TimeoutExpired:
-            error_msg = f"タイムアウト: {script_name}（{timeout}秒）"
-            step_info["error"] = error_msg
-            execution_log["steps"].append(step_info)
-            execution_log["failed_step"] = script_name
-            return False, error_msg, execution_log
-        
-        except Exception as e:
-            error_msg = f"実行エラー: {script_name} - {str(e)}"
-            step_info["error"] = error_msg
-            execution_log["steps"].append(step_info)
-            execution_log["failed_step"] = script_name
-            return False, error_msg, execution_log
+        else:
+            for offset, script_name in enumerate(group):
+                if cancel_event is not None and cancel_event.is_set():
+                    execution_log["failed_step"] = script_name
+                    execution_log["cancelled"] = True
+                    return False, CANCELLED_MESSAGE, execution_log
+                success, error_msg, current_input = _run_script_step(
+                    current_input, script_name, step_idx + offset, total_steps, script_dir,
+                    intermediate_dir, timeout, progress_callback, execution_log, cancel_event, run_start
+                )
+                if not success:
+                    execution_log["profile"]["wall_time"] = round(time.perf_counter() - run_start, 6)
+                    return False, error_msg, execution_log
+        step_idx += len(group)
     
     # 最終結果をコピー
     try:
-        import shutil
         output_path.parent.mkdir(parents=True, exist_ok=True)
         shutil.copy(current_input, output_path)
         execution_log["final_output"] = str(output_path)
+        execution_log["profile"]["wall_time"] = round(time.perf_counter() - run_start, 6)
         return True, None, execution_log
     except Exception as e:
         return False, f"最終出力ファイルのコピーに失敗しました: {e}", execution_log
 
 
+def run_pipeline_job(
+    job,
+    scripts: List[str],
+    script_dir: Path,
+    output_filename: str,
+    timeout: int = 300
+) -> Dict[str, any]:
+    """
+    バックグラウンドジョブとしてパイプラインを実行し、出力を検証（utils/job_queue.py のジョブ関数）
+    
+    出力ファイルと中間ファイルはジョブのディレクトリに保存する。
+    テキスト内容検証は、全スクリプトをエンジンでまとめて実行した場合はエンジンがメモリ上の最終ツリーで行い
+    （レポートはジョブのディレクトリの validation_report.txt）、その結果を使う。それ以外の場合は出力ファイルを検証する。
+    
+    Args:
+        job: utils.job_queue.Job
+        scripts: 実行するスクリプトのリスト
+        script_dir: スクリプトディレクトリのパス
+        output_filename: 出力ファイル名
+        timeout: タイムアウト時間（秒、1ステップあたり）
+    
+    Returns:
+        {"success", "error", "output_path", "intermediate_dir", "execution_log", "validation_results"}
+    """
+    output_path = job.job_dir / output_filename
+    intermediate_dir = job.job_dir / "intermediate_files" / job.input_path.stem
+    intermediate_dir.mkdir(parents=True, exist_ok=True)
+    validation_report = job.job_dir / VALIDATION_REPORT_FILENAME
+    
+    success, error_msg, execution_log = run_pipeline(
+        input_path=job.input_path,
+        output_path=output_path,
+        scripts=scripts,
+        script_dir=script_dir,
+        intermediate_dir=intermediate_dir,
+        timeout=timeout,
+        progress_callback=job.update_progress,
+        cancel_event=job.cancel_event,
+        validation_report=validation_report
+    )
+    if not success:
+        return {"success": False, "error": error_msg, "execution_log": execution_log}
+    
+    if "validation" in execution_log:
+        validation_results = validation_results_from_engine_log(execution_log["validation"], output_path)
+    else:
+        job.update_progress(len(scripts), len(scripts), "検証")
+        validation_results = validate_output(job.input_path, output_path)
+    return {
+        "success": True,
+        "error": None,
+        "output_path": str(output_path),
+        "intermediate_dir": str(intermediate_dir),
+        "execution_log": execution_log,
+        "validation_results": validation_results
+    }
@@ -5,24 +5,30 @@
 """
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
 from typing import List, Optional, Tuple, Dict
 
 
-# 逆変換スクリプトの実行順序（内側から外側へ）
-REVERSE_SCRIPT_ORDER = [
-    "reverse_convert_subitem10.py",
-    "reverse_convert_subitem9.py",
-    "reverse_convert_subitem8.py",
-    "reverse_convert_subitem7.py",
-    "reverse_convert_subitem6.py",
-    "reverse_convert_subitem5.py",
-    "reverse_convert_subitem4.py",
-    "reverse_convert_subitem3.py",
-    "reverse_convert_subitem2.py",
-    "reverse_convert_subitem1.py",
-    "reverse_convert_item.py",
-]
+# scripts/ のステップレジストリを使用（scripts/utils と名前が衝突しないよう、パスの末尾に追加）
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.append(str(SCRIPTS_DIR))
+
+import step_registry
+
+# reverse_app/ の順序検証（verify_reverse_order.py）を使用
+REVERSE_APP_DIR = step_registry.SCRIPT_DIRS[step_registry.DIRECTION_REVERSE]
+if str(REVERSE_APP_DIR) not in sys.path:
+    sys.path.append(str(REVERSE_APP_DIR))
+
+from verify_reverse_order import format_verification_report, verify_order_files
+from utils.job_queue import CANCELLED_MESSAGE, JobCancelled, run_subprocess
+from utils.validation import validate_output
+
+# 逆変換スクリプトの実行順序（内側から外側へ。step_registry の依存関係から決まる）
+REVERSE_SCRIPT_ORDER = step_registry.get_step_order(step_registry.DIRECTION_REVERSE)
 
 
 def get_reverse_script_description(script_name: str) -> str:
@@ -35,20 +41,7 @@ def get_reverse_script_description(script_name: str) -> str:
     Returns:
         スクリプトの説明
     """
-    descriptions = {
-        "reverse_convert_subitem10.py": "Subitem10 → List 逆変換",
-        "reverse_convert_subitem9.py": "Subitem9 → List 逆変換",
-        "reverse_convert_subitem8.py": "Subitem8 → List 逆変換",
-        "reverse_convert_subitem7.py": "Subitem7 → List 逆変換",
-        "reverse_convert_subitem6.py": "Subitem6 → List 逆変換",
-        "reverse_convert_subitem5.py": "Subitem5 → List 逆変換",
-        "reverse_convert_subitem4.py": "Subitem4 → List 逆変換",
-        "reverse_convert_subitem3.py": "Subitem3 → List 逆変換",
-        "reverse_convert_subitem2.py": "Subitem2 → List 逆変換",
-        "reverse_convert_subitem1.py": "Subitem1 → List 逆変換",
-        "reverse_convert_item.py": "Item → List 逆変換",
-    }
-    return descriptions.get(script_name, "逆変換スクリプト")
+    return step_registry.get_step_description(script_name, "逆変換スクリプト")
 
 
 def run_reverse_pipeline(
@@ -63,7 +56,10 @@ def run_reverse_pipeline(
     include_appdxtable: bool = True,
     include_tablecolumn: bool = True,
     include_remarks: bool = True,
-    include_newprovision: bool = True
+    include_newprovision: bool = True,
+    cancel_event: Optional[threading.Event] = None,
+    verify_order: bool = False,
+    max_order_mismatches: Optional[int] = 10
 ) -> Tuple[bool, Optional[str], Dict[str, any]]:
     """
     逆変換パイプラインを実行
@@ -81,9 +77,15 @@ def run_reverse_pipeline(
         include_tablecolumn: TableColumn要素内のItem要素を処理対象にするか（デフォルト: True）
         include_remarks: Remarks要素内のItem要素を処理対象にするか（デフォルト: True）
         include_newprovision: NewProvision要素内のItem要素を処理対象にするか（デフォルト: True）
+        cancel_event: キャンセル要求（設定されると実行中のサブプロセスを終了させ、以降のステップを実行しない）
+        verify_order: 最終ステップの直後に、入力と最終ステップの出力のテキストの順序を検証するか
+            （verify_reverse_order.verify_order_files。結果は execution_log の "order_verification" に記録する）
+        max_order_mismatches: 順序検証をこの件数の不一致で打ち切る（None: 最後まで比較）
     
     Returns:
         (success: bool, error_message: Optional[str], execution_log: Dict)
+        execution_log の各ステップの "profile" と "profile" に処理時間（実時間）を記録する。
+        順序の不一致は失敗として扱わない（"order_verification" の "is_order_preserved" で判定する）。
     """
     if not input_path.exists():
         return False, f"入力ファイルが見つかりません: {input_path}", {}
@@ -100,6 +102,8 @@ def run_reverse_pipeline(
     
     current_input = input_path
     total_steps = len(REVERSE_SCRIPT_ORDER)
+    run_start = time.perf_counter()
+    execution_log["profile"] = {"phases": []}
     
     for step_idx, script_name in enumerate(REVERSE_SCRIPT_ORDER, 1):
         script_path = script_dir / script_name
@@ -109,6 +113,11 @@ def run_reverse_pipeline(
             execution_log["failed_step"] = script_name
             return False, error_msg, execution_log
         
+        if cancel_event is not None and cancel_event.is_set():
+            execution_log["failed_step"] = script_name
+            execution_log["cancelled"] = True
+            return False, CANCELLED_MESSAGE, execution_log
+        
         # 中間ファイルのパスを決定
         if intermediate_dir:
             intermediate_dir.mkdir(parents=True, exist_ok=True)
@@ -130,31 +139,32 @@ def run_reverse_pipeline(
             "error": None
         }
         
+        step_start = time.perf_counter()
         try:
             # Pythonスクリプトを実行（カレントディレクトリをreverse_appに設定）
             # reverse_convert_item.pyの場合のみ、各要素タイプのオプションを追加
             cmd = [sys.executable, str(script_path), str(current_input), str(step_output)]
             if script_name == 'reverse_convert_item.py':
                 # デフォルト（すべてTrue）の場合はオプションを追加しない
-                # 1つでもFalseの場合は、Trueのものだけをオプションとして追加
+                # 1つでもFalseの場合は、Falseのものを --no-include-* オプションとして追加
+                # （入力・出力ファイルの間に入れると出力ファイルが認識されないため、入力ファイルの前に入れる）
                 if not include_paragraph:
-                    cmd.insert(-1, '--no-include-paragraph')
+                    cmd.insert(2, '--no-include-paragraph')
                 if not include_class:
-                    cmd.insert(-1, '--no-include-class')
+                    cmd.insert(2, '--no-include-class')
                 if not include_appdxtable:
-                    cmd.insert(-1, '--no-include-appdxtable')
+                    cmd.insert(2, '--no-include-appdxtable')
                 if not include_tablecolumn:
-                    cmd.insert(-1, '--no-include-tablecolumn')
+                    cmd.insert(2, '--no-include-tablecolumn')
                 if not include_remarks:
-                    cmd.insert(-1, '--no-include-remarks')
+                    cmd.insert(2, '--no-include-remarks')
                 if not include_newprovision:
-                    cmd.insert(-1, '--no-include-newprovision')
+                    cmd.insert(2, '--no-include-newprovision')
             
-            result = subprocess.run(
+            result = run_subprocess(
                 cmd,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
+                timeout,
+                cancel_event,
                 cwd=str(script_dir)  # カレントディレクトリをreverse_appに設定
             )
             
@@ -187,12 +197,38 @@ def run_reverse_pipeline(
             execution_log["failed_step"] = script_name
             return False, error_msg, execution_log
         
+        except JobCancelled:
+            step_info["error"] = CANCELLED_MESSAGE
+            execution_log["steps"].append(step_info)
+            execution_log["failed_step"] = script_name
+            execution_log["cancelled"] = True
+            return False, CANCELLED_MESSAGE, execution_log
+        
         except Exception as e:
             error_msg = f"実行エラー: {script_name} - {str(e)}"
             step_info["error"] = error_msg
             execution_log["steps"].append(step_info)
             execution_log["failed_step"] = script_name
             return False, error_msg, execution_log
+        
+        finally:
+            step_info["profile"] = {
+                "start": round(step_start - run_start, 6),
+                "wall_time": round(time.perf_counter() - step_start, 6),
+                "phases": []
+            }
+            execution_log["profile"]["wall_time"] = round(time.perf_counter() - run_start, 6)
+    
+    # 順序検証（最終ステップの出力を、別途読み込み直さずにその場で検証する）
+    if verify_order:
+        verify_start = time.perf_counter()
+        try:
+            order_result = verify_order_files(input_path, current_input, max_order_mismatches)
+            order_result["report"] = format_verification_report(order_result)
+        except Exception as e:
+            order_result = {"is_order_preserved": False, "error": f"順序検証に失敗しました: {e}"}
+        order_result["wall_time"] = round(time.perf_counter() - verify_start, 6)
+        execution_log["order_verification"] = order_result
     
     # 最終結果をコピー
     try:
@@ -203,3 +239,59 @@ def run_reverse_pipeline(
         return True, None, execution_log
     except Exception as e:
         return False, f"最終出力ファイルのコピーに失敗しました: {e}", execution_log
+
+
+def run_reverse_pipeline_job(
+    job,
+    script_dir: Path,
+    output_filename: str,
+    timeout: int = 300,
+    **include_options
+) -> Dict[str, any]:
+    """
+    バックグラウンドジョブとして逆変換パイプラインを実行し、出力を検証（utils/job_queue.py のジョブ関数）
+    
+    出力ファイルと中間ファイルはジョブのディレクトリに保存する。
+    
+    Args:
+        job: utils.job_queue.Job
+        script_dir: 逆変換スクリプトディレクトリのパス
+        output_filename: 出力ファイル名
+        timeout: タイムアウト時間（秒）
+        **include_options: run_reverse_pipeline の include_* 引数
+    
+    Returns:
+        {"success", "error", "output_path", "intermediate_dir", "execution_log", "validation_results"}
+        validation_results の "order" に、最終ステップの直後に実行した順序検証の結果を含める。
+    """
+    output_path = job.job_dir / output_filename
+    intermediate_dir = job.job_dir / "reverse_intermediate_files" / job.input_path.stem
+    intermediate_dir.mkdir(parents=True, exist_ok=True)
+    
+    success, error_msg, execution_log = run_reverse_pipeline(
+        input_path=job.input_path,
+        output_path=output_path,
+        script_dir=script_dir,
+        intermediate_dir=intermediate_dir,
+        timeout=timeout,
+        progress_callback=job.update_progress,
+        cancel_event=job.cancel_event,
+        verify_order=True,
+        **include_options
+    )
+    if not success:
+        return {"success": False, "error": error_msg, "execution_log": execution_log}
+    
+    total_steps = len(REVERSE_SCRIPT_ORDER)
+    job.update_progress(total_steps, total_steps, "検証")
+    validation_results = validate_output(job.input_path, output_path)
+    if "order_verification" in execution_log:
+        validation_results["order"] = execution_log["order_verification"]
+    return {
+        "success": True,
+        "error": None,
+        "output_path": str(output_path),
+        "intermediate_dir": str(intermediate_dir),
+        "execution_log": execution_log,
+        "validation_results": validation_results
+    }
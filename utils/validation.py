@@ -2,14 +2,25 @@
 検証ユーティリティ
 
 XML構文検証とテキスト内容検証の機能を提供します。
+検証は scripts/ の validate_xml.py・compare_xml_text_content.py をプロセス内で呼び出して行います
+（サブプロセスの起動や一時レポートファイルは使用しません）。
 """
-import subprocess
 import sys
 from pathlib import Path
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, Union
 import xml.etree.ElementTree as ET
+from lxml import etree
 import streamlit as st
 
+# scripts/ の検証モジュールを使用（scripts/utils と名前が衝突しないよう、パスの末尾に追加）
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.append(str(SCRIPTS_DIR))
+
+import compare_xml_text_content
+from compare_xml_text_content import TextContentComparison
+from validate_xml import XMLSyntaxValidation, validate_xml
+
 
 def validate_xml_syntax(file_path: Path) -> Tuple[bool, Optional[str], Optional[str]]:
     """
@@ -41,43 +52,86 @@ def validate_xml_syntax_with_script(
     validation_script_path: Optional[Path] = None
 ) -> Tuple[bool, Optional[str], Optional[str]]:
     """
-    既存の検証スクリプトを使用してXML構文検証を実行
+    既存の検証スクリプト（validate_xml.py）と同じ処理でXML構文検証を実行
     
     Args:
         file_path: 検証するXMLファイルのパス
-        validation_script_path: 検証スクリプトのパス（Noneの場合はデフォルト）
+        validation_script_path: 後方互換性のため残している引数（使用しません）
     
     Returns:
         (is_valid: bool, error_message: Optional[str], validation_output: Optional[str])
     """
-    if validation_script_path is None:
-        # デフォルトの検証スクリプトパス
-        script_dir = file_path.parent.parent / "scripts"
-        validation_script_path = script_dir / "validate_xml.py"
-    
-    if not validation_script_path.exists():
-        # スクリプトが見つからない場合は、直接検証
-        return validate_xml_syntax(file_path)
+    if not file_path.exists():
+        return False, "ファイルが見つかりません", None
     
     try:
-        result = subprocess.run(
-            [sys.executable, str(validation_script_path), str(file_path)],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        output = result.stdout + result.stderr
+        result = validate_xml(str(file_path))
+        output = result.format_report() + "\n"
         
-        if result.returncode == 0 and "SUCCESS:" in output:
+        if result.is_valid:
             return True, None, output
         else:
             return False, "XML構文エラーが検出されました", output
     
-    except subprocess.TimeoutExpired:
-        return False, "検証がタイムアウトしました", None
     except Exception as e:
-        return False, f"検証スクリプトの実行エラー: {str(e)}", None
+        return False, f"検証の実行エラー: {str(e)}", None
+
+
+def check_text_content(
+    original: Union[Path, etree._ElementTree],
+    processed: Union[Path, etree._ElementTree]
+) -> TextContentComparison:
+    """
+    テキスト内容検証を実行し、構造化された結果を返す
+    
+    ファイルパスを渡した場合はストリーミングで走査し、パイプラインがメモリ上に持っている
+    lxmlのツリーを渡した場合は再パースせずにそのまま使用します。
+    
+    Args:
+        original: 元のXML（ファイルパスまたはlxmlのElementTree）
+        processed: 処理後のXML（ファイルパスまたはlxmlのElementTree）
+    
+    Returns:
+        TextContentComparison（missing_texts, extra_texts, table_count_error,
+        table_order_errors, table_position_warnings, is_valid など）
+    
+    Raises:
+        lxml.etree.XMLSyntaxError: XMLのパースに失敗した場合
+    """
+    return compare_xml_text_content.compare_text_content(original, processed)
+
+
+def build_report_data(result: Union[TextContentComparison, Dict], report_content: Optional[str] = None) -> Dict:
+    """
+    検証結果から画面表示用のレポートデータを作成
+    
+    Args:
+        result: check_text_content() の結果、またはその to_dict()（パイプラインエンジンの実行ログの "validation"）
+        report_content: result が辞書の場合のレポート本文（TextContentComparison.format_report() の内容）
+    
+    Returns:
+        {"content": レポート本文, "success": bool, "errors": [エラー行], "result": 構造化された結果}
+    """
+    if isinstance(result, TextContentComparison):
+        report_content = result.format_report()
+        result = result.to_dict()
+    return {
+        "content": report_content,
+        "success": not result["missing_texts"],
+        "errors": [line for line in report_content.split('\n') if "❌ Error:" in line],
+        "result": result
+    }
+
+
+def _content_validation_result(report_data: Dict) -> Dict:
+    """レポートデータから validation_results["content"] の値を作成"""
+    result = report_data["result"]
+    if result["is_valid"]:
+        return {'is_valid': True, 'error': None, 'output': report_data["content"], 'report_data': report_data}
+    error_msg = "テキスト内容の不一致が検出されました"
+    if report_data["errors"]:
+        error_msg += f"\nエラー数: {len(report_data['errors'])}"
+    return {'is_valid': False, 'error': error_msg, 'output': report_data["content"], 'report_data': report_data}
 
 
 def validate_text_content(
@@ -91,7 +145,7 @@ def validate_text_content(
     Args:
         original_file: 元のXMLファイルのパス
         processed_file: 処理後のXMLファイルのパス
-        comparison_script_path: 比較スクリプトのパス（Noneの場合はデフォルト）
+        comparison_script_path: 後方互換性のため残している引数（使用しません）
     
     Returns:
         (is_valid: bool, error_message: Optional[str], validation_output: Optional[str], report_data: Optional[Dict])
@@ -102,67 +156,72 @@ def validate_text_content(
     if not processed_file.exists():
         return False, "処理後のファイルが見つかりません", None, None
     
-    if comparison_script_path is None:
-        # デフォルトの比較スクリプトパス
-        script_dir = original_file.parent.parent / "scripts"
-        comparison_script_path = script_dir / "compare_xml_text_content.py"
+    try:
+        result = check_text_content(original_file, processed_file)
+    except Exception as e:
+        return False, f"検証の実行エラー: {str(e)}", None, None
     
-    if not comparison_script_path.exists():
-        return False, "比較スクリプトが見つかりません", None, None
+    content = _content_validation_result(build_report_data(result))
+    return content['is_valid'], content['error'], content['output'], content['report_data']
+
+
+def validate_output(original_file: Path, output_path: Path) -> Dict[str, Dict]:
+    """
+    変換後のファイルの構文検証とテキスト内容検証をまとめて実行
     
-    try:
-        # 一時的なレポートファイルを作成
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as tmp_report:
-            report_path = Path(tmp_report.name)
-        
-        result = subprocess.run(
-            [
-                sys.executable,
-                str(comparison_script_path),
-                str(original_file),
-                str(processed_file),
-                "--report_file",
-                str(report_path)
-            ],
-            capture_output=True,
-            text=True,
-            timeout=60
+    Args:
+        original_file: 元のXMLファイルのパス
+        output_path: 変換後のXMLファイルのパス
+    
+    Returns:
+        {"syntax": {...}, "content": {...}}（各ファイルが存在しない検証は含まない）
+    """
+    validation_results = {}
+    
+    if output_path.exists():
+        syntax_valid, syntax_error, syntax_output = validate_xml_syntax_with_script(output_path)
+        validation_results['syntax'] = {
+            'is_valid': syntax_valid,
+            'error': syntax_error,
+            'output': syntax_output
+        }
+    
+    if original_file and original_file.exists() and output_path.exists():
+        content_valid, content_error, content_output, report_data = validate_text_content(
+            original_file,
+            output_path
         )
-        
-        # レポートファイルを読み込む
-        report_data = None
-        if report_path.exists():
-            with open(report_path, 'r', encoding='utf-8') as f:
-                report_content = f.read()
-            
-            # レポートの内容を解析
-            report_data = {
-                "content": report_content,
-                "success": "✅ Success:" in report_content or "SUCCESS:" in report_content,
-                "errors": []
-            }
-            
-            # エラー行を抽出
-            for line in report_content.split('\n'):
-                if "❌ Error:" in line or "ERROR:" in line:
-                    report_data["errors"].append(line)
-            
-            # 一時ファイルを削除
-            report_path.unlink()
-        
-        if result.returncode == 0 and report_data and report_data["success"]:
-            return True, None, result.stdout, report_data
-        else:
-            error_msg = "テキスト内容の不一致が検出されました"
-            if report_data and report_data["errors"]:
-                error_msg += f"\nエラー数: {len(report_data['errors'])}"
-            return False, error_msg, result.stdout + result.stderr, report_data
+        validation_results['content'] = {
+            'is_valid': content_valid,
+            'error': content_error,
+            'output': content_output,
+            'report_data': report_data
+        }
     
-    except subprocess.TimeoutExpired:
-        return False, "検証がタイムアウトしました", None, None
-    except Exception as e:
-        return False, f"検証スクリプトの実行エラー: {str(e)}", None, None
+    return validation_results
+
+
+def validation_results_from_engine_log(validation_log: Dict, output_path: Path) -> Dict[str, Dict]:
+    """
+    パイプラインエンジン（scripts/pipeline_engine.py の --validation-report）が最終ツリーで行った
+    テキスト内容検証の結果から、validate_output() と同じ形式の検証結果を作成（ファイルを再度読み込まない）
+    
+    構文検証は、出力ファイルがエンジンのメモリ上のツリーから書き出されたものなので成功として扱います。
+    
+    Args:
+        validation_log: エンジンの実行ログの "validation"（TextContentComparison.to_dict() と "report_file"）
+        output_path: 変換後のXMLファイルのパス
+    
+    Returns:
+        {"syntax": {...}, "content": {...}}
+    """
+    syntax = XMLSyntaxValidation(str(output_path))
+    report_content = Path(validation_log["report_file"]).read_text(encoding='utf-8')
+    result = {key: value for key, value in validation_log.items() if key != "report_file"}
+    return {
+        'syntax': {'is_valid': True, 'error': None, 'output': syntax.format_report() + "\n"},
+        'content': _content_validation_result(build_report_data(result, report_content))
+    }
 
 
 def format_validation_report(report_data: Dict) -> str: